@@ -3,8 +3,8 @@ Aplicación principal de Penya Independent con autenticación
 """
 import streamlit as st
 from common import login
-import home
 from utils.ui import page_config
+from utils.arranque import importar_modulo
 
 def main():
     """
@@ -15,7 +15,9 @@ def main():
     
     # Verificar si el usuario está autenticado
     if login.mostrar_login():
-        # Ejecutar la aplicación principal
+        # Importar la aplicación principal solo tras autenticarse, para que la
+        # pantalla de login no cargue pandas, plotly ni el resto de páginas
+        home = importar_modulo("home")
         home.main()
 
 if __name__ == "__main__":
@@ -3,6 +3,7 @@ Cálculos relacionados con estadísticas del equipo
 """
 import pandas as pd
 import numpy as np
+from utils.instrumentacion import instrumentar
 
 def normalizar_nombre_equipo(nombre):
     """
@@ -35,6 +36,80 @@ def normalizar_nombre_equipo(nombre):
         
     return nombre
 
+def mascara_equipo(campo, equipo_normalizado):
+    """
+    Indica qué filas de una columna de nombres de equipo corresponden al equipo.
+    El nombre se normaliza una sola vez por valor distinto, no una vez por fila.
+    
+    Args:
+        campo: Serie con nombres de equipo
+        equipo_normalizado: Nombre del equipo ya normalizado
+        
+    Returns:
+        Series: Serie booleana alineada con campo
+    """
+    coincidencias = {
+        valor: equipo_normalizado in (normalizar_nombre_equipo(valor) or '')
+        for valor in campo.dropna().unique()
+    }
+    return campo.map(coincidencias).fillna(False).astype(bool)
+
+@instrumentar
+def filtrar_datos_equipo(data, equipo_seleccionado):
+    """
+    Filtra todos los datos según el equipo seleccionado
+    
+    Args:
+        data: Diccionario de datos (ver utils.data.cargar_datos)
+        equipo_seleccionado: Nombre del equipo
+        
+    Returns:
+        dict: Datos completos y filtrados del equipo (actas_penya, goles_penya,
+              partidos_penya con es_local, sustituciones_penya) y el mapa jugador -> equipo
+    """
+    datos_filtrados = {}
+    
+    # Normalizar nombre del equipo seleccionado
+    equipo_normalizado = normalizar_nombre_equipo(equipo_seleccionado)
+    
+    def filtrar_por_equipo(campo):
+        return mascara_equipo(campo, equipo_normalizado)
+    
+    # Filtrar actas
+    datos_filtrados['actas'] = data['actas']  # Mantener todas las actas para referencias
+    datos_filtrados['actas_penya'] = data['actas'][filtrar_por_equipo(data['actas']['equipo'])]
+    
+    # Crear un mapa de jugador -> equipo para filtrar goles específicos del equipo
+    jugador_equipo = data['actas'][['jugador', 'equipo']].drop_duplicates()
+    jugador_equipo_dict = dict(zip(jugador_equipo['jugador'], jugador_equipo['equipo']))
+    datos_filtrados['jugador_equipo'] = jugador_equipo_dict
+    
+    # Filtrar goles
+    goles_con_equipo = data['goles'].copy()
+    goles_con_equipo['equipo'] = goles_con_equipo['jugador'].map(jugador_equipo_dict)
+    datos_filtrados['goles'] = goles_con_equipo  # Todos los goles
+    datos_filtrados['goles_penya'] = goles_con_equipo[filtrar_por_equipo(goles_con_equipo['equipo'])].copy()
+    
+    # Filtrar jornadas/partidos
+    datos_filtrados['jornadas'] = data['jornadas']  # Todas las jornadas
+    
+    partidos_filtrados = data['jornadas'][
+        (filtrar_por_equipo(data['jornadas']['equipo_local'])) | 
+        (filtrar_por_equipo(data['jornadas']['equipo_visitante']))
+    ].copy()
+    
+    # Añadir columna es_local para facilitar cálculos posteriores
+    partidos_filtrados['es_local'] = filtrar_por_equipo(partidos_filtrados['equipo_local'])
+    
+    datos_filtrados['partidos_penya'] = partidos_filtrados
+    
+    # Filtrar sustituciones
+    datos_filtrados['sustituciones'] = data['sustituciones']  # Todas las sustituciones
+    datos_filtrados['sustituciones_penya'] = data['sustituciones'][filtrar_por_equipo(data['sustituciones']['equipo'])]
+    
+    return datos_filtrados
+
+@instrumentar
 def ajustar_tarjetas_por_doble_amarilla(actas_df):
     """
     Ajusta el conteo de tarjetas para que cuando un jugador recibe 2 amarillas
@@ -90,6 +165,7 @@ def ajustar_tarjetas_por_doble_amarilla(actas_df):
     
     return df_ajustado
 
+@instrumentar
 def contar_partidos_jugados(partidos_df, equipo_seleccionado="PENYA INDEPENDENT"):
     """
     Cuenta los partidos jugados, verificando que tengan un enlace de acta válido
@@ -109,6 +185,7 @@ def contar_partidos_jugados(partidos_df, equipo_seleccionado="PENYA INDEPENDENT"
     
     return partidos_jugados
 
+@instrumentar
 def calcular_estadisticas_generales(actas_df, goles_df, partidos_df, equipo_seleccionado="PENYA INDEPENDENT"):
     """
     Calcula estadísticas generales del equipo
@@ -150,6 +227,7 @@ def calcular_estadisticas_generales(actas_df, goles_df, partidos_df, equipo_sele
     
     return estadisticas
 
+@instrumentar
 def analizar_tarjetas_por_jornada(actas_df):
     """
     Analiza la distribución de tarjetas por jornada
@@ -171,6 +249,7 @@ def analizar_tarjetas_por_jornada(actas_df):
     
     return tarjetas_por_jornada
 
+@instrumentar
 def obtener_rivales_con_goles(actas_df, goles_df):
     """
     Obtiene los rivales contra los que se marcaron goles
@@ -203,6 +282,7 @@ def obtener_rivales_con_goles(actas_df, goles_df):
     
     return goles_por_rival
 
+@instrumentar
 def analizar_tipos_goles(goles_df):
     """
     Analiza los tipos de goles marcados
@@ -218,6 +298,7 @@ def analizar_tipos_goles(goles_df):
     
     return tipos_goles
 
+@instrumentar
 def calcular_goles_contra(actas_df, partidos_df, actas_completas_df, equipo_seleccionado="PENYA INDEPENDENT"):
     """
     Calcula los goles en contra basado en los datos de las actas
@@ -285,6 +366,7 @@ def calcular_goles_contra(actas_df, partidos_df, actas_completas_df, equipo_sele
 
     return int(goles_contra)
 
+@instrumentar
 def calcular_tarjetas_rivales(actas_completas_df, partidos_df, equipo_seleccionado="PENYA INDEPENDENT"):
     """
     Calcula las tarjetas de los equipos rivales
@@ -351,6 +433,7 @@ def calcular_tarjetas_rivales(actas_completas_df, partidos_df, equipo_selecciona
         'rojas': int(tr_rival)
     }
 
+@instrumentar
 def calcular_metricas_avanzadas(partidos_df, goles_df, actas_df, actas_completas_df, equipo_seleccionado="PENYA INDEPENDENT", medias_liga=None):
     """
     Calcula métricas avanzadas para mostrar en tarjetas
@@ -3,7 +3,10 @@ Cálculos relacionados con estadísticas de jugadores
 """
 import pandas as pd
 import numpy as np
+from calculos.clasificacion import clave_equipo
+from utils.instrumentacion import instrumentar
 
+@instrumentar
 def ajustar_tarjetas_por_doble_amarilla(actas_df):
     """
     Ajusta el conteo de tarjetas para que cuando un jugador recibe 2 amarillas
@@ -18,47 +21,25 @@ def ajustar_tarjetas_por_doble_amarilla(actas_df):
     # Crear una copia del DataFrame para no modificar el original
     df_ajustado = actas_df.copy()
     
-    # Agrupar por jugador y jornada para identificar casos de doble amarilla
-    tarjetas_por_jugador_jornada = df_ajustado.groupby(['jugador', 'jornada']).agg({
-        'Tarjetas Amarillas': 'sum',
-        'Tarjetas Rojas': 'sum'
-    }).reset_index()
+    # Amarillas totales de cada jugador en cada jornada (vectorizado, sin recorrer los casos uno a uno)
+    amarillas = df_ajustado.groupby(['jugador', 'jornada'])['Tarjetas Amarillas'].transform('sum')
+    doble_amarilla = amarillas >= 2
+    if not doble_amarilla.any():
+        return df_ajustado
     
-    # Identificar jugadores con 2 o más amarillas en una jornada
-    jugadores_doble_amarilla = tarjetas_por_jugador_jornada[
-        (tarjetas_por_jugador_jornada['Tarjetas Amarillas'] >= 2)
-    ]
+    # El primer registro del jugador en la jornada recibe el ajuste: cada par de amarillas es una roja
+    primer_registro = ~df_ajustado.duplicated(['jugador', 'jornada'])
+    ajustar = doble_amarilla & primer_registro
+    df_ajustado.loc[ajustar, 'Tarjetas Rojas'] += (amarillas[ajustar] // 2).astype(df_ajustado['Tarjetas Rojas'].dtype)
+    df_ajustado.loc[ajustar, 'Tarjetas Amarillas'] = (amarillas[ajustar] % 2).astype(df_ajustado['Tarjetas Amarillas'].dtype)
     
-    # Para cada caso de doble amarilla, ajustar en el DataFrame original
-    for _, row in jugadores_doble_amarilla.iterrows():
-        jugador = row['jugador']
-        jornada = row['jornada']
-        amarillas = row['Tarjetas Amarillas']
-        
-        # Si hay 2 o más amarillas, convertir cada par en una roja
-        rojas_adicionales = amarillas // 2
-        amarillas_restantes = amarillas % 2
-        
-        # Localizar registros del jugador en esa jornada
-        mask = (df_ajustado['jugador'] == jugador) & (df_ajustado['jornada'] == jornada)
-        
-        # Actualizar el primer registro con los valores ajustados
-        if any(mask):
-            # Obtener el índice del primer registro que cumple con la condición
-            primer_registro = df_ajustado[mask].index[0]
-            
-            # Actualizar tarjetas amarillas y rojas
-            df_ajustado.loc[primer_registro, 'Tarjetas Amarillas'] = amarillas_restantes
-            df_ajustado.loc[primer_registro, 'Tarjetas Rojas'] += rojas_adicionales
-            
-            # Si hay más registros del mismo jugador en la misma jornada, poner a cero sus tarjetas
-            otros_registros = df_ajustado[mask].index[1:]
-            if len(otros_registros) > 0:
-                df_ajustado.loc[otros_registros, 'Tarjetas Amarillas'] = 0
-                df_ajustado.loc[otros_registros, 'Tarjetas Rojas'] = 0
+    # Si hay más registros del mismo jugador en la misma jornada, poner a cero sus tarjetas
+    otros_registros = doble_amarilla & ~primer_registro
+    df_ajustado.loc[otros_registros, ['Tarjetas Amarillas', 'Tarjetas Rojas']] = 0
     
     return df_ajustado
 
+@instrumentar
 def calcular_estadisticas_jugador(actas_df, jugador_nombre):
     """
     Calcula estadísticas generales para un jugador específico
@@ -108,6 +89,7 @@ def calcular_estadisticas_jugador(actas_df, jugador_nombre):
     
     return estadisticas
 
+@instrumentar
 def obtener_minutos_por_jornada(actas_df, jugador_nombre):
     """
     Obtiene los minutos jugados por jornada para un jugador específico
@@ -136,6 +118,7 @@ def obtener_minutos_por_jornada(actas_df, jugador_nombre):
     
     return minutos_por_jornada
 
+@instrumentar
 def obtener_top_goleadores(actas_df, top_n=5):
     """
     Obtiene los jugadores con más goles
@@ -159,6 +142,7 @@ def obtener_top_goleadores(actas_df, top_n=5):
     # Limitar al número especificado
     return goles_por_jugador.head(top_n)
 
+@instrumentar
 def obtener_top_amonestados(actas_df, top_n=5):
     """
     Obtiene los jugadores con más tarjetas
@@ -194,6 +178,7 @@ def obtener_top_amonestados(actas_df, top_n=5):
     # Limitar al número especificado
     return tarjetas_por_jugador.head(top_n)
 
+@instrumentar
 def obtener_jugadores_mas_minutos(actas_df, top_n=5):
     """
     Obtiene los jugadores con más minutos jugados
@@ -214,6 +199,7 @@ def obtener_jugadores_mas_minutos(actas_df, top_n=5):
     # Limitar al número especificado
     return minutos_por_jugador.head(top_n)
 
+@instrumentar
 def analizar_goles_por_tiempo(goles_df):
     """
     Analiza la distribución de goles por rango de minutos
@@ -237,6 +223,7 @@ def analizar_goles_por_tiempo(goles_df):
     
     return goles_por_minuto
 
+@instrumentar
 def analizar_goles_por_jugador(goles_df, actas_df):
     """
     Analiza los goles marcados por cada jugador
@@ -257,6 +244,7 @@ def analizar_goles_por_jugador(goles_df, actas_df):
     
     return goles_por_jugador
 
+@instrumentar
 def analizar_tarjetas_por_jugador(actas_df):
     """
     Analiza las tarjetas recibidas por cada jugador
@@ -290,6 +278,7 @@ def analizar_tarjetas_por_jugador(actas_df):
     
     return tarjetas_por_jugador
 
+@instrumentar
 def analizar_minutos_por_jugador(actas_df):
     """
     Analiza los minutos jugados por cada jugador con diferentes desgloses
@@ -356,6 +345,7 @@ def analizar_minutos_por_jugador(actas_df):
     
     return minutos_jugador
 
+@instrumentar
 def analizar_minutos_por_jornada(actas_df):
     """
     Analiza los minutos jugados por jornada y condición
@@ -381,6 +371,7 @@ def analizar_minutos_por_jornada(actas_df):
     
     return minutos_pivot
 
+@instrumentar
 def analizar_distribucion_sustituciones(sustituciones_df, rango_minutos=5):
     """
     Analiza la distribución de sustituciones por minuto de juego
@@ -483,4 +474,151 @@ def analizar_distribucion_sustituciones(sustituciones_df, rango_minutos=5):
         'top_sustituciones': top_sustituciones,
         'top_sustituidos': top_sustituidos,
         'top_suplentes': top_suplentes
-    }
\ No newline at end of file
+    }
+# Separación entre partidos en las claves ordenadas partido * ESCALA_MINUTOS + minuto
+ESCALA_MINUTOS = 1000
+
+@instrumentar
+def construir_intervalos_jugadores(actas_df, sustituciones_df, partidos_df):
+    """
+    Calcula los intervalos [desde, hasta) en el campo de cada jugador en cada
+    partido a partir de la titularidad y las sustituciones. Las entradas y
+    salidas de un mismo jugador se emparejan por orden (la k-ésima entrada con
+    la k-ésima salida), así que un jugador puede tener varios intervalos en un
+    partido. Sin salida registrada, el intervalo acaba con el partido.
+    
+    Args:
+        actas_df: DataFrame con los datos de actas (status Titular/Suplente)
+        sustituciones_df: DataFrame con las sustituciones (jugador_entra, jugador_sale, Minuto, equipo, Jornada)
+        partidos_df: Partidos de la línea temporal (jornada, local, visitante, duracion)
+        
+    Returns:
+        DataFrame: partido, lado (0 local, 1 visitante), equipo, jugador, desde y hasta
+    """
+    # Partido y lado de cada equipo en cada jornada
+    lados = pd.concat([
+        pd.DataFrame({'jornada': partidos_df['jornada'], 'clave': partidos_df['local'],
+                      'partido': partidos_df.index, 'lado': 0}),
+        pd.DataFrame({'jornada': partidos_df['jornada'], 'clave': partidos_df['visitante'],
+                      'partido': partidos_df.index, 'lado': 1})
+    ], ignore_index=True).drop_duplicates(['jornada', 'clave'])
+    
+    titulares = actas_df[actas_df['status'] == 'Titular']
+    entradas = pd.concat([
+        pd.DataFrame({'jornada': titulares['jornada'], 'equipo': titulares['equipo'],
+                      'jugador': titulares['jugador'], 'minuto': 0}),
+        pd.DataFrame({'jornada': sustituciones_df['Jornada'], 'equipo': sustituciones_df['equipo'],
+                      'jugador': sustituciones_df['jugador_entra'], 'minuto': sustituciones_df['Minuto']})
+    ], ignore_index=True)
+    salidas = pd.DataFrame({'jornada': sustituciones_df['Jornada'], 'equipo': sustituciones_df['equipo'],
+                            'jugador': sustituciones_df['jugador_sale'], 'minuto': sustituciones_df['Minuto']})
+    
+    # Emparejar la k-ésima entrada con la k-ésima salida de cada jugador en cada jornada
+    claves = ['jornada', 'equipo', 'jugador']
+    entradas = entradas.drop_duplicates().sort_values(claves + ['minuto'], kind='stable')
+    salidas = salidas.drop_duplicates().sort_values(claves + ['minuto'], kind='stable')
+    entradas['orden'] = entradas.groupby(claves).cumcount()
+    salidas['orden'] = salidas.groupby(claves).cumcount()
+    intervalos = entradas.merge(salidas, on=claves + ['orden'], how='left', suffixes=('_entra', '_sale'))
+    
+    intervalos['jornada'] = pd.to_numeric(intervalos['jornada'], errors='coerce')
+    intervalos = intervalos.dropna(subset=['jornada'])
+    intervalos['jornada'] = intervalos['jornada'].astype(int)
+    intervalos['clave'] = intervalos['equipo'].map(clave_equipo)
+    intervalos = intervalos.merge(lados, on=['jornada', 'clave'], how='inner')
+    
+    duracion = partidos_df['duracion'].to_numpy()[intervalos['partido'].to_numpy()]
+    intervalos['desde'] = intervalos['minuto_entra'].astype(int)
+    intervalos['hasta'] = np.minimum(intervalos['minuto_sale'].fillna(pd.Series(duracion, index=intervalos.index)), duracion).astype(int)
+    intervalos = intervalos[intervalos['hasta'] > intervalos['desde']]
+    
+    return intervalos[['partido', 'lado', 'equipo', 'jugador', 'desde', 'hasta']].astype(
+        {'partido': np.int32, 'lado': np.int8, 'desde': np.int16, 'hasta': np.int16}
+    ).sort_values(['partido', 'lado', 'desde'], kind='stable').reset_index(drop=True)
+
+def contar_en_intervalos(claves_ordenadas, partido, desde, hasta, hasta_final):
+    """
+    Número de claves (partido * ESCALA_MINUTOS + minuto) dentro de cada
+    intervalo [desde, hasta) de su partido, con dos búsquedas binarias.
+    Los intervalos que acaban con el partido (hasta_final) incluyen su último
+    minuto, para no perder los goles del minuto final.
+    """
+    base = partido.astype(np.int64) * ESCALA_MINUTOS
+    fin = base + hasta + hasta_final
+    return (np.searchsorted(claves_ordenadas, fin, side='left')
+            - np.searchsorted(claves_ordenadas, base + desde, side='left'))
+
+@instrumentar
+def calcular_mas_menos(intervalos, goles_df, partidos_df):
+    """
+    Goles a favor y en contra de cada jugador con él en el campo y sin él
+    (en los partidos que ha jugado), para toda la liga de una vez. Los goles se
+    cruzan con los intervalos mediante búsquedas binarias sobre los goles
+    ordenados de cada lado, sin bucles por partido ni por jugador.
+    
+    Args:
+        intervalos: Resultado de construir_intervalos_jugadores
+        goles_df: Goles con partido, minuto y lado (0 local, 1 visitante)
+        partidos_df: Partidos de la línea temporal (duracion)
+        
+    Returns:
+        DataFrame: Por jugador y equipo, minutos, goles con él en el campo y
+                   fuera, +/- total, +/- por 90 minutos dentro y fuera y la diferencia
+    """
+    columnas = ['jugador', 'equipo', 'partidos', 'minutos', 'goles_favor', 'goles_contra', 'mas_menos',
+                'mas_menos_90', 'minutos_fuera', 'goles_favor_fuera', 'goles_contra_fuera',
+                'mas_menos_fuera_90', 'diferencia_dentro_fuera']
+    if intervalos.empty:
+        return pd.DataFrame(columns=columnas)
+    
+    partido = intervalos['partido'].to_numpy()
+    lado = intervalos['lado'].to_numpy()
+    desde = intervalos['desde'].to_numpy().astype(np.int64)
+    hasta = intervalos['hasta'].to_numpy().astype(np.int64)
+    
+    # Claves ordenadas de los goles de cada lado
+    claves = goles_df['partido'].to_numpy(np.int64) * ESCALA_MINUTOS + goles_df['minuto'].to_numpy()
+    claves_lado = [np.sort(claves[goles_df['lado'].to_numpy() == l]) for l in (0, 1)]
+    hasta_final = hasta == partidos_df['duracion'].to_numpy()[partido]
+    goles_local = contar_en_intervalos(claves_lado[0], partido, desde, hasta, hasta_final)
+    goles_visitante = contar_en_intervalos(claves_lado[1], partido, desde, hasta, hasta_final)
+    
+    dentro = intervalos[['partido', 'lado', 'jugador', 'equipo']].assign(
+        minutos=hasta - desde,
+        goles_favor=np.where(lado == 0, goles_local, goles_visitante),
+        goles_contra=np.where(lado == 0, goles_visitante, goles_local)
+    )
+    
+    # Totales de cada jugador en cada partido y del equipo en ese partido
+    n = len(partidos_df)
+    total_por_lado = np.stack([
+        np.bincount(goles_df['partido'][goles_df['lado'] == l], minlength=n) for l in (0, 1)
+    ])
+    por_partido = dentro.groupby(['partido', 'lado', 'jugador', 'equipo'], sort=False)[
+        ['minutos', 'goles_favor', 'goles_contra']
+    ].sum().reset_index()
+    p = por_partido['partido'].to_numpy()
+    lado_jugador = por_partido['lado'].to_numpy()
+    por_partido['minutos_fuera'] = partidos_df['duracion'].to_numpy()[p] - por_partido['minutos']
+    por_partido['goles_favor_fuera'] = total_por_lado[lado_jugador, p] - por_partido['goles_favor']
+    por_partido['goles_contra_fuera'] = total_por_lado[1 - lado_jugador, p] - por_partido['goles_contra']
+    
+    resumen = por_partido.groupby(['jugador', 'equipo']).agg(
+        partidos=('partido', 'nunique'),
+        minutos=('minutos', 'sum'),
+        goles_favor=('goles_favor', 'sum'),
+        goles_contra=('goles_contra', 'sum'),
+        minutos_fuera=('minutos_fuera', 'sum'),
+        goles_favor_fuera=('goles_favor_fuera', 'sum'),
+        goles_contra_fuera=('goles_contra_fuera', 'sum')
+    ).reset_index()
+    
+    resumen['mas_menos'] = resumen['goles_favor'] - resumen['goles_contra']
+    resumen['mas_menos_90'] = (resumen['mas_menos'] * 90 / resumen['minutos'].where(resumen['minutos'] > 0)).round(2)
+    resumen['mas_menos_fuera_90'] = (
+        (resumen['goles_favor_fuera'] - resumen['goles_contra_fuera']) * 90
+        / resumen['minutos_fuera'].where(resumen['minutos_fuera'] > 0)
+    ).round(2)
+    resumen['diferencia_dentro_fuera'] = (resumen['mas_menos_90'] - resumen['mas_menos_fuera_90']).round(2)
+    
+    return resumen[columnas].sort_values('mas_menos', ascending=False).reset_index(drop=True)
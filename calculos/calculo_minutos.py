@@ -1,5 +1,7 @@
 import pandas as pd
+from utils.instrumentacion import instrumentar
 
+@instrumentar
 def obtener_minutos_por_jornada(actas_df, jugador):
     """
     Obtiene los minutos jugados por jornada para un jugador específico
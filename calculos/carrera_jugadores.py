@@ -0,0 +1,263 @@
+"""
+Índice de identidad de jugadores y resumen de su carrera entre temporadas
+Ubicación: calculos/carrera_jugadores.py
+
+El nombre de las actas ("APELLIDOS, NOMBRE") no es estable entre temporadas:
+cambian acentos, espacios o alguna letra. Aquí cada variante se asigna a un
+jugador_id estable mediante:
+  1. Normalización (mayúsculas, sin acentos ni signos, espacios simples).
+  2. Fusiones manuales del archivo data/fusiones_jugadores.csv (opcional).
+  3. Coincidencia aproximada entre nombres con el mismo primer apellido,
+     sin unir nunca dos grupos de nombres que comparten alguna temporada.
+
+El jugador_id se deriva de la primera variante vista (primera temporada y
+primera aparición en ella), de modo que no cambia cuando en temporadas
+posteriores aparecen variantes nuevas del mismo nombre.
+
+Con el índice se precalcula una tabla con una fila por jugador y temporada,
+y la carrera de cada jugador se consulta con un acceso a diccionario.
+"""
+import os
+import re
+import hashlib
+import unicodedata
+from difflib import SequenceMatcher
+
+import pandas as pd
+
+from calculos.calculo_jugadores import ajustar_tarjetas_por_doble_amarilla
+from utils.instrumentacion import instrumentar
+
+# Similitud mínima (0-1) para considerar dos nombres el mismo jugador
+UMBRAL_SIMILITUD = 0.92
+
+RUTA_FUSIONES = os.path.join("data", "fusiones_jugadores.csv")
+
+
+def normalizar_nombre_jugador(nombre):
+    """
+    Normaliza un nombre de jugador: mayúsculas, sin acentos, sin signos
+    (salvo la coma entre apellidos y nombre) y con espacios simples
+
+    Args:
+        nombre: Nombre tal como aparece en las actas
+
+    Returns:
+        str: Nombre normalizado, por ejemplo "GARCIA LOPEZ, JOSE MARIA"
+    """
+    if not isinstance(nombre, str):
+        return ""
+    texto = unicodedata.normalize('NFKD', nombre)
+    texto = ''.join(c for c in texto if not unicodedata.combining(c)).upper()
+    texto = re.sub(r"[^A-Z0-9, ]+", " ", texto)
+    partes = [re.sub(r"\s+", " ", p).strip() for p in texto.split(",")]
+    return ", ".join(p for p in partes if p)
+
+
+def _id_jugador(nombre_canonico):
+    """
+    Identificador estable derivado del nombre canónico (la primera variante vista)
+    """
+    return "J" + hashlib.sha1(nombre_canonico.encode('utf-8')).hexdigest()[:10]
+
+
+def cargar_fusiones(ruta=RUTA_FUSIONES):
+    """
+    Lee las fusiones manuales (columnas nombre, nombre_canonico)
+
+    Returns:
+        dict: nombre normalizado -> nombre canónico normalizado
+    """
+    if not os.path.exists(ruta):
+        return {}
+    try:
+        fusiones = pd.read_csv(ruta)
+    except Exception as e:
+        print(f"Error al leer las fusiones de jugadores: {e}")
+        return {}
+    return {
+        normalizar_nombre_jugador(n): normalizar_nombre_jugador(c)
+        for n, c in zip(fusiones['nombre'], fusiones['nombre_canonico'])
+    }
+
+
+class _Uniones:
+    """
+    Conjuntos disjuntos para agrupar variantes de un mismo nombre. Cada grupo
+    guarda las temporadas de todas sus variantes y el orden de aparición de
+    la primera, que es su representante.
+    """
+    def __init__(self):
+        self.padre = {}
+        self.temporadas = {}  # raíz -> temporadas de todas las variantes del grupo
+        self.orden = {}  # raíz -> orden de aparición de la primera variante
+
+    def agregar(self, x, temporadas=(), orden=float('inf')):
+        if x not in self.padre:
+            self.padre[x] = x
+            self.temporadas[x] = set(temporadas)
+            self.orden[x] = orden
+
+    def buscar(self, x):
+        self.agregar(x)
+        while self.padre[x] != x:
+            self.padre[x] = self.padre[self.padre[x]]
+            x = self.padre[x]
+        return x
+
+    def unir(self, a, b, forzar=False):
+        """
+        Une los grupos de a y b. Sin forzar, no se unen dos grupos que comparten
+        alguna temporada (serían dos jugadores distintos de la misma temporada).
+
+        Returns:
+            bool: True si a y b quedan en el mismo grupo
+        """
+        ra, rb = self.buscar(a), self.buscar(b)
+        if ra == rb:
+            return True
+        if not forzar and self.temporadas[ra] & self.temporadas[rb]:
+            return False
+        # El representante es la variante que apareció antes, para que el id no cambie
+        if (self.orden[rb], rb) < (self.orden[ra], ra):
+            ra, rb = rb, ra
+        self.padre[rb] = ra
+        self.temporadas[ra] |= self.temporadas.pop(rb)
+        self.orden.pop(rb)
+        return True
+
+
+@instrumentar
+def construir_indice_jugadores(actas_df, fusiones=None, umbral=UMBRAL_SIMILITUD):
+    """
+    Asigna un jugador_id a cada nombre que aparece en las actas
+
+    Args:
+        actas_df: Actas de una o varias temporadas (con columna 'temporada')
+        fusiones: Fusiones manuales {nombre: nombre_canonico}; por defecto las del CSV
+        umbral: Similitud mínima para la coincidencia aproximada
+
+    Returns:
+        DataFrame: Columnas jugador (nombre original), nombre_normalizado,
+                   nombre_canonico y jugador_id
+    """
+    if fusiones is None:
+        fusiones = cargar_fusiones()
+
+    # Orden de aparición: temporada y, dentro de ella, el orden de las actas
+    nombres = actas_df[['jugador', 'temporada']].dropna()
+    nombres = nombres.sort_values('temporada', kind='stable').drop_duplicates()
+    nombres['nombre_normalizado'] = nombres['jugador'].map(normalizar_nombre_jugador)
+
+    # Temporadas y primera aparición de cada nombre normalizado
+    temporadas_nombre = nombres.groupby('nombre_normalizado', sort=False)['temporada'].agg(set).to_dict()
+    uniones = _Uniones()
+    for orden, nombre in enumerate(temporadas_nombre):
+        uniones.agregar(nombre, temporadas_nombre[nombre], orden)
+
+    # Fusiones manuales: se aplican aunque los nombres compartan temporada
+    for nombre, canonico in fusiones.items():
+        if nombre and canonico:
+            uniones.unir(canonico, nombre, forzar=True)
+
+    # Coincidencia aproximada solo entre nombres con el mismo primer apellido
+    bloques = {}
+    for nombre in temporadas_nombre:
+        bloques.setdefault(nombre.split(" ")[0], []).append(nombre)
+
+    for candidatos in bloques.values():
+        candidatos.sort()
+        for i, a in enumerate(candidatos):
+            for b in candidatos[i + 1:]:
+                # unir rechaza los grupos que comparten temporada (jugadores distintos)
+                if uniones.buscar(a) == uniones.buscar(b):
+                    continue
+                if SequenceMatcher(None, a, b).ratio() >= umbral:
+                    uniones.unir(a, b)
+
+    indice = nombres[['jugador', 'nombre_normalizado']].drop_duplicates('jugador').copy()
+    indice['nombre_canonico'] = indice['nombre_normalizado'].map(uniones.buscar)
+    indice['jugador_id'] = indice['nombre_canonico'].map(_id_jugador)
+    return indice.reset_index(drop=True)
+
+
+@instrumentar
+def construir_resumen_carreras(actas_df, indice=None):
+    """
+    Precalcula una fila por jugador y temporada con sus totales
+
+    Args:
+        actas_df: Actas de una o varias temporadas (con columna 'temporada')
+        indice: Índice de construir_indice_jugadores (se calcula si no se pasa)
+
+    Returns:
+        DataFrame: jugador_id, temporada, nombre, equipos, partidos, titularidades,
+                   minutos, goles, tarjetas_amarillas y tarjetas_rojas
+    """
+    if indice is None:
+        indice = construir_indice_jugadores(actas_df)
+
+    # Ajuste de dobles amarillas dentro de cada temporada (las jornadas se repiten entre temporadas)
+    actas = pd.concat(
+        [ajustar_tarjetas_por_doble_amarilla(grupo) for _, grupo in actas_df.groupby('temporada', sort=False)],
+        ignore_index=True
+    ) if not actas_df.empty else actas_df.copy()
+
+    actas = actas.merge(indice[['jugador', 'jugador_id']], on='jugador', how='inner')
+    actas['titular'] = actas['status'] == 'Titular'
+
+    resumen = actas.groupby(['jugador_id', 'temporada']).agg(
+        nombre=('jugador', 'first'),
+        equipos=('equipo', lambda e: ' / '.join(sorted(e.dropna().unique()))),
+        partidos=('jornada', 'size'),
+        titularidades=('titular', 'sum'),
+        minutos=('minutos_jugados', 'sum'),
+        goles=('goles', 'sum'),
+        tarjetas_amarillas=('Tarjetas Amarillas', 'sum'),
+        tarjetas_rojas=('Tarjetas Rojas', 'sum')
+    ).reset_index()
+
+    return resumen.sort_values(['jugador_id', 'temporada']).reset_index(drop=True)
+
+
+@instrumentar
+def construir_carreras(actas_df, fusiones=None):
+    """
+    Construye el índice de identidad y la carrera de cada jugador
+
+    Args:
+        actas_df: Actas de todas las temporadas (con columna 'temporada')
+        fusiones: Fusiones manuales (por defecto las del CSV)
+
+    Returns:
+        dict: 'indice' (DataFrame), 'resumen' (DataFrame jugador/temporada),
+              'por_nombre' (nombre original -> jugador_id) y
+              'carreras' (jugador_id -> DataFrame con sus temporadas)
+    """
+    indice = construir_indice_jugadores(actas_df, fusiones)
+    resumen = construir_resumen_carreras(actas_df, indice)
+
+    return {
+        'indice': indice,
+        'resumen': resumen,
+        'por_nombre': dict(zip(indice['jugador'], indice['jugador_id'])),
+        'carreras': {
+            jugador_id: grupo.reset_index(drop=True)
+            for jugador_id, grupo in resumen.groupby('jugador_id', sort=False)
+        }
+    }
+
+
+def obtener_carrera(carreras, jugador):
+    """
+    Devuelve la carrera de un jugador a partir de su nombre (cualquier variante) o de su jugador_id
+
+    Args:
+        carreras: Diccionario devuelto por construir_carreras
+        jugador: Nombre tal como aparece en las actas o jugador_id
+
+    Returns:
+        DataFrame: Una fila por temporada (vacío si no hay datos)
+    """
+    jugador_id = carreras['por_nombre'].get(jugador, jugador)
+    return carreras['carreras'].get(jugador_id, pd.DataFrame(columns=carreras['resumen'].columns))
@@ -0,0 +1,342 @@
+"""
+Clasificación de la liga calculada a partir de los resultados
+Ubicación: calculos/clasificacion.py
+
+El marcador de cada partido del listado de jornadas se obtiene sumando los
+goles de las actas de cada equipo en esa jornada. Con los resultados se
+mantienen dos arrays de forma (jornadas, equipos, columnas):
+
+  - deltas: lo que aporta cada jornada a cada equipo (PJ, G, E, P, GF, GC)
+  - acumulado: la suma acumulada de deltas hasta cada jornada
+
+Así, la clasificación a una jornada cualquiera es una fila de 'acumulado'
+(O(equipos)) más la ordenación con los criterios de desempate. Al añadir o
+corregir un acta solo se actualiza su jornada y se recalcula el acumulado
+desde esa jornada, sin recorrer de nuevo toda la temporada.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+from utils.instrumentacion import instrumentar
+
+# Columnas de los arrays de deltas y acumulado
+COLUMNAS = ['PJ', 'G', 'E', 'P', 'GF', 'GC']
+PJ, G, E, P, GF, GC = range(len(COLUMNAS))
+
+PUNTOS_VICTORIA = 3
+PUNTOS_EMPATE = 1
+
+
+def clave_equipo(nombre):
+    """
+    Nombre de equipo comparable entre el listado de jornadas y las actas
+    (sin comillas, en mayúsculas y con espacios simples):
+    'SAN FRANCISCO "B"' y 'SAN FRANCISCO B' dan la misma clave
+    """
+    if not isinstance(nombre, str):
+        return ""
+    return re.sub(r"\s+", " ", nombre.replace('"', '')).strip().upper()
+
+
+@instrumentar
+def resultados_partidos(jornadas_df, actas_df):
+    """
+    Obtiene el marcador de cada partido con acta
+
+    Args:
+        jornadas_df: Listado de jornadas (equipo_local, equipo_visitante, jornada)
+        actas_df: Actas de todos los equipos (goles por jugador)
+
+    Returns:
+        DataFrame: jornada, local, visitante, goles_local y goles_visitante
+    """
+    partidos = pd.DataFrame({
+        'jornada': pd.to_numeric(jornadas_df['jornada'], errors='coerce'),
+        'local': jornadas_df['equipo_local'].map(clave_equipo),
+        'visitante': jornadas_df['equipo_visitante'].map(clave_equipo)
+    }).dropna(subset=['jornada'])
+    partidos['jornada'] = partidos['jornada'].astype(int)
+    # El listado puede repetir partidos
+    partidos = partidos.drop_duplicates(['jornada', 'local', 'visitante'])
+
+    # Goles de cada equipo en cada jornada; solo cuentan los partidos con acta
+    actas = actas_df.assign(
+        clave=actas_df['equipo'].map(clave_equipo),
+        jornada=pd.to_numeric(actas_df['jornada'], errors='coerce')
+    ).dropna(subset=['jornada'])
+    actas['jornada'] = actas['jornada'].astype(int)
+    goles = actas.groupby(['jornada', 'clave'])['goles'].sum().to_dict()
+
+    claves_local = list(zip(partidos['jornada'], partidos['local']))
+    claves_visitante = list(zip(partidos['jornada'], partidos['visitante']))
+    partidos['goles_local'] = [goles.get(c) for c in claves_local]
+    partidos['goles_visitante'] = [goles.get(c) for c in claves_visitante]
+
+    partidos = partidos.dropna(subset=['goles_local', 'goles_visitante'])
+    partidos[['goles_local', 'goles_visitante']] = partidos[['goles_local', 'goles_visitante']].astype(int)
+    return partidos.sort_values(['jornada', 'local']).reset_index(drop=True)
+
+
+def _aportacion(goles_propios, goles_rival):
+    """
+    Fila de deltas que aporta un resultado a un equipo
+    """
+    fila = np.zeros(len(COLUMNAS), dtype=np.int32)
+    fila[PJ] = 1
+    fila[G if goles_propios > goles_rival else E if goles_propios == goles_rival else P] = 1
+    fila[GF] = goles_propios
+    fila[GC] = goles_rival
+    return fila
+
+
+def crear_estado_clasificacion(equipos=(), jornadas=()):
+    """
+    Crea un estado vacío de clasificación
+
+    Args:
+        equipos: Claves de equipo conocidas de antemano
+        jornadas: Números de jornada conocidos de antemano
+
+    Returns:
+        dict: Estado con equipos, jornadas, deltas, acumulado y resultados
+    """
+    equipos = sorted(set(equipos))
+    jornadas = sorted(set(int(j) for j in jornadas))
+    forma = (len(jornadas), len(equipos), len(COLUMNAS))
+    return {
+        'equipos': equipos,
+        'indice_equipos': {e: i for i, e in enumerate(equipos)},
+        'jornadas': jornadas,
+        'indice_jornadas': {j: i for i, j in enumerate(jornadas)},
+        'deltas': np.zeros(forma, dtype=np.int32),
+        'acumulado': np.zeros(forma, dtype=np.int32),
+        'resultados': {},  # (jornada, local, visitante) -> (goles_local, goles_visitante)
+        'pendiente_desde': None  # primera jornada (índice) cuyo acumulado hay que rehacer
+    }
+
+
+def _asegurar_equipo(estado, equipo):
+    """
+    Devuelve el índice de un equipo, añadiéndolo a los arrays si es nuevo
+    """
+    if equipo not in estado['indice_equipos']:
+        estado['equipos'].append(equipo)
+        estado['indice_equipos'][equipo] = len(estado['equipos']) - 1
+        relleno = np.zeros((len(estado['jornadas']), 1, len(COLUMNAS)), dtype=np.int32)
+        estado['deltas'] = np.concatenate([estado['deltas'], relleno], axis=1)
+        estado['acumulado'] = np.concatenate([estado['acumulado'], relleno], axis=1)
+    return estado['indice_equipos'][equipo]
+
+
+def _asegurar_jornada(estado, jornada):
+    """
+    Devuelve el índice de una jornada, insertándola en orden si es nueva
+    """
+    if jornada not in estado['indice_jornadas']:
+        posicion = int(np.searchsorted(estado['jornadas'], jornada))
+        estado['jornadas'].insert(posicion, jornada)
+        estado['indice_jornadas'] = {j: i for i, j in enumerate(estado['jornadas'])}
+        fila = np.zeros((1, len(estado['equipos']), len(COLUMNAS)), dtype=np.int32)
+        estado['deltas'] = np.insert(estado['deltas'], posicion, fila, axis=0)
+        estado['acumulado'] = np.insert(estado['acumulado'], posicion, fila, axis=0)
+        _marcar_pendiente(estado, posicion)
+    return estado['indice_jornadas'][jornada]
+
+
+def _marcar_pendiente(estado, posicion):
+    if estado['pendiente_desde'] is None or posicion < estado['pendiente_desde']:
+        estado['pendiente_desde'] = posicion
+
+
+def registrar_resultado(estado, jornada, local, visitante, goles_local, goles_visitante):
+    """
+    Añade o corrige el resultado de un partido. Solo se modifica la jornada
+    del partido; el acumulado se rehace desde ella la próxima vez que se consulte.
+
+    Args:
+        estado: Estado de clasificación
+        jornada: Número de jornada
+        local, visitante: Claves de los equipos (ver clave_equipo)
+        goles_local, goles_visitante: Marcador
+
+    Returns:
+        bool: True si el estado ha cambiado
+    """
+    jornada = int(jornada)
+    clave = (jornada, local, visitante)
+    nuevo = (int(goles_local), int(goles_visitante))
+    anterior = estado['resultados'].get(clave)
+    if anterior == nuevo:
+        return False
+
+    j = _asegurar_jornada(estado, jornada)
+    i_local = _asegurar_equipo(estado, local)
+    i_visitante = _asegurar_equipo(estado, visitante)
+
+    # Quitar el resultado anterior si se está corrigiendo un acta
+    if anterior is not None:
+        estado['deltas'][j, i_local] -= _aportacion(anterior[0], anterior[1])
+        estado['deltas'][j, i_visitante] -= _aportacion(anterior[1], anterior[0])
+
+    estado['deltas'][j, i_local] += _aportacion(nuevo[0], nuevo[1])
+    estado['deltas'][j, i_visitante] += _aportacion(nuevo[1], nuevo[0])
+    estado['resultados'][clave] = nuevo
+    _marcar_pendiente(estado, j)
+    return True
+
+
+def quitar_resultado(estado, jornada, local, visitante):
+    """
+    Quita el resultado de un partido (por ejemplo, si se retira su acta).
+    Como al corregirlo, solo se modifica la jornada del partido.
+
+    Returns:
+        bool: True si el partido tenía resultado
+    """
+    jornada = int(jornada)
+    anterior = estado['resultados'].pop((jornada, local, visitante), None)
+    if anterior is None:
+        return False
+
+    j = estado['indice_jornadas'][jornada]
+    estado['deltas'][j, estado['indice_equipos'][local]] -= _aportacion(anterior[0], anterior[1])
+    estado['deltas'][j, estado['indice_equipos'][visitante]] -= _aportacion(anterior[1], anterior[0])
+    _marcar_pendiente(estado, j)
+    return True
+
+
+def _actualizar_acumulado(estado):
+    """
+    Rehace el acumulado desde la primera jornada modificada
+    """
+    desde = estado['pendiente_desde']
+    if desde is None:
+        return
+    base = estado['acumulado'][desde - 1] if desde > 0 else 0
+    estado['acumulado'][desde:] = base + np.cumsum(estado['deltas'][desde:], axis=0)
+    estado['pendiente_desde'] = None
+
+
+@instrumentar
+def actualizar_clasificacion(estado, jornadas_df, actas_df):
+    """
+    Incorpora al estado los resultados nuevos o corregidos de las actas y
+    quita los que ya no están. Los partidos cuyo marcador no ha cambiado no
+    se vuelven a procesar, y el acumulado solo se rehace desde la primera
+    jornada afectada.
+
+    Returns:
+        int: Número de partidos añadidos, corregidos o quitados
+    """
+    for equipo in set(jornadas_df['equipo_local'].map(clave_equipo)) | set(jornadas_df['equipo_visitante'].map(clave_equipo)):
+        if equipo:
+            _asegurar_equipo(estado, equipo)
+    for jornada in pd.to_numeric(jornadas_df['jornada'], errors='coerce').dropna().astype(int).unique():
+        _asegurar_jornada(estado, int(jornada))
+
+    resultados = resultados_partidos(jornadas_df, actas_df)
+    vigentes = set(zip(resultados['jornada'], resultados['local'], resultados['visitante']))
+    cambios = sum(quitar_resultado(estado, *clave) for clave in list(estado['resultados']) if clave not in vigentes)
+    for jornada, local, visitante, goles_local, goles_visitante in resultados[
+        ['jornada', 'local', 'visitante', 'goles_local', 'goles_visitante']
+    ].itertuples(index=False):
+        cambios += registrar_resultado(estado, jornada, local, visitante, goles_local, goles_visitante)
+    _actualizar_acumulado(estado)
+    return cambios
+
+
+@instrumentar
+def construir_clasificacion(jornadas_df, actas_df):
+    """
+    Construye el estado de clasificación de la temporada
+
+    Args:
+        jornadas_df: Listado de jornadas
+        actas_df: Actas de todos los equipos
+
+    Returns:
+        dict: Estado listo para consultar con clasificacion_jornada
+    """
+    equipos = set(jornadas_df['equipo_local'].map(clave_equipo)) | set(jornadas_df['equipo_visitante'].map(clave_equipo))
+    jornadas = pd.to_numeric(jornadas_df['jornada'], errors='coerce').dropna().astype(int)
+    estado = crear_estado_clasificacion(equipos - {""}, jornadas)
+    actualizar_clasificacion(estado, jornadas_df, actas_df)
+    return estado
+
+
+def _enfrentamientos(estado, equipos, jornada_max):
+    """
+    Puntos y diferencia de goles de cada equipo en los partidos entre los equipos dados
+
+    Returns:
+        dict: equipo -> (puntos, diferencia de goles)
+    """
+    grupo = set(equipos)
+    tabla = {e: [0, 0] for e in equipos}
+    for (jornada, local, visitante), (gl, gv) in estado['resultados'].items():
+        if jornada > jornada_max or local not in grupo or visitante not in grupo:
+            continue
+        tabla[local][1] += gl - gv
+        tabla[visitante][1] += gv - gl
+        if gl > gv:
+            tabla[local][0] += PUNTOS_VICTORIA
+        elif gl < gv:
+            tabla[visitante][0] += PUNTOS_VICTORIA
+        else:
+            tabla[local][0] += PUNTOS_EMPATE
+            tabla[visitante][0] += PUNTOS_EMPATE
+    return {e: tuple(v) for e, v in tabla.items()}
+
+
+def clasificacion_jornada(estado, jornada=None):
+    """
+    Clasificación tras una jornada
+
+    Criterios de orden: puntos, puntos en los enfrentamientos directos entre
+    los empatados, diferencia de goles en esos enfrentamientos, diferencia de
+    goles general y goles a favor.
+
+    Args:
+        estado: Estado de clasificación
+        jornada: Número de jornada (None para la última)
+
+    Returns:
+        DataFrame: Pos, Equipo, Pts, PJ, G, E, P, GF, GC y DG
+    """
+    _actualizar_acumulado(estado)
+    columnas = ['Pos', 'Equipo', 'Pts'] + COLUMNAS + ['DG']
+    if not estado['jornadas'] or not estado['equipos']:
+        return pd.DataFrame(columns=columnas)
+
+    if jornada is None:
+        jornada = estado['jornadas'][-1]
+    # Última jornada registrada que no supera la pedida
+    j = int(np.searchsorted(estado['jornadas'], jornada, side='right')) - 1
+    if j < 0:
+        fila = np.zeros((len(estado['equipos']), len(COLUMNAS)), dtype=np.int32)
+    else:
+        fila = estado['acumulado'][j]
+
+    tabla = pd.DataFrame(fila, columns=COLUMNAS)
+    tabla.insert(0, 'Equipo', estado['equipos'])
+    tabla.insert(1, 'Pts', tabla['G'] * PUNTOS_VICTORIA + tabla['E'] * PUNTOS_EMPATE)
+    tabla['DG'] = tabla['GF'] - tabla['GC']
+
+    # Desempate por enfrentamientos directos dentro de cada grupo de equipos con los mismos puntos
+    tabla['Pts_directo'] = 0
+    tabla['DG_directo'] = 0
+    for _, empatados in tabla.groupby('Pts'):
+        if len(empatados) < 2:
+            continue
+        directos = _enfrentamientos(estado, empatados['Equipo'], jornada)
+        tabla.loc[empatados.index, 'Pts_directo'] = [directos[e][0] for e in empatados['Equipo']]
+        tabla.loc[empatados.index, 'DG_directo'] = [directos[e][1] for e in empatados['Equipo']]
+
+    tabla = tabla.sort_values(
+        ['Pts', 'Pts_directo', 'DG_directo', 'DG', 'GF', 'Equipo'],
+        ascending=[False, False, False, False, False, True]
+    ).drop(columns=['Pts_directo', 'DG_directo']).reset_index(drop=True)
+    tabla.insert(0, 'Pos', np.arange(1, len(tabla) + 1))
+    return tabla[columnas]
@@ -0,0 +1,203 @@
+"""
+Forma reciente de todos los equipos en ventanas móviles de jornadas
+Ubicación: calculos/forma_equipos.py
+
+A partir de los deltas por jornada de la clasificación (calculos/clasificacion.py)
+y de las actas se forman matrices equipos x jornadas (puntos, goles a favor y
+en contra, tarjetas y partidos). Las sumas móviles de las últimas N jornadas se
+obtienen de una vez para todos los equipos con sumas acumuladas a lo largo del
+eje de jornadas. Se precalculan para cada N de VENTANAS, de modo que los
+widgets de forma y las características de ML solo leen cortes de los arrays.
+
+La concentración de minutos es el índice de Herfindahl de los minutos de los
+jugadores del equipo en la ventana (suma de cuotas al cuadrado): cuanto más
+alta, más minutos se reparten entre pocos jugadores.
+"""
+import numpy as np
+import pandas as pd
+
+from calculos.clasificacion import clave_equipo, G, E, GF, GC, PJ, PUNTOS_VICTORIA, PUNTOS_EMPATE
+from utils.instrumentacion import instrumentar
+
+VENTANAS = (3, 5, 10)
+METRICAS = ['partidos', 'puntos', 'goles_favor', 'goles_contra', 'tarjetas', 'concentracion_minutos']
+
+# Resultado de cada equipo en cada jornada en la matriz 'resultados'
+SIN_PARTIDO, DERROTA, EMPATE, VICTORIA = -1, 0, 1, 2
+
+
+def _suma_movil(matriz, n):
+    """
+    Suma de las últimas n columnas (incluida la actual) para cada columna
+
+    Args:
+        matriz: Array (filas, jornadas)
+        n: Tamaño de la ventana
+
+    Returns:
+        ndarray: Misma forma que matriz
+    """
+    acumulada = np.zeros((matriz.shape[0], matriz.shape[1] + 1), dtype=np.float64)
+    np.cumsum(matriz, axis=1, out=acumulada[:, 1:])
+    inicio = np.maximum(np.arange(1, matriz.shape[1] + 1) - n, 0)
+    return acumulada[:, 1:] - acumulada[:, inicio]
+
+
+def _matriz_actas(actas_df, columna, equipos, jornadas, por_jugador=False):
+    """
+    Suma de una columna de las actas por equipo (o por jugador) y jornada
+
+    Returns:
+        ndarray o tuple: (equipos, jornadas); con por_jugador, (matriz
+                         jugadores x jornadas, equipo de cada jugador)
+    """
+    indice_equipos = {e: i for i, e in enumerate(equipos)}
+    indice_jornadas = {j: i for i, j in enumerate(jornadas)}
+    actas = pd.DataFrame({
+        'equipo': actas_df['equipo'].map(clave_equipo).map(indice_equipos),
+        'jornada': pd.to_numeric(actas_df['jornada'], errors='coerce').map(indice_jornadas),
+        'jugador': actas_df['jugador'],
+        'valor': pd.to_numeric(actas_df[columna], errors='coerce').fillna(0).clip(lower=0)
+    }).dropna(subset=['equipo', 'jornada'])
+    equipo = actas['equipo'].to_numpy(int)
+    jornada = actas['jornada'].to_numpy(int)
+
+    if not por_jugador:
+        matriz = np.zeros((len(equipos), len(jornadas)))
+        np.add.at(matriz, (equipo, jornada), actas['valor'].to_numpy())
+        return matriz
+
+    # Un jugador se identifica por (jugador, equipo): una fila por grupo
+    grupos = actas.groupby(['jugador', 'equipo'], sort=False, dropna=False)
+    fila = grupos.ngroup().to_numpy()
+    matriz = np.zeros((grupos.ngroups, len(jornadas)))
+    np.add.at(matriz, (fila, jornada), actas['valor'].to_numpy())
+    equipo_jugador = np.zeros(grupos.ngroups, dtype=int)
+    equipo_jugador[fila] = equipo
+    return matriz, equipo_jugador
+
+
+@instrumentar
+def construir_forma(estado_clasificacion, actas_df, ventanas=VENTANAS):
+    """
+    Precalcula las métricas de forma de todos los equipos para cada ventana
+
+    Args:
+        estado_clasificacion: Estado de calculos/clasificacion.py (deltas por jornada)
+        actas_df: Actas de todos los equipos (tarjetas y minutos)
+        ventanas: Tamaños de ventana en jornadas
+
+    Returns:
+        dict: 'equipos', 'jornadas', 'resultados' (equipos x jornadas, ver
+              SIN_PARTIDO/DERROTA/EMPATE/VICTORIA) y 'ventanas' (N -> métrica ->
+              array equipos x jornadas en float32)
+    """
+    equipos = list(estado_clasificacion['equipos'])
+    jornadas = list(estado_clasificacion['jornadas'])
+    deltas = estado_clasificacion['deltas'].transpose(1, 0, 2)  # equipos x jornadas x columnas
+
+    jugados = deltas[:, :, PJ].astype(np.float64)
+    puntos = (deltas[:, :, G] * PUNTOS_VICTORIA + deltas[:, :, E] * PUNTOS_EMPATE).astype(np.float64)
+    resultados = np.where(
+        jugados > 0,
+        np.where(deltas[:, :, G] > 0, VICTORIA, np.where(deltas[:, :, E] > 0, EMPATE, DERROTA)),
+        SIN_PARTIDO
+    ).astype(np.int8)
+
+    tarjetas = (_matriz_actas(actas_df, 'Tarjetas Amarillas', equipos, jornadas)
+                + _matriz_actas(actas_df, 'Tarjetas Rojas', equipos, jornadas))
+    minutos_jugador, equipo_jugador = _matriz_actas(actas_df, 'minutos_jugados', equipos, jornadas, por_jugador=True)
+
+    base = {
+        'partidos': jugados,
+        'puntos': puntos,
+        'goles_favor': deltas[:, :, GF].astype(np.float64),
+        'goles_contra': deltas[:, :, GC].astype(np.float64),
+        'tarjetas': tarjetas
+    }
+
+    por_ventana = {}
+    for n in ventanas:
+        metricas = {nombre: _suma_movil(matriz, n).astype(np.float32) for nombre, matriz in base.items()}
+
+        # Herfindahl de los minutos de los jugadores de cada equipo en la ventana
+        minutos = _suma_movil(minutos_jugador, n)
+        total = np.zeros((len(equipos), len(jornadas)))
+        cuadrados = np.zeros((len(equipos), len(jornadas)))
+        np.add.at(total, equipo_jugador, minutos)
+        np.add.at(cuadrados, equipo_jugador, minutos ** 2)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            metricas['concentracion_minutos'] = np.where(total > 0, cuadrados / total ** 2, 0).astype(np.float32)
+
+        por_ventana[n] = metricas
+
+    return {
+        'equipos': equipos,
+        'jornadas': jornadas,
+        'resultados': resultados,
+        'ventanas': por_ventana
+    }
+
+
+def _posicion_jornada(forma, jornada):
+    """
+    Índice de la última jornada que no supera la pedida (la última si es None)
+    """
+    if jornada is None:
+        return len(forma['jornadas']) - 1
+    return int(np.searchsorted(forma['jornadas'], jornada, side='right')) - 1
+
+
+def forma_jornada(forma, n, jornada=None):
+    """
+    Métricas de forma de todos los equipos tras una jornada
+
+    Args:
+        forma: Resultado de construir_forma
+        n: Tamaño de ventana (uno de los precalculados)
+        jornada: Número de jornada (None para la última)
+
+    Returns:
+        DataFrame: Equipo y METRICAS, más puntos por partido
+    """
+    j = _posicion_jornada(forma, jornada)
+    if j < 0 or n not in forma['ventanas']:
+        return pd.DataFrame(columns=['Equipo'] + METRICAS + ['puntos_por_partido'])
+    metricas = forma['ventanas'][n]
+    tabla = pd.DataFrame({nombre: metricas[nombre][:, j] for nombre in METRICAS})
+    tabla.insert(0, 'Equipo', forma['equipos'])
+    tabla['puntos_por_partido'] = (tabla['puntos'] / tabla['partidos'].where(tabla['partidos'] > 0)).fillna(0).round(2)
+    return tabla
+
+
+def forma_equipo(forma, equipo, n):
+    """
+    Evolución de las métricas de forma de un equipo jornada a jornada
+
+    Returns:
+        DataFrame: jornada, resultado y METRICAS (vacío si el equipo no existe)
+    """
+    clave = clave_equipo(equipo)
+    if clave not in forma['equipos'] or n not in forma['ventanas']:
+        return pd.DataFrame(columns=['jornada', 'resultado'] + METRICAS)
+    i = forma['equipos'].index(clave)
+    tabla = pd.DataFrame({nombre: forma['ventanas'][n][nombre][i] for nombre in METRICAS})
+    tabla.insert(0, 'jornada', forma['jornadas'])
+    tabla.insert(1, 'resultado', forma['resultados'][i])
+    return tabla
+
+
+def racha_equipo(forma, equipo, n, jornada=None):
+    """
+    Resultados de los últimos n partidos de un equipo, del más antiguo al más reciente
+
+    Returns:
+        list: 'V', 'E' o 'D' por partido
+    """
+    clave = clave_equipo(equipo)
+    j = _posicion_jornada(forma, jornada)
+    if clave not in forma['equipos'] or j < 0:
+        return []
+    resultados = forma['resultados'][forma['equipos'].index(clave), :j + 1]
+    letras = {VICTORIA: 'V', EMPATE: 'E', DERROTA: 'D'}
+    return [letras[r] for r in resultados[resultados != SIN_PARTIDO][-n:]]
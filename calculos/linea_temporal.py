@@ -0,0 +1,317 @@
+"""
+Línea temporal de eventos de cada partido
+Ubicación: calculos/linea_temporal.py
+
+Goles (Goles_unificado), sustituciones (Sustituciones_unificado) y tarjetas
+(solo recuentos en las actas) se guardan por separado. Aquí se unen una sola
+vez para toda la liga en un único DataFrame de eventos ordenado por partido y
+minuto, con el marcador acumulado tras cada evento. Los eventos de un partido
+ocupan un tramo contiguo (inicio[p]:inicio[p + 1]), de modo que la línea
+temporal de un partido es un corte y el marcador de todos los partidos en un
+minuto se obtiene con una sola búsqueda binaria (searchsorted).
+
+Las actas no indican el minuto de las tarjetas: se registran con minuto
+SIN_MINUTO y no cuentan en las consultas por minuto.
+"""
+import numpy as np
+import pandas as pd
+
+from calculos.clasificacion import clave_equipo
+from calculos.calculo_jugadores import ajustar_tarjetas_por_doble_amarilla
+from utils.instrumentacion import instrumentar
+
+DURACION_PARTIDO = 90
+SIN_MINUTO = -1
+
+# Tipos de evento; el orden decide qué va antes dentro de un mismo minuto
+TIPOS_EVENTO = ['Gol', 'Gol de penalti', 'Sustitución', 'Amarilla', 'Roja']
+GOL, GOL_PENALTI, SUSTITUCION, AMARILLA, ROJA = range(len(TIPOS_EVENTO))
+
+LOCAL, VISITANTE = 0, 1
+ESTADOS = ['Ganando', 'Empatando', 'Perdiendo']
+
+COLUMNAS_EVENTOS = ['partido', 'minuto', 'tipo', 'lado', 'equipo', 'jugador', 'jugador_sale',
+                    'goles_local', 'goles_visitante']
+
+# Separación entre partidos en la clave ordenada partido * ESCALA_MINUTOS + minuto
+ESCALA_MINUTOS = 1000
+
+
+def _partidos_actas(actas_df):
+    """
+    Partidos con acta y lado de cada equipo en cada jornada
+
+    Returns:
+        tuple: (partidos, lados); partidos tiene jornada, local y visitante y lados
+               relaciona (jornada, clave de equipo) con partido y lado
+    """
+    actas = pd.DataFrame({
+        'jornada': pd.to_numeric(actas_df['jornada'], errors='coerce'),
+        'equipo': actas_df['equipo'].map(clave_equipo),
+        'rival': actas_df['rival'].map(clave_equipo),
+        'es_local': actas_df['localizacion'] == 'Local'
+    }).dropna(subset=['jornada']).drop_duplicates(['jornada', 'equipo'])
+    actas['jornada'] = actas['jornada'].astype(int)
+
+    partidos = pd.DataFrame({
+        'jornada': actas['jornada'],
+        'local': actas['equipo'].where(actas['es_local'], actas['rival']),
+        'visitante': actas['rival'].where(actas['es_local'], actas['equipo'])
+    }).drop_duplicates().sort_values(['jornada', 'local']).reset_index(drop=True)
+
+    lados = pd.concat([
+        pd.DataFrame({'jornada': partidos['jornada'], 'clave': partidos['local'],
+                      'partido': partidos.index, 'lado': LOCAL}),
+        pd.DataFrame({'jornada': partidos['jornada'], 'clave': partidos['visitante'],
+                      'partido': partidos.index, 'lado': VISITANTE})
+    ], ignore_index=True).drop_duplicates(['jornada', 'clave'])
+    return partidos, lados
+
+
+@instrumentar
+def construir_linea_temporal(actas_df, goles_df, sustituciones_df):
+    """
+    Construye la línea temporal de eventos de todos los partidos de la liga
+
+    Args:
+        actas_df: Actas de todos los equipos
+        goles_df: Goles de la liga (Jornada, Minuto, jugador, Tipo de Gol)
+        sustituciones_df: Sustituciones de la liga (jugador_entra, jugador_sale, Minuto, equipo, Jornada)
+
+    Returns:
+        dict: 'partidos' (DataFrame con jornada, local, visitante, marcador final y
+              duración), 'eventos' (DataFrame con COLUMNAS_EVENTOS ordenado por partido
+              y minuto), 'inicio' (posición del primer evento de cada partido) y
+              'claves' (clave ordenada partido * ESCALA_MINUTOS + minuto de cada evento)
+    """
+    partidos, lados = _partidos_actas(actas_df)
+
+    # Equipo de cada goleador en la jornada según las actas
+    jugadores = actas_df[['jugador', 'jornada', 'equipo']].assign(
+        jornada=pd.to_numeric(actas_df['jornada'], errors='coerce'),
+        clave=actas_df['equipo'].map(clave_equipo)
+    ).dropna(subset=['jornada']).drop_duplicates(['jugador', 'jornada'])
+    jugadores['jornada'] = jugadores['jornada'].astype(int)
+
+    goles = goles_df[['Jornada', 'Minuto', 'jugador', 'Tipo de Gol']].rename(
+        columns={'Jornada': 'jornada', 'Minuto': 'minuto'}
+    ).merge(jugadores, on=['jugador', 'jornada'], how='inner')
+    goles = goles.assign(
+        tipo=np.where(goles['Tipo de Gol'] == 'Penalti', GOL_PENALTI, GOL),
+        jugador_sale=""
+    )
+
+    sustituciones = pd.DataFrame({
+        'jornada': sustituciones_df['Jornada'],
+        'minuto': sustituciones_df['Minuto'],
+        'jugador': sustituciones_df['jugador_entra'],
+        'jugador_sale': sustituciones_df['jugador_sale'],
+        'equipo': sustituciones_df['equipo'],
+        'clave': sustituciones_df['equipo'].map(clave_equipo),
+        'tipo': SUSTITUCION
+    })
+
+    # Tarjetas: una fila por tarjeta a partir de los recuentos de las actas
+    actas = ajustar_tarjetas_por_doble_amarilla(actas_df)
+    tarjetas = []
+    for columna, tipo in (('Tarjetas Amarillas', AMARILLA), ('Tarjetas Rojas', ROJA)):
+        veces = pd.to_numeric(actas[columna], errors='coerce').fillna(0).astype(int).clip(lower=0).to_numpy()
+        filas = actas.loc[np.repeat(actas.index.to_numpy(), veces), ['jornada', 'jugador', 'equipo']]
+        tarjetas.append(filas.assign(
+            clave=filas['equipo'].map(clave_equipo), minuto=SIN_MINUTO, tipo=tipo, jugador_sale=""
+        ))
+
+    eventos = pd.concat([goles, sustituciones] + tarjetas, ignore_index=True)
+    eventos['jornada'] = pd.to_numeric(eventos['jornada'], errors='coerce')
+    eventos = eventos.dropna(subset=['jornada', 'minuto'])
+    eventos['jornada'] = eventos['jornada'].astype(int)
+    eventos = eventos.merge(lados, on=['jornada', 'clave'], how='inner')
+
+    # Orden único para toda la liga: partido, minuto y tipo de evento
+    eventos = eventos.sort_values(['partido', 'minuto', 'tipo'], kind='stable').reset_index(drop=True)
+
+    # Marcador acumulado tras cada evento
+    es_gol = eventos['tipo'].isin([GOL, GOL_PENALTI])
+    eventos['goles_local'] = (es_gol & (eventos['lado'] == LOCAL)).astype(np.int16).groupby(eventos['partido']).cumsum()
+    eventos['goles_visitante'] = (es_gol & (eventos['lado'] == VISITANTE)).astype(np.int16).groupby(eventos['partido']).cumsum()
+
+    eventos = eventos[COLUMNAS_EVENTOS].astype({
+        'partido': np.int32, 'minuto': np.int16, 'tipo': np.int8, 'lado': np.int8,
+        'goles_local': np.int16, 'goles_visitante': np.int16
+    })
+
+    # Posición del primer evento de cada partido y marcador final
+    n = len(partidos)
+    inicio = np.searchsorted(eventos['partido'].to_numpy(), np.arange(n + 1))
+    goles_partido = eventos[es_gol.to_numpy()]
+    partidos['goles_local'] = np.bincount(goles_partido['partido'], goles_partido['lado'] == LOCAL, n).astype(int)
+    partidos['goles_visitante'] = np.bincount(goles_partido['partido'], goles_partido['lado'] == VISITANTE, n).astype(int)
+    ultimo_minuto = eventos.groupby('partido')['minuto'].max().reindex(range(n), fill_value=0)
+    partidos['duracion'] = np.maximum(DURACION_PARTIDO, ultimo_minuto.to_numpy())
+
+    return {
+        'partidos': partidos,
+        'eventos': eventos,
+        'inicio': inicio,
+        'claves': eventos['partido'].to_numpy(np.int64) * ESCALA_MINUTOS + eventos['minuto'].to_numpy()
+    }
+
+
+def buscar_partido(linea, jornada, equipo):
+    """
+    Índice del partido de un equipo en una jornada (None si no hay acta)
+    """
+    partidos = linea['partidos']
+    clave = clave_equipo(equipo)
+    encontrados = partidos.index[
+        (partidos['jornada'] == int(jornada)) & ((partidos['local'] == clave) | (partidos['visitante'] == clave))
+    ]
+    return int(encontrados[0]) if len(encontrados) else None
+
+
+def eventos_partido(linea, partido):
+    """
+    Eventos de un partido en orden, con el tipo de evento en texto
+
+    Returns:
+        DataFrame: minuto, evento, equipo, jugador, jugador_sale y marcador
+    """
+    inicio = linea['inicio']
+    eventos = linea['eventos'].iloc[inicio[partido]:inicio[partido + 1]]
+    return pd.DataFrame({
+        'minuto': eventos['minuto'].where(eventos['minuto'] != SIN_MINUTO),
+        'evento': eventos['tipo'].map(dict(enumerate(TIPOS_EVENTO))),
+        'equipo': eventos['equipo'],
+        'jugador': eventos['jugador'],
+        'jugador_sale': eventos['jugador_sale'],
+        'marcador': eventos['goles_local'].astype(str) + '-' + eventos['goles_visitante'].astype(str)
+    }).reset_index(drop=True)
+
+
+def goles_linea(linea):
+    """
+    Goles de todos los partidos en el orden de la línea temporal
+
+    Returns:
+        DataFrame: partido, minuto y lado del equipo que marca
+    """
+    eventos = linea['eventos']
+    return eventos.loc[eventos['tipo'].isin([GOL, GOL_PENALTI]), ['partido', 'minuto', 'lado']].reset_index(drop=True)
+
+
+def marcador_en_minuto(linea, minuto):
+    """
+    Marcador de todos los partidos al final de un minuto
+
+    Args:
+        linea: Resultado de construir_linea_temporal
+        minuto: Minuto consultado (los goles de ese minuto cuentan)
+
+    Returns:
+        DataFrame: partidos con goles_local y goles_visitante en ese minuto
+    """
+    partidos = linea['partidos']
+    n = len(partidos)
+    # Último evento de cada partido hasta el minuto: una búsqueda binaria para todos
+    posicion = np.searchsorted(linea['claves'], np.arange(n) * ESCALA_MINUTOS + minuto, side='right') - 1
+    hay_evento = posicion >= linea['inicio'][:n]
+    posicion = np.where(hay_evento, posicion, 0)
+
+    eventos = linea['eventos']
+    goles_local = np.where(hay_evento, eventos['goles_local'].to_numpy()[posicion], 0) if len(eventos) else np.zeros(n, dtype=int)
+    goles_visitante = np.where(hay_evento, eventos['goles_visitante'].to_numpy()[posicion], 0) if len(eventos) else np.zeros(n, dtype=int)
+    return partidos[['jornada', 'local', 'visitante']].assign(goles_local=goles_local, goles_visitante=goles_visitante)
+
+
+def tramos_marcador(linea):
+    """
+    Divide cada partido en tramos con el marcador constante
+
+    Returns:
+        DataFrame: partido, desde, hasta y diferencia (goles local - goles visitante
+                   durante el tramo)
+    """
+    partidos = linea['partidos']
+    eventos = linea['eventos']
+    goles = eventos[eventos['tipo'].isin([GOL, GOL_PENALTI])]
+
+    # Cada gol cierra un tramo; el último tramo de cada partido acaba con el partido
+    final = pd.DataFrame({
+        'partido': partidos.index.to_numpy(np.int32),
+        'minuto': partidos['duracion'].to_numpy(),
+        'goles_local': partidos['goles_local'].to_numpy(),
+        'goles_visitante': partidos['goles_visitante'].to_numpy(),
+        'es_final': True
+    })
+    cortes = pd.concat([goles[['partido', 'minuto', 'goles_local', 'goles_visitante']].assign(es_final=False), final],
+                       ignore_index=True).sort_values(['partido', 'minuto', 'es_final'], kind='stable')
+
+    # Diferencia vigente antes de cada corte: la del corte anterior del mismo partido
+    diferencia = (cortes['goles_local'] - cortes['goles_visitante']).astype(int)
+    mismo_partido = cortes['partido'].eq(cortes['partido'].shift())
+    tramos = pd.DataFrame({
+        'partido': cortes['partido'].to_numpy(),
+        'desde': cortes['minuto'].shift().where(mismo_partido, 0).to_numpy().astype(int),
+        'hasta': cortes['minuto'].to_numpy().astype(int),
+        'diferencia': diferencia.shift().where(mismo_partido, 0).to_numpy().astype(int)
+    })
+    return tramos[tramos['hasta'] > tramos['desde']].reset_index(drop=True)
+
+
+def _estado(diferencia):
+    """
+    Índice en ESTADOS según la diferencia de goles propia
+    """
+    return np.where(diferencia > 0, 0, np.where(diferencia == 0, 1, 2))
+
+
+@instrumentar
+def estados_marcador(linea):
+    """
+    Minutos y goles de cada equipo según vaya ganando, empatando o perdiendo
+
+    Returns:
+        DataFrame: equipo, estado, minutos, goles_favor y goles_contra
+    """
+    partidos = linea['partidos']
+    tramos = tramos_marcador(linea)
+    local = partidos['local'].to_numpy()
+    visitante = partidos['visitante'].to_numpy()
+
+    # Minutos en cada estado, desde el punto de vista de local y visitante
+    duracion = tramos['hasta'] - tramos['desde']
+    minutos = pd.concat([
+        pd.DataFrame({'equipo': local[tramos['partido']], 'estado': _estado(tramos['diferencia']), 'minutos': duracion}),
+        pd.DataFrame({'equipo': visitante[tramos['partido']], 'estado': _estado(-tramos['diferencia']), 'minutos': duracion})
+    ]).groupby(['equipo', 'estado'])['minutos'].sum()
+
+    # Goles según el estado previo al gol, para quien marca y para quien lo recibe
+    eventos = linea['eventos']
+    goles = eventos[eventos['tipo'].isin([GOL, GOL_PENALTI])]
+    es_local = (goles['lado'] == LOCAL).to_numpy()
+    previa = (goles['goles_local'] - goles['goles_visitante']).to_numpy() - np.where(es_local, 1, -1)
+    autor = np.where(es_local, local[goles['partido']], visitante[goles['partido']])
+    receptor = np.where(es_local, visitante[goles['partido']], local[goles['partido']])
+    goles_favor = pd.DataFrame({
+        'equipo': autor, 'estado': _estado(np.where(es_local, previa, -previa))
+    }).groupby(['equipo', 'estado']).size()
+    goles_contra = pd.DataFrame({
+        'equipo': receptor, 'estado': _estado(np.where(es_local, -previa, previa))
+    }).groupby(['equipo', 'estado']).size()
+
+    equipos = sorted(set(local) | set(visitante))
+    indice = pd.MultiIndex.from_product([equipos, range(len(ESTADOS))], names=['equipo', 'estado'])
+    tabla = pd.DataFrame({
+        'minutos': minutos.reindex(indice, fill_value=0),
+        'goles_favor': goles_favor.reindex(indice, fill_value=0),
+        'goles_contra': goles_contra.reindex(indice, fill_value=0)
+    }).reset_index()
+    tabla['estado'] = tabla['estado'].map(dict(enumerate(ESTADOS)))
+    return tabla
+
+
+def estados_equipo(tabla_estados, equipo):
+    """
+    Filas de estados_marcador de un equipo (vacío si no tiene partidos)
+    """
+    return tabla_estados[tabla_estados['equipo'] == clave_equipo(equipo)].reset_index(drop=True)
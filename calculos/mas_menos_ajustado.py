@@ -0,0 +1,165 @@
+"""
++/- ajustado (regularizado) de los jugadores
+Ubicación: calculos/mas_menos_ajustado.py
+
+El +/- de calculos/calculo_jugadores.py depende de los compañeros y rivales
+con los que coincide cada jugador. Aquí cada partido se divide en tramos con
+las mismas alineaciones en el campo (entre dos cambios consecutivos) y se
+plantea una regresión ridge para toda la liga:
+
+    diferencia de goles por 90 del tramo ~ ventaja local
+        + suma(jugadores del local) - suma(jugadores del visitante)
+
+La matriz de diseño (tramos x jugadores) es dispersa (scipy.sparse): cada
+tramo solo tiene 22 valores no nulos. El sistema normal es pequeño (jugadores
+x jugadores) y se resuelve directamente, ponderando cada tramo por su duración.
+"""
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.sparse.linalg import spsolve
+
+from calculos.calculo_jugadores import ESCALA_MINUTOS, contar_en_intervalos
+from utils.instrumentacion import instrumentar
+
+# Peso de la penalización ridge, en partidos completos "a cero" que se suman a cada jugador
+PENALIZACION_RIDGE = 5.0
+
+
+@instrumentar
+def extraer_tramos(intervalos, goles_df):
+    """
+    Divide cada partido en tramos con las alineaciones constantes y asigna
+    a cada intervalo de jugador los tramos que cubre
+
+    Args:
+        intervalos: Resultado de construir_intervalos_jugadores
+        goles_df: Goles con partido, minuto y lado (0 local, 1 visitante)
+
+    Returns:
+        dict: 'tramos' (DataFrame con partido, desde, hasta, goles_local y
+              goles_visitante), 'jugadores' (DataFrame con jugador y equipo de
+              cada columna) y 'presencias' (arrays tramo, jugador y signo)
+    """
+    intervalos = intervalos.dropna(subset=['jugador', 'equipo']).reset_index(drop=True)
+    partido = intervalos['partido'].to_numpy().astype(np.int64)
+    desde = intervalos['desde'].to_numpy().astype(np.int64)
+    hasta = intervalos['hasta'].to_numpy().astype(np.int64)
+
+    # Cortes de cada partido: todos los minutos en que alguien entra o sale
+    cortes = np.unique(np.concatenate([partido * ESCALA_MINUTOS + desde, partido * ESCALA_MINUTOS + hasta]))
+    mismo_partido = cortes[1:] // ESCALA_MINUTOS == cortes[:-1] // ESCALA_MINUTOS
+    inicio_tramo = cortes[:-1][mismo_partido]
+    fin_tramo = cortes[1:][mismo_partido]
+
+    tramos = pd.DataFrame({
+        'partido': (inicio_tramo // ESCALA_MINUTOS).astype(np.int32),
+        'desde': (inicio_tramo % ESCALA_MINUTOS).astype(np.int16),
+        'hasta': (fin_tramo % ESCALA_MINUTOS).astype(np.int16)
+    })
+
+    # Goles de cada lado dentro de cada tramo (el último tramo de cada partido incluye su minuto final)
+    ultimo_tramo = np.ones(len(tramos), dtype=bool)
+    ultimo_tramo[:-1] = tramos['partido'].to_numpy()[1:] != tramos['partido'].to_numpy()[:-1]
+    claves = goles_df['partido'].to_numpy(np.int64) * ESCALA_MINUTOS + goles_df['minuto'].to_numpy()
+    for lado, columna in ((0, 'goles_local'), (1, 'goles_visitante')):
+        claves_lado = np.sort(claves[goles_df['lado'].to_numpy() == lado])
+        tramos[columna] = contar_en_intervalos(
+            claves_lado, tramos['partido'].to_numpy(), tramos['desde'].to_numpy().astype(np.int64),
+            tramos['hasta'].to_numpy().astype(np.int64), ultimo_tramo
+        )
+
+    # Tramos cubiertos por cada intervalo: un rango contiguo [primero, ultimo)
+    primero = np.searchsorted(inicio_tramo, partido * ESCALA_MINUTOS + desde, side='left')
+    ultimo = np.searchsorted(fin_tramo, partido * ESCALA_MINUTOS + hasta, side='right')
+    repeticiones = ultimo - primero
+    fila_intervalo = np.repeat(np.arange(len(intervalos)), repeticiones)
+    desplazamiento = np.arange(len(fila_intervalo)) - np.repeat(np.cumsum(repeticiones) - repeticiones, repeticiones)
+    tramo = np.repeat(primero, repeticiones) + desplazamiento
+
+    # Columna de cada jugador: un grupo por (jugador, equipo), en orden alfabético
+    columna_jugador = intervalos.groupby(['jugador', 'equipo'], sort=True).ngroup().to_numpy()
+    jugadores = intervalos.drop_duplicates(['jugador', 'equipo']).sort_values(['jugador', 'equipo'])
+
+    return {
+        'tramos': tramos,
+        'jugadores': jugadores[['jugador', 'equipo']].reset_index(drop=True),
+        'presencias': {
+            'tramo': tramo,
+            'jugador': columna_jugador[fila_intervalo],
+            'signo': np.where(intervalos['lado'].to_numpy()[fila_intervalo] == 0, 1.0, -1.0)
+        }
+    }
+
+
+def matriz_diseno(datos_tramos):
+    """
+    Matriz dispersa tramos x (jugadores + 1): +1 para los jugadores del local,
+    -1 para los del visitante y una última columna de unos (ventaja local)
+
+    Returns:
+        csr_matrix
+    """
+    tramos = datos_tramos['tramos']
+    presencias = datos_tramos['presencias']
+    n_tramos, n_jugadores = len(tramos), len(datos_tramos['jugadores'])
+    filas = np.concatenate([presencias['tramo'], np.arange(n_tramos)])
+    columnas = np.concatenate([presencias['jugador'], np.full(n_tramos, n_jugadores)])
+    valores = np.concatenate([presencias['signo'], np.ones(n_tramos)])
+    return sparse.csr_matrix((valores, (filas, columnas)), shape=(n_tramos, n_jugadores + 1))
+
+
+@instrumentar
+def ajustar_mas_menos(datos_tramos, penalizacion=PENALIZACION_RIDGE):
+    """
+    Resuelve la regresión ridge del +/- ajustado para toda la liga
+
+    Args:
+        datos_tramos: Resultado de extraer_tramos
+        penalizacion: Peso de la penalización ridge (en partidos completos)
+
+    Returns:
+        dict: 'jugadores' (DataFrame con jugador, equipo, minutos y mas_menos_ajustado,
+              en goles por 90 minutos) y 'ventaja_local' (goles por 90)
+    """
+    tramos = datos_tramos['tramos']
+    jugadores = datos_tramos['jugadores'].copy()
+    if tramos.empty or jugadores.empty:
+        jugadores['minutos'] = 0
+        jugadores['mas_menos_ajustado'] = 0.0
+        return {'jugadores': jugadores, 'ventaja_local': 0.0}
+
+    X = matriz_diseno(datos_tramos)
+    duracion = (tramos['hasta'] - tramos['desde']).to_numpy().astype(float)
+    peso = duracion / 90
+    objetivo = (tramos['goles_local'] - tramos['goles_visitante']).to_numpy() / peso
+
+    # Ecuaciones normales: (X' W X + λ I) β = X' W y; la ventaja local no se penaliza
+    Xw = X.T.multiply(peso).tocsr()
+    penalizaciones = np.full(X.shape[1], penalizacion)
+    penalizaciones[-1] = 0.0
+    A = (Xw @ X + sparse.diags(penalizaciones)).tocsc()
+    coeficientes = spsolve(A, Xw @ objetivo)
+
+    presencias = datos_tramos['presencias']
+    jugadores['minutos'] = np.bincount(
+        presencias['jugador'], duracion[presencias['tramo']], len(jugadores)
+    ).astype(int)
+    jugadores['mas_menos_ajustado'] = np.round(coeficientes[:-1], 3)
+    return {
+        'jugadores': jugadores.sort_values('mas_menos_ajustado', ascending=False).reset_index(drop=True),
+        'ventaja_local': float(coeficientes[-1])
+    }
+
+
+def construir_mas_menos_ajustado(intervalos, goles_df, penalizacion=PENALIZACION_RIDGE):
+    """
+    Tramos y +/- ajustado de toda la liga en un solo paso
+
+    Returns:
+        dict: Resultado de ajustar_mas_menos más 'tramos' (resultado de extraer_tramos)
+    """
+    datos_tramos = extraer_tramos(intervalos, goles_df)
+    resultado = ajustar_mas_menos(datos_tramos, penalizacion)
+    resultado['tramos'] = datos_tramos
+    return resultado
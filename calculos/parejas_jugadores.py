@@ -0,0 +1,99 @@
+"""
+Minutos y goles compartidos por cada pareja de jugadores de un equipo
+Ubicación: calculos/parejas_jugadores.py
+
+Se parte de los tramos con alineación constante de calculos/mas_menos_ajustado.py.
+Para cada equipo se forma la matriz de presencia P (tramos x jugadores, 0/1)
+y las matrices de parejas salen de productos matriciales densos:
+
+    minutos juntos      = P' diag(duración) P
+    goles a favor juntos = P' diag(goles a favor) P
+
+La diagonal es el total de cada jugador. No hay bucles por partido ni por pareja.
+"""
+import numpy as np
+import pandas as pd
+
+from utils.instrumentacion import instrumentar
+
+
+@instrumentar
+def construir_matrices_parejas(datos_tramos):
+    """
+    Calcula las matrices de parejas de todos los equipos de la liga
+
+    Args:
+        datos_tramos: Resultado de extraer_tramos (calculos/mas_menos_ajustado.py)
+
+    Returns:
+        dict: equipo -> {'jugadores' (lista), 'minutos', 'goles_favor' y
+              'goles_contra' (arrays jugadores x jugadores)}
+    """
+    tramos = datos_tramos['tramos']
+    jugadores = datos_tramos['jugadores']
+    presencias = datos_tramos['presencias']
+    if tramos.empty:
+        return {}
+
+    duracion = (tramos['hasta'] - tramos['desde']).to_numpy().astype(np.float64)
+    goles_local = tramos['goles_local'].to_numpy().astype(np.float64)
+    goles_visitante = tramos['goles_visitante'].to_numpy().astype(np.float64)
+    equipo_presencia = jugadores['equipo'].to_numpy()[presencias['jugador']]
+
+    matrices = {}
+    for equipo, posiciones in pd.Series(np.arange(len(equipo_presencia))).groupby(equipo_presencia):
+        posiciones = posiciones.to_numpy()
+        tramo = presencias['tramo'][posiciones]
+        jugador = presencias['jugador'][posiciones]
+        es_local = presencias['signo'][posiciones] > 0
+
+        # Reindexar tramos y jugadores del equipo a posiciones consecutivas
+        tramos_equipo, fila = np.unique(tramo, return_inverse=True)
+        jugadores_equipo, columna = np.unique(jugador, return_inverse=True)
+        presencia = np.zeros((len(tramos_equipo), len(jugadores_equipo)))
+        presencia[fila, columna] = 1.0
+
+        # Goles del equipo y del rival en cada tramo según el lado en que juega
+        local_tramo = np.zeros(len(tramos_equipo), dtype=bool)
+        local_tramo[fila] = es_local
+        favor = np.where(local_tramo, goles_local[tramos_equipo], goles_visitante[tramos_equipo])
+        contra = np.where(local_tramo, goles_visitante[tramos_equipo], goles_local[tramos_equipo])
+
+        matrices[equipo] = {
+            'jugadores': jugadores['jugador'].to_numpy()[jugadores_equipo].tolist(),
+            'minutos': (presencia.T * duracion[tramos_equipo]) @ presencia,
+            'goles_favor': (presencia.T * favor) @ presencia,
+            'goles_contra': (presencia.T * contra) @ presencia
+        }
+    return matrices
+
+
+def mejores_parejas(matrices_equipo, minimo_minutos=90, top_n=10):
+    """
+    Parejas de un equipo con más minutos juntos
+
+    Args:
+        matrices_equipo: Entrada de un equipo en construir_matrices_parejas
+        minimo_minutos: Minutos juntos mínimos para incluir una pareja
+        top_n: Número de parejas a devolver
+
+    Returns:
+        DataFrame: jugador_1, jugador_2, minutos, goles_favor, goles_contra y mas_menos_90
+    """
+    columnas = ['jugador_1', 'jugador_2', 'minutos', 'goles_favor', 'goles_contra', 'mas_menos_90']
+    if not matrices_equipo:
+        return pd.DataFrame(columns=columnas)
+
+    i, j = np.triu_indices(len(matrices_equipo['jugadores']), k=1)
+    nombres = np.array(matrices_equipo['jugadores'], dtype=object)
+    minutos = matrices_equipo['minutos'][i, j]
+    parejas = pd.DataFrame({
+        'jugador_1': nombres[i],
+        'jugador_2': nombres[j],
+        'minutos': minutos.astype(int),
+        'goles_favor': matrices_equipo['goles_favor'][i, j].astype(int),
+        'goles_contra': matrices_equipo['goles_contra'][i, j].astype(int)
+    })
+    parejas = parejas[parejas['minutos'] >= minimo_minutos]
+    parejas['mas_menos_90'] = ((parejas['goles_favor'] - parejas['goles_contra']) * 90 / parejas['minutos']).round(2)
+    return parejas.sort_values('minutos', ascending=False).head(top_n).reset_index(drop=True)
@@ -0,0 +1,150 @@
+"""
+Perfiles precalculados de jugadores
+Ubicación: calculos/perfiles_jugadores.py
+
+Todos los perfiles se construyen de una vez al cargar los datos, con una sola
+pasada agrupada por jugador. Después, consultar un jugador es un acceso a un
+diccionario y no depende del tamaño de la liga.
+"""
+import numpy as np
+import pandas as pd
+
+from calculos.calculo_jugadores import ajustar_tarjetas_por_doble_amarilla
+from utils.instrumentacion import instrumentar
+
+COLUMNAS_GOLES = ['Jornada', 'Minuto', 'Tipo de Gol', 'Rival']
+COLUMNAS_TARJETAS = ['Jornada', 'Tipo', 'Rival', 'Doble Amarilla']
+
+
+def _tabla_tarjetas(actas_df, actas_ajustadas):
+    """
+    Construye la tabla de tarjetas de todos los jugadores: una fila por cada
+    acta con amarillas (tras el ajuste) y una por cada tarjeta roja, indicando
+    si la roja proviene de una doble amarilla
+
+    Returns:
+        DataFrame: Columnas jugador + COLUMNAS_TARJETAS
+    """
+    amarillas = actas_ajustadas[actas_ajustadas['Tarjetas Amarillas'] > 0]
+    tabla_amarillas = pd.DataFrame({
+        'jugador': amarillas['jugador'],
+        'Jornada': amarillas['jornada'],
+        'Tipo': 'Amarilla',
+        'Rival': amarillas['rival'],
+        'Doble Amarilla': '-'
+    })
+
+    # Amarillas originales por jugador y jornada (antes del ajuste)
+    amarillas_originales = actas_df.groupby(['jugador', 'jornada'])['Tarjetas Amarillas'].transform('sum')
+    es_doble = (amarillas_originales >= 2) & (actas_ajustadas['Tarjetas Amarillas'] < amarillas_originales)
+
+    # Repetir cada acta tantas veces como tarjetas rojas tenga
+    rojas = actas_ajustadas[actas_ajustadas['Tarjetas Rojas'] > 0]
+    repeticiones = rojas['Tarjetas Rojas'].astype(int).to_numpy()
+    posiciones = np.repeat(np.arange(len(rojas)), repeticiones)
+    rojas_repetidas = rojas.iloc[posiciones]
+    # Solo la primera roja de cada acta puede venir de una doble amarilla
+    primera = np.ones(len(posiciones), dtype=bool)
+    primera[1:] = posiciones[1:] != posiciones[:-1]
+    doble = primera & es_doble.loc[rojas_repetidas.index].to_numpy()
+
+    tabla_rojas = pd.DataFrame({
+        'jugador': rojas_repetidas['jugador'].to_numpy(),
+        'Jornada': rojas_repetidas['jornada'].to_numpy(),
+        'Tipo': 'Roja',
+        'Rival': rojas_repetidas['rival'].to_numpy(),
+        'Doble Amarilla': np.where(doble, 'Si', 'No')
+    })
+
+    tarjetas = pd.concat([tabla_amarillas, tabla_rojas], ignore_index=True)
+    return tarjetas.sort_values(['jugador', 'Jornada'], kind='stable')
+
+
+@instrumentar
+def construir_perfiles_jugadores(actas_df, goles_df):
+    """
+    Construye el perfil de cada jugador: totales, minutos por jornada, goles
+    (minuto, tipo y rival) y tarjetas
+
+    Args:
+        actas_df: DataFrame con las actas de los jugadores
+        goles_df: DataFrame con los goles de esos jugadores
+
+    Returns:
+        dict: jugador -> {'estadisticas', 'minutos_jornada', 'goles', 'tarjetas'}
+    """
+    if actas_df.empty:
+        return {}
+
+    actas = actas_df.reset_index(drop=True)
+    actas_ajustadas = ajustar_tarjetas_por_doble_amarilla(actas)
+
+    # Totales por jugador (mismas métricas que calcular_estadisticas_jugador)
+    totales = actas_ajustadas.assign(
+        titular=actas_ajustadas['status'] == 'Titular'
+    ).groupby('jugador').agg(
+        goles=('goles', 'sum'),
+        tarjetas_amarillas=('Tarjetas Amarillas', 'sum'),
+        tarjetas_rojas=('Tarjetas Rojas', 'sum'),
+        minutos_jugados=('minutos_jugados', 'sum'),
+        partidos_jugados=('jugador', 'size'),
+        titularidades=('titular', 'sum')
+    )
+
+    # Minutos por jornada (mismo formato que obtener_minutos_por_jornada)
+    minutos = actas.sort_values('jornada', kind='stable').copy()
+    minutos['es_titular'] = minutos['status'] == 'Titular'
+
+    # Goles con el rival de la jornada en que se marcaron
+    rivales = actas[['jugador', 'jornada', 'rival']].drop_duplicates(['jugador', 'jornada'], keep='last')
+    goles = goles_df.merge(
+        rivales.rename(columns={'jornada': 'Jornada', 'rival': 'Rival'}),
+        on=['jugador', 'Jornada'], how='left'
+    ).sort_values('Jornada', kind='stable')
+
+    tarjetas = _tabla_tarjetas(actas, actas_ajustadas)
+
+    goles_por_jugador = {j: g[COLUMNAS_GOLES].reset_index(drop=True) for j, g in goles.groupby('jugador', sort=False)}
+    tarjetas_por_jugador = {j: t[COLUMNAS_TARJETAS].reset_index(drop=True) for j, t in tarjetas.groupby('jugador', sort=False)}
+    goles_vacio = pd.DataFrame(columns=COLUMNAS_GOLES)
+    tarjetas_vacio = pd.DataFrame(columns=COLUMNAS_TARJETAS)
+
+    perfiles = {}
+    for jugador, minutos_jugador in minutos.groupby('jugador', sort=False):
+        fila = totales.loc[jugador]
+        partidos = int(fila['partidos_jugados'])
+        minutos_totales = int(fila['minutos_jugados'])
+        titularidades = int(fila['titularidades'])
+
+        perfiles[jugador] = {
+            'estadisticas': {
+                'nombre': jugador,
+                'goles': int(fila['goles']),
+                'tarjetas_amarillas': int(fila['tarjetas_amarillas']),
+                'tarjetas_rojas': int(fila['tarjetas_rojas']),
+                'minutos_jugados': minutos_totales,
+                'partidos_jugados': partidos,
+                'titularidades': titularidades,
+                'suplencias': partidos - titularidades,
+                'minutos_por_partido': round(minutos_totales / partidos, 1) if partidos > 0 else 0
+            },
+            'minutos_jornada': minutos_jugador,
+            'goles': goles_por_jugador.get(jugador, goles_vacio),
+            'tarjetas': tarjetas_por_jugador.get(jugador, tarjetas_vacio)
+        }
+
+    return perfiles
+
+
+def obtener_perfil_jugador(perfiles, jugador):
+    """
+    Devuelve el perfil precalculado de un jugador
+
+    Args:
+        perfiles: Diccionario devuelto por construir_perfiles_jugadores
+        jugador: Nombre del jugador
+
+    Returns:
+        dict o None si el jugador no tiene actas
+    """
+    return perfiles.get(jugador)
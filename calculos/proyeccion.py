@@ -0,0 +1,248 @@
+"""
+Proyección de la temporada por simulación Monte Carlo
+Ubicación: calculos/proyeccion.py
+
+A partir de los resultados ya jugados se ajusta, para cada equipo, una
+fuerza de ataque y de defensa (modelo de Poisson multiplicativo con ventaja
+de campo). Los partidos pendientes del listado de jornadas se simulan muchas
+veces a la vez: la diferencia de goles de cada partido se genera en arrays
+(partidos x simulaciones) y los puntos se reparten a los equipos con un
+producto matricial, sin bucles por partido. Las simulaciones se procesan por
+bloques para acotar la memoria.
+"""
+import numpy as np
+import pandas as pd
+
+from calculos.clasificacion import resultados_partidos, clave_equipo, PUNTOS_VICTORIA, PUNTOS_EMPATE
+from utils.instrumentacion import instrumentar
+
+NUM_SIMULACIONES = 100_000
+SIMULACIONES_POR_BLOQUE = 20_000
+
+# Puntos de local y visitante según el resultado (derrota, empate o victoria local)
+PUNTOS_LOCAL = np.array([0, PUNTOS_EMPATE, PUNTOS_VICTORIA], dtype=np.float32)
+PUNTOS_VISITANTE = PUNTOS_LOCAL[::-1].copy()
+
+# Máximo de goles de un equipo en un partido simulado
+MAX_GOLES = 15
+
+# Partidos "ficticios" de media de la liga que se suman a cada equipo al
+# estimar su ataque y defensa, para que pocas jornadas no den valores extremos
+PARTIDOS_PRIOR = 3
+
+
+def partidos_pendientes(jornadas_df, resultados):
+    """
+    Partidos del listado que todavía no tienen resultado
+
+    Returns:
+        DataFrame: jornada, local y visitante
+    """
+    calendario = pd.DataFrame({
+        'jornada': pd.to_numeric(jornadas_df['jornada'], errors='coerce'),
+        'local': jornadas_df['equipo_local'].map(clave_equipo),
+        'visitante': jornadas_df['equipo_visitante'].map(clave_equipo)
+    }).dropna(subset=['jornada'])
+    calendario['jornada'] = calendario['jornada'].astype(int)
+    calendario = calendario.drop_duplicates(['jornada', 'local', 'visitante'])
+
+    jugados = set(zip(resultados['jornada'], resultados['local'], resultados['visitante']))
+    pendiente = [c not in jugados for c in zip(calendario['jornada'], calendario['local'], calendario['visitante'])]
+    return calendario[pendiente].reset_index(drop=True)
+
+
+def ajustar_fuerzas(resultados, equipos):
+    """
+    Estima ataque y defensa de cada equipo y las medias de goles de local y visitante
+
+    Args:
+        resultados: Partidos jugados (ver resultados_partidos)
+        equipos: Lista de claves de equipo
+
+    Returns:
+        tuple: (ataque, defensa, media_local, media_visitante); ataque y defensa son
+               arrays alineados con equipos (1 = media de la liga)
+    """
+    indice = {e: i for i, e in enumerate(equipos)}
+    media_local = resultados['goles_local'].mean() if not resultados.empty else 1.4
+    media_visitante = resultados['goles_visitante'].mean() if not resultados.empty else 1.1
+    media_partido = (media_local + media_visitante) / 2
+
+    local = resultados['local'].map(indice).to_numpy()
+    visitante = resultados['visitante'].map(indice).to_numpy()
+    gl = resultados['goles_local'].to_numpy()
+    gv = resultados['goles_visitante'].to_numpy()
+
+    n = len(equipos)
+    goles_favor = np.bincount(local, gl, n) + np.bincount(visitante, gv, n)
+    goles_contra = np.bincount(local, gv, n) + np.bincount(visitante, gl, n)
+    partidos = np.bincount(local, minlength=n) + np.bincount(visitante, minlength=n)
+
+    # Suavizado hacia la media de la liga
+    ataque = (goles_favor + PARTIDOS_PRIOR * media_partido) / ((partidos + PARTIDOS_PRIOR) * media_partido)
+    defensa = (goles_contra + PARTIDOS_PRIOR * media_partido) / ((partidos + PARTIDOS_PRIOR) * media_partido)
+    return ataque, defensa, media_local, media_visitante
+
+
+def _pmf_poisson(lambdas):
+    """
+    Probabilidad de 0 a MAX_GOLES goles para cada partido
+
+    Returns:
+        ndarray: (partidos, MAX_GOLES + 1)
+    """
+    k = np.arange(MAX_GOLES + 1)
+    # pmf(k) = exp(-λ) λ^k / k!, calculada como producto acumulado
+    factores = np.ones((len(lambdas), MAX_GOLES + 1))
+    factores[:, 1:] = lambdas[:, None] / k[None, 1:]
+    return np.exp(-lambdas)[:, None] * np.cumprod(factores, axis=1)
+
+
+def _cdf_diferencia(lambda_local, lambda_visitante):
+    """
+    Distribución acumulada de la diferencia de goles (local - visitante) de
+    cada partido, de -MAX_GOLES a MAX_GOLES
+
+    Returns:
+        ndarray: (partidos, 2 * MAX_GOLES + 1) en float32
+    """
+    conjunta = _pmf_poisson(lambda_local)[:, :, None] * _pmf_poisson(lambda_visitante)[:, None, :]
+    pmf = np.stack([
+        np.diagonal(conjunta, offset=-d, axis1=1, axis2=2).sum(axis=1)
+        for d in range(-MAX_GOLES, MAX_GOLES + 1)
+    ], axis=1)
+    return np.cumsum(pmf, axis=1).astype(np.float32)
+
+
+def _simular_diferencias(rng, cdf, s):
+    """
+    Genera la diferencia de goles (partidos x simulaciones) por inversión de la
+    distribución: es el número de valores de la CDF por debajo de un uniforme.
+    El bucle recorre los posibles valores de la diferencia, no los partidos,
+    y se limita a los valores con probabilidad no despreciable.
+    """
+    diferencias = np.full((cdf.shape[0], s), -MAX_GOLES, dtype=np.int16)
+    if cdf.shape[0] == 0:
+        return diferencias
+    u = rng.random((cdf.shape[0], s), dtype=np.float32)
+    for k in range(cdf.shape[1]):
+        umbral = cdf[:, k:k + 1]
+        if umbral.max() < 1e-7:
+            # Ningún partido puede acabar con esta diferencia: todos la superan
+            diferencias += 1
+            continue
+        if umbral.min() >= 1 - 1e-6:
+            break
+        np.add(diferencias, u > umbral, out=diferencias, casting='unsafe')
+    return diferencias
+
+
+@instrumentar
+def simular_temporada(jornadas_df, actas_df, num_simulaciones=NUM_SIMULACIONES, semilla=42):
+    """
+    Simula los partidos pendientes y devuelve la distribución de puntos y
+    posiciones finales de cada equipo
+
+    Args:
+        jornadas_df: Listado de jornadas (incluye los partidos pendientes)
+        actas_df: Actas de todos los equipos
+        num_simulaciones: Número de temporadas simuladas
+        semilla: Semilla del generador aleatorio (resultados reproducibles)
+
+    Returns:
+        dict: 'equipos', 'pendientes' (número de partidos), 'posiciones'
+              (equipos x posiciones, probabilidades), 'puntos' (equipos x puntos,
+              probabilidades) y 'resumen' (DataFrame)
+    """
+    resultados = resultados_partidos(jornadas_df, actas_df)
+    pendientes = partidos_pendientes(jornadas_df, resultados)
+
+    equipos = sorted(
+        (set(resultados['local']) | set(resultados['visitante']) |
+         set(pendientes['local']) | set(pendientes['visitante'])) - {""}
+    )
+    indice = {e: i for i, e in enumerate(equipos)}
+    n = len(equipos)
+
+    # Situación actual
+    local = resultados['local'].map(indice).to_numpy()
+    visitante = resultados['visitante'].map(indice).to_numpy()
+    gl = resultados['goles_local'].to_numpy()
+    gv = resultados['goles_visitante'].to_numpy()
+    puntos_local = np.where(gl > gv, PUNTOS_VICTORIA, np.where(gl == gv, PUNTOS_EMPATE, 0))
+    puntos_visitante = np.where(gv > gl, PUNTOS_VICTORIA, np.where(gl == gv, PUNTOS_EMPATE, 0))
+    puntos_actuales = np.bincount(local, puntos_local, n) + np.bincount(visitante, puntos_visitante, n)
+    dg_actual = np.bincount(local, gl - gv, n) + np.bincount(visitante, gv - gl, n)
+
+    # Goles esperados de cada partido pendiente
+    ataque, defensa, media_local, media_visitante = ajustar_fuerzas(resultados, equipos)
+    p_local = pendientes['local'].map(indice).to_numpy()
+    p_visitante = pendientes['visitante'].map(indice).to_numpy()
+    lambda_local = media_local * ataque[p_local] * defensa[p_visitante]
+    lambda_visitante = media_visitante * ataque[p_visitante] * defensa[p_local]
+
+    # Matrices de incidencia equipo x partido pendiente (local y visitante)
+    m = len(pendientes)
+    incidencia_local = np.zeros((n, m), dtype=np.float32)
+    incidencia_visitante = np.zeros((n, m), dtype=np.float32)
+    incidencia_local[p_local, np.arange(m)] = 1
+    incidencia_visitante[p_visitante, np.arange(m)] = 1
+
+    rng = np.random.default_rng(semilla)
+    cdf_diferencia = _cdf_diferencia(lambda_local, lambda_visitante)
+    max_puntos = int(puntos_actuales.max() + PUNTOS_VICTORIA * (incidencia_local + incidencia_visitante).sum(axis=1).max()) if n else 0
+    conteo_posiciones = np.zeros((n, n), dtype=np.int64)
+    conteo_puntos = np.zeros((n, max_puntos + 1), dtype=np.int64)
+    suma_puntos = np.zeros(n)
+
+    restantes = num_simulaciones
+    while restantes > 0 and n > 0:
+        s = min(SIMULACIONES_POR_BLOQUE, restantes)
+        restantes -= s
+
+        # Diferencia de goles de todos los partidos pendientes en todas las simulaciones del bloque
+        diferencia = _simular_diferencias(rng, cdf_diferencia, s)
+        resultado = np.sign(diferencia) + 1  # 0 derrota local, 1 empate, 2 victoria local
+
+        # Reparto a los equipos: (equipos x partidos) @ (partidos x simulaciones)
+        diferencia = diferencia.astype(np.float32)
+        puntos = (puntos_actuales[:, None] + incidencia_local @ PUNTOS_LOCAL[resultado]
+                  + incidencia_visitante @ PUNTOS_VISITANTE[resultado])
+        dg = dg_actual[:, None] + (incidencia_local - incidencia_visitante) @ diferencia
+
+        # Orden: puntos, diferencia de goles y sorteo
+        clave = puntos * 1e4 + dg + rng.random((n, s))
+        orden = np.argsort(-clave, axis=0)
+        posiciones = np.empty_like(orden)
+        np.put_along_axis(posiciones, orden, np.arange(n)[:, None], axis=0)
+
+        # Recuento vectorizado: cada (equipo, valor) se codifica como un único índice
+        equipo = np.arange(n)[:, None]
+        conteo_posiciones += np.bincount((equipo * n + posiciones).ravel(), minlength=n * n).reshape(n, n)
+        ancho = max_puntos + 1
+        conteo_puntos += np.bincount(
+            (equipo * ancho + np.rint(puntos).astype(np.int64)).ravel(), minlength=n * ancho
+        ).reshape(n, ancho)
+        suma_puntos += puntos.sum(axis=1)
+
+    prob_posiciones = conteo_posiciones / max(num_simulaciones, 1)
+    prob_puntos = conteo_puntos / max(num_simulaciones, 1)
+
+    acumulada = np.cumsum(prob_puntos, axis=1)
+    resumen = pd.DataFrame({
+        'Equipo': equipos,
+        'Pts actuales': puntos_actuales.astype(int),
+        'Pts esperados': np.round(suma_puntos / max(num_simulaciones, 1), 1),
+        'Pts P10': (acumulada < 0.10).sum(axis=1),
+        'Pts P90': (acumulada < 0.90).sum(axis=1),
+        'Pos media': np.round(prob_posiciones @ np.arange(1, n + 1), 1),
+        'P(1º)': np.round(prob_posiciones[:, 0] * 100, 1)
+    }).sort_values('Pos media').reset_index(drop=True)
+
+    return {
+        'equipos': equipos,
+        'pendientes': m,
+        'posiciones': prob_posiciones,
+        'puntos': prob_puntos,
+        'resumen': resumen
+    }
@@ -0,0 +1,279 @@
+"""
+Rating de equipos tipo Elo calculado jornada a jornada
+Ubicación: calculos/rating_equipos.py
+
+Los partidos (resultados_partidos de calculos/clasificacion.py) se procesan
+en orden de jornada. Dentro de una jornada todos los partidos se actualizan
+a la vez con los ratings previos a la jornada, de modo que el orden de los
+partidos de una misma jornada no importa y cada jornada se calcula con
+operaciones vectorizadas.
+
+Tras cada jornada se guarda una foto de los ratings en un array compacto
+(jornadas x equipos, float32). Si se añade o corrige un acta, basta con
+recalcular desde su jornada partiendo de la foto de la jornada anterior.
+"""
+import numpy as np
+import pandas as pd
+
+from calculos.clasificacion import resultados_partidos, clave_equipo
+from utils.instrumentacion import instrumentar
+
+RATING_INICIAL = 1500.0
+FACTOR_K = 20.0
+VENTAJA_LOCAL = 60.0
+
+
+def _multiplicador_goles(diferencia):
+    """
+    Peso del resultado según la diferencia de goles (1, 1.5 o (11 + dif) / 8)
+    """
+    diferencia = np.abs(diferencia)
+    return np.where(diferencia <= 1, 1.0, np.where(diferencia == 2, 1.5, (11.0 + diferencia) / 8.0))
+
+
+def _procesar_jornada(ratings, partidos):
+    """
+    Aplica los partidos de una jornada a los ratings
+
+    Args:
+        ratings: Array de ratings antes de la jornada
+        partidos: Array (n, 4) con índice local, índice visitante, goles local y goles visitante
+
+    Returns:
+        ndarray: Ratings después de la jornada
+    """
+    nuevos = ratings.astype(np.float64).copy()
+    if len(partidos) == 0:
+        return nuevos
+
+    local, visitante = partidos[:, 0], partidos[:, 1]
+    goles_local, goles_visitante = partidos[:, 2], partidos[:, 3]
+
+    esperado_local = 1.0 / (1.0 + 10 ** ((ratings[visitante] - ratings[local] - VENTAJA_LOCAL) / 400.0))
+    resultado_local = np.where(goles_local > goles_visitante, 1.0, np.where(goles_local == goles_visitante, 0.5, 0.0))
+    cambio = FACTOR_K * _multiplicador_goles(goles_local - goles_visitante) * (resultado_local - esperado_local)
+
+    np.add.at(nuevos, local, cambio)
+    np.add.at(nuevos, visitante, -cambio)
+    return nuevos
+
+
+def crear_estado_ratings(equipos=(), jornadas=()):
+    """
+    Crea un estado vacío de ratings
+
+    Returns:
+        dict: Estado con equipos, jornadas, partidos por jornada y fotos de ratings
+    """
+    equipos = sorted(set(equipos))
+    jornadas = sorted(set(int(j) for j in jornadas))
+    return {
+        'equipos': equipos,
+        'indice_equipos': {e: i for i, e in enumerate(equipos)},
+        'jornadas': jornadas,
+        'partidos': {j: {} for j in jornadas},  # jornada -> {(local, visitante): (gl, gv)}
+        'fotos': np.full((len(jornadas), len(equipos)), RATING_INICIAL, dtype=np.float32),
+        'pendiente_desde': 0 if jornadas else None
+    }
+
+
+def _asegurar_equipo(estado, equipo):
+    if equipo not in estado['indice_equipos']:
+        estado['equipos'].append(equipo)
+        estado['indice_equipos'][equipo] = len(estado['equipos']) - 1
+        columna = np.full((len(estado['jornadas']), 1), RATING_INICIAL, dtype=np.float32)
+        estado['fotos'] = np.concatenate([estado['fotos'], columna], axis=1)
+    return estado['indice_equipos'][equipo]
+
+
+def _asegurar_jornada(estado, jornada):
+    if jornada not in estado['partidos']:
+        posicion = int(np.searchsorted(estado['jornadas'], jornada))
+        estado['jornadas'].insert(posicion, jornada)
+        estado['partidos'][jornada] = {}
+        fila = np.full((1, len(estado['equipos'])), RATING_INICIAL, dtype=np.float32)
+        estado['fotos'] = np.insert(estado['fotos'], posicion, fila, axis=0)
+        _marcar_pendiente(estado, posicion)
+    return estado['jornadas'].index(jornada)
+
+
+def _marcar_pendiente(estado, posicion):
+    if estado['pendiente_desde'] is None or posicion < estado['pendiente_desde']:
+        estado['pendiente_desde'] = posicion
+
+
+def registrar_resultado(estado, jornada, local, visitante, goles_local, goles_visitante):
+    """
+    Añade o corrige un resultado. Los ratings se recalculan desde su jornada
+    la próxima vez que se consulten.
+
+    Returns:
+        bool: True si el estado ha cambiado
+    """
+    jornada = int(jornada)
+    nuevo = (int(goles_local), int(goles_visitante))
+    if estado['partidos'].get(jornada, {}).get((local, visitante)) == nuevo:
+        return False
+
+    posicion = _asegurar_jornada(estado, jornada)
+    _asegurar_equipo(estado, local)
+    _asegurar_equipo(estado, visitante)
+    estado['partidos'][jornada][(local, visitante)] = nuevo
+    _marcar_pendiente(estado, posicion)
+    return True
+
+
+def quitar_resultado(estado, jornada, local, visitante):
+    """
+    Quita un resultado (por ejemplo, si se retira su acta). Los ratings se
+    recalculan desde su jornada la próxima vez que se consulten.
+
+    Returns:
+        bool: True si el partido tenía resultado
+    """
+    jornada = int(jornada)
+    if estado['partidos'].get(jornada, {}).pop((local, visitante), None) is None:
+        return False
+    _marcar_pendiente(estado, estado['jornadas'].index(jornada))
+    return True
+
+
+def recalcular_desde(estado, jornada=None):
+    """
+    Recalcula las fotos de ratings desde una jornada (por defecto, desde la
+    primera jornada con cambios pendientes) partiendo de la foto anterior
+    """
+    if jornada is not None:
+        _marcar_pendiente(estado, int(np.searchsorted(estado['jornadas'], int(jornada))))
+    desde = estado['pendiente_desde']
+    if desde is None:
+        return
+
+    indice = estado['indice_equipos']
+    if desde > 0:
+        ratings = estado['fotos'][desde - 1].astype(np.float64)
+    else:
+        ratings = np.full(len(estado['equipos']), RATING_INICIAL)
+
+    for posicion in range(desde, len(estado['jornadas'])):
+        resultados = estado['partidos'][estado['jornadas'][posicion]]
+        partidos = np.array(
+            [(indice[l], indice[v], gl, gv) for (l, v), (gl, gv) in resultados.items()],
+            dtype=np.int64
+        ).reshape(-1, 4)
+        ratings = _procesar_jornada(ratings, partidos)
+        estado['fotos'][posicion] = ratings
+
+    estado['pendiente_desde'] = None
+
+
+@instrumentar
+def actualizar_ratings(estado, jornadas_df, actas_df):
+    """
+    Incorpora los resultados nuevos o corregidos, quita los que ya no están
+    y recalcula solo desde la primera jornada afectada
+
+    Returns:
+        int: Número de partidos añadidos, corregidos o quitados
+    """
+    resultados = resultados_partidos(jornadas_df, actas_df)
+    vigentes = set(zip(resultados['jornada'], resultados['local'], resultados['visitante']))
+    cambios = sum(
+        quitar_resultado(estado, jornada, local, visitante)
+        for jornada, partidos in estado['partidos'].items()
+        for local, visitante in list(partidos)
+        if (jornada, local, visitante) not in vigentes
+    )
+    for jornada, local, visitante, goles_local, goles_visitante in resultados[
+        ['jornada', 'local', 'visitante', 'goles_local', 'goles_visitante']
+    ].itertuples(index=False):
+        cambios += registrar_resultado(estado, jornada, local, visitante, goles_local, goles_visitante)
+    recalcular_desde(estado)
+    return cambios
+
+
+@instrumentar
+def construir_ratings(jornadas_df, actas_df):
+    """
+    Calcula los ratings de toda la temporada
+
+    Returns:
+        dict: Estado de ratings
+    """
+    estado = crear_estado_ratings()
+    actualizar_ratings(estado, jornadas_df, actas_df)
+    return estado
+
+
+def _posicion_jornada(estado, jornada):
+    """
+    Índice de la última jornada registrada que no supera la pedida (-1 si ninguna)
+    """
+    if jornada is None:
+        return len(estado['jornadas']) - 1
+    return int(np.searchsorted(estado['jornadas'], jornada, side='right')) - 1
+
+
+def ratings_jornada(estado, jornada=None):
+    """
+    Ratings de todos los equipos tras una jornada
+
+    Returns:
+        DataFrame: Equipo y Rating, de mayor a menor
+    """
+    recalcular_desde(estado)
+    posicion = _posicion_jornada(estado, jornada)
+    valores = estado['fotos'][posicion] if posicion >= 0 else np.full(len(estado['equipos']), RATING_INICIAL)
+    tabla = pd.DataFrame({'Equipo': estado['equipos'], 'Rating': np.round(valores).astype(int)})
+    return tabla.sort_values('Rating', ascending=False).reset_index(drop=True)
+
+
+def rating_equipo(estado, equipo, jornada=None):
+    """
+    Rating de un equipo tras una jornada (RATING_INICIAL si no tiene partidos)
+    """
+    recalcular_desde(estado)
+    indice = estado['indice_equipos'].get(clave_equipo(equipo))
+    posicion = _posicion_jornada(estado, jornada)
+    if indice is None or posicion < 0:
+        return RATING_INICIAL
+    return float(estado['fotos'][posicion, indice])
+
+
+def evolucion_rating(estado, equipo):
+    """
+    Rating de un equipo tras cada jornada
+
+    Returns:
+        DataFrame: jornada y rating
+    """
+    recalcular_desde(estado)
+    indice = estado['indice_equipos'].get(clave_equipo(equipo))
+    if indice is None:
+        return pd.DataFrame(columns=['jornada', 'rating'])
+    return pd.DataFrame({'jornada': estado['jornadas'], 'rating': estado['fotos'][:, indice].astype(float)})
+
+
+def dificultad_rivales(estado, equipo):
+    """
+    Rating de cada rival antes del partido (dificultad del calendario)
+
+    Returns:
+        DataFrame: jornada, rival, condicion (Local/Visitante) y rating_rival
+    """
+    recalcular_desde(estado)
+    clave = clave_equipo(equipo)
+    filas = []
+    for posicion, jornada in enumerate(estado['jornadas']):
+        for (local, visitante) in estado['partidos'][jornada]:
+            if clave not in (local, visitante):
+                continue
+            rival = visitante if local == clave else local
+            previo = estado['fotos'][posicion - 1, estado['indice_equipos'][rival]] if posicion > 0 else RATING_INICIAL
+            filas.append({
+                'jornada': jornada,
+                'rival': rival,
+                'condicion': 'Local' if local == clave else 'Visitante',
+                'rating_rival': float(previo)
+            })
+    return pd.DataFrame(filas, columns=['jornada', 'rival', 'condicion', 'rating_rival'])
@@ -2,8 +2,14 @@
 Módulo para el sistema de login de la aplicación Penya Independent
 """
 import streamlit as st
-import pandas as pd
 import os
+import csv
+import hmac
+import time
+import hashlib
+import secrets
+import threading
+from collections import defaultdict, deque
 from base64 import b64encode
 
 def get_image_base64(image_path):
@@ -11,9 +17,173 @@ def get_image_base64(image_path):
         encoded_string = b64encode(image_file.read()).decode('utf-8')
         return encoded_string
 
+# Parámetros del hash de contraseñas (PBKDF2-HMAC-SHA256)
+ALGORITMO_HASH = "pbkdf2_sha256"
+ITERACIONES_HASH = 200_000
+
+# Limitación de intentos fallidos por usuario
+MAX_INTENTOS_FALLIDOS = 5
+VENTANA_INTENTOS_SEGUNDOS = 300
+# Usuarios con intentos registrados a partir de los cuales se purgan los caducados
+MAX_USUARIOS_CON_INTENTOS = 10_000
+
+# Índice de usuarios en memoria: se recarga solo si cambia el archivo
+_usuarios = {'mtime': None, 'indice': {}}
+_usuarios_lock = threading.Lock()
+
+# Instantes de los intentos fallidos recientes de cada usuario
+_intentos_fallidos = defaultdict(deque)
+_intentos_lock = threading.Lock()
+
+# Hash de referencia para los usuarios inexistentes
+_HASH_FICTICIO = f"{ALGORITMO_HASH}${ITERACIONES_HASH}${'00' * 16}${'00' * 32}"
+
+def _ruta_usuarios():
+    """
+    Ruta al archivo usuarios.csv
+    """
+    return os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'usuarios.csv')
+
+def generar_hash_clave(clave, sal=None, iteraciones=ITERACIONES_HASH):
+    """
+    Genera el hash con sal de una contraseña
+    
+    Args:
+        clave (str): Contraseña en claro
+        sal (bytes): Sal a usar (opcional, por defecto aleatoria)
+        iteraciones (int): Iteraciones de PBKDF2
+    
+    Returns:
+        str: Hash con el formato pbkdf2_sha256$iteraciones$sal$hash
+    """
+    if sal is None:
+        sal = secrets.token_bytes(16)
+    derivada = hashlib.pbkdf2_hmac('sha256', clave.encode('utf-8'), sal, iteraciones)
+    return f"{ALGORITMO_HASH}${iteraciones}${sal.hex()}${derivada.hex()}"
+
+def verificar_clave(clave, hash_guardado):
+    """
+    Comprueba una contraseña contra su hash en tiempo constante
+    
+    Args:
+        clave (str): Contraseña introducida
+        hash_guardado (str): Hash generado con generar_hash_clave
+    
+    Returns:
+        bool: True si la contraseña es correcta
+    """
+    try:
+        algoritmo, iteraciones, sal_hex, derivada_hex = hash_guardado.split('$')
+        if algoritmo != ALGORITMO_HASH:
+            return False
+        derivada = hashlib.pbkdf2_hmac('sha256', clave.encode('utf-8'), bytes.fromhex(sal_hex), int(iteraciones))
+        return hmac.compare_digest(derivada.hex(), derivada_hex)
+    except (ValueError, AttributeError):
+        return False
+
+def _reescribir_usuarios(csv_path, campos, filas):
+    """
+    Guarda usuarios.csv con todas las claves ya convertidas a hash, escribiendo
+    primero en un archivo temporal para no dejarlo a medias
+    """
+    ruta_temporal = f"{csv_path}.tmp"
+    with open(ruta_temporal, 'w', newline='', encoding='utf-8') as f:
+        escritor = csv.DictWriter(f, fieldnames=campos)
+        escritor.writeheader()
+        escritor.writerows(filas)
+    os.replace(ruta_temporal, csv_path)
+
+def _cargar_usuarios():
+    """
+    Devuelve el índice de usuarios {usuario: {nombre, rol, hash}}, leyendo
+    usuarios.csv solo cuando cambia su fecha de modificación. Las claves que
+    aún están en claro en el archivo se convierten a hash y se reescriben en
+    el propio archivo, de modo que no quedan contraseñas en claro en disco.
+    """
+    csv_path = _ruta_usuarios()
+    mtime = os.stat(csv_path).st_mtime_ns
+    
+    with _usuarios_lock:
+        if _usuarios['mtime'] == mtime:
+            return _usuarios['indice']
+        
+        indice = {}
+        hay_claves_en_claro = False
+        with open(csv_path, newline='', encoding='utf-8') as f:
+            lector = csv.DictReader(f)
+            filas = list(lector)
+            campos = lector.fieldnames
+        for fila in filas:
+            usuario = (fila.get('usuario') or '').strip()
+            clave = fila.get('clave') or ''
+            if not usuario:
+                continue
+            if not clave.startswith(f"{ALGORITMO_HASH}$"):
+                clave = generar_hash_clave(clave)
+                fila['clave'] = clave
+                hay_claves_en_claro = True
+            indice[usuario] = {
+                'nombre': fila.get('nombre') or usuario,
+                'rol': fila.get('rol') or 'usuario',
+                'hash': clave
+            }
+        
+        if hay_claves_en_claro:
+            try:
+                _reescribir_usuarios(csv_path, campos, filas)
+                mtime = os.stat(csv_path).st_mtime_ns
+            except OSError as e:
+                print(f"No se ha podido guardar el hash de las claves en {csv_path}: {e}")
+        
+        _usuarios['mtime'] = mtime
+        _usuarios['indice'] = indice
+        return indice
+
+def segundos_bloqueo(usuario):
+    """
+    Indica cuántos segundos le quedan a un usuario bloqueado por exceso de intentos
+    
+    Returns:
+        int: Segundos restantes (0 si no está bloqueado)
+    """
+    ahora = time.monotonic()
+    with _intentos_lock:
+        intentos = _intentos_fallidos.get(usuario)
+        if not intentos:
+            return 0
+        _olvidar_intentos_caducados(usuario, intentos, ahora)
+        if len(intentos) < MAX_INTENTOS_FALLIDOS:
+            return 0
+        return int(VENTANA_INTENTOS_SEGUNDOS - (ahora - intentos[0])) + 1
+
+def _olvidar_intentos_caducados(usuario, intentos, ahora):
+    """
+    Quita los intentos que ya están fuera de la ventana y, si no queda
+    ninguno, la entrada del usuario (se llama con _intentos_lock adquirido)
+    """
+    while intentos and ahora - intentos[0] > VENTANA_INTENTOS_SEGUNDOS:
+        intentos.popleft()
+    if not intentos:
+        _intentos_fallidos.pop(usuario, None)
+
+def _registrar_intento(usuario, correcto):
+    """
+    Registra el resultado de un intento de login para la limitación de intentos
+    """
+    ahora = time.monotonic()
+    with _intentos_lock:
+        if correcto:
+            _intentos_fallidos.pop(usuario, None)
+            return
+        # Purgar los usuarios sin intentos recientes para que el registro no crezca sin límite
+        if len(_intentos_fallidos) >= MAX_USUARIOS_CON_INTENTOS:
+            for otro, intentos in list(_intentos_fallidos.items()):
+                _olvidar_intentos_caducados(otro, intentos, ahora)
+        _intentos_fallidos[usuario].append(ahora)
+
 def validar_usuario(usuario, clave):
     """
-    Valida el usuario y clave contra el archivo usuarios.csv
+    Valida el usuario y clave contra el índice de usuarios (cargado de usuarios.csv)
     
     Args:
         usuario (str): Usuario a validar
@@ -22,32 +192,36 @@ def validar_usuario(usuario, clave):
     Returns:
         tuple: (es_valido, rol) - (True, rol) si es válido, (False, None) si no lo es
     """
-    # Construir la ruta al archivo usuarios.csv
-    csv_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'usuarios.csv')
+    csv_path = _ruta_usuarios()
     
     # Verificar si el archivo existe
     if not os.path.exists(csv_path):
         st.error(f"El archivo de usuarios no se encuentra en: {csv_path}")
         return False, None
     
+    # Rechazar sin calcular el hash si el usuario está bloqueado
+    if segundos_bloqueo(usuario) > 0:
+        return False, None
+    
     try:
-        # Leer el archivo CSV
-        df_usuarios = pd.read_csv(csv_path)
-        
-        # Validar el usuario y la clave
-        usuario_valido = df_usuarios[(df_usuarios['usuario'] == usuario) & 
-                                    (df_usuarios['clave'] == clave)]
-        
-        if not usuario_valido.empty:
-            # Si encontramos el usuario, también guardamos su rol
-            rol = usuario_valido.iloc[0]['rol'] if 'rol' in usuario_valido.columns else 'usuario'
-            return True, rol
-        else:
-            return False, None
-            
+        usuarios = _cargar_usuarios()
     except Exception as e:
         st.error(f"Error al leer el archivo de usuarios: {e}")
         return False, None
+    
+    datos_usuario = usuarios.get(usuario)
+    if datos_usuario is None:
+        # Calcular igualmente un hash para no revelar qué usuarios existen
+        verificar_clave(clave, _HASH_FICTICIO)
+        _registrar_intento(usuario, False)
+        return False, None
+    
+    es_valido = verificar_clave(clave, datos_usuario['hash'])
+    _registrar_intento(usuario, es_valido)
+    
+    if es_valido:
+        return True, datos_usuario['rol']
+    return False, None
 
 def mostrar_login():
     """
@@ -83,12 +257,15 @@ def mostrar_login():
         if st.button("Iniciar Sesión", use_container_width=True):
             if usuario and clave:  # Verificamos que no estén vacíos
                 es_valido, rol = validar_usuario(usuario, clave)
+                bloqueo = segundos_bloqueo(usuario)
                 if es_valido:
                     # Guardamos los datos en session_state
                     st.session_state.usuario_autenticado = True
                     st.session_state.nombre_usuario = usuario
                     st.session_state.rol_usuario = rol
                     st.rerun()  # Recargamos la página
+                elif bloqueo > 0:
+                    st.error(f"Demasiados intentos fallidos. Inténtalo de nuevo en {bloqueo} segundos")
                 else:
                     st.error("Usuario o contraseña incorrectos")
             else:
@@ -104,4 +281,9 @@ def cerrar_sesion():
         if key in st.session_state:
             del st.session_state[key]
     
-    st.rerun()  # Recargamos la página
\ No newline at end of file
+    st.rerun()  # Recargamos la página
+
+if __name__ == "__main__":
+    # Generar el hash de una contraseña para guardarlo en la columna 'clave' de usuarios.csv
+    import getpass
+    print(generar_hash_clave(getpass.getpass("Contraseña: ")))
@@ -191,24 +191,123 @@ def crear_menu():
     
     return st.session_state.pagina_actual
 
+# Módulo que implementa cada página del menú (se importa solo al visitarla)
+MODULOS_PAGINAS = {
+    "Inicio": "home",
+    "Jugadores": "pages.jugadores",
+    "Equipo": "pages.equipos",
+    "Análisis Comparativo": "pages.ml"
+}
+
 def mostrar_pagina_actual():
     """
-    Muestra la página correspondiente según la selección del menú
+    Muestra la página correspondiente según la selección del menú.
+    Solo se importa el módulo de la página visitada (y sus dependencias).
     """
-    from home import main as main_home
-    from pages.jugadores import main as main_jugadores
-    from pages.equipos import main as main_equipos
-    from pages.ml import main as main_ml  
+    from utils.arranque import importar_modulo
+    from utils.instrumentacion import medir
     
     pagina = st.session_state.pagina_actual
+    modulo = MODULOS_PAGINAS.get(pagina)
+    
+    if modulo is None:
+        st.error(f"Página no encontrada: {pagina}")
+        return
     
-    if pagina == "Inicio":
-        main_home()
-    elif pagina == "Jugadores":
-        main_jugadores()
-    elif pagina == "Equipo":
-        main_equipos()
-    elif pagina == "Análisis Comparativo":  
-        main_ml()
+    # Captura de perfilado pedida por un administrador para esta carga
+    if st.session_state.pop('perfilar_proxima_carga', False) and st.session_state.get('rol_usuario') == 'admin':
+        from utils.perfilado import perfilar, CLAVES_SELECCION
+        from utils.data import version_datos
+        
+        metadatos = {
+            'usuario': st.session_state.get('nombre_usuario'),
+            'seleccion': {c: st.session_state[c] for c in CLAVES_SELECCION if c in st.session_state},
+            'version_datos': version_datos()
+        }
+        with perfilar(modulo, metadatos), medir(f"pagina.{modulo}"):
+            importar_modulo(modulo).main()
     else:
-        st.error(f"Página no encontrada: {pagina}")
\ No newline at end of file
+        # Medir el tiempo total de dibujar la página
+        with medir(f"pagina.{modulo}"):
+            importar_modulo(modulo).main()
+    
+    mostrar_panel_rendimiento()
+
+def mostrar_panel_rendimiento():
+    """
+    Muestra el panel de rendimiento (solo para administradores) con los
+    percentiles de tiempo de cada función instrumentada
+    """
+    if st.session_state.get('rol_usuario') != 'admin':
+        return
+    
+    from utils.instrumentacion import (
+        resumen_rendimiento, exportar_jsonl, limpiar_registros,
+        activar_trazado_memoria, trazando_memoria
+    )
+    
+    with st.expander("⏱️ Rendimiento"):
+        # El trazado es global al proceso: solo se cambia cuando se pulsa la casilla,
+        # no en cada recarga de la página
+        st.checkbox(
+            "Medir memoria neta reservada (todo el proceso, más lento)",
+            value=trazando_memoria(),
+            key="rendimiento_memoria",
+            on_change=lambda: activar_trazado_memoria(st.session_state.rendimiento_memoria)
+        )
+        
+        filas = resumen_rendimiento()
+        if filas:
+            st.dataframe(filas, hide_index=True, use_container_width=True)
+        else:
+            st.info("Todavía no hay llamadas registradas")
+        
+        col_descarga, col_vaciar = st.columns(2)
+        with col_descarga:
+            st.download_button(
+                "📥 Descargar registros (JSON lines)",
+                data=exportar_jsonl(),
+                file_name="rendimiento.jsonl",
+                mime="application/x-ndjson",
+                use_container_width=True
+            )
+        with col_vaciar:
+            if st.button("🗑️ Vaciar registros", key="rendimiento_vaciar", use_container_width=True):
+                limpiar_registros()
+                st.rerun()
+        
+        mostrar_capturas_perfilado()
+
+def mostrar_capturas_perfilado(num_capturas=10):
+    """
+    Permite pedir una captura de perfilado de la siguiente carga de la página
+    y descargar las últimas capturas guardadas (solo administradores)
+    """
+    from utils.perfilado import listar_capturas
+    
+    st.markdown("**Perfilado de páginas**")
+    if st.button("🔬 Perfilar la próxima carga de esta página", key="rendimiento_perfilar"):
+        st.session_state.perfilar_proxima_carga = True
+        st.rerun()
+    
+    capturas = listar_capturas(num_capturas)
+    if not capturas:
+        st.caption("No hay capturas guardadas")
+        return
+    
+    for i, captura in enumerate(capturas):
+        seleccion = ", ".join(str(v) for v in captura.get('seleccion', {}).values()) or "-"
+        st.write(
+            f"{captura['fecha']} · {captura['pagina']} · {seleccion} · "
+            f"{captura['duracion_ms']:.0f} ms · datos {captura.get('version_datos', '-')}"
+        )
+        cols = st.columns(max(1, len(captura['rutas'])))
+        for col, ruta in zip(cols, captura['rutas']):
+            with col:
+                with open(ruta, 'rb') as f:
+                    st.download_button(
+                        f"📥 {os.path.basename(ruta)}",
+                        data=f.read(),
+                        file_name=os.path.basename(ruta),
+                        key=f"captura_{i}_{os.path.basename(ruta)}"
+                    )
\ No newline at end of file
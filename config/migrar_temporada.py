@@ -4,13 +4,17 @@ Ubicación: config/migrar_temporada.py
 """
 import os
 import sys
-import shutil
-from datetime import datetime
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Agregar el directorio raíz al path para importaciones
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config.temporadas import *
+from utils.almacen import publicar_particion
+from utils.archivo_temporadas import archivar_temporada, CARPETA_ARCHIVO
 
 def migrar_a_nueva_temporada(nueva_temporada_codigo, cod_competicion, cod_grupo, cod_temporada):
     """
@@ -19,45 +23,38 @@ def migrar_a_nueva_temporada(nueva_temporada_codigo, cod_competicion, cod_grupo,
     print("🔄 INICIANDO MIGRACIÓN A NUEVA TEMPORADA")
     print("=" * 50)
     
-    # 1. Hacer backup de la temporada actual
-    print("📦 1. Creando backup de temporada actual...")
-    backup_folder = f"backup_temporada_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    # 1. Archivar la temporada actual (Parquet comprimido, sin duplicar
+    # tablas que ya estén archivadas con el mismo contenido)
+    temporada_anterior, _ = obtener_temporada_activa()
+    print(f"📦 1. Archivando temporada {temporada_anterior}...")
     
     try:
-        os.makedirs(backup_folder, exist_ok=True)
+        manifiesto = archivar_temporada(temporada_anterior)
+        ruta_manifiesto = os.path.join(CARPETA_ARCHIVO, "temporadas", f"{temporada_anterior}.json")
         
-        # Backup de archivos principales
-        archivos_backup = [
-            'data/Repositorio/Listado_Jornadas.csv',
-            'data/Actas_unificado.csv',
-            'data/Goles_unificado.csv',
-            'data/Sustituciones_unificado.csv'
-        ]
-        
-        for archivo in archivos_backup:
-            if os.path.exists(archivo):
-                shutil.copy2(archivo, backup_folder)
-                print(f"  ✅ Backup: {archivo}")
-        
-        # Backup de carpetas de datos individuales
-        carpetas_backup = [
-            'data/Repositorio/Actas',
-            'data/Repositorio/Goles',
-            'data/Repositorio/Sustituciones'
-        ]
-        
-        for carpeta in carpetas_backup:
-            if os.path.exists(carpeta):
-                backup_carpeta = os.path.join(backup_folder, os.path.basename(carpeta))
-                shutil.copytree(carpeta, backup_carpeta)
-                print(f"  ✅ Backup carpeta: {carpeta}")
-        
-        print(f"✅ Backup completado en: {backup_folder}")
+        mb_origen = manifiesto['bytes_origen'] / 1024 / 1024
+        mb_archivo = manifiesto['bytes_archivo'] / 1024 / 1024
+        print(f"✅ Archivo completado: {mb_origen:.1f} MB de CSV -> {mb_archivo:.1f} MB")
         
     except Exception as e:
         print(f"❌ Error durante backup: {e}")
         return False
     
+    # 1b. Publicar los datos actuales como partición de su temporada (data/season=<código>/)
+    # y vaciar los de la temporada activa. Se hace antes de activar la nueva
+    # temporada: si los CSV de siempre conservaran los datos anteriores, se
+    # leerían como la nueva temporada y la anterior se contaría dos veces.
+    print(f"\n🗂️  1b. Publicando partición de la temporada {temporada_anterior}...")
+    
+    try:
+        carpeta = publicar_particion(temporada_anterior, sobrescribir=True, vaciar=True)
+        print(f"✅ Partición publicada en: {carpeta}")
+        print("✅ Datos de la temporada activa vaciados")
+    except Exception as e:
+        print(f"❌ Error publicando la partición: {e}")
+        print("   La temporada activa no se ha cambiado")
+        return False
+    
     # 2. Agregar nueva temporada
     print(f"\n🆕 2. Configurando nueva temporada {nueva_temporada_codigo}...")
     
@@ -75,59 +72,8 @@ def migrar_a_nueva_temporada(nueva_temporada_codigo, cod_competicion, cod_grupo,
         print(f"❌ Error configurando nueva temporada: {e}")
         return False
     
-    # 3. Limpiar datos de temporada anterior (opcional)
-    print(f"\n🧹 3. ¿Limpiar datos de temporada anterior?")
-    respuesta = input("¿Quieres limpiar los datos de la temporada anterior? (s/N): ")
-    
-    if respuesta.lower() in ['s', 'si', 'sí', 'y', 'yes']:
-        try:
-            # Limpiar archivos unificados
-            archivos_limpiar = [
-                'data/Actas_unificado.csv',
-                'data/Goles_unificado.csv', 
-                'data/Sustituciones_unificado.csv'
-            ]
-            
-            for archivo in archivos_limpiar:
-                if os.path.exists(archivo):
-                    os.remove(archivo)
-                    print(f"  🗑️  Eliminado: {archivo}")
-            
-            # Limpiar Listado_Jornadas.csv
-            listado_path = 'data/Repositorio/Listado_Jornadas.csv'
-            if os.path.exists(listado_path):
-                # Crear un archivo vacío con solo headers
-                import pandas as pd
-                df_vacio = pd.DataFrame(columns=[
-                    'cod_temporada', 'cod_competicion', 'cod_grupo', 'jornada',
-                    'equipo_local', 'equipo_visitante', 'cod_acta', 'link_acta', 'acta_extraida'
-                ])
-                df_vacio.to_csv(listado_path, index=False)
-                print(f"  🗑️  Reiniciado: {listado_path}")
-            
-            # Limpiar carpetas de datos individuales
-            carpetas_limpiar = [
-                'data/Repositorio/Actas',
-                'data/Repositorio/Goles',
-                'data/Repositorio/Sustituciones'
-            ]
-            
-            for carpeta in carpetas_limpiar:
-                if os.path.exists(carpeta):
-                    for archivo in os.listdir(carpeta):
-                        if archivo.endswith('.csv'):
-                            os.remove(os.path.join(carpeta, archivo))
-                    print(f"  🗑️  Limpiada carpeta: {carpeta}")
-            
-            print("✅ Limpieza completada")
-            
-        except Exception as e:
-            print(f"❌ Error durante limpieza: {e}")
-    else:
-        print("ℹ️  Datos anteriores conservados")
-    
-    # 4. Verificar configuración
-    print(f"\n✅ 4. Verificando nueva configuración...")
+    # 3. Verificar configuración
+    print(f"\n✅ 3. Verificando nueva configuración...")
     
     try:
         params = obtener_parametros_scraping()
@@ -143,14 +89,123 @@ def migrar_a_nueva_temporada(nueva_temporada_codigo, cod_competicion, cod_grupo,
     print(f"\n🎉 MIGRACIÓN COMPLETADA EXITOSAMENTE")
     print("=" * 50)
     print(f"📅 Nueva temporada activa: {nueva_temporada_codigo}")
-    print(f"📦 Backup guardado en: {backup_folder}")
+    print(f"📦 Archivo de la temporada anterior: {ruta_manifiesto}")
     print(f"🔄 Ya puedes ejecutar el scraping para la nueva temporada")
     
     return True
 
-def detectar_codigos_nueva_temporada():
+# Caché de los sondeos de códigos: evita repetir peticiones en comprobaciones programadas
+CACHE_DETECCION = os.path.join("data", "cache_deteccion_temporadas.json")
+HORAS_CACHE_DETECCION = 12
+# Los sondeos sin partidos caducan antes: una temporada puede abrirse en cualquier momento
+MINUTOS_CACHE_DETECCION_NEGATIVA = 30
+
+# Pestañas de Chrome abiertas a la vez y espera máxima por página
+MAX_SONDEOS_PARALELOS = 4
+SEGUNDOS_ESPERA_SONDEO = 8
+
+def _url_sondeo(cod_competicion, cod_grupo, cod_temporada):
     """
-    Ayuda a detectar los códigos de una nueva temporada
+    URL de la jornada 1 de una combinación de códigos
+    """
+    return ('https://www.ffib.es/Fed/NPcd/NFG_CmpJornada?cod_primaria=1000110'
+            f'&CodCompeticion={cod_competicion}'
+            f'&CodGrupo={cod_grupo}'
+            f'&CodTemporada={cod_temporada}'
+            f'&cod_agrupacion=1'
+            f'&CodJornada=1')
+
+def _cargar_cache_deteccion(ruta=CACHE_DETECCION):
+    """
+    Lee la caché de sondeos descartando las entradas caducadas. Las combinaciones
+    con partidos duran HORAS_CACHE_DETECCION horas y las que no tenían partidos
+    solo MINUTOS_CACHE_DETECCION_NEGATIVA minutos.
+    """
+    if not os.path.exists(ruta):
+        return {}
+    try:
+        with open(ruta, encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    ahora = time.time()
+    limite_activa = ahora - HORAS_CACHE_DETECCION * 3600
+    limite_sin_datos = ahora - MINUTOS_CACHE_DETECCION_NEGATIVA * 60
+    return {
+        clave: r for clave, r in cache.items()
+        if r.get('marca', 0) >= (limite_activa if r.get('activa') else limite_sin_datos)
+    }
+
+def _guardar_cache_deteccion(cache, ruta=CACHE_DETECCION):
+    """
+    Guarda la caché de sondeos
+    """
+    try:
+        os.makedirs(os.path.dirname(ruta) or ".", exist_ok=True)
+        with open(f"{ruta}.tmp", 'w', encoding='utf-8') as f:
+            json.dump(cache, f, ensure_ascii=False, indent=2)
+        os.replace(f"{ruta}.tmp", ruta)
+    except OSError as e:
+        print(f"⚠️  No se pudo guardar la caché de detección: {e}")
+
+def _sondear_codigos(driver, cod_competicion, cod_grupo, cod_temporada):
+    """
+    Abre la jornada 1 de una combinación de códigos y comprueba si tiene partidos.
+    En lugar de una pausa fija se espera solo hasta que aparecen los partidos.
+    
+    Returns:
+        dict: activa, partidos y texto de la jornada
+    """
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.common.exceptions import TimeoutException
+    from bs4 import BeautifulSoup
+    
+    driver.get(_url_sondeo(cod_competicion, cod_grupo, cod_temporada))
+    try:
+        WebDriverWait(driver, SEGUNDOS_ESPERA_SONDEO).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, 'table[width="100%"]'))
+        )
+    except TimeoutException:
+        pass  # Sin partidos: la página no tiene datos para estos códigos
+    
+    soup = BeautifulSoup(driver.page_source, 'html.parser')
+    
+    # Verificar si la página tiene contenido válido
+    jornada_text = soup.find("div", class_="col-sm-12", style="text-align:center")
+    partidos = soup.find_all("table", width="100%")
+    
+    return {
+        'activa': bool(jornada_text and partidos),
+        'partidos': len(partidos),
+        'jornada': jornada_text.text.strip() if jornada_text and "Jornada" in jornada_text.text else ""
+    }
+
+def detectar_codigos_nueva_temporada(codigos_temporada=None, codigos_competicion=None, codigos_grupo=None,
+                                     max_paralelos=MAX_SONDEOS_PARALELOS, parar_al_encontrar=True,
+                                     usar_cache=True):
+    """
+    Ayuda a detectar los códigos de una nueva temporada.
+    
+    Las combinaciones de códigos se sondean en paralelo; cada hilo reutiliza
+    su propio navegador en lugar de abrir uno por sondeo. Con
+    parar_al_encontrar se cancelan los sondeos pendientes en cuanto una
+    combinación tiene partidos. Los resultados se guardan en caché durante
+    HORAS_CACHE_DETECCION horas (MINUTOS_CACHE_DETECCION_NEGATIVA minutos si
+    la combinación no tenía partidos).
+    
+    Args:
+        codigos_temporada: Códigos de temporada a probar (por defecto, los 5 siguientes al activo)
+        codigos_competicion: Códigos de competición (por defecto, el de la temporada activa)
+        codigos_grupo: Códigos de grupo (por defecto, el de la temporada activa)
+        max_paralelos: Número máximo de navegadores a la vez
+        parar_al_encontrar: Cancelar los sondeos pendientes tras la primera coincidencia
+        usar_cache: Reutilizar los sondeos recientes guardados en caché
+        
+    Returns:
+        list: Combinaciones con partidos (dicts con cod_competicion, cod_grupo,
+              cod_temporada, partidos y jornada)
     """
     print("🔍 DETECTANDO CÓDIGOS DE NUEVA TEMPORADA")
     print("=" * 50)
@@ -158,60 +213,126 @@ def detectar_codigos_nueva_temporada():
     try:
         from selenium import webdriver
         from selenium.webdriver.chrome.options import Options
-        from bs4 import BeautifulSoup
-        import time
+        from bs4 import BeautifulSoup  # noqa: F401
     except ImportError:
         print("❌ Error: Necesitas instalar selenium y beautifulsoup4")
         print("   pip install selenium beautifulsoup4")
-        return
-    
-    # Probar diferentes códigos de temporada
-    cod_competicion_base = 7077248
-    cod_grupo_base = 7077249
-    
-    print("🕷️  Probando diferentes códigos de temporada...")
-    
-    for cod_temp in range(20, 26):  # Probar temporadas 20-25
-        try:
-            url = (f'https://www.ffib.es/Fed/NPcd/NFG_CmpJornada?cod_primaria=1000110'
-                   f'&CodCompeticion={cod_competicion_base}'
-                   f'&CodGrupo={cod_grupo_base}'
-                   f'&CodTemporada={cod_temp}'
-                   f'&cod_agrupacion=1'
-                   f'&CodJornada=1')
-            
+        return []
+    
+    # Candidatos a partir de los códigos de la temporada activa
+    _, config_activa = obtener_temporada_activa()
+    cod_temporada_actual = config_activa.get('cod_temporada') or 20
+    codigos_temporada = codigos_temporada or range(cod_temporada_actual + 1, cod_temporada_actual + 6)
+    codigos_competicion = codigos_competicion or [config_activa.get('cod_competicion') or 7077248]
+    codigos_grupo = codigos_grupo or [config_activa.get('cod_grupo') or 7077249]
+    
+    candidatos = [
+        (cod_comp, cod_grupo, cod_temp)
+        for cod_temp in codigos_temporada
+        for cod_comp in codigos_competicion
+        for cod_grupo in codigos_grupo
+    ]
+    
+    cache = _cargar_cache_deteccion() if usar_cache else {}
+    encontrados = []
+    
+    # Resultados ya conocidos
+    pendientes = []
+    for codigos in candidatos:
+        resultado = cache.get("-".join(map(str, codigos)))
+        if resultado is None:
+            pendientes.append(codigos)
+        elif resultado['activa']:
+            encontrados.append(codigos)
+            print(f"  ✅ {codigos}: ACTIVA - {resultado['partidos']} partidos (caché)")
+    
+    if encontrados and parar_al_encontrar:
+        pendientes = []
+    
+    print(f"🕷️  Probando {len(pendientes)} combinaciones de códigos ({len(candidatos) - len(pendientes)} en caché)...")
+    
+    # Un navegador por hilo, reutilizado en todos los sondeos de ese hilo
+    locales = threading.local()
+    navegadores = []
+    lock_navegadores = threading.Lock()
+    encontrado = threading.Event()
+    
+    def obtener_navegador():
+        if not hasattr(locales, 'driver'):
             options = Options()
             options.add_argument('--headless')
             options.add_argument('--no-sandbox')
             options.add_argument('--disable-dev-shm-usage')
-            
-            driver = webdriver.Chrome(options=options)
-            driver.get(url)
-            time.sleep(3)
-            
-            soup = BeautifulSoup(driver.page_source, 'html.parser')
-            driver.quit()
-            
-            # Verificar si la página tiene contenido válido
-            jornada_text = soup.find("div", class_="col-sm-12", style="text-align:center")
-            partidos = soup.find_all("table", width="100%")
-            
-            if jornada_text and partidos:
-                print(f"  ✅ Temporada {cod_temp}: ACTIVA - {len(partidos)} partidos encontrados")
+            options.add_argument('--disable-gpu')
+            locales.driver = webdriver.Chrome(options=options)
+            with lock_navegadores:
+                navegadores.append(locales.driver)
+        return locales.driver
+    
+    def sondear(codigos):
+        if parar_al_encontrar and encontrado.is_set():
+            return codigos, None
+        resultado = _sondear_codigos(obtener_navegador(), *codigos)
+        if resultado['activa']:
+            encontrado.set()
+        return codigos, resultado
+    
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_paralelos, len(pendientes)))) as executor:
+            futuros = [executor.submit(sondear, codigos) for codigos in pendientes]
+            for futuro in as_completed(futuros):
+                try:
+                    codigos, resultado = futuro.result()
+                except Exception as e:
+                    print(f"  ⚠️  Error en un sondeo: {e}")
+                    continue
+                if resultado is None:
+                    continue
                 
-                # Extraer información adicional
-                if "Jornada" in jornada_text.text:
-                    print(f"      📅 {jornada_text.text.strip()}")
-                    
-            else:
-                print(f"  ❌ Temporada {cod_temp}: Sin datos")
+                resultado['marca'] = time.time()
+                cache["-".join(map(str, codigos))] = resultado
                 
-        except Exception as e:
-            print(f"  ⚠️  Temporada {cod_temp}: Error - {e}")
+                if resultado['activa']:
+                    encontrados.append(codigos)
+                    print(f"  ✅ {codigos}: ACTIVA - {resultado['partidos']} partidos encontrados")
+                    if resultado['jornada']:
+                        print(f"      📅 {resultado['jornada']}")
+                    if parar_al_encontrar:
+                        # Cancelar los sondeos que aún no han empezado
+                        for pendiente in futuros:
+                            pendiente.cancel()
+                else:
+                    print(f"  ❌ {codigos}: Sin datos")
+    finally:
+        for driver in navegadores:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        _guardar_cache_deteccion(cache)
     
-    print("\n💡 Usa el código de temporada que muestre 'ACTIVA' para la migración")
+    if encontrados:
+        print("\n💡 Usa los códigos (competición, grupo, temporada) que muestren 'ACTIVA' para la migración")
+    else:
+        print("\nℹ️  No se ha encontrado ninguna temporada nueva")
+    
+    return [
+        {
+            'cod_competicion': codigos[0],
+            'cod_grupo': codigos[1],
+            'cod_temporada': codigos[2],
+            'partidos': cache.get("-".join(map(str, codigos)), {}).get('partidos'),
+            'jornada': cache.get("-".join(map(str, codigos)), {}).get('jornada', "")
+        }
+        for codigos in sorted(set(encontrados), key=lambda c: c[2])
+    ]
 
 if __name__ == "__main__":
+    # Comprobación programada (por ejemplo desde cron): sin preguntas y con
+    # código de salida 0 si hay una temporada nueva y 1 si no la hay
+    if len(sys.argv) > 1 and sys.argv[1] == "--detectar":
+        sys.exit(0 if detectar_codigos_nueva_temporada() else 1)
+    
     print("🔧 HERRAMIENTA DE MIGRACIÓN DE TEMPORADA")
     print("=" * 50)
     
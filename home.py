@@ -3,8 +3,6 @@ Página principal del dashboard de Penya Independent
 """
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 import re
 
 # Importar módulos propios
@@ -8,17 +8,20 @@ import plotly.express as px
 import plotly.graph_objects as go
 
 # Importar módulos propios
-from utils.data import cargar_datos
-from utils.ui import page_config  
-from utils.pdf_export import show_download_button  
+from utils.data import cargar_datos, obtener_datos_equipo, obtener_clasificacion, obtener_ratings, obtener_proyeccion, obtener_linea_temporal, obtener_forma
+from calculos.clasificacion import clasificacion_jornada, clave_equipo
+from calculos.rating_equipos import ratings_jornada, evolucion_rating, dificultad_rivales
+from calculos.linea_temporal import buscar_partido, eventos_partido, estados_marcador, estados_equipo
+from calculos.forma_equipos import VENTANAS, forma_jornada, forma_equipo, racha_equipo
+from utils.ui import page_config, pestanas_perezosas
+from utils.pdf_export import boton_pdf_bajo_demanda
 from calculos.calculo_equipo import (
     obtener_rivales_con_goles, 
     analizar_tarjetas_por_jornada, 
     analizar_tipos_goles, 
     calcular_metricas_avanzadas, 
     calcular_goles_contra, 
-    calcular_tarjetas_rivales,
-    normalizar_nombre_equipo
+    calcular_tarjetas_rivales
 )
 from calculos.calculo_jugadores import (
     analizar_goles_por_tiempo, 
@@ -29,22 +32,19 @@ from calculos.calculo_jugadores import (
 )
 from visualizaciones.equipo import (
     graficar_tarjetas_por_jornada, 
+    construir_tarjetas_por_jornada,
     graficar_tipos_goles, 
     graficar_goles_por_tiempo
 )
-from visualizaciones.jugadores import graficar_goles_por_jugador, graficar_tarjetas_por_jugador
+from visualizaciones.jugadores import graficar_goles_por_jugador, graficar_tarjetas_por_jugador, construir_goles_por_jugador
 from visualizaciones.minutos import (
     graficar_minutos_por_jugador,
     graficar_minutos_por_jugador_desglose,
+    construir_minutos_desglose,
     graficar_distribucion_sustituciones
 )
 from utils.constants import PENYA_PRIMARY_COLOR, PENYA_SECONDARY_COLOR
 
-# Configurar la página
-page_config()
-
-# Cargar datos
-data = cargar_datos()
 
 def mostrar_tarjeta_metrica_compacta(titulo, valor, valor_referencia=None, color_valor="#FF8C00"):
     """
@@ -99,57 +99,415 @@ def mostrar_tarjeta_metrica_compacta(titulo, valor, valor_referencia=None, color
         unsafe_allow_html=True
     )
 
-def filtrar_datos_equipo(data, equipo_seleccionado):
+@st.fragment
+def seccion_goles(datos_equipo, equipo_seleccionado):
     """
-    Filtra todos los datos según el equipo seleccionado
+    Muestra las visualizaciones de goles del equipo.
+    Se ejecuta como fragmento: cambiar de pestaña solo recalcula esta sección
+    y solo se calcula la pestaña visible.
     """
-    datos_filtrados = {}
-    
-    # Normalizar nombre del equipo seleccionado
-    equipo_normalizado = normalizar_nombre_equipo(equipo_seleccionado)
-    
-    # Crear una función de filtrado que normalice antes de comparar
-    def filtrar_por_equipo(campo):
-        return campo.apply(lambda x: normalizar_nombre_equipo(x)).str.contains(equipo_normalizado, na=False)
+    st.subheader("Goles")
     
-    # Filtrar actas
-    datos_filtrados['actas'] = data['actas']  # Mantener todas las actas para referencias
-    datos_filtrados['actas_penya'] = data['actas'][filtrar_por_equipo(data['actas']['equipo'])]
-    
-    # Crear un mapa de jugador -> equipo para filtrar goles específicos del equipo
-    jugador_equipo = data['actas'][['jugador', 'equipo']].drop_duplicates()
-    jugador_equipo_dict = dict(zip(jugador_equipo['jugador'], jugador_equipo['equipo']))
-    
-    # Filtrar goles
-    goles_con_equipo = data['goles'].copy()
-    goles_con_equipo['equipo'] = goles_con_equipo['jugador'].map(jugador_equipo_dict)
-    datos_filtrados['goles'] = goles_con_equipo  # Todos los goles
-    datos_filtrados['goles_penya'] = goles_con_equipo[filtrar_por_equipo(goles_con_equipo['equipo'])].copy()
+    pestana = pestanas_perezosas(
+        ["Goles por Jugador", "Goles por Minuto", "Tipos de Goles"],
+        "equipos_goles"
+    )
     
-    # Filtrar jornadas/partidos
-    datos_filtrados['jornadas'] = data['jornadas']  # Todas las jornadas
+    if pestana == "Goles por Jugador":
+        try:
+            # Goles por jugador 
+            goles_jugador = analizar_goles_por_jugador(datos_equipo['goles_penya'], datos_equipo['actas_penya'])
+            fig = construir_goles_por_jugador(goles_jugador)
+            st.plotly_chart(fig, use_container_width=True)
+        except Exception as e:
+            st.warning(f"No hay datos suficientes para mostrar goles por jugador para {equipo_seleccionado}")
+
+    elif pestana == "Goles por Minuto":
+        try:
+            # Distribución de goles por minuto 
+            goles_tiempo = analizar_goles_por_tiempo(datos_equipo['goles_penya'])
+            df = goles_tiempo.reset_index()
+            df.columns = ['Rango', 'Goles']
+            
+            fig = px.bar(
+                df,
+                x='Rango',
+                y='Goles',
+                labels={'Rango': 'Rango de Minutos', 'Goles': 'Número de Goles'},
+                color_discrete_sequence=[PENYA_PRIMARY_COLOR]
+            )
+            
+            fig.update_layout(
+                xaxis_title='Rango de Minutos',
+                yaxis_title='Número de Goles',
+                showlegend=False,
+                
+                yaxis=dict(
+                    tickmode='linear',
+                    tick0=0,
+                    dtick=1
+                )
+            )
+            
+            fig.update_traces(
+                hovertemplate='<b>%{x}</b><br>Goles: %{y}<extra></extra>'
+            )
+            
+            st.plotly_chart(fig, use_container_width=True)
+        except Exception as e:
+            st.warning(f"No hay datos suficientes para mostrar goles por minuto para {equipo_seleccionado}")
+
+    elif pestana == "Tipos de Goles":
+        try:
+            # Tipos de goles 
+            tipos_goles = analizar_tipos_goles(datos_equipo['goles_penya'])
+            df = tipos_goles.reset_index()
+            df.columns = ['Tipo', 'Cantidad']
+            
+            fig = px.pie(
+                df,
+                values='Cantidad',
+                names='Tipo',
+                color_discrete_sequence=[PENYA_PRIMARY_COLOR, PENYA_SECONDARY_COLOR, "#555555", "#777777"]
+            )
+            
+            fig.update_layout(
+                showlegend=False  
+            )
+            
+            fig.update_traces(
+                textposition='inside',
+                textinfo='percent+label',
+                hole=0.4,
+                hovertemplate='<b>%{label}</b><br>Cantidad: %{value}<br>(%{percent})<extra></extra>'
+            )
+            
+            st.plotly_chart(fig, use_container_width=True)
+        except Exception as e:
+            st.warning(f"No hay datos suficientes para mostrar tipos de goles para {equipo_seleccionado}")
+
+@st.fragment
+def seccion_tarjetas(datos_equipo, equipo_seleccionado):
+    """
+    Muestra las visualizaciones de tarjetas del equipo (fragmento con pestañas perezosas)
+    """
+    st.subheader("Tarjetas")
     
-    # Usar la misma normalización al filtrar partidos
-    partidos_filtrados = data['jornadas'][
-        (filtrar_por_equipo(data['jornadas']['equipo_local'])) | 
-        (filtrar_por_equipo(data['jornadas']['equipo_visitante']))
-    ].copy()
+    pestana = pestanas_perezosas(["Tarjetas por Jugador", "Tarjetas por Jornada"], "equipos_tarjetas")
     
-    # Añadir columna es_local para facilitar cálculos posteriores
-    partidos_filtrados['es_local'] = filtrar_por_equipo(partidos_filtrados['equipo_local'])
+    if pestana == "Tarjetas por Jugador":
+        try:
+            # Análisis de tarjetas por jugador (todos los jugadores) 
+            tarjetas_jugador = analizar_tarjetas_por_jugador(datos_equipo['actas_penya'])
+            
+            # Crear gráfico de barras apiladas con orden invertido de las leyendas
+            fig = go.Figure()
+            
+            
+            fig.add_trace(go.Bar(
+                y=tarjetas_jugador['jugador'],
+                x=tarjetas_jugador['Tarjetas Rojas'],
+                name='Rojas',
+                orientation='h',
+                marker=dict(color='#FF4136')  # Color rojo
+            ))
+            
+            fig.add_trace(go.Bar(
+                y=tarjetas_jugador['jugador'],
+                x=tarjetas_jugador['Tarjetas Amarillas'],
+                name='Amarillas',
+                orientation='h',
+                marker=dict(color='#FFD700')  # Color amarillo
+            ))
+            
+            fig.update_layout(
+                xaxis_title='Número de Tarjetas',
+                yaxis_title='',
+                barmode='stack',
+                yaxis={'categoryorder': 'total ascending'},
+                legend=dict(
+                    orientation="h",
+                    yanchor="bottom",
+                    y=1.02,
+                    xanchor="right",
+                    x=1
+                ),
+                height=max(400, len(tarjetas_jugador) * 25)
+            )
+            
+            fig.update_traces(
+                hovertemplate='Tarjetas: %{x}<extra></extra>'
+            )
+            
+            st.plotly_chart(fig, use_container_width=True)
+        except Exception as e:
+            st.warning(f"No hay datos suficientes para mostrar tarjetas por jugador para {equipo_seleccionado}")
+
+    elif pestana == "Tarjetas por Jornada":
+        try:
+            # Análisis de tarjetas por jornada 
+            tarjetas_jornada = analizar_tarjetas_por_jornada(datos_equipo['actas_penya'])
+            fig = construir_tarjetas_por_jornada(tarjetas_jornada)
+            
+            st.plotly_chart(fig, use_container_width=True)
+        except Exception as e:
+            st.warning(f"No hay datos suficientes para mostrar tarjetas por jornada para {equipo_seleccionado}")
+
+@st.fragment
+def seccion_minutos(datos_equipo, equipo_seleccionado):
+    """
+    Muestra el desglose de minutos por jugador (fragmento con pestañas perezosas)
+    """
+    st.subheader("Minutos por Jugador")
     
-    datos_filtrados['partidos_penya'] = partidos_filtrados
+    pestana = pestanas_perezosas(["Local vs Visitante", "Titular vs Suplente"], "equipos_minutos")
+    tipo_desglose = 'local_visitante' if pestana == "Local vs Visitante" else 'titular_suplente'
     
-    # Filtrar sustituciones
-    datos_filtrados['sustituciones'] = data['sustituciones']  # Todas las sustituciones
-    datos_filtrados['sustituciones_penya'] = data['sustituciones'][filtrar_por_equipo(data['sustituciones']['equipo'])]
+    try:
+        # Calcular datos de minutos
+        minutos_jugador = analizar_minutos_por_jugador(datos_equipo['actas_penya'])
+        
+        fig = construir_minutos_desglose(
+            minutos_jugador, 30, tipo_desglose,
+            PENYA_PRIMARY_COLOR, PENYA_SECONDARY_COLOR
+        )
+        st.plotly_chart(fig, use_container_width=True)
+    except Exception as e:
+        st.warning(f"No hay datos suficientes para mostrar minutos por jugador para {equipo_seleccionado}")
+
+@st.fragment
+def seccion_sustituciones(datos_equipo, equipo_seleccionado):
+    """
+    Muestra la distribución de sustituciones del equipo (fragmento)
+    """
+    st.subheader("Distribución de Sustituciones")
     
-    return datos_filtrados
+    # Comprobar si hay datos de sustituciones
+    if 'sustituciones_penya' in datos_equipo and not datos_equipo['sustituciones_penya'].empty:
+        try:
+            # Calcular distribución de sustituciones con un rango de 5 minutos
+            sustituciones_data = analizar_distribucion_sustituciones(datos_equipo['sustituciones_penya'], rango_minutos=5)
+            
+            graficar_distribucion_sustituciones(sustituciones_data, clave="equipos_sustituciones")
+        except Exception as e:
+            st.warning(f"Error al procesar las sustituciones: {str(e)}")
+    else:
+        st.warning(f"No hay datos disponibles para el análisis de sustituciones para {equipo_seleccionado}")
+
+@st.fragment
+def seccion_clasificacion(data, equipo_seleccionado):
+    """
+    Muestra la clasificación de la liga y el rating Elo tras la jornada elegida,
+    resaltando el equipo seleccionado, y la evolución de su rating frente al de
+    sus rivales. Cambiar de jornada solo recalcula esta sección.
+    """
+    estado = obtener_clasificacion(data)
+    if not estado['jornadas']:
+        st.info("No hay resultados suficientes para calcular la clasificación")
+        return
+    
+    with st.expander("🏆 Clasificación", expanded=False):
+        jornada = st.select_slider(
+            "Clasificación tras la jornada",
+            options=estado['jornadas'],
+            value=estado['jornadas'][-1],
+            key="equipos_jornada_clasificacion"
+        )
+        tabla = clasificacion_jornada(estado, jornada)
+        clave = clave_equipo(equipo_seleccionado)
+        
+        # Rating Elo de cada equipo tras la misma jornada
+        ratings = obtener_ratings(data)
+        tabla = tabla.merge(ratings_jornada(ratings, jornada).rename(columns={'Rating': 'Elo'}), on='Equipo', how='left')
+        
+        st.dataframe(
+            tabla.style.apply(
+                lambda fila: [f'background-color: {PENYA_PRIMARY_COLOR}33' if fila['Equipo'] == clave else '' for _ in fila],
+                axis=1
+            ),
+            hide_index=True,
+            use_container_width=True,
+            height=35 * (len(tabla) + 1) + 3
+        )
+        
+        # Evolución del rating del equipo y dificultad de sus rivales
+        evolucion = evolucion_rating(ratings, equipo_seleccionado)
+        rivales = dificultad_rivales(ratings, equipo_seleccionado)
+        if not evolucion.empty:
+            fig = go.Figure()
+            fig.add_trace(go.Scatter(
+                x=evolucion['jornada'], y=evolucion['rating'],
+                mode='lines+markers', name='Rating del equipo',
+                line=dict(color=PENYA_PRIMARY_COLOR)
+            ))
+            if not rivales.empty:
+                fig.add_trace(go.Bar(
+                    x=rivales['jornada'], y=rivales['rating_rival'],
+                    name='Rating del rival', marker_color=PENYA_SECONDARY_COLOR,
+                    opacity=0.35, hovertext=rivales['rival']
+                ))
+            fig.update_layout(
+                title="Rating Elo por jornada",
+                xaxis_title="Jornada", yaxis_title="Rating",
+                height=350, barmode='overlay',
+                yaxis=dict(range=[evolucion['rating'].min() - 150, evolucion['rating'].max() + 150])
+            )
+            st.plotly_chart(fig, use_container_width=True)
+
+@st.fragment
+def seccion_forma(data, equipo_seleccionado):
+    """
+    Muestra la forma reciente del equipo en las últimas N jornadas: racha de
+    resultados, métricas frente a la media de la liga y evolución de los puntos
+    por partido. Las ventanas están precalculadas, aquí solo se leen cortes.
+    """
+    forma = obtener_forma(data)
+    if not forma['jornadas'] or clave_equipo(equipo_seleccionado) not in forma['equipos']:
+        return
+    
+    with st.expander("📈 Forma reciente", expanded=False):
+        n = st.radio(
+            "Últimas jornadas", VENTANAS, index=1, horizontal=True,
+            format_func=lambda v: f"{v} jornadas", key="equipos_ventana_forma"
+        )
+        
+        # Racha de resultados, del más antiguo al más reciente
+        colores = {'V': '#4CAF50', 'E': '#FFC107', 'D': '#FF4136'}
+        racha = racha_equipo(forma, equipo_seleccionado, n)
+        st.markdown(
+            " ".join(
+                f'<span style="background-color: {colores[r]}; color: white; padding: 4px 10px; '
+                f'border-radius: 4px; font-weight: 700;">{r}</span>'
+                for r in racha
+            ),
+            unsafe_allow_html=True
+        )
+        
+        # Métricas del equipo y media de la liga en la misma ventana
+        tabla = forma_jornada(forma, n)
+        fila = tabla[tabla['Equipo'] == clave_equipo(equipo_seleccionado)].iloc[0]
+        metricas = [
+            ("Puntos", int(fila['puntos']), round(tabla['puntos'].mean(), 1)),
+            ("Goles a favor", int(fila['goles_favor']), round(tabla['goles_favor'].mean(), 1)),
+            ("Goles en contra", int(fila['goles_contra']), round(tabla['goles_contra'].mean(), 1)),
+            ("Tarjetas", int(fila['tarjetas']), round(tabla['tarjetas'].mean(), 1)),
+            ("Concentración min.", round(float(fila['concentracion_minutos']), 3),
+             round(tabla['concentracion_minutos'].mean(), 3))
+        ]
+        columnas = st.columns(len(metricas))
+        for columna, (titulo, valor, media) in zip(columnas, metricas):
+            with columna:
+                mostrar_tarjeta_metrica_compacta(titulo, valor, media)
+        st.caption("Entre paréntesis, la media de la liga. La concentración de minutos es más alta cuanto menos se rota la plantilla.")
+        
+        # Evolución de los puntos por partido en la ventana
+        evolucion = forma_equipo(forma, equipo_seleccionado, n)
+        evolucion['puntos_por_partido'] = evolucion['puntos'] / evolucion['partidos'].where(evolucion['partidos'] > 0)
+        liga = forma['ventanas'][n]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            media_liga = np.nanmean(np.where(liga['partidos'] > 0, liga['puntos'] / liga['partidos'], np.nan), axis=0)
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(
+            x=evolucion['jornada'], y=evolucion['puntos_por_partido'],
+            mode='lines+markers', name=equipo_seleccionado, line=dict(color=PENYA_PRIMARY_COLOR)
+        ))
+        fig.add_trace(go.Scatter(
+            x=forma['jornadas'], y=media_liga, mode='lines', name='Media de la liga',
+            line=dict(color=PENYA_SECONDARY_COLOR, dash='dash')
+        ))
+        fig.update_layout(
+            title=f"Puntos por partido en las últimas {n} jornadas",
+            xaxis_title="Jornada", yaxis_title="Puntos por partido",
+            height=320, yaxis=dict(range=[0, 3.1])
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+@st.fragment
+def seccion_proyeccion(data, equipo_seleccionado):
+    """
+    Muestra la proyección Monte Carlo de la temporada: puntos y posición
+    esperados de cada equipo y la probabilidad de cada posición final del
+    equipo seleccionado. La simulación solo se ejecuta al abrir la sección.
+    """
+    with st.expander("🔮 Proyección de la temporada", expanded=False):
+        if not st.toggle("Simular el resto de la temporada", key="equipos_simular_proyeccion"):
+            return
+        
+        with st.spinner("Simulando temporadas..."):
+            proyeccion = obtener_proyeccion(data)
+        
+        if proyeccion['pendientes'] == 0:
+            st.info("No quedan partidos pendientes: la clasificación actual es la definitiva")
+            return
+        
+        st.caption(f"{proyeccion['pendientes']} partidos pendientes simulados")
+        clave = clave_equipo(equipo_seleccionado)
+        tabla = proyeccion['resumen']
+        st.dataframe(
+            tabla.style.apply(
+                lambda fila: [f'background-color: {PENYA_PRIMARY_COLOR}33' if fila['Equipo'] == clave else '' for _ in fila],
+                axis=1
+            ),
+            hide_index=True,
+            use_container_width=True,
+            height=35 * (len(tabla) + 1) + 3
+        )
+        
+        if clave in proyeccion['equipos']:
+            probabilidades = proyeccion['posiciones'][proyeccion['equipos'].index(clave)] * 100
+            fig = px.bar(
+                x=np.arange(1, len(probabilidades) + 1), y=probabilidades,
+                labels={'x': 'Posición final', 'y': 'Probabilidad (%)'},
+                title=f"Posición final de {equipo_seleccionado}",
+                color_discrete_sequence=[PENYA_PRIMARY_COLOR]
+            )
+            fig.update_layout(height=300, xaxis=dict(dtick=1))
+            st.plotly_chart(fig, use_container_width=True)
+
+@st.fragment
+def seccion_linea_temporal(data, equipo_seleccionado):
+    """
+    Muestra los minutos y goles del equipo según vaya ganando, empatando o
+    perdiendo, y la secuencia de eventos del partido de la jornada elegida
+    """
+    linea = obtener_linea_temporal(data)
+    clave = clave_equipo(equipo_seleccionado)
+    partidos = linea['partidos']
+    jornadas = sorted(partidos.loc[(partidos['local'] == clave) | (partidos['visitante'] == clave), 'jornada'].unique())
+    if not jornadas:
+        return
+    
+    with st.expander("⏱️ Partidos minuto a minuto", expanded=False):
+        # Reparto por estado del marcador
+        estados = estados_equipo(estados_marcador(linea), equipo_seleccionado)
+        columnas = st.columns(len(estados))
+        for columna, fila in zip(columnas, estados.itertuples()):
+            with columna:
+                mostrar_tarjeta_metrica_compacta(
+                    f"Minutos {fila.estado.lower()}",
+                    fila.minutos,
+                    f"{fila.goles_favor}-{fila.goles_contra}"
+                )
+        st.caption("Entre paréntesis, goles a favor y en contra marcados en cada situación")
+        
+        # Eventos de un partido
+        jornada = st.selectbox("Jornada", jornadas, index=len(jornadas) - 1, key="equipos_jornada_linea_temporal")
+        partido = buscar_partido(linea, jornada, equipo_seleccionado)
+        if partido is not None:
+            datos_partido = partidos.loc[partido]
+            st.markdown(
+                f"**{datos_partido['local']} {datos_partido['goles_local']} - "
+                f"{datos_partido['goles_visitante']} {datos_partido['visitante']}**"
+            )
+            eventos = eventos_partido(linea, partido)
+            st.dataframe(eventos, hide_index=True, use_container_width=True)
+            st.caption("Las actas no recogen el minuto de las tarjetas")
 
 def main():
     """Función principal que muestra el análisis de equipos"""
     
-    # Eliminar el título "Análisis de Equipos"
+    # Cargar datos (en caché; ya no se cargan al importar el módulo)
+    data = cargar_datos()
     
     # Obtener lista de equipos disponibles
     equipos_disponibles = sorted(data['actas']['equipo'].unique())
@@ -195,7 +553,8 @@ def main():
             "Seleccionar Equipo", 
             options=equipos_disponibles, 
             index=equipos_disponibles.index(equipo_default),
-            format_func=lambda x: x.strip()
+            format_func=lambda x: x.strip(),
+            key="selector_equipo"
         )
     
     # Columna vacía para crear espacio
@@ -204,13 +563,15 @@ def main():
         
     with col3:
         # Añadir el botón de PDF en la misma línea que el selector
+        # (el informe se genera solo al pulsarlo, no en cada cambio de equipo)
         if equipo_seleccionado:  # Solo mostrar el botón si hay un equipo seleccionado
-            show_download_button(data=data, page_type='equipo', equipo_seleccionado=equipo_seleccionado.strip())
+            boton_pdf_bajo_demanda(data=data, page_type='equipo', equipo_seleccionado=equipo_seleccionado.strip())
     
     st.markdown("---")
     
     # Filtrar los datos para el equipo seleccionado
-    datos_equipo = filtrar_datos_equipo(data, equipo_seleccionado)
+    # (en caché por equipo y versión de los datos; el PDF reutiliza el mismo resultado)
+    datos_equipo = obtener_datos_equipo(data, equipo_seleccionado)
     
     # Calcular número de partidos jugados directamente para mostrar en la tarjeta
     partidos_jugados = datos_equipo['partidos_penya'][
@@ -348,342 +709,35 @@ def main():
                 metrica['color']
             )
     
-    # Crear dos columnas para las visualizaciones
+    # Clasificación de la liga
+    seccion_clasificacion(data, equipo_seleccionado)
+    seccion_forma(data, equipo_seleccionado)
+    seccion_proyeccion(data, equipo_seleccionado)
+    seccion_linea_temporal(data, equipo_seleccionado)
+    
+    # Cada sección es un fragmento independiente: cambiar de pestaña no recarga la página
     col_goles, col_tarjetas = st.columns(2)
     
-    # Sección de Visualizaciones de Goles
     with col_goles:
-        # CAMBIO: Agregar título "Goles"
-        st.subheader("Goles")
-        
-        # Tabs para diferentes visualizaciones de goles en el orden solicitado
-        gol_tab1, gol_tab2, gol_tab3 = st.tabs([
-            "Goles por Jugador",
-            "Goles por Minuto", 
-            "Tipos de Goles"
-        ])
-        
-        with gol_tab1:
-            try:
-                # Goles por jugador 
-                goles_jugador = analizar_goles_por_jugador(datos_equipo['goles_penya'], datos_equipo['actas_penya'])
-                fig = px.bar(
-                    goles_jugador,
-                    y='jugador',
-                    x='goles',
-                    orientation='h',
-                    labels={'jugador': 'Jugador', 'goles': 'Goles'},
-                    color_discrete_sequence=[PENYA_PRIMARY_COLOR]
-                )
-                
-                fig.update_layout(
-                    yaxis={'categoryorder': 'total ascending'},
-                    xaxis_title='Goles',
-                    yaxis_title='',
-                    showlegend=False,
-                    height=max(400, len(goles_jugador) * 25)
-                )
-                
-                fig.update_traces(
-                    hovertemplate='Goles: %{x}<extra></extra>'
-                )
-                
-                st.plotly_chart(fig, use_container_width=True)
-            except Exception as e:
-                st.warning(f"No hay datos suficientes para mostrar goles por jugador para {equipo_seleccionado}")
-        
-        with gol_tab2:
-            try:
-                # Distribución de goles por minuto 
-                goles_tiempo = analizar_goles_por_tiempo(datos_equipo['goles_penya'])
-                df = goles_tiempo.reset_index()
-                df.columns = ['Rango', 'Goles']
-                
-                fig = px.bar(
-                    df,
-                    x='Rango',
-                    y='Goles',
-                    labels={'Rango': 'Rango de Minutos', 'Goles': 'Número de Goles'},
-                    color_discrete_sequence=[PENYA_PRIMARY_COLOR]
-                )
-                
-                fig.update_layout(
-                    xaxis_title='Rango de Minutos',
-                    yaxis_title='Número de Goles',
-                    showlegend=False,
-                    
-                    yaxis=dict(
-                        tickmode='linear',
-                        tick0=0,
-                        dtick=1
-                    )
-                )
-                
-                fig.update_traces(
-                    hovertemplate='<b>%{x}</b><br>Goles: %{y}<extra></extra>'
-                )
-                
-                st.plotly_chart(fig, use_container_width=True)
-            except Exception as e:
-                st.warning(f"No hay datos suficientes para mostrar goles por minuto para {equipo_seleccionado}")
-        
-        with gol_tab3:
-            try:
-                # Tipos de goles 
-                tipos_goles = analizar_tipos_goles(datos_equipo['goles_penya'])
-                df = tipos_goles.reset_index()
-                df.columns = ['Tipo', 'Cantidad']
-                
-                fig = px.pie(
-                    df,
-                    values='Cantidad',
-                    names='Tipo',
-                    color_discrete_sequence=[PENYA_PRIMARY_COLOR, PENYA_SECONDARY_COLOR, "#555555", "#777777"]
-                )
-                
-                fig.update_layout(
-                    showlegend=False  
-                )
-                
-                fig.update_traces(
-                    textposition='inside',
-                    textinfo='percent+label',
-                    hole=0.4,
-                    hovertemplate='<b>%{label}</b><br>Cantidad: %{value}<br>(%{percent})<extra></extra>'
-                )
-                
-                st.plotly_chart(fig, use_container_width=True)
-            except Exception as e:
-                st.warning(f"No hay datos suficientes para mostrar tipos de goles para {equipo_seleccionado}")
+        seccion_goles(datos_equipo, equipo_seleccionado)
     
-    # Sección de Visualizaciones de Tarjetas
     with col_tarjetas:
-        
-        st.subheader("Tarjetas")
-        
-        
-        tarjeta_tab1, tarjeta_tab2 = st.tabs([
-            "Tarjetas por Jugador",
-            "Tarjetas por Jornada"
-        ])
-        
-        with tarjeta_tab1:
-            try:
-                # Análisis de tarjetas por jugador (todos los jugadores) 
-                tarjetas_jugador = analizar_tarjetas_por_jugador(datos_equipo['actas_penya'])
-                
-                # Crear gráfico de barras apiladas con orden invertido de las leyendas
-                fig = go.Figure()
-                
-                
-                fig.add_trace(go.Bar(
-                    y=tarjetas_jugador['jugador'],
-                    x=tarjetas_jugador['Tarjetas Rojas'],
-                    name='Rojas',
-                    orientation='h',
-                    marker=dict(color='#FF4136')  # Color rojo
-                ))
-                
-                fig.add_trace(go.Bar(
-                    y=tarjetas_jugador['jugador'],
-                    x=tarjetas_jugador['Tarjetas Amarillas'],
-                    name='Amarillas',
-                    orientation='h',
-                    marker=dict(color='#FFD700')  # Color amarillo
-                ))
-                
-                fig.update_layout(
-                    xaxis_title='Número de Tarjetas',
-                    yaxis_title='',
-                    barmode='stack',
-                    yaxis={'categoryorder': 'total ascending'},
-                    legend=dict(
-                        orientation="h",
-                        yanchor="bottom",
-                        y=1.02,
-                        xanchor="right",
-                        x=1
-                    ),
-                    height=max(400, len(tarjetas_jugador) * 25)
-                )
-                
-                fig.update_traces(
-                    hovertemplate='Tarjetas: %{x}<extra></extra>'
-                )
-                
-                st.plotly_chart(fig, use_container_width=True)
-            except Exception as e:
-                st.warning(f"No hay datos suficientes para mostrar tarjetas por jugador para {equipo_seleccionado}")
-        
-        with tarjeta_tab2:
-            try:
-                # Análisis de tarjetas por jornada 
-                tarjetas_jornada = analizar_tarjetas_por_jornada(datos_equipo['actas_penya'])
-                
-                fig = go.Figure()
-                
-                fig.add_trace(go.Scatter(
-                    x=tarjetas_jornada['jornada'],
-                    y=tarjetas_jornada['Tarjetas Amarillas'],
-                    mode='lines+markers',
-                    name='Amarillas',
-                    line=dict(color='#FFD700', width=2),
-                    marker=dict(size=8)
-                ))
-                
-                fig.add_trace(go.Scatter(
-                    x=tarjetas_jornada['jornada'],
-                    y=tarjetas_jornada['Tarjetas Rojas'],
-                    mode='lines+markers',
-                    name='Rojas',
-                    line=dict(color='#FF4136', width=2),
-                    marker=dict(size=8)
-                ))
-                
-                fig.update_layout(
-                    xaxis_title='Jornada',
-                    yaxis_title='Número de Tarjetas',
-                    legend=dict(
-                        orientation="h",
-                        yanchor="bottom",
-                        y=1.02,
-                        xanchor="right",
-                        x=1
-                    )
-                )
-                
-                fig.update_traces(
-                    hovertemplate='<b>Jornada %{x}</b><br>Tarjetas: %{y}<extra></extra>'
-                )
-                
-                st.plotly_chart(fig, use_container_width=True)
-            except Exception as e:
-                st.warning(f"No hay datos suficientes para mostrar tarjetas por jornada para {equipo_seleccionado}")
+        seccion_tarjetas(datos_equipo, equipo_seleccionado)
     
     # Separador
     st.markdown("---")
     
-    
     col_minutos, col_sustituciones = st.columns(2)
     
-    # Sección de Análisis de Minutos 
     with col_minutos:
-        
-        st.subheader("Minutos por Jugador")
-        
-        try:
-            # Calcular datos de minutos
-            minutos_jugador = analizar_minutos_por_jugador(datos_equipo['actas_penya'])
-            
-            # Pestañas para los diferentes análisis de minutos 
-            minutos_tab1, minutos_tab2 = st.tabs([
-                "Local vs Visitante", 
-                "Titular vs Suplente"
-            ])
-            
-            with minutos_tab1:
-               
-                # Desglose local vs visitante
-                df = minutos_jugador.head(30).copy()
-                
-                # Crear figura
-                fig = go.Figure()
-                
-                
-                fig.add_trace(go.Bar(
-                    y=df['jugador'],
-                    x=df['minutos_local'],
-                    name='Local',
-                    orientation='h',
-                    marker=dict(color=PENYA_PRIMARY_COLOR)
-                ))
-                
-                fig.add_trace(go.Bar(
-                    y=df['jugador'],
-                    x=df['minutos_visitante'],
-                    name='Visitante',
-                    orientation='h',
-                    marker=dict(color='#36A2EB' if PENYA_SECONDARY_COLOR is None else PENYA_SECONDARY_COLOR)
-                ))
-                
-                fig.update_layout(
-                    yaxis={'categoryorder': 'total ascending'},
-                    xaxis_title='Minutos Jugados',
-                    yaxis_title='',
-                    barmode='stack',
-                    legend=dict(
-                        orientation="h",
-                        yanchor="bottom",
-                        y=1.02,
-                        xanchor="right",
-                        x=1
-                    ),
-                    height=600
-                )
-                
-                st.plotly_chart(fig, use_container_width=True)
-            
-            with minutos_tab2:
-                
-                # Desglose titular vs suplente
-                df = minutos_jugador.head(30).copy()
-                
-                # Crear figura
-                fig = go.Figure()
-                
-                
-                fig.add_trace(go.Bar(
-                    y=df['jugador'],
-                    x=df['minutos_titular'],
-                    name='Como Titular',
-                    orientation='h',
-                    marker=dict(color=PENYA_PRIMARY_COLOR)
-                ))
-                
-                fig.add_trace(go.Bar(
-                    y=df['jugador'],
-                    x=df['minutos_suplente'],
-                    name='Como Suplente',
-                    orientation='h',
-                    marker=dict(color='#888888' if PENYA_SECONDARY_COLOR is None else PENYA_SECONDARY_COLOR)
-                ))
-                
-                fig.update_layout(
-                    yaxis={'categoryorder': 'total ascending'},
-                    xaxis_title='Minutos Jugados',
-                    yaxis_title='',
-                    barmode='stack',
-                    legend=dict(
-                        orientation="h",
-                        yanchor="bottom",
-                        y=1.02,
-                        xanchor="right",
-                        x=1
-                    ),
-                    height=600
-                )
-                
-                st.plotly_chart(fig, use_container_width=True)
-        except Exception as e:
-            st.warning(f"No hay datos suficientes para mostrar minutos por jugador para {equipo_seleccionado}")
+        seccion_minutos(datos_equipo, equipo_seleccionado)
     
-    # Sección de Distribución de Sustituciones (columna derecha)
     with col_sustituciones:
-        st.subheader("Distribución de Sustituciones")
-        
-        # Comprobar si hay datos de sustituciones
-        if 'sustituciones_penya' in datos_equipo and not datos_equipo['sustituciones_penya'].empty:
-            try:
-                # Calcular distribución de sustituciones con un rango de 5 minutos
-                sustituciones_data = analizar_distribucion_sustituciones(datos_equipo['sustituciones_penya'], rango_minutos=5)
-                
-                # Pasar el trabajo al archivo minutos.py (función actualizada)
-                graficar_distribucion_sustituciones(sustituciones_data)
-            except Exception as e:
-                st.warning(f"Error al procesar las sustituciones: {str(e)}")
-        else:
-            st.warning(f"No hay datos disponibles para el análisis de sustituciones para {equipo_seleccionado}")
+        seccion_sustituciones(datos_equipo, equipo_seleccionado)
 
 if __name__ == "__main__":
+    # Configurar la página
+    page_config()
+    
     main()
                     
\ No newline at end of file
@@ -3,23 +3,24 @@ Página de análisis individual de jugadores
 """
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 
 # Importar módulos propios
-from utils.data import cargar_datos
-from utils.ui import page_config  
-from calculos.calculo_jugadores import calcular_estadisticas_jugador, ajustar_tarjetas_por_doble_amarilla, analizar_goles_por_tiempo
+from utils.data import cargar_datos, cargar_carreras, obtener_intervalos_jugadores, obtener_mas_menos_ajustado, obtener_parejas
+from utils.ui import page_config, pestanas_perezosas
+from calculos.calculo_jugadores import analizar_goles_por_tiempo
+from calculos.perfiles_jugadores import obtener_perfil_jugador
+from calculos.carrera_jugadores import obtener_carrera
+from calculos.parejas_jugadores import mejores_parejas
 from utils.constants import PENYA_PRIMARY_COLOR, PENYA_SECONDARY_COLOR, COLOR_TARJETAS_AMARILLAS, COLOR_TARJETAS_ROJAS
-from utils.pdf_export import show_download_button
-from visualizaciones.jugadores import graficar_minutos_por_jornada, graficar_goles_por_tiempo
-from calculos.calculo_minutos import obtener_minutos_por_jornada
+from utils.pdf_export import boton_pdf_bajo_demanda
+from visualizaciones.jugadores import (
+    graficar_minutos_por_jornada, graficar_goles_por_tiempo,
+    construir_minutos_por_jornada, construir_desglose_participacion, construir_mapa_parejas
+)
 
-# Configurar la página
-page_config()
-
-# Cargar datos
-data = cargar_datos()
 
 def mostrar_tarjeta_jugador(estadisticas):
     """
@@ -130,9 +131,284 @@ def mostrar_tarjeta_metrica_compacta(titulo, valor, color_valor="#FF8C00"):
         unsafe_allow_html=True
     )
 
+@st.fragment
+def seccion_minutos_jugador(minutos_jornada, partidos_penya):
+    """
+    Muestra el análisis de minutos del jugador seleccionado.
+    Se ejecuta como fragmento y solo calcula la pestaña visible.
+    
+    Args:
+        minutos_jornada: DataFrame con los minutos del jugador por jornada
+        partidos_penya: DataFrame con los partidos del equipo
+    """
+    st.subheader("Minutos")
+    
+    if not minutos_jornada.empty:
+        # Crear columna "Condición" basada en status
+        minutos_jornada = minutos_jornada.copy()
+        minutos_jornada['Condición'] = minutos_jornada['es_titular'].map({True: 'Titular', False: 'Suplente'})
+        
+        # Crear pestañas para los diferentes análisis de minutos
+        pestana = pestanas_perezosas([
+            "Minutos por Jornada",
+            "Desglose por participación",
+            "Detalle por Partido"
+        ], "jugadores_minutos")
+        
+        # Pestaña 1: Minutos por Jornada
+        if pestana == "Minutos por Jornada":
+            # Crear gráfico con Plotly (figura en caché)
+            fig = construir_minutos_por_jornada(minutos_jornada[['jornada', 'minutos_jugados', 'es_titular', 'rival']])
+            
+            # Mostrar el gráfico
+            st.plotly_chart(fig, use_container_width=True)
+        
+        # Pestaña 2: Desglose por participación
+        elif pestana == "Desglose por participación":
+            # Calcular diferentes tipos de participación
+            titular_completo = sum((minutos_jornada['es_titular'] == True) & (minutos_jornada['minutos_jugados'] == 90))
+            titular_sustituido = sum((minutos_jornada['es_titular'] == True) & (minutos_jornada['minutos_jugados'] < 90))
+            suplente = sum(minutos_jornada['es_titular'] == False)
+            
+            # Calcular partidos en los que no participó
+            partidos_totales = len(partidos_penya)
+            partidos_jugados = len(minutos_jornada)
+            no_participa = partidos_totales - partidos_jugados
+            
+            # Crear datos para la tabla/gráfico
+            categorias = ['Titular todo el partido', 'Titular Sustituido', 'Participación Suplente', 'No Participa']
+            valores = [titular_completo, titular_sustituido, suplente, no_participa]
+            
+            # Crear gráfico de barras (figura en caché)
+            fig = construir_desglose_participacion(categorias, [int(v) for v in valores])
+            
+            # Mostrar el gráfico
+            st.plotly_chart(fig, use_container_width=True)
+        
+        # Pestaña 3: Detalle por partido
+        else:
+            # Mostrar directamente la tabla con los datos
+            st.write("Detalle de participación por partidos:")
+            
+            # Hacer una copia y renombrar columnas para mostrar
+            tabla_partidos = minutos_jornada[['jornada', 'rival', 'Condición', 'minutos_jugados']].copy()
+            tabla_partidos = tabla_partidos.rename(columns={
+                'jornada': 'Jornada',
+                'rival': 'Rival',
+                'minutos_jugados': 'Minutos'
+            })
+            
+            # Mostrar la tabla con altura controlada
+            st.dataframe(tabla_partidos, height=350, use_container_width=True)
+    else:
+        st.warning("No hay datos de minutos para este jugador")
+
+@st.fragment
+def seccion_goles_tarjetas(perfil):
+    """
+    Muestra los goles y tarjetas del jugador seleccionado (fragmento con pestañas perezosas)
+    
+    Args:
+        perfil: Perfil precalculado del jugador (ver calculos/perfiles_jugadores.py)
+    """
+    st.subheader("Goles/Tarjetas")
+    
+    estadisticas = perfil['estadisticas'] if perfil else None
+    
+    # Crear pestañas para goles y tarjetas
+    if estadisticas and (estadisticas['goles'] > 0 or estadisticas['tarjetas_amarillas'] > 0 or estadisticas['tarjetas_rojas'] > 0):
+        pestana = pestanas_perezosas(["Goles", "Tarjetas"], "jugadores_goles_tarjetas")
+        
+        # Pestaña de Goles
+        if pestana == "Goles":
+            if estadisticas['goles'] > 0:
+                # Añadir espacios para mantener alineación similar
+                st.write("")
+                st.write("")
+                st.write("")
+                
+                # Mostrar tabla de goles (jornada, minuto, tipo y rival) con altura controlada
+                st.dataframe(perfil['goles'], height=250, hide_index=True, use_container_width=True)
+            else:
+                # Usar mismo espacio que columna izquierda
+                st.empty()
+                st.info("Este jugador no ha marcado goles en la temporada.")
+        
+        # Pestaña de Tarjetas
+        else:
+            if estadisticas['tarjetas_amarillas'] > 0 or estadisticas['tarjetas_rojas'] > 0:
+                if not perfil['tarjetas'].empty:
+                    # Añadir espacio para mantener alineación similar a la otra pestaña
+                    st.write("")
+                    st.write("")
+                    
+                    # Mostrar tabla con altura controlada
+                    st.dataframe(perfil['tarjetas'], height=250, hide_index=True, use_container_width=True)
+                else:
+                    st.info("No se encontraron datos detallados de las tarjetas.")
+            else:
+                # Usar mismo espacio que columna izquierda
+                st.empty()
+                st.info("Este jugador no ha recibido tarjetas en la temporada.")
+    else:
+        # Mostrar mensaje informativo centrado verticalmente para mantener alineación
+        st.empty()
+        st.empty()
+        st.info("Este jugador no ha marcado goles ni recibido tarjetas en la temporada.")
+        st.empty()
+        st.empty()
+
+@st.fragment
+def seccion_trayectoria(jugador):
+    """
+    Muestra la carrera del jugador por temporadas cuando hay más de una temporada con datos
+    
+    Args:
+        jugador: Nombre del jugador tal como aparece en las actas
+    """
+    carrera = obtener_carrera(cargar_carreras(), jugador)
+    if len(carrera) < 2:
+        return
+    
+    with st.expander("📈 Trayectoria por temporadas", expanded=False):
+        st.dataframe(
+            carrera.drop(columns=['jugador_id']).rename(columns={
+                'temporada': 'Temporada',
+                'nombre': 'Nombre en actas',
+                'equipos': 'Equipo',
+                'partidos': 'Partidos',
+                'titularidades': 'Titular',
+                'minutos': 'Minutos',
+                'goles': 'Goles',
+                'tarjetas_amarillas': 'Amarillas',
+                'tarjetas_rojas': 'Rojas'
+            }),
+            hide_index=True,
+            use_container_width=True
+        )
+        
+        # Totales de la carrera
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Temporadas", len(carrera))
+        col2.metric("Partidos", int(carrera['partidos'].sum()))
+        col3.metric("Minutos", int(carrera['minutos'].sum()))
+        col4.metric("Goles", int(carrera['goles'].sum()))
+
+@st.fragment
+def seccion_mas_menos(data, jugador):
+    """
+    Muestra el +/- del jugador: goles a favor y en contra del equipo con él en
+    el campo y sin él, por cada 90 minutos, en los partidos que ha jugado
+    
+    Args:
+        data: Diccionario devuelto por cargar_datos
+        jugador: Nombre del jugador tal como aparece en las actas
+    """
+    try:
+        mas_menos = obtener_intervalos_jugadores(data)['mas_menos']
+    except Exception as e:
+        st.warning(f"No se ha podido calcular el +/- del jugador: {str(e)}")
+        return
+    filas = mas_menos[mas_menos['jugador'] == jugador]
+    if filas.empty:
+        return
+    fila = filas.iloc[0]
+    
+    with st.expander("➕ Impacto en el campo (+/-)", expanded=False):
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Goles con él (GF-GC)", f"{int(fila['goles_favor'])}-{int(fila['goles_contra'])}")
+        col2.metric("+/- por 90'", "-" if pd.isna(fila['mas_menos_90']) else f"{fila['mas_menos_90']:+.2f}")
+        col3.metric("+/- por 90' sin él", "-" if pd.isna(fila['mas_menos_fuera_90']) else f"{fila['mas_menos_fuera_90']:+.2f}")
+        col4.metric("Diferencia", "-" if pd.isna(fila['diferencia_dentro_fuera']) else f"{fila['diferencia_dentro_fuera']:+.2f}")
+        st.caption(
+            f"{int(fila['minutos'])} minutos en el campo y {int(fila['minutos_fuera'])} fuera "
+            f"en sus {int(fila['partidos'])} partidos. Con pocos minutos los valores por 90 son poco fiables."
+        )
+        
+        # +/- ajustado: descuenta el efecto de compañeros y rivales
+        try:
+            ranking = obtener_mas_menos_ajustado(data)['jugadores']
+        except Exception as e:
+            st.warning(f"No se ha podido calcular el +/- ajustado: {str(e)}")
+            return
+        ajustado = ranking[ranking['jugador'] == jugador]
+        if not ajustado.empty:
+            valor = ajustado['mas_menos_ajustado'].iloc[0]
+            ranking = ranking['mas_menos_ajustado']
+            posicion = int((ranking > valor).sum()) + 1
+            col1, col2 = st.columns(2)
+            col1.metric("+/- ajustado por 90'", f"{valor:+.2f}")
+            col2.metric("Posición en la liga", f"{posicion} de {len(ranking)}")
+            st.caption(
+                "El +/- ajustado estima lo que aporta el jugador descontando con qué compañeros "
+                "y contra qué rivales ha coincidido en el campo (regresión ridge sobre toda la liga)."
+            )
+
+@st.fragment
+def seccion_parejas(data):
+    """
+    Muestra un mapa de calor con los minutos que comparte en el campo cada
+    pareja de jugadores del equipo y las parejas más utilizadas con los goles
+    a favor y en contra mientras coinciden
+    
+    Args:
+        data: Diccionario devuelto por cargar_datos
+    """
+    try:
+        parejas = obtener_parejas(data)
+    except Exception as e:
+        st.warning(f"No se han podido calcular las parejas de jugadores: {str(e)}")
+        return
+    equipos = sorted(e for e in data['actas_penya']['equipo'].dropna().unique() if e in parejas)
+    if not equipos:
+        return
+    
+    with st.expander("🤝 Parejas de jugadores", expanded=False):
+        equipo = equipos[0] if len(equipos) == 1 else st.selectbox("Equipo", equipos, key="jugadores_equipo_parejas")
+        matrices = parejas[equipo]
+        if len(matrices['jugadores']) < 5:
+            st.info("No hay suficientes jugadores con minutos para comparar parejas")
+            return
+        
+        col_metrica, col_num = st.columns(2)
+        with col_metrica:
+            metrica = st.radio(
+                "Valor", ["Minutos juntos", "+/- juntos"], horizontal=True, key="jugadores_metrica_parejas"
+            )
+        with col_num:
+            num_jugadores = st.slider(
+                "Jugadores", 5, len(matrices['jugadores']), min(16, len(matrices['jugadores'])),
+                key="jugadores_num_parejas"
+            )
+        
+        # Jugadores con más minutos, de mayor a menor
+        orden = np.argsort(-np.diag(matrices['minutos']))[:num_jugadores]
+        nombres = [matrices['jugadores'][i].split(',')[0].title() for i in orden]
+        if metrica == "Minutos juntos":
+            valores = matrices['minutos'][np.ix_(orden, orden)]
+            escala = "Oranges"
+        else:
+            valores = (matrices['goles_favor'] - matrices['goles_contra'])[np.ix_(orden, orden)]
+            escala = "RdYlGn"
+        
+        fig = construir_mapa_parejas(
+            valores, nombres, escala, punto_medio=0 if metrica != "Minutos juntos" else None
+        )
+        st.plotly_chart(fig, use_container_width=True)
+        st.caption("La diagonal es el total de cada jugador")
+        
+        tabla = mejores_parejas(matrices).rename(columns={
+            'jugador_1': 'Jugador 1', 'jugador_2': 'Jugador 2', 'minutos': 'Minutos',
+            'goles_favor': 'GF', 'goles_contra': 'GC', 'mas_menos_90': "+/- por 90'"
+        })
+        st.dataframe(tabla, hide_index=True, use_container_width=True)
+
 def main():
     """Función principal que muestra el análisis de jugadores"""
     
+    # Cargar datos (en caché; ya no se cargan al importar el módulo)
+    data = cargar_datos()
+    
     # Añadir CSS personalizado para asegurar alineación correcta
     st.markdown("""
     <style>
@@ -181,7 +457,8 @@ def main():
     with col_select:
         jugador_seleccionado = st.selectbox(
             "Selecciona un jugador",
-            jugadores
+            jugadores,
+            key="selector_jugador"
         )
     
     with col_pdf:
@@ -190,7 +467,8 @@ def main():
             'actas_penya': data['actas_penya'],
             'goles_penya': data['goles_penya'],
             'partidos_penya': data['partidos_penya'],
-            'actas': data['actas']  # Datos completos necesarios para cálculos
+            'actas': data['actas'],  # Datos completos necesarios para cálculos
+            'perfiles_jugadores': data['perfiles_jugadores']
         }
         # Añadir CSS para alinear verticalmente el botón
         st.markdown("""
@@ -201,19 +479,27 @@ def main():
         }
         </style>
         """, unsafe_allow_html=True)
-        show_download_button(datos_filtrados, 'jugador', jugador_seleccionado=jugador_seleccionado)
+        # El informe se genera solo al pulsar el botón, no en cada cambio de jugador
+        boton_pdf_bajo_demanda(datos_filtrados, 'jugador', jugador_seleccionado=jugador_seleccionado)
     
-    # Calcular estadísticas del jugador seleccionado
-    estadisticas = calcular_estadisticas_jugador(data['actas_penya'], jugador_seleccionado)
+    # Perfil precalculado del jugador seleccionado (acceso directo, sin filtrar las actas)
+    perfil = obtener_perfil_jugador(data['perfiles_jugadores'], jugador_seleccionado)
+    estadisticas = perfil['estadisticas'] if perfil else None
     
     # Mostrar tarjeta de jugador
     mostrar_tarjeta_jugador(estadisticas)
     
+    # Temporadas anteriores del jugador (solo si las hay)
+    seccion_trayectoria(jugador_seleccionado)
+    
+    # +/- con el jugador dentro y fuera del campo
+    seccion_mas_menos(data, jugador_seleccionado)
+    
     # Espacio para separar secciones
     st.markdown("---")
     
-    # Obtener minutos por jornada para la visualización
-    minutos_jornada = obtener_minutos_por_jornada(data['actas_penya'], jugador_seleccionado)
+    # Minutos por jornada para la visualización
+    minutos_jornada = perfil['minutos_jornada'] if perfil else pd.DataFrame()
     
     # Crear un contenedor para mantener alineación consistente
     with st.container():
@@ -222,227 +508,19 @@ def main():
         
         # Columna izquierda: Minutos
         with col_izq:
-            st.subheader("Minutos")
-            
-            if not minutos_jornada.empty:
-                # Crear columna "Condición" basada en status
-                minutos_jornada['Condición'] = minutos_jornada['es_titular'].map({True: 'Titular', False: 'Suplente'})
-                
-                # Crear pestañas para los diferentes análisis de minutos
-                min_tab1, min_tab2, min_tab3 = st.tabs([
-                    "Minutos por Jornada",
-                    "Desglose por participación",
-                    "Detalle por Partido"
-                ])
-                
-                # Pestaña 1: Minutos por Jornada
-                with min_tab1:
-                    # Crear gráfico con Plotly
-                    import plotly.express as px
-                    
-                    # Hacer una copia del DataFrame para modificar los valores
-                    minutos_plot = minutos_jornada.copy()
-                    minutos_plot['condicion'] = minutos_plot['es_titular'].map({True: 'Titular', False: 'Suplente'})
-                    
-                    fig = px.bar(
-                        minutos_plot, 
-                        x='jornada', 
-                        y='minutos_jugados',
-                        color='condicion',
-                        labels={'jornada': 'Jornada', 'minutos_jugados': 'Minutos Jugados', 'condicion': 'Condición'},
-                        color_discrete_map={'Titular': PENYA_PRIMARY_COLOR, 'Suplente': PENYA_SECONDARY_COLOR},
-                        hover_data=['rival']
-                    )
-                    
-                    # Personalizar el gráfico
-                    fig.update_layout(
-                        xaxis_title='Jornada',
-                        yaxis_title='Minutos',
-                        yaxis_range=[0, 100],
-                        legend_title="Condición",
-                        height=400  # Fijar altura para mantener consistencia
-                    )
-                    
-                    # Mostrar el gráfico
-                    st.plotly_chart(fig, use_container_width=True)
-                
-                # Pestaña 2: Desglose por participación
-                with min_tab2:
-                    import plotly.graph_objects as go
-                    
-                    # Calcular diferentes tipos de participación
-                    titular_completo = sum((minutos_jornada['es_titular'] == True) & (minutos_jornada['minutos_jugados'] == 90))
-                    titular_sustituido = sum((minutos_jornada['es_titular'] == True) & (minutos_jornada['minutos_jugados'] < 90))
-                    suplente = sum(minutos_jornada['es_titular'] == False)
-                    
-                    # Calcular partidos en los que no participó
-                    partidos_totales = len(data['partidos_penya'])
-                    partidos_jugados = len(minutos_jornada)
-                    no_participa = partidos_totales - partidos_jugados
-                    
-                    # Crear datos para la tabla/gráfico
-                    categorias = ['Titular todo el partido', 'Titular Sustituido', 'Participación Suplente', 'No Participa']
-                    valores = [titular_completo, titular_sustituido, suplente, no_participa]
-                    
-                    # Crear gráfico de barras
-                    fig = go.Figure()
-                    
-                    # Añadir barras (alternando naranja y negro)
-                    fig.add_trace(go.Bar(
-                        x=categorias,
-                        y=valores,
-                        marker_color=[PENYA_PRIMARY_COLOR, PENYA_SECONDARY_COLOR, PENYA_PRIMARY_COLOR, PENYA_SECONDARY_COLOR]
-                    ))
-                    
-                    # Personalizar el gráfico
-                    fig.update_layout(
-                        xaxis_title='Tipo de Participación',
-                        yaxis_title='Partidos',
-                        yaxis=dict(
-                            tickmode='linear',
-                            tick0=0,
-                            dtick=1
-                        ),
-                        height=400  
-                    )
-                    
-                    # Mostrar el gráfico
-                    st.plotly_chart(fig, use_container_width=True)
-                
-                # Pestaña 3: Detalle por partido
-                with min_tab3:
-                    # Mostrar directamente la tabla con los datos
-                    st.write("Detalle de participación por partidos:")
-                    
-                    # Hacer una copia y renombrar columnas para mostrar
-                    tabla_partidos = minutos_jornada[['jornada', 'rival', 'Condición', 'minutos_jugados']].copy()
-                    tabla_partidos = tabla_partidos.rename(columns={
-                        'jornada': 'Jornada',
-                        'rival': 'Rival',
-                        'minutos_jugados': 'Minutos'
-                    })
-                    
-                    # Mostrar la tabla con altura controlada
-                    st.dataframe(tabla_partidos, height=350, use_container_width=True)
-            else:
-                st.warning("No hay datos de minutos para este jugador")
+            seccion_minutos_jugador(minutos_jornada, data['partidos_penya'])
         
         # Columna derecha: Goles y Tarjetas
         with col_der:
-            st.subheader("Goles/Tarjetas")
-            
-            # Crear pestañas para goles y tarjetas
-            if estadisticas and (estadisticas['goles'] > 0 or estadisticas['tarjetas_amarillas'] > 0 or estadisticas['tarjetas_rojas'] > 0):
-                gt_tab1, gt_tab2 = st.tabs(["Goles", "Tarjetas"])
-                
-                # Pestaña de Goles
-                with gt_tab1:
-                    if estadisticas['goles'] > 0:
-                        # Filtrar goles del jugador
-                        goles_jugador = data['goles_penya'][data['goles_penya']['jugador'] == jugador_seleccionado].copy()
-                        
-                        # Añadir información de rivales
-                        jugador_actas = data['actas_penya'][data['actas_penya']['jugador'] == jugador_seleccionado]
-                        jornada_rival = dict(zip(jugador_actas['jornada'], jugador_actas['rival']))
-                        goles_jugador['Rival'] = goles_jugador['Jornada'].map(jornada_rival)
-                        
-                        # Mostrar tabla de goles
-                        goles_tabla = goles_jugador[['Jornada', 'Minuto', 'Tipo de Gol', 'Rival']]
-                        goles_tabla = goles_tabla.sort_values('Jornada')
-                        
-                        # Añadir espacios para mantener alineación similar
-                        st.write("")
-                        st.write("")
-                        st.write("")
-                        
-                        # Mostrar tabla de goles con altura controlada
-                        st.dataframe(goles_tabla, height=250, hide_index=True, use_container_width=True)
-                    else:
-                        # Usar mismo espacio que columna izquierda
-                        st.empty()
-                        st.info("Este jugador no ha marcado goles en la temporada.")
-                
-                # Pestaña de Tarjetas
-                with gt_tab2:
-                    if estadisticas['tarjetas_amarillas'] > 0 or estadisticas['tarjetas_rojas'] > 0:
-                        # Aplicar ajuste de tarjetas
-                        actas_ajustadas = ajustar_tarjetas_por_doble_amarilla(data['actas_penya'])
-                        
-                        # Filtrar las actas del jugador
-                        actas_jugador = actas_ajustadas[actas_ajustadas['jugador'] == jugador_seleccionado].copy()
-                        
-                        # Crear una lista para almacenar las tarjetas
-                        tarjetas_temp = []
-                        
-                        # Procesar tarjetas amarillas (después del ajuste)
-                        for _, row in actas_jugador[actas_jugador['Tarjetas Amarillas'] > 0].iterrows():
-                            tarjetas_temp.append({
-                                'Jornada': row['jornada'],
-                                'Tipo': 'Amarilla',
-                                'Rival': row['rival'],
-                                'Doble Amarilla': '-'
-                            })
-                        
-                        # Procesar tarjetas rojas
-                        for _, row in actas_jugador[actas_jugador['Tarjetas Rojas'] > 0].iterrows():
-                            # Verificar si es una tarjeta roja directa o por doble amarilla
-                            jornada = row['jornada']
-                            
-                            # Comprobar si esta roja proviene de una doble amarilla
-                            # Verificamos comparando con las actas originales
-                            actas_original = data['actas_penya'][
-                                (data['actas_penya']['jugador'] == jugador_seleccionado) & 
-                                (data['actas_penya']['jornada'] == jornada)
-                            ]
-                            
-                            amarillas_originales = actas_original['Tarjetas Amarillas'].sum()
-                            rojas_originales = actas_original['Tarjetas Rojas'].sum()
-                            
-                            # Si en las actas originales hay 2+ amarillas y en las ajustadas hay menos,
-                            # es una roja por doble amarilla
-                            es_por_doble_amarilla = amarillas_originales >= 2 and row['Tarjetas Amarillas'] < amarillas_originales
-                            
-                            # Añadir tarjetas rojas a la lista
-                            for i in range(int(row['Tarjetas Rojas'])):
-                                # Si es la primera roja y proviene de doble amarilla
-                                if i == 0 and es_por_doble_amarilla:
-                                    doble_amarilla = 'Si'
-                                else:
-                                    doble_amarilla = 'No'
-                                    
-                                tarjetas_temp.append({
-                                    'Jornada': jornada,
-                                    'Tipo': 'Roja',
-                                    'Rival': row['rival'],
-                                    'Doble Amarilla': doble_amarilla
-                                })
-                        
-                        # Crear DataFrame
-                        if tarjetas_temp:
-                            tarjetas_df = pd.DataFrame(tarjetas_temp)
-                            tarjetas_df = tarjetas_df.sort_values('Jornada')
-                            
-                            # Añadir espacio para mantener alineación similar a la otra pestaña
-                            st.write("")
-                            st.write("")
-                            
-                            # Mostrar tabla con altura controlada
-                            st.dataframe(tarjetas_df, height=250, hide_index=True, use_container_width=True)
-                        else:
-                            st.info("No se encontraron datos detallados de las tarjetas.")
-                    else:
-                        # Usar mismo espacio que columna izquierda
-                        st.empty()
-                        st.info("Este jugador no ha recibido tarjetas en la temporada.")
-            else:
-                # Mostrar mensaje informativo centrado verticalmente para mantener alineación
-                st.empty()
-                st.empty()
-                st.info("Este jugador no ha marcado goles ni recibido tarjetas en la temporada.")
-                st.empty()
-                st.empty()
+            seccion_goles_tarjetas(perfil)
+    
+    # Parejas de jugadores del equipo
+    seccion_parejas(data)
     
     # Eliminar el botón PDF del final ya que ahora está al lado del selector
 
 if __name__ == "__main__":
+    # Configurar la página
+    page_config()
+    
     main()
\ No newline at end of file
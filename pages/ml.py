@@ -11,10 +11,13 @@ from sklearn.preprocessing import StandardScaler
 from sklearn.cluster import KMeans
 from sklearn.decomposition import PCA
 
-from utils.data import cargar_datos
+from utils.data import cargar_datos, obtener_ratings, obtener_forma
 from utils.constants import PENYA_PRIMARY_COLOR, PENYA_SECONDARY_COLOR
 from utils.ui import page_config
 from calculos.calculo_equipo import calcular_goles_contra
+from calculos.clasificacion import clave_equipo
+from calculos.rating_equipos import ratings_jornada
+from calculos.forma_equipos import forma_jornada
 from utils.pdf_export import show_download_button  
 
 def limpiar_nombre_equipo(nombre):
@@ -83,12 +86,16 @@ def distribucion_goles_por_periodo(data, equipo):
             'ultimo_cuarto': 0
         }
 
-def preparar_datos_clustering():
+def preparar_datos_clustering(data=None):
     """
     Prepara datos de rendimiento de equipos para análisis táctico
+    
+    Args:
+        data: Diccionario de datos ya cargado (opcional, por defecto cargar_datos())
     """
     # Cargar datos
-    data = cargar_datos()
+    if data is None:
+        data = cargar_datos()
     actas = data['actas'].copy()
     
     # Limpiar nombres de equipos
@@ -177,6 +184,20 @@ def preparar_datos_clustering():
     # Añadir columna de goles en contra
     metricas_equipo['goles_contra'] = metricas_equipo['equipo_limpio'].map(goles_contra)
     
+    # Añadir el rating Elo actual de cada equipo (fuerza según sus resultados)
+    ratings = ratings_jornada(obtener_ratings(data))
+    rating_por_equipo = dict(zip(ratings['Equipo'], ratings['Rating']))
+    metricas_equipo['rating'] = metricas_equipo['equipo_limpio'].map(
+        lambda x: rating_por_equipo.get(clave_equipo(x))
+    ).fillna(ratings['Rating'].mean() if not ratings.empty else 0)
+    
+    # Añadir la forma reciente (puntos por partido en las últimas 5 jornadas, precalculada)
+    forma = forma_jornada(obtener_forma(data), 5)
+    forma_por_equipo = dict(zip(forma['Equipo'], forma['puntos_por_partido']))
+    metricas_equipo['forma'] = metricas_equipo['equipo_limpio'].map(
+        lambda x: forma_por_equipo.get(clave_equipo(x))
+    ).fillna(forma['puntos_por_partido'].mean() if not forma.empty else 0)
+    
     return metricas_equipo
 
 def realizar_clustering(datos, n_clusters=4):
@@ -188,7 +209,7 @@ def realizar_clustering(datos, n_clusters=4):
         'goles', 'goles_contra', 'Tarjetas Amarillas', 'Tarjetas Rojas', 
         'minutos_jugados', 'jugador', 'total_sustituciones',
         'goles_primer_cuarto', 'goles_segundo_cuarto', 
-        'goles_tercer_cuarto', 'goles_ultimo_cuarto'
+        'goles_tercer_cuarto', 'goles_ultimo_cuarto', 'rating', 'forma'
     ]
     
     # Preparar datos para clustering
@@ -649,7 +670,8 @@ def main():
     # Selector de equipo
     equipo_seleccionado = st.selectbox(
         "Seleccione un equipo para analizar:",
-        equipos_ordenados
+        equipos_ordenados,
+        key="selector_equipo_ml"
     )
     
     # Obtener datos del equipo seleccionado
@@ -0,0 +1,118 @@
+"""
+Datos de prueba compartidos: una liga pequeña de cuatro equipos y dos jornadas
+con las mismas columnas que las actas, goles, sustituciones y listado reales.
+
+    Jornada 1: EQUIPO A 2-1 EQUIPO B  (A1 10', B1 50', A2 80'; en A entra A4 por A3 en el 60')
+               EQUIPO C 0-0 EQUIPO D
+    Jornada 2: EQUIPO A 1-1 EQUIPO C  (A1 30', C1 70')
+               EQUIPO B 0-2 EQUIPO D  (D2 20', D3 90'; en D entra D4 por D1 en el 45')
+
+Cada equipo tiene tres titulares (X1, X2, X3) y un suplente (X4).
+"""
+import pandas as pd
+import pytest
+
+PARTIDOS = [
+    # jornada, local, visitante
+    (1, 'A', 'B'),
+    (1, 'C', 'D'),
+    (2, 'A', 'C'),
+    (2, 'B', 'D'),
+]
+
+GOLES = [
+    # jornada, minuto, jugador
+    (1, 10, 'A1'),
+    (1, 50, 'B1'),
+    (1, 80, 'A2'),
+    (2, 30, 'A1'),
+    (2, 70, 'C1'),
+    (2, 20, 'D2'),
+    (2, 90, 'D3'),
+]
+
+SUSTITUCIONES = [
+    # jornada, equipo, entra, sale, minuto
+    (1, 'A', 'A4', 'A3', 60),
+    (2, 'D', 'D4', 'D1', 45),
+]
+
+
+def nombre_jugador(codigo):
+    return f"JUGADOR {codigo}, NOMBRE"
+
+
+def nombre_equipo(letra):
+    return f"EQUIPO {letra}"
+
+
+def _liga():
+    entra = {(j, nombre_jugador(e)): m for j, _, e, _, m in SUSTITUCIONES}
+    sale = {(j, nombre_jugador(s)): m for j, _, _, s, m in SUSTITUCIONES}
+    goles_jugador = {}
+    for jornada, _, jugador in GOLES:
+        clave = (jornada, nombre_jugador(jugador))
+        goles_jugador[clave] = goles_jugador.get(clave, 0) + 1
+
+    filas = []
+    for jornada, local, visitante in PARTIDOS:
+        for equipo, rival, localizacion in ((local, visitante, 'Local'), (visitante, local, 'Visitante')):
+            for numero in range(1, 5):
+                jugador = nombre_jugador(f"{equipo}{numero}")
+                titular = numero < 4
+                if titular:
+                    minutos = sale.get((jornada, jugador), 90)
+                else:
+                    minutos = 90 - entra[(jornada, jugador)] if (jornada, jugador) in entra else 0
+                filas.append({
+                    'numero': numero,
+                    'jugador': jugador,
+                    'equipo': nombre_equipo(equipo),
+                    'status': 'Titular' if titular else 'Suplente',
+                    'localizacion': localizacion,
+                    'rival': nombre_equipo(rival),
+                    'jornada': jornada,
+                    'goles': goles_jugador.get((jornada, jugador), 0),
+                    'Tarjetas Amarillas': 1 if (jornada, jugador) == (1, nombre_jugador('B2')) else 0,
+                    'Tarjetas Rojas': 0,
+                    'minutos_jugados': minutos
+                })
+    actas = pd.DataFrame(filas)
+
+    goles = pd.DataFrame({
+        'Jornada': [g[0] for g in GOLES],
+        'Minuto': [g[1] for g in GOLES],
+        'jugador': [nombre_jugador(g[2]) for g in GOLES],
+        'Tipo de Gol': 'Normal'
+    })
+    sustituciones = pd.DataFrame({
+        'jugador_entra': [nombre_jugador(s[2]) for s in SUSTITUCIONES],
+        'jugador_sale': [nombre_jugador(s[3]) for s in SUSTITUCIONES],
+        'Minuto': [s[4] for s in SUSTITUCIONES],
+        'equipo': [nombre_equipo(s[1]) for s in SUSTITUCIONES],
+        'Jornada': [s[0] for s in SUSTITUCIONES]
+    })
+    # El listado usa comillas en el nombre del equipo, como el de la federación
+    jornadas = pd.DataFrame({
+        'jornada': [p[0] for p in PARTIDOS],
+        'equipo_local': [f'EQUIPO "{p[1]}"' for p in PARTIDOS],
+        'equipo_visitante': [f'EQUIPO "{p[2]}"' for p in PARTIDOS]
+    })
+    return {'actas': actas, 'goles': goles, 'sustituciones': sustituciones, 'jornadas': jornadas}
+
+
+@pytest.fixture
+def liga():
+    return _liga()
+
+
+@pytest.fixture
+def linea(liga):
+    from calculos.linea_temporal import construir_linea_temporal
+    return construir_linea_temporal(liga['actas'], liga['goles'], liga['sustituciones'])
+
+
+@pytest.fixture
+def intervalos(liga, linea):
+    from calculos.calculo_jugadores import construir_intervalos_jugadores
+    return construir_intervalos_jugadores(liga['actas'], liga['sustituciones'], linea['partidos'])
@@ -0,0 +1,44 @@
+import pandas as pd
+
+from utils import almacen
+
+
+def _preparar_datos(datos, liga):
+    (datos / 'Repositorio' / 'Actas').mkdir(parents=True)
+    liga['actas'].to_csv(datos / 'Actas_unificado.csv', index=False)
+    liga['goles'].to_csv(datos / 'Goles_unificado.csv', index=False)
+    liga['sustituciones'].to_csv(datos / 'Sustituciones_unificado.csv', index=False)
+    liga['jornadas'].to_csv(datos / 'Repositorio' / 'Listado_Jornadas.csv', index=False)
+    for jornada, grupo in liga['actas'].groupby('jornada'):
+        grupo.to_csv(datos / 'Repositorio' / 'Actas' / f'jornada_{jornada}.csv', index=False)
+
+
+def test_publicar_y_vaciar_no_duplica_la_temporada(tmp_path, liga, monkeypatch):
+    datos = tmp_path / 'data'
+    _preparar_datos(datos, liga)
+    monkeypatch.setattr(almacen, 'temporada_activa', lambda: '2024-25')
+
+    almacen.publicar_particion('2024-25', str(datos), vaciar=True)
+    # Se activa la nueva temporada, todavía sin datos
+    monkeypatch.setattr(almacen, 'temporada_activa', lambda: '2025-26')
+
+    actas = almacen.leer_tabla('actas', 'todas', str(datos))
+    assert len(actas) == len(liga['actas'])
+    assert set(actas['temporada']) == {'2024-25'}
+    jornadas = almacen.leer_tabla('jornadas', None, str(datos))
+    assert jornadas.empty
+    assert list(jornadas.columns) == list(liga['jornadas'].columns) + ['temporada']
+    assert not list((datos / 'Repositorio' / 'Actas').iterdir())
+
+
+def test_publicar_sin_vaciar_conserva_los_datos_activos(tmp_path, liga, monkeypatch):
+    datos = tmp_path / 'data'
+    _preparar_datos(datos, liga)
+    monkeypatch.setattr(almacen, 'temporada_activa', lambda: '2024-25')
+
+    carpeta = almacen.publicar_particion('2024-25', str(datos))
+
+    assert (datos / 'Actas_unificado.csv').exists()
+    pd.testing.assert_frame_equal(
+        pd.read_csv(f"{carpeta}/actas.csv"), pd.read_csv(datos / 'Actas_unificado.csv')
+    )
@@ -0,0 +1,72 @@
+import os
+
+import pandas as pd
+import pandas.testing as pdt
+import pytest
+
+from utils.archivo_temporadas import (
+    archivar_temporada, restaurar_temporada, leer_archivo, temporadas_archivadas, cargar_manifiesto
+)
+
+pytest.importorskip('pyarrow')
+
+
+@pytest.fixture
+def carpeta_datos(tmp_path, liga):
+    datos = tmp_path / 'data'
+    (datos / 'Repositorio' / 'Actas').mkdir(parents=True)
+    (datos / 'Repositorio' / 'Goles').mkdir()
+    liga['actas'].to_csv(datos / 'Actas_unificado.csv', index=False)
+    liga['goles'].to_csv(datos / 'Goles_unificado.csv', index=False)
+    liga['sustituciones'].to_csv(datos / 'Sustituciones_unificado.csv', index=False)
+    liga['jornadas'].to_csv(datos / 'Repositorio' / 'Listado_Jornadas.csv', index=False)
+
+    # Un CSV por partido: con columnas distintas, con ceros a la izquierda y vacío
+    for jornada, grupo in liga['actas'].groupby('jornada'):
+        grupo.to_csv(datos / 'Repositorio' / 'Actas' / f'jornada_{jornada}.csv', index=False)
+    (datos / 'Repositorio' / 'Goles' / 'codigos.csv').write_text('codigo,minuto\n007,09\n', encoding='utf-8')
+    (datos / 'Repositorio' / 'Goles' / 'vacio.csv').write_text('', encoding='utf-8')
+    return datos
+
+
+def _archivos(carpeta):
+    return {
+        os.path.relpath(os.path.join(raiz, f), carpeta)
+        for raiz, _, archivos in os.walk(carpeta) for f in archivos
+    }
+
+
+def test_archivar_y_restaurar(tmp_path, carpeta_datos, liga):
+    archivo = tmp_path / 'backups'
+    manifiesto = archivar_temporada('2024-25', str(carpeta_datos), str(archivo))
+
+    assert temporadas_archivadas(str(archivo)) == ['2024-25']
+    assert manifiesto['tablas']['actas']['filas'] == len(liga['actas'])
+    assert 'repositorio_sustituciones' not in manifiesto['tablas']
+
+    destino = tmp_path / 'restaurado'
+    escritos = restaurar_temporada('2024-25', str(destino), str(archivo))
+    assert _archivos(destino) == _archivos(carpeta_datos)
+    assert escritos == len(_archivos(carpeta_datos))
+
+    # Los CSV de las carpetas se reescriben tal cual; los unificados conservan los datos
+    for relativa in _archivos(carpeta_datos):
+        if relativa.startswith('Repositorio' + os.sep + 'Actas') or relativa.startswith('Repositorio' + os.sep + 'Goles'):
+            assert (destino / relativa).read_bytes() == (carpeta_datos / relativa).read_bytes()
+    pdt.assert_frame_equal(pd.read_csv(destino / 'Actas_unificado.csv'), pd.read_csv(carpeta_datos / 'Actas_unificado.csv'))
+
+
+def test_objetos_reutilizados_y_lectura_por_columnas(tmp_path, carpeta_datos):
+    archivo = tmp_path / 'backups'
+    archivar_temporada('2023-24', str(carpeta_datos), str(archivo))
+    objetos = set(os.listdir(archivo / 'objetos'))
+
+    # Sin cambios en los datos no se escribe ningún objeto nuevo
+    archivar_temporada('2024-25', str(carpeta_datos), str(archivo))
+    assert set(os.listdir(archivo / 'objetos')) == objetos
+    assert cargar_manifiesto('2024-25', str(archivo))['tablas'] == cargar_manifiesto('2023-24', str(archivo))['tablas']
+
+    goles = leer_archivo('2024-25', 'goles', columnas=['jugador'], carpeta=str(archivo))
+    assert list(goles.columns) == ['jugador']
+    with pytest.raises(KeyError):
+        leer_archivo('2024-25', 'repositorio_sustituciones', carpeta=str(archivo))
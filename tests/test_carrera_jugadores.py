@@ -0,0 +1,40 @@
+import pandas as pd
+
+from calculos.carrera_jugadores import construir_indice_jugadores
+
+
+def _actas(filas):
+    return pd.DataFrame(filas, columns=['jugador', 'temporada'])
+
+
+def _ids(indice):
+    return dict(zip(indice['jugador'], indice['jugador_id']))
+
+
+def test_no_une_por_transitividad_nombres_de_una_misma_temporada():
+    actas = _actas([
+        ('GARCIA LOPEZ, JUAN', '2023-24'),
+        ('GARCIA LOPEZ, JUANA', '2023-24'),
+        ('GARCIA LOPEZ, JUAN A', '2024-25'),
+    ])
+    ids = _ids(construir_indice_jugadores(actas, fusiones={}))
+
+    assert ids['GARCIA LOPEZ, JUAN'] != ids['GARCIA LOPEZ, JUANA']
+    assert ids['GARCIA LOPEZ, JUAN A'] in (ids['GARCIA LOPEZ, JUAN'], ids['GARCIA LOPEZ, JUANA'])
+
+
+def test_id_estable_al_aparecer_variantes_posteriores():
+    primera = _actas([('PEREZ, MARIOS', '2023-24')])
+    ampliada = _actas([('PEREZ, MARIOS', '2023-24'), ('PEREZ, MARIO', '2024-25')])
+
+    id_inicial = _ids(construir_indice_jugadores(primera, fusiones={}))['PEREZ, MARIOS']
+    ids = _ids(construir_indice_jugadores(ampliada, fusiones={}))
+
+    assert ids['PEREZ, MARIO'] == ids['PEREZ, MARIOS'] == id_inicial
+
+
+def test_fusion_manual_se_aplica_aunque_compartan_temporada():
+    actas = _actas([('RUIZ, ANA', '2023-24'), ('SANZ, ANA', '2023-24')])
+    ids = _ids(construir_indice_jugadores(actas, fusiones={'SANZ, ANA': 'RUIZ, ANA'}))
+
+    assert ids['RUIZ, ANA'] == ids['SANZ, ANA']
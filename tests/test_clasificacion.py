@@ -0,0 +1,73 @@
+from calculos.clasificacion import (
+    clave_equipo, construir_clasificacion, crear_estado_clasificacion,
+    registrar_resultado, clasificacion_jornada, resultados_partidos, actualizar_clasificacion
+)
+from tests.conftest import nombre_equipo
+
+
+def test_clave_equipo_ignora_comillas_y_espacios():
+    assert clave_equipo('San  Francisco "B" ') == clave_equipo('SAN FRANCISCO B') == 'SAN FRANCISCO B'
+    assert clave_equipo(None) == ''
+
+
+def test_resultados_desde_las_actas(liga):
+    resultados = resultados_partidos(liga['jornadas'], liga['actas'])
+    marcadores = {
+        (j, l, v): (gl, gv)
+        for j, l, v, gl, gv in resultados[['jornada', 'local', 'visitante', 'goles_local', 'goles_visitante']].itertuples(index=False)
+    }
+    assert marcadores[(1, nombre_equipo('A'), nombre_equipo('B'))] == (2, 1)
+    assert marcadores[(2, nombre_equipo('B'), nombre_equipo('D'))] == (0, 2)
+
+
+def test_clasificacion_por_jornada(liga):
+    estado = construir_clasificacion(liga['jornadas'], liga['actas'])
+
+    # Jornada 1: C y D empatan en todo y se ordenan por nombre
+    tabla = clasificacion_jornada(estado, 1)
+    assert tabla['Equipo'].tolist() == [nombre_equipo(e) for e in 'ACDB']
+
+    # Jornada 2: A y D empatan a 4 puntos sin enfrentamiento directo; D tiene mejor diferencia de goles
+    tabla = clasificacion_jornada(estado).set_index('Equipo')
+    assert tabla['Pos'].to_dict() == {nombre_equipo(e): p for p, e in enumerate('DACB', start=1)}
+    assert tabla.loc[nombre_equipo('A'), ['Pts', 'PJ', 'G', 'E', 'P', 'GF', 'GC', 'DG']].tolist() == [4, 2, 1, 1, 0, 3, 2, 1]
+
+
+def test_desempate_por_enfrentamientos_directos():
+    estado = crear_estado_clasificacion()
+    registrar_resultado(estado, 1, 'X', 'Y', 1, 0)
+    registrar_resultado(estado, 2, 'Y', 'W', 5, 0)
+    registrar_resultado(estado, 2, 'X', 'Z', 0, 1)
+
+    # X, Y y Z empatan a 3 puntos; Y tiene la mejor diferencia general pero pierde con X
+    assert clasificacion_jornada(estado)['Equipo'].tolist() == ['Z', 'X', 'Y', 'W']
+
+
+def test_corregir_un_acta_rehace_el_acumulado(liga):
+    estado = construir_clasificacion(liga['jornadas'], liga['actas'])
+    a, b = nombre_equipo('A'), nombre_equipo('B')
+
+    assert not registrar_resultado(estado, 1, a, b, 2, 1)
+    assert registrar_resultado(estado, 1, a, b, 0, 1)
+
+    tabla = clasificacion_jornada(estado).set_index('Equipo')
+    assert tabla.loc[a, 'Pts'] == 1
+    assert tabla.loc[b, 'Pts'] == 3
+    assert tabla.loc[a, 'GF'] == 1
+
+
+def test_actualizar_aplica_altas_y_bajas_de_actas(liga):
+    # Estado construido sin el acta de A-C (jornada 2) de uno de los equipos
+    a = nombre_equipo('A')
+    sin_acta = liga['actas'][~((liga['actas']['jornada'] == 2) & (liga['actas']['equipo'] == a))]
+    estado = construir_clasificacion(liga['jornadas'], sin_acta)
+    assert clasificacion_jornada(estado).set_index('Equipo').loc[a, 'PJ'] == 1
+
+    # Llega el acta: solo cambia la jornada 2
+    assert actualizar_clasificacion(estado, liga['jornadas'], liga['actas']) == 1
+    completo = construir_clasificacion(liga['jornadas'], liga['actas'])
+    assert clasificacion_jornada(estado).equals(clasificacion_jornada(completo))
+
+    # Se retira el acta: vuelve a la clasificación sin ese partido
+    assert actualizar_clasificacion(estado, liga['jornadas'], sin_acta) == 1
+    assert clasificacion_jornada(estado).equals(clasificacion_jornada(construir_clasificacion(liga['jornadas'], sin_acta)))
@@ -0,0 +1,64 @@
+import pytest
+
+from utils import data as modulo_data
+from utils.data import version_datos, obtener_clasificacion, obtener_ratings
+from calculos.clasificacion import clasificacion_jornada, construir_clasificacion
+from calculos.rating_equipos import construir_ratings
+from tests.conftest import nombre_equipo
+
+
+def test_version_cambia_con_los_archivos_extra(tmp_path):
+    fusiones = tmp_path / "fusiones_jugadores.csv"
+    sin_fusiones = version_datos(str(tmp_path), 'todas', archivos_extra=(str(fusiones),))
+
+    fusiones.write_text("nombre,nombre_canonico\nJUAN P.,JUAN PEREZ\n")
+    con_fusiones = version_datos(str(tmp_path), 'todas', archivos_extra=(str(fusiones),))
+
+    fusiones.write_text("nombre,nombre_canonico\nJUAN P.,JUAN PEREZ\nANA G.,ANA GARCIA\n")
+    editadas = version_datos(str(tmp_path), 'todas', archivos_extra=(str(fusiones),))
+
+    assert len({sin_fusiones, con_fusiones, editadas}) == 3
+    # Sin archivos extra la versión solo depende de las tablas
+    assert version_datos(str(tmp_path), 'todas') == version_datos(str(tmp_path), 'todas')
+
+
+@pytest.fixture
+def construcciones(monkeypatch):
+    """Cuenta las construcciones desde cero de cada motor"""
+    contador = {'clasificacion': 0, 'ratings': 0}
+
+    def contar(nombre, funcion):
+        def envoltorio(*args):
+            contador[nombre] += 1
+            return funcion(*args)
+        return envoltorio
+
+    monkeypatch.setattr(modulo_data, '_estados_incrementales', {})
+    monkeypatch.setattr(modulo_data, 'construir_clasificacion', contar('clasificacion', construir_clasificacion))
+    monkeypatch.setattr(modulo_data, 'construir_ratings', contar('ratings', construir_ratings))
+    return contador
+
+
+def test_versiones_nuevas_actualizan_el_estado_anterior(liga, construcciones):
+    a = nombre_equipo('A')
+    jornadas = liga['jornadas'].assign(temporada='2024-25')
+    sin_acta = liga['actas'][~((liga['actas']['jornada'] == 2) & (liga['actas']['equipo'] == a))]
+
+    primera = {'jornadas': jornadas, 'actas': sin_acta, 'version': 'incremental-1'}
+    segunda = {'jornadas': jornadas, 'actas': liga['actas'], 'version': 'incremental-2'}
+    clasificacion_1, ratings_1 = obtener_clasificacion(primera), obtener_ratings(primera)
+    clasificacion_2, ratings_2 = obtener_clasificacion(segunda), obtener_ratings(segunda)
+
+    # Solo la primera versión se construye desde cero
+    assert construcciones == {'clasificacion': 1, 'ratings': 1}
+    assert clasificacion_jornada(clasificacion_2).equals(
+        clasificacion_jornada(construir_clasificacion(jornadas, liga['actas']))
+    )
+    # El estado de la versión anterior, que sigue en caché, no cambia
+    assert clasificacion_jornada(clasificacion_1).set_index('Equipo').loc[a, 'PJ'] == 1
+    assert ratings_1['fotos'].tolist() != ratings_2['fotos'].tolist()
+
+    # Otras temporadas no reutilizan el estado
+    otra = {'jornadas': jornadas.assign(temporada='2025-26'), 'actas': liga['actas'], 'version': 'incremental-3'}
+    obtener_clasificacion(otra)
+    assert construcciones['clasificacion'] == 2
@@ -0,0 +1,48 @@
+import pandas as pd
+import pytest
+
+from calculos.clasificacion import construir_clasificacion
+from calculos.forma_equipos import _matriz_actas, construir_forma, forma_jornada, racha_equipo
+from tests.conftest import nombre_equipo
+
+
+@pytest.fixture
+def forma(liga):
+    estado = construir_clasificacion(liga['jornadas'], liga['actas'])
+    return construir_forma(estado, liga['actas'], ventanas=(1, 3))
+
+
+def test_sumas_moviles_por_ventana(forma):
+    tabla = forma_jornada(forma, 3).set_index('Equipo')
+    equipo_a = tabla.loc[nombre_equipo('A')]
+    assert (equipo_a['partidos'], equipo_a['puntos'], equipo_a['goles_favor'], equipo_a['goles_contra']) == (2, 4, 3, 2)
+    assert tabla.loc[nombre_equipo('B'), 'tarjetas'] == 1
+
+    # Con ventana 1 solo cuenta el empate de la jornada 2
+    assert forma_jornada(forma, 1).set_index('Equipo').loc[nombre_equipo('A'), 'puntos'] == 1
+
+
+def test_concentracion_de_minutos(forma):
+    tabla = forma_jornada(forma, 3).set_index('Equipo')
+    # A1 180', A2 180', A3 150' y A4 30' de 540'
+    esperado = (180 ** 2 + 180 ** 2 + 150 ** 2 + 30 ** 2) / 540 ** 2
+    assert tabla.loc[nombre_equipo('A'), 'concentracion_minutos'] == pytest.approx(esperado, rel=1e-5)
+
+
+def test_racha(forma):
+    assert racha_equipo(forma, nombre_equipo('A'), 5) == ['V', 'E']
+    assert racha_equipo(forma, nombre_equipo('B'), 5) == ['D', 'D']
+    assert racha_equipo(forma, nombre_equipo('D'), 1, jornada=1) == ['E']
+
+
+def test_mismo_nombre_en_dos_equipos_son_dos_jugadores():
+    actas = pd.DataFrame({
+        'equipo': ['EQUIPO A', 'EQUIPO B', 'EQUIPO A'],
+        'jornada': [1, 1, 2],
+        'jugador': ['GARCIA, JUAN', 'GARCIA, JUAN', 'GARCIA, JUAN'],
+        'minutos_jugados': [90, 45, 30]
+    })
+    matriz, equipo_jugador = _matriz_actas(actas, 'minutos_jugados', ['EQUIPO A', 'EQUIPO B'], [1, 2], por_jugador=True)
+
+    assert matriz.shape == (2, 2)
+    assert sorted(zip(equipo_jugador, matriz.tolist())) == [(0, [90, 30]), (1, [45, 0])]
@@ -0,0 +1,34 @@
+import pandas as pd
+
+from utils.informes_lote import listar_informes
+
+
+def _datos(num_partidos):
+    actas = pd.DataFrame({
+        'jugador': ['Ana', 'Ana', 'Bea'],
+        'equipo': ['PENYA INDEPENDENT'] * 3,
+        'jornada': [1, 2, 1],
+        'minutos_jugados': [90, 45, 90],
+    })
+    return {
+        'actas': actas,
+        'actas_penya': actas,
+        'goles': pd.DataFrame({'jugador': ['Ana'], 'jornada': [1], 'minuto': [10]}),
+        'partidos_penya': pd.DataFrame({'jornada': list(range(1, num_partidos + 1))}),
+    }
+
+
+def test_huella_jugador_cambia_con_los_partidos_de_penya():
+    antes = {i['entidad']: i['huella'] for i in listar_informes(_datos(2), None, ['jugador'])}
+    # Penya juega un partido en el que no participa nadie: cambia la barra "No Participa"
+    despues = {i['entidad']: i['huella'] for i in listar_informes(_datos(3), None, ['jugador'])}
+
+    assert antes.keys() == despues.keys() == {'Ana', 'Bea'}
+    assert all(antes[j] != despues[j] for j in antes)
+
+
+def test_huella_jugador_estable_sin_cambios():
+    primera = listar_informes(_datos(2), None, ['jugador'])
+    segunda = listar_informes(_datos(2), None, ['jugador'])
+
+    assert [i['huella'] for i in primera] == [i['huella'] for i in segunda]
@@ -0,0 +1,51 @@
+import numpy as np
+
+from calculos.linea_temporal import (
+    buscar_partido, eventos_partido, marcador_en_minuto, tramos_marcador, estados_marcador, estados_equipo
+)
+from tests.conftest import nombre_equipo, nombre_jugador
+
+
+def test_partidos_y_marcador_final(linea):
+    partidos = linea['partidos']
+    assert len(partidos) == 4
+    partido = buscar_partido(linea, 1, 'EQUIPO "A"')
+    assert partidos.loc[partido, ['local', 'visitante', 'goles_local', 'goles_visitante']].tolist() == [
+        nombre_equipo('A'), nombre_equipo('B'), 2, 1
+    ]
+    assert buscar_partido(linea, 3, nombre_equipo('A')) is None
+
+
+def test_eventos_de_un_partido_en_orden(linea):
+    eventos = eventos_partido(linea, buscar_partido(linea, 1, nombre_equipo('A')))
+
+    # La tarjeta no tiene minuto y va primero; después goles y cambio por minuto
+    assert eventos['evento'].tolist() == ['Amarilla', 'Gol', 'Gol', 'Sustitución', 'Gol']
+    assert np.isnan(eventos['minuto'].iloc[0])
+    assert eventos['minuto'].iloc[1:].tolist() == [10, 50, 60, 80]
+    assert eventos['marcador'].tolist() == ['0-0', '1-0', '1-1', '1-1', '2-1']
+    assert eventos.loc[3, ['jugador', 'jugador_sale']].tolist() == [nombre_jugador('A4'), nombre_jugador('A3')]
+
+
+def test_marcador_de_todos_los_partidos_en_un_minuto(linea):
+    marcador = marcador_en_minuto(linea, 50).set_index(['jornada', 'local'])
+    assert marcador.loc[(1, nombre_equipo('A')), ['goles_local', 'goles_visitante']].tolist() == [1, 1]
+    assert marcador.loc[(2, nombre_equipo('A')), ['goles_local', 'goles_visitante']].tolist() == [1, 0]
+    assert marcador.loc[(2, nombre_equipo('B')), ['goles_local', 'goles_visitante']].tolist() == [0, 1]
+    assert marcador.loc[(1, nombre_equipo('C')), ['goles_local', 'goles_visitante']].tolist() == [0, 0]
+
+
+def test_tramos_cubren_cada_partido(linea):
+    tramos = tramos_marcador(linea)
+    assert ((tramos['hasta'] - tramos['desde']).groupby(tramos['partido']).sum() == 90).all()
+    partido = buscar_partido(linea, 1, nombre_equipo('A'))
+    assert tramos.loc[tramos['partido'] == partido, 'diferencia'].tolist() == [0, 1, 0, 1]
+
+
+def test_estados_de_un_equipo(linea):
+    estados = estados_equipo(estados_marcador(linea), 'EQUIPO "A"').set_index('estado')
+
+    assert estados['minutos'].to_dict() == {'Ganando': 90, 'Empatando': 90, 'Perdiendo': 0}
+    # Los tres goles de A llegan con empate; los dos que recibe, ganando
+    assert estados.loc['Empatando', 'goles_favor'] == 3
+    assert estados.loc['Ganando', 'goles_contra'] == 2
@@ -0,0 +1,40 @@
+import csv
+
+from common import login
+from common.login import ALGORITMO_HASH, generar_hash_clave, verificar_clave
+
+
+def test_hash_y_verificacion():
+    hash_clave = generar_hash_clave('secreta')
+
+    assert hash_clave.startswith(f"{ALGORITMO_HASH}$")
+    assert verificar_clave('secreta', hash_clave)
+    assert not verificar_clave('otra', hash_clave)
+    assert not verificar_clave('secreta', 'secreta')
+    assert generar_hash_clave('secreta') != hash_clave  # sal aleatoria
+
+
+def test_usuarios_del_repositorio_sin_claves_en_claro():
+    with open(login._ruta_usuarios(), newline='', encoding='utf-8') as f:
+        for fila in csv.DictReader(f):
+            assert fila['clave'].startswith(f"{ALGORITMO_HASH}$")
+
+
+def test_claves_en_claro_se_reescriben_con_hash(tmp_path, monkeypatch):
+    ruta = tmp_path / 'usuarios.csv'
+    ruta.write_text('usuario,nombre,clave,rol\npepe,Pepe,secreta,usuario\n', encoding='utf-8')
+    monkeypatch.setattr(login, '_ruta_usuarios', lambda: str(ruta))
+    monkeypatch.setattr(login, '_usuarios', {'mtime': None, 'indice': {}})
+
+    assert login.validar_usuario('pepe', 'secreta') == (True, 'usuario')
+    assert 'secreta' not in ruta.read_text(encoding='utf-8')
+    assert login.validar_usuario('pepe', 'secreta') == (True, 'usuario')
+
+
+def test_intentos_caducados_se_olvidan(monkeypatch):
+    monkeypatch.setattr(login, '_intentos_fallidos', login.defaultdict(login.deque))
+    login._registrar_intento('nadie', False)
+    login._intentos_fallidos['nadie'][0] -= login.VENTANA_INTENTOS_SEGUNDOS + 1
+
+    assert login.segundos_bloqueo('nadie') == 0
+    assert 'nadie' not in login._intentos_fallidos
@@ -0,0 +1,52 @@
+import pandas as pd
+
+from calculos.calculo_jugadores import construir_intervalos_jugadores, calcular_mas_menos
+from calculos.linea_temporal import goles_linea
+from tests.conftest import nombre_jugador, nombre_equipo
+
+
+def _intervalos_de(intervalos, codigo):
+    filas = intervalos[intervalos['jugador'] == nombre_jugador(codigo)]
+    return list(zip(filas['partido'], filas['desde'], filas['hasta']))
+
+
+def test_intervalos_en_el_campo(intervalos):
+    # 6 titulares por partido más los dos que entran desde el banquillo
+    assert len(intervalos) == 4 * 6 + 2
+    assert _intervalos_de(intervalos, 'A3') == [(0, 0, 60), (2, 0, 90)]
+    assert _intervalos_de(intervalos, 'A4') == [(0, 60, 90)]
+    assert _intervalos_de(intervalos, 'B4') == []
+
+
+def test_jugador_que_vuelve_a_entrar(liga, linea):
+    vuelta = pd.DataFrame({
+        'jugador_entra': [nombre_jugador('A3')], 'jugador_sale': [nombre_jugador('A4')],
+        'Minuto': [75], 'equipo': [nombre_equipo('A')], 'Jornada': [1]
+    })
+    sustituciones = pd.concat([liga['sustituciones'], vuelta], ignore_index=True)
+    intervalos = construir_intervalos_jugadores(liga['actas'], sustituciones, linea['partidos'])
+
+    assert _intervalos_de(intervalos, 'A3') == [(0, 0, 60), (0, 75, 90), (2, 0, 90)]
+    assert _intervalos_de(intervalos, 'A4') == [(0, 60, 75)]
+
+
+def test_mas_menos_dentro_y_fuera(intervalos, linea):
+    mas_menos = calcular_mas_menos(intervalos, goles_linea(linea), linea['partidos'])
+    fila = mas_menos.set_index('jugador').loc
+
+    a3 = fila[nombre_jugador('A3')]
+    assert (a3['partidos'], a3['minutos'], a3['goles_favor'], a3['goles_contra']) == (2, 150, 2, 2)
+    assert (a3['minutos_fuera'], a3['goles_favor_fuera'], a3['goles_contra_fuera']) == (30, 1, 0)
+
+    a4 = fila[nombre_jugador('A4')]
+    assert (a4['partidos'], a4['minutos'], a4['mas_menos'], a4['mas_menos_90']) == (1, 30, 1, 3.0)
+
+
+def test_gol_del_ultimo_minuto_cuenta_para_quien_acaba_el_partido(intervalos, linea):
+    fila = calcular_mas_menos(intervalos, goles_linea(linea), linea['partidos']).set_index('jugador').loc
+
+    # D3 marca en el 90' de la jornada 2; D4 está en el campo desde el 45'
+    assert fila[nombre_jugador('D4'), 'goles_favor'] == 1
+    assert fila[nombre_jugador('D1'), 'goles_favor'] == 1
+    assert fila[nombre_jugador('D1'), 'goles_favor_fuera'] == 1
+    assert fila[nombre_jugador('D3'), 'mas_menos'] == 2
@@ -0,0 +1,41 @@
+import numpy as np
+
+from calculos.linea_temporal import goles_linea
+from calculos.mas_menos_ajustado import construir_mas_menos_ajustado, matriz_diseno
+from tests.conftest import nombre_jugador, nombre_equipo
+
+
+def test_tramos_cortan_en_cada_cambio_y_cuentan_todos_los_goles(intervalos, linea):
+    resultado = construir_mas_menos_ajustado(intervalos, goles_linea(linea))
+    tramos = resultado['tramos']['tramos']
+
+    # Dos partidos con un cambio (dos tramos) y dos sin cambios (uno)
+    assert len(tramos) == 6
+    assert (tramos['goles_local'] + tramos['goles_visitante']).sum() == 7
+
+
+def test_jugadores_alineados_con_las_columnas(intervalos, linea):
+    resultado = construir_mas_menos_ajustado(intervalos, goles_linea(linea))
+    datos = resultado['tramos']
+    jugadores = datos['jugadores']
+
+    assert list(jugadores.columns) == ['jugador', 'equipo']
+    assert len(jugadores) == 14  # 12 titulares y los dos suplentes que entran
+    assert not jugadores.duplicated().any()
+
+    # Cada presencia apunta a un jugador del equipo que jugaba ese tramo
+    X = matriz_diseno(datos)
+    assert X.shape == (len(datos['tramos']), len(jugadores) + 1)
+    fila = jugadores.index[(jugadores['jugador'] == nombre_jugador('A4'))
+                           & (jugadores['equipo'] == nombre_equipo('A'))][0]
+    assert resultado['jugadores'].set_index('jugador').loc[nombre_jugador('A4'), 'minutos'] == 30
+    assert np.abs(X[:, fila].toarray()).sum() == 1
+
+
+def test_ridge_da_un_valor_finito_por_jugador(intervalos, linea):
+    resultado = construir_mas_menos_ajustado(intervalos, goles_linea(linea))
+    ajustado = resultado['jugadores']['mas_menos_ajustado']
+
+    assert len(ajustado) == 14
+    assert np.isfinite(ajustado).all()
+    assert np.isfinite(resultado['ventaja_local'])
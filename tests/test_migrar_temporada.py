@@ -0,0 +1,21 @@
+import json
+import time
+
+from config.migrar_temporada import (
+    _cargar_cache_deteccion, HORAS_CACHE_DETECCION, MINUTOS_CACHE_DETECCION_NEGATIVA
+)
+
+
+def test_sondeos_sin_partidos_caducan_antes(tmp_path):
+    ahora = time.time()
+    hace_una_hora = ahora - 3600
+    assert MINUTOS_CACHE_DETECCION_NEGATIVA * 60 < 3600 < HORAS_CACHE_DETECCION * 3600
+
+    ruta = tmp_path / 'cache.json'
+    ruta.write_text(json.dumps({
+        '1-2-21': {'activa': True, 'partidos': 8, 'jornada': 'Jornada 1', 'marca': hace_una_hora},
+        '1-2-22': {'activa': False, 'partidos': 0, 'jornada': '', 'marca': hace_una_hora},
+        '1-2-23': {'activa': False, 'partidos': 0, 'jornada': '', 'marca': ahora},
+    }), encoding='utf-8')
+
+    assert set(_cargar_cache_deteccion(str(ruta))) == {'1-2-21', '1-2-23'}
@@ -0,0 +1,36 @@
+import numpy as np
+
+from calculos.linea_temporal import goles_linea
+from calculos.mas_menos_ajustado import extraer_tramos
+from calculos.parejas_jugadores import construir_matrices_parejas, mejores_parejas
+from tests.conftest import nombre_jugador, nombre_equipo
+
+
+def test_matrices_simetricas_con_totales_en_la_diagonal(intervalos, linea):
+    matrices = construir_matrices_parejas(extraer_tramos(intervalos, goles_linea(linea)))
+    equipo_a = matrices[nombre_equipo('A')]
+    jugadores = equipo_a['jugadores']
+    i1, i3, i4 = (jugadores.index(nombre_jugador(c)) for c in ('A1', 'A3', 'A4'))
+
+    for nombre in ('minutos', 'goles_favor', 'goles_contra'):
+        assert np.array_equal(equipo_a[nombre], equipo_a[nombre].T)
+
+    # A1 juega los dos partidos completos; A3 sale en el 60' y A4 entra por él
+    assert equipo_a['minutos'][i1, i1] == 180
+    assert equipo_a['minutos'][i1, i3] == 60 + 90
+    assert equipo_a['minutos'][i3, i4] == 0
+    assert equipo_a['minutos'][i1, i4] == 30
+
+    # Con A1 y A3: A 1-1 B hasta el 60' (jornada 1) y A 1-1 C (jornada 2)
+    assert equipo_a['goles_favor'][i1, i3] == 2
+    assert equipo_a['goles_contra'][i1, i3] == 2
+    # Con A1 y A4: el gol de A2 en el 80'
+    assert equipo_a['goles_favor'][i1, i4] == 1
+
+
+def test_mejores_parejas_ordenadas_por_minutos(intervalos, linea):
+    matrices = construir_matrices_parejas(extraer_tramos(intervalos, goles_linea(linea)))
+    parejas = mejores_parejas(matrices[nombre_equipo('A')], minimo_minutos=1)
+
+    assert parejas['minutos'].is_monotonic_decreasing
+    assert parejas['minutos'].iloc[0] == 180
@@ -0,0 +1,52 @@
+import io
+import tempfile
+
+import pytest
+
+fpdf = pytest.importorskip("fpdf")
+Image = pytest.importorskip("PIL.Image")
+
+import fpdf.fpdf as modulo_fpdf
+from utils.pdf_export import PenyaPDF, _info_png
+
+
+def _png(modo, ancho=7, alto=5):
+    imagen = Image.new(modo, (ancho, alto))
+    imagen.putdata([tuple((x * 37 + y * 11 + c * 53) % 256 for c in range(len(modo)))
+                    for y in range(alto) for x in range(ancho)])
+    buffer = io.BytesIO()
+    imagen.save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize("modo", ['RGB', 'RGBA', 'LA'])
+def test_info_png_coincide_con_el_parser_de_fpdf(modo, tmp_path):
+    datos = _png(modo)
+    ruta = tmp_path / "imagen.png"
+    ruta.write_bytes(datos)
+
+    esperado = modulo_fpdf.FPDF()._parsepng(str(ruta))
+    obtenido = _info_png(datos)
+
+    for campo in ('w', 'h', 'cs', 'bpc', 'dp', 'trns'):
+        assert obtenido[campo] == esperado[campo]
+    assert modulo_fpdf.zlib.decompress(obtenido['data']) == modulo_fpdf.zlib.decompress(esperado['data'])
+    if 'smask' in esperado:
+        assert modulo_fpdf.zlib.decompress(obtenido['smask']) == modulo_fpdf.zlib.decompress(esperado['smask'])
+
+
+def test_insertar_imagen_no_crea_archivos_temporales(monkeypatch):
+    def prohibido(*args, **kwargs):
+        raise AssertionError("la imagen no debe pasar por disco")
+
+    monkeypatch.setattr(tempfile, 'mkstemp', prohibido)
+    monkeypatch.setattr(tempfile, 'NamedTemporaryFile', prohibido)
+    # FPDF 1.7.2 abre los PNG con open() del propio módulo
+    monkeypatch.setattr(modulo_fpdf, 'open', prohibido, raising=False)
+
+    pdf = PenyaPDF("Prueba")
+    pdf.image_png(_png('RGBA'), "grafico.png", x=10, y=40, w=50)
+    salida = pdf.output(dest='S')
+
+    assert {"penya_logo.png", "grafico.png"} <= set(pdf.images)
+    assert "/SMask" in salida
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from calculos.clasificacion import resultados_partidos
+from calculos.proyeccion import (
+    MAX_GOLES, _cdf_diferencia, _pmf_poisson, _simular_diferencias, partidos_pendientes, simular_temporada
+)
+from tests.conftest import nombre_equipo
+
+
+@pytest.fixture
+def jornadas_con_pendientes(liga):
+    # Jornada 3 del listado todavía sin actas
+    jornada_3 = pd.DataFrame({
+        'jornada': [3, 3],
+        'equipo_local': ['EQUIPO "A"', 'EQUIPO "B"'],
+        'equipo_visitante': ['EQUIPO "D"', 'EQUIPO "C"']
+    })
+    return pd.concat([liga['jornadas'], jornada_3], ignore_index=True)
+
+
+def test_partidos_pendientes(liga, jornadas_con_pendientes):
+    resultados = resultados_partidos(jornadas_con_pendientes, liga['actas'])
+    pendientes = partidos_pendientes(jornadas_con_pendientes, resultados)
+    assert list(zip(pendientes['local'], pendientes['visitante'])) == [
+        (nombre_equipo('A'), nombre_equipo('D')), (nombre_equipo('B'), nombre_equipo('C'))
+    ]
+
+
+def test_distribucion_de_la_diferencia_de_goles():
+    lambda_local, lambda_visitante = np.array([1.5]), np.array([1.0])
+    cdf = _cdf_diferencia(lambda_local, lambda_visitante)[0]
+    assert np.all(np.diff(cdf) >= 0)
+    assert cdf[-1] == pytest.approx(1, abs=1e-5)
+
+    # P(victoria local) de la CDF frente a la calculada directamente
+    conjunta = np.outer(_pmf_poisson(lambda_local)[0], _pmf_poisson(lambda_visitante)[0])
+    victoria_local = np.tril(conjunta, k=-1).sum()
+    assert 1 - cdf[MAX_GOLES] == pytest.approx(victoria_local, abs=1e-5)
+
+    diferencias = _simular_diferencias(np.random.default_rng(0), cdf[None, :], 200_000)
+    assert (diferencias > 0).mean() == pytest.approx(victoria_local, abs=0.01)
+
+
+def test_simulacion_reproducible_y_normalizada(liga, jornadas_con_pendientes):
+    proyeccion = simular_temporada(jornadas_con_pendientes, liga['actas'], num_simulaciones=5_000)
+    otra = simular_temporada(jornadas_con_pendientes, liga['actas'], num_simulaciones=5_000)
+
+    assert proyeccion['pendientes'] == 2
+    assert np.allclose(proyeccion['posiciones'].sum(axis=0), 1)
+    assert np.allclose(proyeccion['posiciones'].sum(axis=1), 1)
+    assert np.allclose(proyeccion['puntos'].sum(axis=1), 1)
+    assert np.array_equal(proyeccion['posiciones'], otra['posiciones'])
+
+    resumen = proyeccion['resumen'].set_index('Equipo')
+    assert resumen.loc[nombre_equipo('A'), 'Pts actuales'] == 4
+    assert 4 <= resumen.loc[nombre_equipo('A'), 'Pts esperados'] <= 7
+
+
+def test_sin_partidos_pendientes_la_clasificacion_es_la_actual(liga):
+    proyeccion = simular_temporada(liga['jornadas'], liga['actas'], num_simulaciones=1_000)
+    resumen = proyeccion['resumen']
+
+    assert proyeccion['pendientes'] == 0
+    assert resumen['Equipo'].tolist() == [nombre_equipo(e) for e in 'DACB']
+    assert resumen['P(1º)'].iloc[0] == 100
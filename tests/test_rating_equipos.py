@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from calculos.rating_equipos import (
+    FACTOR_K, RATING_INICIAL, VENTAJA_LOCAL, construir_ratings, crear_estado_ratings,
+    registrar_resultado, rating_equipo, ratings_jornada, dificultad_rivales, actualizar_ratings
+)
+from tests.conftest import nombre_equipo
+
+# Probabilidad esperada de ganar del local entre dos equipos con el mismo rating
+ESPERADO_LOCAL = 1 / (1 + 10 ** (-VENTAJA_LOCAL / 400))
+
+
+def test_primera_jornada(liga):
+    estado = construir_ratings(liga['jornadas'], liga['actas'])
+
+    # A gana 2-1 en casa (diferencia de 1: multiplicador 1)
+    assert rating_equipo(estado, nombre_equipo('A'), 1) == pytest.approx(RATING_INICIAL + FACTOR_K * (1 - ESPERADO_LOCAL), abs=1e-3)
+    assert rating_equipo(estado, nombre_equipo('B'), 1) == pytest.approx(RATING_INICIAL - FACTOR_K * (1 - ESPERADO_LOCAL), abs=1e-3)
+    # El empate en casa resta al local
+    assert rating_equipo(estado, nombre_equipo('C'), 1) < RATING_INICIAL < rating_equipo(estado, nombre_equipo('D'), 1)
+
+
+def test_suma_constante(liga):
+    estado = construir_ratings(liga['jornadas'], liga['actas'])
+    assert ratings_jornada(estado)['Rating'].sum() == pytest.approx(4 * RATING_INICIAL, abs=2)
+    assert np.allclose(estado['fotos'].sum(axis=1), 4 * RATING_INICIAL, atol=1e-2)
+
+
+def test_orden_de_los_partidos_de_una_jornada_no_importa():
+    partidos = [(1, 'X', 'Y', 3, 0), (1, 'Z', 'X', 1, 1), (2, 'Y', 'Z', 2, 1)]
+    estados = []
+    for orden in (partidos, partidos[::-1]):
+        estado = crear_estado_ratings()
+        for partido in orden:
+            registrar_resultado(estado, *partido)
+        estados.append(ratings_jornada(estado).set_index('Equipo')['Rating'].to_dict())
+    assert estados[0] == estados[1]
+
+
+def test_corregir_un_acta_recalcula_desde_su_jornada(liga):
+    estado = construir_ratings(liga['jornadas'], liga['actas'])
+    a, b = nombre_equipo('A'), nombre_equipo('B')
+    rating_a_antes = rating_equipo(estado, a)
+
+    assert registrar_resultado(estado, 1, a, b, 0, 3)
+    assert rating_equipo(estado, a) < rating_a_antes
+
+    # Mismo resultado que calcular desde cero con el acta corregida
+    desde_cero = crear_estado_ratings()
+    for jornada, partidos in estado['partidos'].items():
+        for (local, visitante), (gl, gv) in partidos.items():
+            registrar_resultado(desde_cero, jornada, local, visitante, gl, gv)
+    assert rating_equipo(desde_cero, a) == pytest.approx(rating_equipo(estado, a), abs=1e-3)
+
+
+def test_dificultad_de_los_rivales(liga):
+    estado = construir_ratings(liga['jornadas'], liga['actas'])
+    rivales = dificultad_rivales(estado, nombre_equipo('A'))
+
+    assert rivales['rival'].tolist() == [nombre_equipo('B'), nombre_equipo('C')]
+    assert rivales['rating_rival'].iloc[0] == RATING_INICIAL
+    # Rating de C tras la jornada 1, antes de jugar contra A
+    assert rivales['rating_rival'].iloc[1] == pytest.approx(rating_equipo(estado, nombre_equipo('C'), 1))
+
+
+def test_actualizar_aplica_altas_y_bajas_de_actas(liga):
+    a = nombre_equipo('A')
+    sin_acta = liga['actas'][~((liga['actas']['jornada'] == 2) & (liga['actas']['equipo'] == a))]
+    estado = construir_ratings(liga['jornadas'], sin_acta)
+
+    assert actualizar_ratings(estado, liga['jornadas'], liga['actas']) == 1
+    assert np.allclose(estado['fotos'], construir_ratings(liga['jornadas'], liga['actas'])['fotos'])
+
+    assert actualizar_ratings(estado, liga['jornadas'], sin_acta) == 1
+    assert np.allclose(estado['fotos'], construir_ratings(liga['jornadas'], sin_acta)['fotos'])
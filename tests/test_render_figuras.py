@@ -0,0 +1,60 @@
+import os
+import threading
+
+import pytest
+
+from utils import render_figuras
+
+
+class MotorFalso:
+    """Motor que solo responde cuando todos los motores están trabajando a la vez"""
+
+    def __init__(self, barrera):
+        self.barrera = barrera
+        self.figuras = []
+
+    def transform(self, figura, format, width, height, scale):
+        self.barrera.wait(timeout=5)
+        self.figuras.append(figura['id'])
+        return f"{figura['id']}-{width}x{height}@{scale}".encode()
+
+
+@pytest.fixture
+def motores_falsos(monkeypatch):
+    barrera = threading.Barrier(2)
+    creados = []
+
+    def crear_motor():
+        creados.append(MotorFalso(barrera))
+        return creados[-1]
+
+    monkeypatch.setattr(render_figuras, 'NUM_MOTORES', 2)
+    monkeypatch.setattr(render_figuras, '_motores', None)
+    monkeypatch.setattr(render_figuras, '_sin_motores', False)
+    monkeypatch.setattr(render_figuras, '_crear_motor', crear_motor)
+    return creados
+
+
+def test_renderizar_lote_reparte_entre_los_motores_calientes(motores_falsos):
+    trabajos = [({'id': i}, 100, 50, 2) for i in range(4)]
+
+    pngs = render_figuras.renderizar_lote(trabajos)
+
+    assert pngs == [f"{i}-100x50@2".encode() for i in range(4)]
+    assert not render_figuras._sin_motores
+    assert len(motores_falsos) == 2
+    # Los dos motores han trabajado en paralelo (la barrera exige a ambos a la vez)
+    assert all(motor.figuras for motor in motores_falsos)
+    assert render_figuras.calentar_motores() == 2
+
+
+def test_motor_usa_el_plotlyjs_del_paquete():
+    plotly = pytest.importorskip("plotly")
+
+    opciones = render_figuras._opciones_motor()
+
+    assert opciones['plotlyjs'] == os.path.join(
+        os.path.dirname(os.path.abspath(plotly.__file__)), "package_data", "plotly.min.js"
+    )
+    assert os.path.exists(opciones['plotlyjs'])
+    assert opciones['mathjax']
@@ -0,0 +1,240 @@
+"""
+Almacén de datos particionado por temporada
+Ubicación: utils/almacen.py
+
+La temporada activa se lee de los CSV de siempre (data/Actas_unificado.csv,
+...), que son los que actualiza el scraping. Cada temporada anterior se
+guarda en su propia partición:
+
+    data/season=2024-25/actas.csv
+    data/season=2024-25/goles.csv
+    data/season=2024-25/jornadas.csv
+    data/season=2024-25/sustituciones.csv
+
+Al leer se indican las temporadas y solo se abren los archivos de esas
+particiones (poda de particiones): cargar la temporada actual nunca toca los
+archivos históricos. Todas las tablas leídas llevan una columna 'temporada'
+para poder combinar varias temporadas en una misma consulta.
+"""
+import os
+import shutil
+from datetime import datetime
+
+import pandas as pd
+
+from config.temporadas import TEMPORADAS, obtener_temporada_activa
+
+# Tabla -> archivo de la temporada activa (relativo a la carpeta de datos)
+ARCHIVOS_ACTIVOS = {
+    'actas': "Actas_unificado.csv",
+    'goles': "Goles_unificado.csv",
+    'jornadas': "Repositorio/Listado_Jornadas.csv",
+    'sustituciones': "Sustituciones_unificado.csv"
+}
+
+# Archivos por partido de la temporada activa, a partir de los que el scraping
+# vuelve a generar los CSV unificados
+CARPETAS_REPOSITORIO = ("Repositorio/Actas", "Repositorio/Goles", "Repositorio/Sustituciones")
+
+PREFIJO_PARTICION = "season="
+
+
+def carpeta_particion(temporada, data_path="data"):
+    """
+    Carpeta de la partición de una temporada
+    """
+    return os.path.join(data_path, f"{PREFIJO_PARTICION}{temporada}")
+
+
+def temporada_activa():
+    """
+    Código de la temporada activa (por ejemplo '2024-25')
+    """
+    codigo, _ = obtener_temporada_activa()
+    return codigo
+
+
+def temporadas_disponibles(data_path="data"):
+    """
+    Temporadas con datos: la activa y las que tienen partición en disco
+
+    Returns:
+        list: Códigos de temporada ordenados
+    """
+    temporadas = {temporada_activa()}
+    if os.path.isdir(data_path):
+        for nombre in os.listdir(data_path):
+            if nombre.startswith(PREFIJO_PARTICION) and os.path.isdir(os.path.join(data_path, nombre)):
+                temporadas.add(nombre[len(PREFIJO_PARTICION):])
+    return sorted(temporadas)
+
+
+def _normalizar_temporadas(temporadas, data_path):
+    """
+    Convierte el argumento temporadas en una lista de códigos.
+    None -> solo la activa; 'todas' -> todas las disponibles; str -> una sola.
+    """
+    if temporadas is None:
+        return [temporada_activa()]
+    if temporadas == 'todas':
+        return temporadas_disponibles(data_path)
+    if isinstance(temporadas, str):
+        return [temporadas]
+    return list(dict.fromkeys(temporadas))
+
+
+def ruta_tabla(tabla, temporada, data_path="data"):
+    """
+    Archivo que contiene una tabla de una temporada
+
+    Args:
+        tabla: 'actas', 'goles', 'jornadas' o 'sustituciones'
+        temporada: Código de temporada
+
+    Returns:
+        str: Ruta del CSV (puede no existir)
+    """
+    if tabla not in ARCHIVOS_ACTIVOS:
+        raise ValueError(f"Tabla desconocida: {tabla}")
+    if temporada == temporada_activa():
+        return os.path.join(data_path, ARCHIVOS_ACTIVOS[tabla])
+    return os.path.join(carpeta_particion(temporada, data_path), f"{tabla}.csv")
+
+
+def rutas_tablas(temporadas=None, data_path="data"):
+    """
+    Archivos de todas las tablas de las temporadas pedidas
+
+    Returns:
+        list: Rutas de los CSV, en orden estable
+    """
+    return [
+        ruta_tabla(tabla, temporada, data_path)
+        for temporada in _normalizar_temporadas(temporadas, data_path)
+        for tabla in ARCHIVOS_ACTIVOS
+    ]
+
+
+def leer_tabla(tabla, temporadas=None, data_path="data", columnas=None):
+    """
+    Lee una tabla de una o varias temporadas, abriendo solo sus particiones
+
+    Args:
+        tabla: 'actas', 'goles', 'jornadas' o 'sustituciones'
+        temporadas: None (activa), 'todas', un código o una lista de códigos
+        data_path: Carpeta de datos
+        columnas: Columnas a leer (None para todas)
+
+    Returns:
+        DataFrame: Filas de todas las temporadas con la columna 'temporada'
+    """
+    partes = []
+    for temporada in _normalizar_temporadas(temporadas, data_path):
+        ruta = ruta_tabla(tabla, temporada, data_path)
+        if not os.path.exists(ruta) and temporada != temporada_activa():
+            print(f"⚠️ No hay datos de {tabla} para la temporada {temporada}")
+            continue
+        df = pd.read_csv(ruta, usecols=columnas)
+        df['temporada'] = temporada
+        partes.append(df)
+
+    if not partes:
+        return pd.DataFrame(columns=list(columnas or []) + ['temporada'])
+    if len(partes) == 1:
+        return partes[0]
+    return pd.concat(partes, ignore_index=True)
+
+
+def publicar_particion(temporada, data_path="data", sobrescribir=False, vaciar=False):
+    """
+    Copia los CSV de la temporada activa a la partición de esa temporada, para
+    que sigan disponibles después de limpiar los archivos de la temporada.
+    La partición se escribe en una carpeta temporal y se renombra al final,
+    de modo que nunca queda a medias.
+
+    Con vaciar, una vez publicada la partición se vacían los datos de la
+    temporada activa (ver vaciar_temporada_activa). Es lo que debe hacerse al
+    cambiar de temporada: si los CSV de siempre conservaran los datos ya
+    publicados, se leerían como la nueva temporada activa y esa temporada se
+    contaría dos veces al consultar todas.
+
+    Args:
+        temporada: Código de la temporada a la que pertenecen los datos actuales
+        data_path: Carpeta de datos
+        sobrescribir: Reemplazar la partición si ya existe
+        vaciar: Vaciar los datos de la temporada activa tras publicarla
+
+    Returns:
+        str: Carpeta de la partición
+    """
+    destino = carpeta_particion(temporada, data_path)
+    if os.path.exists(destino) and not sobrescribir:
+        raise FileExistsError(f"La partición {destino} ya existe")
+    temporal = f"{destino}.tmp_{datetime.now().strftime('%Y%m%d%H%M%S')}"
+    os.makedirs(temporal)
+
+    try:
+        for tabla, archivo in ARCHIVOS_ACTIVOS.items():
+            origen = os.path.join(data_path, archivo)
+            if os.path.exists(origen):
+                shutil.copy2(origen, os.path.join(temporal, f"{tabla}.csv"))
+                print(f"  ✅ Partición {temporada}: {tabla}")
+        if os.path.exists(destino):
+            shutil.rmtree(destino)
+        os.rename(temporal, destino)
+    except Exception:
+        shutil.rmtree(temporal, ignore_errors=True)
+        raise
+
+    if vaciar:
+        vaciar_temporada_activa(data_path)
+
+    return destino
+
+
+def vaciar_temporada_activa(data_path="data"):
+    """
+    Elimina los datos de la temporada activa: los CSV de cada tabla se quedan
+    solo con su cabecera (así se siguen pudiendo leer, sin filas) y se borran
+    los archivos por partido del repositorio, con los que el scraping volvería
+    a generar los CSV unificados
+
+    Args:
+        data_path: Carpeta de datos
+    """
+    for archivo in ARCHIVOS_ACTIVOS.values():
+        ruta = os.path.join(data_path, archivo)
+        if os.path.exists(ruta):
+            columnas = pd.read_csv(ruta, nrows=0).columns
+            pd.DataFrame(columns=columnas).to_csv(ruta, index=False)
+            print(f"  🗑️  Vaciado: {ruta}")
+
+    for carpeta in CARPETAS_REPOSITORIO:
+        ruta = os.path.join(data_path, carpeta)
+        if os.path.isdir(ruta):
+            for archivo in os.listdir(ruta):
+                if archivo.endswith('.csv'):
+                    os.remove(os.path.join(ruta, archivo))
+            print(f"  🗑️  Limpiada carpeta: {ruta}")
+
+
+def resumen_temporadas(data_path="data"):
+    """
+    Jornadas, equipos, jugadores y goles de cada temporada disponible,
+    consultando todas las particiones sin restaurar backups
+
+    Returns:
+        DataFrame: Una fila por temporada
+    """
+    actas = leer_tabla('actas', 'todas', data_path, columnas=['jugador', 'jornada', 'equipo', 'goles'])
+    if actas.empty:
+        return pd.DataFrame(columns=['temporada', 'nombre', 'jornadas', 'equipos', 'jugadores', 'goles'])
+
+    resumen = actas.groupby('temporada').agg(
+        jornadas=('jornada', 'nunique'),
+        equipos=('equipo', 'nunique'),
+        jugadores=('jugador', 'nunique'),
+        goles=('goles', 'sum')
+    ).reset_index()
+    resumen.insert(1, 'nombre', resumen['temporada'].map(lambda t: TEMPORADAS.get(t, {}).get('nombre', t)))
+    return resumen
@@ -0,0 +1,306 @@
+"""
+Archivo comprimido de temporadas
+Ubicación: utils/archivo_temporadas.py
+
+Al migrar de temporada, los datos de la temporada que termina se guardan en
+formato columnar (Parquet comprimido con zstd) en lugar de copiar cientos de
+CSV sueltos:
+
+    backups/objetos/<hash>.parquet      una tabla, identificada por el hash de su contenido
+    backups/temporadas/<codigo>.json    manifiesto de la temporada (tabla -> objeto)
+
+Cada tabla (los CSV unificados, el listado de jornadas y cada carpeta del
+repositorio de actas, goles y sustituciones) se guarda como un único objeto.
+Si una tabla tiene exactamente el mismo contenido que en un archivo anterior
+se reutiliza su objeto y no se vuelve a escribir.
+
+Las tablas archivadas se pueden consultar una a una (y solo con las columnas
+necesarias) con leer_archivo, sin restaurar nada, o restaurar a CSV con
+restaurar_temporada.
+"""
+import os
+import json
+import hashlib
+from datetime import datetime
+
+import pandas as pd
+
+CARPETA_ARCHIVO = "backups"
+
+# Tablas archivadas: nombre -> ruta relativa a la carpeta de datos
+ARCHIVOS_TEMPORADA = {
+    'listado_jornadas': "Repositorio/Listado_Jornadas.csv",
+    'actas': "Actas_unificado.csv",
+    'goles': "Goles_unificado.csv",
+    'sustituciones': "Sustituciones_unificado.csv"
+}
+
+# Carpetas con un CSV por partido: nombre -> ruta relativa a la carpeta de datos
+CARPETAS_TEMPORADA = {
+    'repositorio_actas': "Repositorio/Actas",
+    'repositorio_goles': "Repositorio/Goles",
+    'repositorio_sustituciones': "Repositorio/Sustituciones"
+}
+
+# Columna con el archivo de origen en las tablas que agrupan una carpeta
+COLUMNA_ARCHIVO = "archivo"
+
+
+def _hash_archivo(ruta, h=None):
+    """
+    Hash SHA-256 del contenido de un archivo (leído por bloques)
+    """
+    h = h or hashlib.sha256()
+    with open(ruta, 'rb') as f:
+        for bloque in iter(lambda: f.read(1 << 20), b''):
+            h.update(bloque)
+    return h
+
+
+def _archivos_csv(carpeta):
+    """
+    CSV de una carpeta, en orden estable
+    """
+    return sorted(f for f in os.listdir(carpeta) if f.endswith('.csv'))
+
+
+def _hash_carpeta(carpeta):
+    """
+    Hash del contenido de una carpeta: nombre y contenido de cada CSV
+    """
+    h = hashlib.sha256()
+    for nombre in _archivos_csv(carpeta):
+        h.update(nombre.encode('utf-8') + b'\0')
+        _hash_archivo(os.path.join(carpeta, nombre), h)
+        h.update(b'\0')
+    return h.hexdigest()
+
+
+def _leer_carpeta(carpeta):
+    """
+    Une todos los CSV de una carpeta en una sola tabla. Los valores se leen
+    como texto para poder reescribir los CSV tal como estaban.
+
+    Returns:
+        tuple: (DataFrame con la columna 'archivo', dict archivo -> columnas)
+    """
+    partes = []
+    columnas_archivo = {}
+    for nombre in _archivos_csv(carpeta):
+        try:
+            df = pd.read_csv(os.path.join(carpeta, nombre), dtype=str, keep_default_na=False)
+        except pd.errors.EmptyDataError:
+            df = pd.DataFrame()
+        columnas_archivo[nombre] = list(df.columns)
+        if not df.empty:
+            df.insert(0, COLUMNA_ARCHIVO, nombre)
+            partes.append(df)
+
+    tabla = pd.concat(partes, ignore_index=True) if partes else pd.DataFrame(columns=[COLUMNA_ARCHIVO])
+    return tabla.fillna(''), columnas_archivo
+
+
+def _ruta_objeto(hash_contenido, carpeta):
+    return os.path.join(carpeta, "objetos", f"{hash_contenido}.parquet")
+
+
+def _ruta_manifiesto(temporada, carpeta):
+    return os.path.join(carpeta, "temporadas", f"{temporada}.json")
+
+
+def _guardar_objeto(df, hash_contenido, carpeta):
+    """
+    Escribe una tabla como objeto Parquet, salvo que ya exista uno con el mismo contenido
+
+    Returns:
+        bool: True si el objeto ya existía y se ha reutilizado
+    """
+    ruta = _ruta_objeto(hash_contenido, carpeta)
+    if os.path.exists(ruta):
+        return True
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    temporal = f"{ruta}.tmp"
+    df.to_parquet(temporal, compression='zstd', index=False)
+    os.replace(temporal, ruta)
+    return False
+
+
+def archivar_temporada(temporada, data_path="data", carpeta=CARPETA_ARCHIVO):
+    """
+    Archiva los datos actuales como la temporada indicada
+
+    Args:
+        temporada: Código de la temporada a la que pertenecen los datos
+        data_path: Carpeta de datos
+        carpeta: Carpeta del archivo
+
+    Returns:
+        dict: Manifiesto de la temporada archivada
+    """
+    tablas = {}
+    bytes_origen = 0
+
+    fuentes = [(tabla, ruta, False) for tabla, ruta in ARCHIVOS_TEMPORADA.items()]
+    fuentes += [(tabla, ruta, True) for tabla, ruta in CARPETAS_TEMPORADA.items()]
+
+    for tabla, relativa, es_carpeta in fuentes:
+        origen = os.path.join(data_path, relativa)
+        if not os.path.exists(origen):
+            continue
+
+        if es_carpeta:
+            hash_contenido = _hash_carpeta(origen)
+            tamano = sum(os.path.getsize(os.path.join(origen, f)) for f in _archivos_csv(origen))
+        else:
+            hash_contenido = _hash_archivo(origen).hexdigest()
+            tamano = os.path.getsize(origen)
+
+        entrada = {'origen': relativa, 'hash': hash_contenido, 'bytes_origen': tamano}
+
+        # Solo se leen los datos si el contenido no está ya archivado
+        entrada_previa = None
+        if os.path.exists(_ruta_objeto(hash_contenido, carpeta)):
+            entrada_previa = _buscar_entrada(hash_contenido, carpeta)
+
+        if entrada_previa:
+            reutilizado = True
+            entrada.update({k: v for k, v in entrada_previa.items() if k not in entrada})
+        else:
+            if es_carpeta:
+                df, columnas_archivo = _leer_carpeta(origen)
+                entrada['archivos'] = columnas_archivo
+            else:
+                df = pd.read_csv(origen)
+            entrada['filas'] = len(df)
+            entrada['columnas'] = list(df.columns)
+            reutilizado = _guardar_objeto(df, hash_contenido, carpeta)
+
+        bytes_origen += tamano
+        tablas[tabla] = entrada
+        print(f"  {'♻️ ' if reutilizado else '✅'} Archivo {temporada}: {tabla}"
+              f"{' (sin cambios, reutilizado)' if reutilizado else ''}")
+
+    manifiesto = {
+        'temporada': temporada,
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'bytes_origen': bytes_origen,
+        'bytes_archivo': sum(os.path.getsize(_ruta_objeto(t['hash'], carpeta)) for t in tablas.values()),
+        'tablas': tablas
+    }
+
+    ruta = _ruta_manifiesto(temporada, carpeta)
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    with open(f"{ruta}.tmp", 'w', encoding='utf-8') as f:
+        json.dump(manifiesto, f, ensure_ascii=False, indent=2)
+    os.replace(f"{ruta}.tmp", ruta)
+
+    return manifiesto
+
+
+def _buscar_entrada(hash_contenido, carpeta):
+    """
+    Busca en los manifiestos existentes la entrada de un objeto ya archivado
+    """
+    carpeta_manifiestos = os.path.join(carpeta, "temporadas")
+    if not os.path.isdir(carpeta_manifiestos):
+        return None
+    for nombre in os.listdir(carpeta_manifiestos):
+        if not nombre.endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(carpeta_manifiestos, nombre), encoding='utf-8') as f:
+                manifiesto = json.load(f)
+        except (OSError, ValueError):
+            continue
+        for entrada in manifiesto.get('tablas', {}).values():
+            if entrada.get('hash') == hash_contenido:
+                return entrada
+    return None
+
+
+def temporadas_archivadas(carpeta=CARPETA_ARCHIVO):
+    """
+    Códigos de las temporadas con archivo
+
+    Returns:
+        list: Códigos ordenados
+    """
+    carpeta_manifiestos = os.path.join(carpeta, "temporadas")
+    if not os.path.isdir(carpeta_manifiestos):
+        return []
+    return sorted(f[:-len(".json")] for f in os.listdir(carpeta_manifiestos) if f.endswith(".json"))
+
+
+def cargar_manifiesto(temporada, carpeta=CARPETA_ARCHIVO):
+    """
+    Lee el manifiesto de una temporada archivada
+
+    Returns:
+        dict: Manifiesto (ver archivar_temporada)
+    """
+    ruta = _ruta_manifiesto(temporada, carpeta)
+    if not os.path.exists(ruta):
+        raise FileNotFoundError(f"No hay archivo de la temporada {temporada}")
+    with open(ruta, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def leer_archivo(temporada, tabla, columnas=None, carpeta=CARPETA_ARCHIVO):
+    """
+    Lee una tabla de una temporada archivada sin restaurar nada en disco.
+    Solo se abre el objeto de esa tabla y solo se leen las columnas pedidas.
+
+    Args:
+        temporada: Código de la temporada
+        tabla: Nombre de la tabla (ver ARCHIVOS_TEMPORADA y CARPETAS_TEMPORADA)
+        columnas: Columnas a leer (None para todas)
+        carpeta: Carpeta del archivo
+
+    Returns:
+        DataFrame: Contenido de la tabla
+    """
+    manifiesto = cargar_manifiesto(temporada, carpeta)
+    if tabla not in manifiesto['tablas']:
+        raise KeyError(f"La temporada {temporada} no tiene la tabla {tabla}")
+    return pd.read_parquet(_ruta_objeto(manifiesto['tablas'][tabla]['hash'], carpeta), columns=columnas)
+
+
+def restaurar_temporada(temporada, data_path, carpeta=CARPETA_ARCHIVO):
+    """
+    Reescribe como CSV los datos de una temporada archivada
+
+    Args:
+        temporada: Código de la temporada
+        data_path: Carpeta de destino (misma estructura que data/)
+        carpeta: Carpeta del archivo
+
+    Returns:
+        int: Número de archivos CSV escritos
+    """
+    manifiesto = cargar_manifiesto(temporada, carpeta)
+    escritos = 0
+
+    for tabla, entrada in manifiesto['tablas'].items():
+        df = pd.read_parquet(_ruta_objeto(entrada['hash'], carpeta))
+        destino = os.path.join(data_path, entrada['origen'])
+
+        if 'archivos' not in entrada:
+            os.makedirs(os.path.dirname(destino), exist_ok=True)
+            df.to_csv(destino, index=False)
+            escritos += 1
+            continue
+
+        os.makedirs(destino, exist_ok=True)
+        filas_por_archivo = {nombre: grupo for nombre, grupo in df.groupby(COLUMNA_ARCHIVO, sort=False)}
+        for nombre, columnas in entrada['archivos'].items():
+            ruta = os.path.join(destino, nombre)
+            if not columnas:
+                open(ruta, 'w').close()
+            else:
+                filas = filas_por_archivo.get(nombre, pd.DataFrame(columns=columnas))
+                filas[columnas].to_csv(ruta, index=False)
+            escritos += 1
+
+        print(f"  ✅ Restaurado {tabla}: {len(entrada['archivos'])} archivos")
+
+    return escritos
@@ -0,0 +1,76 @@
+"""
+Carga diferida de módulos y medición del tiempo de importación.
+
+Las páginas de la aplicación se importan solo la primera vez que se visitan.
+Cada importación se mide y queda registrada, junto con los paquetes que
+arrastra, para poder revisar el coste de arranque de cada módulo.
+"""
+import sys
+import time
+import importlib
+
+# nombre del módulo -> {'ms': tiempo de importación, 'paquetes': paquetes nuevos cargados}
+TIEMPOS_IMPORTACION = {}
+
+
+def importar_modulo(nombre):
+    """
+    Importa un módulo (si no estaba ya cargado) midiendo cuánto tarda
+
+    Args:
+        nombre: Nombre completo del módulo, por ejemplo 'pages.equipos'
+
+    Returns:
+        module: El módulo importado
+    """
+    if nombre in sys.modules:
+        return sys.modules[nombre]
+
+    modulos_previos = set(sys.modules)
+    inicio = time.perf_counter()
+    modulo = importlib.import_module(nombre)
+    duracion_ms = (time.perf_counter() - inicio) * 1000
+
+    # Paquetes de primer nivel que se han cargado por primera vez con esta importación
+    paquetes_nuevos = sorted({m.split('.')[0] for m in set(sys.modules) - modulos_previos})
+    TIEMPOS_IMPORTACION[nombre] = {'ms': round(duracion_ms, 1), 'paquetes': paquetes_nuevos}
+    print(f"⏱️ Importado {nombre} en {duracion_ms:.0f} ms ({len(paquetes_nuevos)} paquetes nuevos)")
+
+    return modulo
+
+
+def informe_importaciones():
+    """
+    Devuelve el registro de importaciones ordenado de más a menos lento
+
+    Returns:
+        list: Tuplas (módulo, ms, paquetes nuevos)
+    """
+    return sorted(
+        ((nombre, datos['ms'], datos['paquetes']) for nombre, datos in TIEMPOS_IMPORTACION.items()),
+        key=lambda fila: fila[1],
+        reverse=True
+    )
+
+
+def perfil_arranque(modulos=("common.login", "home", "pages.equipos", "pages.jugadores", "pages.ml")):
+    """
+    Importa en orden los módulos indicados y muestra el tiempo de cada uno.
+    Pensado para ejecutarse en un proceso limpio: python utils/arranque.py
+    """
+    for nombre in modulos:
+        try:
+            importar_modulo(nombre)
+        except Exception as e:
+            print(f"❌ Error al importar {nombre}: {e}")
+
+    print("\n📊 Tiempo de importación por módulo:")
+    for nombre, ms, paquetes in informe_importaciones():
+        print(f"  {nombre:<20} {ms:>8.1f} ms  {', '.join(paquetes)}")
+
+
+if __name__ == "__main__":
+    import os
+    # Agregar el directorio raíz al path para importaciones
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    perfil_arranque()
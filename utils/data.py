@@ -2,17 +2,45 @@
 Utilidades para cargar y procesar datos
 """
 import os
-import pandas as pd
+import copy
+import hashlib
+import threading
 import streamlit as st
 
+from calculos.perfiles_jugadores import construir_perfiles_jugadores
+from calculos.carrera_jugadores import construir_carreras, RUTA_FUSIONES
+from calculos.calculo_equipo import normalizar_nombre_equipo, filtrar_datos_equipo
+from calculos.clasificacion import construir_clasificacion, actualizar_clasificacion
+from calculos.rating_equipos import construir_ratings, actualizar_ratings
+from calculos.proyeccion import simular_temporada, NUM_SIMULACIONES
+from calculos.linea_temporal import construir_linea_temporal, goles_linea
+from calculos.calculo_jugadores import construir_intervalos_jugadores, calcular_mas_menos
+from calculos.parejas_jugadores import construir_matrices_parejas
+from calculos.forma_equipos import construir_forma
+from utils.instrumentacion import instrumentar
+from utils.almacen import leer_tabla, rutas_tablas
+
+# Número máximo de equipos con sus datos filtrados en caché (se descartan los menos usados)
+MAX_EQUIPOS_CACHE = 16
+
+# Último estado de los motores incrementales (clasificación y ratings) por
+# motor y temporadas: cada versión nueva de los datos parte de él y solo
+# aplica los partidos añadidos, corregidos o quitados
+_estados_incrementales = {}
+_estados_lock = threading.Lock()
+
+@instrumentar
 @st.cache_data
-def calcular_medias_liga(actas_df):
+def calcular_medias_liga(_actas_df, version):
     """
     Calcula las medias de la liga para todas las métricas relevantes.
     Se usa decorador cache_data para que solo se recalcule cuando los datos cambian.
+    La caché se indexa por la versión de los datos: el DataFrame (con guion
+    bajo) no se hashea, así que encontrar el resultado no depende del número de filas.
     
     Args:
-        actas_df: DataFrame con todas las actas
+        _actas_df: DataFrame con todas las actas
+        version: Versión de los datos de las actas (ver version_datos)
         
     Returns:
         dict: Diccionario con valores de referencia
@@ -61,13 +89,13 @@ def calcular_medias_liga(actas_df):
         return df_ajustado
     
     # Ajustar tarjetas para los cálculos
-    actas_ajustadas = ajustar_tarjetas(actas_df)
+    actas_ajustadas = ajustar_tarjetas(_actas_df)
     
     # Calcular medias por equipo
-    goles_por_equipo = actas_df.groupby('equipo')['goles'].sum()
+    goles_por_equipo = _actas_df.groupby('equipo')['goles'].sum()
     tarjetas_amarillas_por_equipo = actas_ajustadas.groupby('equipo')['Tarjetas Amarillas'].sum()
     tarjetas_rojas_por_equipo = actas_ajustadas.groupby('equipo')['Tarjetas Rojas'].sum()
-    jugadores_por_equipo = actas_df.groupby('equipo')['jugador'].nunique()
+    jugadores_por_equipo = _actas_df.groupby('equipo')['jugador'].nunique()
     
     # Calcular medias globales (valores de referencia)
     medias = {
@@ -82,30 +110,372 @@ def calcular_medias_liga(actas_df):
     
     return medias
 
-@st.cache_data
-def cargar_datos():
+def version_datos(data_path="data", temporadas=None, archivos_extra=()):
+    """
+    Calcula una versión corta de los datos a partir de la fecha de modificación
+    y el tamaño de cada archivo. Cambia en cuanto se actualiza cualquiera de ellos.
+    
+    Args:
+        data_path: Carpeta donde están los archivos de datos
+        temporadas: Temporadas consideradas (None para la activa)
+        archivos_extra: Otros archivos de los que depende el resultado (opcional)
+        
+    Returns:
+        str: Versión de 12 caracteres hexadecimales
+    """
+    h = hashlib.sha1()
+    for ruta in [*rutas_tablas(temporadas, data_path), *archivos_extra]:
+        try:
+            info = os.stat(ruta)
+            h.update(f"{ruta}:{info.st_mtime_ns}:{info.st_size};".encode('utf-8'))
+        except OSError:
+            h.update(f"{ruta}:-;".encode('utf-8'))
+    return h.hexdigest()[:12]
+
+@instrumentar
+def cargar_datos(temporadas=None):
     """
     Carga todos los datasets y los devuelve como diccionario de DataFrames.
-    Utiliza caché de Streamlit para mejorar el rendimiento.
+    Utiliza caché de Streamlit para mejorar el rendimiento: la caché se indexa
+    por la versión de los archivos, de modo que se invalida exactamente cuando
+    el scraping escribe datos nuevos.
+    
+    Args:
+        temporadas: None (temporada activa), 'todas', un código o una tupla de códigos
+    """
+    return _cargar_datos_version(temporadas, version_datos(temporadas=temporadas))
+
+@st.cache_data
+def _cargar_datos_version(temporadas, version):
+    """
+    Carga en caché de los datos de una versión concreta (ver cargar_datos)
+    """
+    return leer_datos(temporadas=temporadas)
+
+@instrumentar
+def cargar_carreras():
+    """
+    Índice de identidad y carrera de todos los jugadores en todas las temporadas
+    disponibles (ver calculos/carrera_jugadores.py). Solo se leen las actas.
+    La versión incluye el archivo de fusiones manuales, de modo que editarlo
+    invalida la caché sin esperar a que cambien los datos.
+    
+    Returns:
+        dict: Resultado de construir_carreras
+    """
+    return _cargar_carreras_version(version_datos(temporadas='todas', archivos_extra=(RUTA_FUSIONES,)))
+
+@st.cache_data
+def _cargar_carreras_version(version):
+    """
+    Carga en caché de las carreras de una versión concreta (ver cargar_carreras)
+    """
+    return construir_carreras(leer_tabla('actas', 'todas'))
+
+def obtener_datos_equipo(data, equipo_seleccionado):
+    """
+    Devuelve los datos filtrados de un equipo (ver filtrar_datos_equipo).
+    Se guardan en una caché compartida entre sesiones, indexada por equipo y
+    versión de los datos, con un máximo de MAX_EQUIPOS_CACHE equipos. La
+    página de equipos y el PDF del equipo reutilizan el mismo resultado.
+    
+    Los DataFrames devueltos son compartidos: no deben modificarse.
+    
+    Args:
+        data: Diccionario devuelto por cargar_datos
+        equipo_seleccionado: Nombre del equipo
+        
+    Returns:
+        dict: Datos del equipo
+    """
+    equipo_normalizado = normalizar_nombre_equipo(equipo_seleccionado)
+    version = data.get('version')
+    if version is None:
+        return filtrar_datos_equipo(data, equipo_normalizado)
+    return _datos_equipo_version(data, equipo_normalizado, version)
+
+@st.cache_resource(max_entries=MAX_EQUIPOS_CACHE)
+def _datos_equipo_version(_data, equipo_normalizado, version):
     """
-    # Ruta a los archivos de datos
-    data_path = "data"
+    Caché de los datos de un equipo para una versión concreta (ver obtener_datos_equipo)
+    """
+    return filtrar_datos_equipo(_data, equipo_normalizado)
+
+def obtener_clasificacion(data):
+    """
+    Devuelve el estado de clasificación de la liga (ver calculos/clasificacion.py),
+    en caché compartida por versión de los datos. Se consulta con clasificacion_jornada.
+    
+    Args:
+        data: Diccionario devuelto por cargar_datos
+        
+    Returns:
+        dict: Estado de clasificación
+    """
+    version = data.get('version')
+    if version is None:
+        return construir_clasificacion(data['jornadas'], data['actas'])
+    return _clasificacion_version(data, version)
+
+@st.cache_resource(max_entries=4)
+def _clasificacion_version(_data, version):
+    """
+    Caché de la clasificación de una versión concreta (ver obtener_clasificacion)
+    """
+    return _estado_incremental('clasificacion', _data, construir_clasificacion, actualizar_clasificacion)
+
+def obtener_ratings(data):
+    """
+    Devuelve el estado de ratings Elo de los equipos (ver calculos/rating_equipos.py),
+    en caché compartida por versión de los datos
+    
+    Args:
+        data: Diccionario devuelto por cargar_datos
+        
+    Returns:
+        dict: Estado de ratings
+    """
+    version = data.get('version')
+    if version is None:
+        return construir_ratings(data['jornadas'], data['actas'])
+    return _ratings_version(data, version)
+
+@st.cache_resource(max_entries=4)
+def _ratings_version(_data, version):
+    """
+    Caché de los ratings de una versión concreta (ver obtener_ratings)
+    """
+    return _estado_incremental('ratings', _data, construir_ratings, actualizar_ratings)
+
+def _estado_incremental(motor, data, construir, actualizar):
+    """
+    Calcula el estado de un motor incremental para una versión nueva de los
+    datos. Si ya hay un estado de las mismas temporadas, se actualiza una
+    copia suya con actualizar, que solo rehace desde la primera jornada
+    afectada. Si no lo hay, se construye desde cero. Se copia porque los
+    estados de versiones anteriores siguen en la caché y no deben cambiar.
+    
+    Args:
+        motor: Nombre del motor ('clasificacion' o 'ratings')
+        data: Diccionario devuelto por cargar_datos
+        construir: Función (jornadas_df, actas_df) -> estado
+        actualizar: Función (estado, jornadas_df, actas_df) que aplica los cambios
+        
+    Returns:
+        dict: Estado del motor
+    """
+    clave = (motor, tuple(sorted(data['jornadas']['temporada'].dropna().unique())))
+    with _estados_lock:
+        anterior = _estados_incrementales.get(clave)
     
-    # Cargar los archivos CSV
-    actas = pd.read_csv(os.path.join(data_path, "Actas_unificado.csv"))
-    goles = pd.read_csv(os.path.join(data_path, "Goles_unificado.csv"))
-    jornadas = pd.read_csv(os.path.join(data_path, "Repositorio/Listado_Jornadas.csv"))
-    sustituciones = pd.read_csv(os.path.join(data_path, "Sustituciones_unificado.csv"))
+    if anterior is None:
+        estado = construir(data['jornadas'], data['actas'])
+    else:
+        estado = copy.deepcopy(anterior)
+        actualizar(estado, data['jornadas'], data['actas'])
+    
+    with _estados_lock:
+        _estados_incrementales[clave] = estado
+    return estado
+
+def obtener_proyeccion(data, num_simulaciones=NUM_SIMULACIONES):
+    """
+    Devuelve la proyección Monte Carlo de la temporada (ver calculos/proyeccion.py),
+    en caché compartida por versión de los datos
+    
+    Args:
+        data: Diccionario devuelto por cargar_datos
+        num_simulaciones: Número de temporadas simuladas
+        
+    Returns:
+        dict: Resultado de simular_temporada
+    """
+    version = data.get('version')
+    if version is None:
+        return simular_temporada(data['jornadas'], data['actas'], num_simulaciones)
+    return _proyeccion_version(data, num_simulaciones, version)
+
+@st.cache_resource(max_entries=4)
+def _proyeccion_version(_data, num_simulaciones, version):
+    """
+    Caché de la proyección de una versión concreta (ver obtener_proyeccion)
+    """
+    return simular_temporada(_data['jornadas'], _data['actas'], num_simulaciones)
+
+def obtener_linea_temporal(data):
+    """
+    Devuelve la línea temporal de eventos de todos los partidos de la liga
+    (ver calculos/linea_temporal.py), en caché compartida por versión de los datos
+    
+    Args:
+        data: Diccionario devuelto por cargar_datos
+        
+    Returns:
+        dict: Resultado de construir_linea_temporal
+    """
+    version = data.get('version')
+    if version is None:
+        return construir_linea_temporal(data['actas'], data['goles'], data['sustituciones'])
+    return _linea_temporal_version(data, version)
+
+@st.cache_resource(max_entries=4)
+def _linea_temporal_version(_data, version):
+    """
+    Caché de la línea temporal de una versión concreta (ver obtener_linea_temporal)
+    """
+    return construir_linea_temporal(_data['actas'], _data['goles'], _data['sustituciones'])
+
+def obtener_intervalos_jugadores(data):
+    """
+    Devuelve los intervalos en el campo de todos los jugadores de la liga y
+    su +/- (ver construir_intervalos_jugadores y calcular_mas_menos en
+    calculos/calculo_jugadores.py), en caché compartida por versión de los datos
+    
+    Args:
+        data: Diccionario devuelto por cargar_datos
+        
+    Returns:
+        dict: 'intervalos' (DataFrame) y 'mas_menos' (DataFrame por jugador y equipo)
+    """
+    version = data.get('version')
+    if version is None:
+        return _calcular_intervalos(data)
+    return _intervalos_version(data, version)
+
+def _calcular_intervalos(data):
+    """
+    Intervalos y +/- a partir de la línea temporal de la liga
+    """
+    linea = obtener_linea_temporal(data)
+    intervalos = construir_intervalos_jugadores(data['actas'], data['sustituciones'], linea['partidos'])
+    return {
+        'intervalos': intervalos,
+        'mas_menos': calcular_mas_menos(intervalos, goles_linea(linea), linea['partidos'])
+    }
+
+@st.cache_resource(max_entries=4)
+def _intervalos_version(_data, version):
+    """
+    Caché de los intervalos de una versión concreta (ver obtener_intervalos_jugadores)
+    """
+    return _calcular_intervalos(_data)
+
+def obtener_mas_menos_ajustado(data):
+    """
+    Devuelve el +/- ajustado por regresión ridge de todos los jugadores de la
+    liga (ver calculos/mas_menos_ajustado.py), en caché compartida por versión
+    de los datos
+    
+    Args:
+        data: Diccionario devuelto por cargar_datos
+        
+    Returns:
+        dict: Resultado de construir_mas_menos_ajustado
+    """
+    version = data.get('version')
+    if version is None:
+        return _calcular_mas_menos_ajustado(data)
+    return _mas_menos_ajustado_version(data, version)
+
+def _calcular_mas_menos_ajustado(data):
+    """
+    +/- ajustado a partir de los intervalos y los goles de la línea temporal.
+    El módulo (y scipy.sparse) se importa aquí para no cargarlo en cada página.
+    """
+    from calculos.mas_menos_ajustado import construir_mas_menos_ajustado
+    
+    linea = obtener_linea_temporal(data)
+    intervalos = obtener_intervalos_jugadores(data)['intervalos']
+    return construir_mas_menos_ajustado(intervalos, goles_linea(linea))
+
+@st.cache_resource(max_entries=4)
+def _mas_menos_ajustado_version(_data, version):
+    """
+    Caché del +/- ajustado de una versión concreta (ver obtener_mas_menos_ajustado)
+    """
+    return _calcular_mas_menos_ajustado(_data)
+
+def obtener_parejas(data):
+    """
+    Devuelve las matrices de minutos y goles compartidos por cada pareja de
+    jugadores de cada equipo (ver calculos/parejas_jugadores.py), en caché
+    compartida por versión de los datos
+    
+    Args:
+        data: Diccionario devuelto por cargar_datos
+        
+    Returns:
+        dict: Resultado de construir_matrices_parejas (equipo -> matrices)
+    """
+    version = data.get('version')
+    if version is None:
+        return construir_matrices_parejas(obtener_mas_menos_ajustado(data)['tramos'])
+    return _parejas_version(data, version)
+
+@st.cache_resource(max_entries=4)
+def _parejas_version(_data, version):
+    """
+    Caché de las matrices de parejas de una versión concreta (ver obtener_parejas)
+    """
+    return construir_matrices_parejas(obtener_mas_menos_ajustado(_data)['tramos'])
+
+def obtener_forma(data):
+    """
+    Devuelve las métricas de forma reciente de todos los equipos para cada
+    ventana de jornadas (ver calculos/forma_equipos.py), en caché compartida
+    por versión de los datos
+    
+    Args:
+        data: Diccionario devuelto por cargar_datos
+        
+    Returns:
+        dict: Resultado de construir_forma
+    """
+    version = data.get('version')
+    if version is None:
+        return construir_forma(obtener_clasificacion(data), data['actas'])
+    return _forma_version(data, version)
+
+@st.cache_resource(max_entries=4)
+def _forma_version(_data, version):
+    """
+    Caché de la forma de una versión concreta (ver obtener_forma)
+    """
+    return construir_forma(obtener_clasificacion(_data), _data['actas'])
+
+@instrumentar
+def leer_datos(data_path="data", temporadas=None):
+    """
+    Lee y prepara todos los datasets sin pasar por la caché de Streamlit,
+    para poder usarlos también desde scripts sin interfaz.
+    Solo se leen los archivos de las temporadas pedidas (ver utils/almacen.py).
+    
+    Args:
+        data_path: Carpeta donde están los archivos de datos
+        temporadas: None (temporada activa), 'todas', un código o una lista de códigos
+        
+    Returns:
+        dict: Diccionario de DataFrames (mismas claves que cargar_datos)
+    """
+    # Versión de los archivos antes de leerlos: si cambian durante la lectura,
+    # la siguiente llamada verá una versión distinta y volverá a cargarlos
+    version = version_datos(data_path, temporadas)
+    
+    # Cargar las tablas de las temporadas pedidas
+    actas = leer_tabla('actas', temporadas, data_path)
+    goles = leer_tabla('goles', temporadas, data_path)
+    jornadas = leer_tabla('jornadas', temporadas, data_path)
+    sustituciones = leer_tabla('sustituciones', temporadas, data_path)
     
     # Filtrar solo datos de Penya Independent
     actas_penya = actas[actas['equipo'].str.contains('PENYA INDEPENDENT', na=False)]
     
-    # Crear un mapa de jugador -> equipo para filtrar goles
-    jugador_equipo = actas[['jugador', 'equipo']].drop_duplicates()
-    jugador_equipo_dict = dict(zip(jugador_equipo['jugador'], jugador_equipo['equipo']))
+    # Crear un mapa (jugador, temporada) -> equipo para filtrar goles
+    # (un jugador puede cambiar de equipo entre temporadas)
+    jugador_equipo = actas[['jugador', 'temporada', 'equipo']].drop_duplicates(['jugador', 'temporada'], keep='last')
     
     # Filtrar goles de Penya Independent usando el mapa de jugadores
-    goles['equipo'] = goles['jugador'].map(jugador_equipo_dict)
+    goles = goles.merge(jugador_equipo, on=['jugador', 'temporada'], how='left')
     goles_penya = goles[goles['equipo'].str.contains('PENYA INDEPENDENT', na=False)].copy()
     
     # Filtrar partidos donde participa Penya Independent
@@ -118,7 +488,10 @@ def cargar_datos():
     sustituciones_penya = sustituciones[sustituciones['equipo'].str.contains('PENYA INDEPENDENT', na=False)]
     
     # Calcular las medias de la liga (se almacenarán en caché)
-    medias_liga = calcular_medias_liga(actas)
+    medias_liga = calcular_medias_liga(actas, version)
+    
+    # Perfiles de los jugadores de Penya Independent, calculados una sola vez
+    perfiles_jugadores = construir_perfiles_jugadores(actas_penya, goles_penya)
     
     return {
         'actas': actas,
@@ -129,5 +502,7 @@ def cargar_datos():
         'partidos_penya': partidos_penya,
         'sustituciones': sustituciones,
         'sustituciones_penya': sustituciones_penya,
-        'medias_liga': medias_liga  # Agregar las medias al resultado
+        'medias_liga': medias_liga,  # Agregar las medias al resultado
+        'perfiles_jugadores': perfiles_jugadores,
+        'version': version
     }
\ No newline at end of file
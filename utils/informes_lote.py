@@ -0,0 +1,320 @@
+"""
+Generación en lote de todos los informes PDF (jugadores, equipos y análisis comparativo)
+Ubicación: utils/informes_lote.py
+
+Uso:
+    python utils/informes_lote.py --salida informes [--tipos jugador equipo ml] [--procesos 4]
+
+Los informes se generan en paralelo en un pool de procesos que comparten los
+datos, los agregados precalculados y una caché en disco de gráficos
+rasterizados. Al terminar se escribe un manifest.json y un zip con todos los
+PDFs. Los informes cuyos datos de entrada no han cambiado desde la ejecución
+anterior no se vuelven a generar.
+"""
+import os
+import sys
+import re
+import json
+import zipfile
+import hashlib
+import argparse
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Agregar el directorio raíz al path para importaciones
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+# Cambiar este valor invalida todos los informes generados anteriormente
+VERSION_INFORMES = "1"
+
+TIPOS_INFORME = ('jugador', 'equipo', 'ml')
+
+# Estado compartido de cada proceso del pool (se rellena en _inicializar_proceso)
+_datos_proceso = None
+_ml_proceso = None
+
+
+def _nombre_archivo(texto):
+    """
+    Convierte el nombre de un jugador o equipo en un nombre de archivo seguro
+    """
+    return re.sub(r'[^0-9a-zA-Z]+', '_', str(texto)).strip('_').lower()
+
+
+def _huella(*partes):
+    """
+    Calcula un hash estable a partir de DataFrames y valores simples
+    """
+    h = hashlib.sha1(VERSION_INFORMES.encode('utf-8'))
+    for parte in partes:
+        if isinstance(parte, pd.DataFrame):
+            h.update('|'.join(map(str, parte.columns)).encode('utf-8'))
+            h.update(pd.util.hash_pandas_object(parte, index=False).values.tobytes())
+        else:
+            h.update(json.dumps(parte, sort_keys=True, default=str).encode('utf-8'))
+    return h.hexdigest()
+
+
+def preparar_datos_ml(data):
+    """
+    Calcula una sola vez el clustering y el mapa de equipos que comparten
+    todos los informes de análisis comparativo
+
+    Returns:
+        dict: datos_clustered, caracteristicas_clusters, mapa_fig y cluster_colors
+    """
+    from pages.ml import (
+        preparar_datos_clustering, realizar_clustering,
+        generar_caracteristicas_cluster, crear_mapa_equipos
+    )
+
+    datos_equipos = preparar_datos_clustering(data)
+    datos_clustered = realizar_clustering(datos_equipos, n_clusters=4)
+    caracteristicas_clusters = generar_caracteristicas_cluster(datos_clustered)
+    mapa_fig, colores_cluster = crear_mapa_equipos(datos_clustered)
+
+    return {
+        'datos_clustered': datos_clustered,
+        'caracteristicas_clusters': caracteristicas_clusters,
+        'mapa_fig': mapa_fig,
+        'cluster_colors': colores_cluster
+    }
+
+
+def listar_informes(data, datos_ml, tipos):
+    """
+    Enumera los informes a generar junto con la huella de sus datos de entrada
+
+    Returns:
+        list: Diccionarios con tipo, entidad, archivo y huella
+    """
+    informes = []
+    actas = data['actas']
+
+    if 'jugador' in tipos:
+        goles = data['goles']
+        # El informe cuenta los partidos de Penya en los que no participó el jugador
+        huella_partidos = _huella(data['partidos_penya'])
+        for jugador in sorted(data['actas_penya']['jugador'].dropna().unique()):
+            informes.append({
+                'tipo': 'jugador',
+                'entidad': jugador,
+                'archivo': f"analisis_jugador_{_nombre_archivo(jugador)}.pdf",
+                'huella': _huella(
+                    'jugador', jugador,
+                    actas[actas['jugador'] == jugador],
+                    goles[goles['jugador'] == jugador],
+                    huella_partidos
+                )
+            })
+
+    if 'equipo' in tipos:
+        jornadas = data['jornadas']
+        sustituciones = data['sustituciones']
+        for equipo in sorted(actas['equipo'].dropna().unique()):
+            # Actas del equipo y de sus rivales (goles y tarjetas en contra)
+            actas_equipo = actas[(actas['equipo'] == equipo) | (actas['rival'] == equipo)]
+            jugadores_equipo = set(actas.loc[actas['equipo'] == equipo, 'jugador'])
+            informes.append({
+                'tipo': 'equipo',
+                'entidad': equipo,
+                'archivo': f"analisis_equipo_{_nombre_archivo(equipo)}.pdf",
+                'huella': _huella(
+                    'equipo', equipo,
+                    actas_equipo,
+                    data['goles'][data['goles']['jugador'].isin(jugadores_equipo)],
+                    jornadas[jornadas['jornada'].isin(actas_equipo['jornada'].unique())],
+                    sustituciones[sustituciones['equipo'] == equipo],
+                    data.get('medias_liga', {})
+                )
+            })
+
+    if 'ml' in tipos and datos_ml is not None:
+        # El mapa incluye a todos los equipos, así que cualquier cambio afecta a todos los informes
+        huella_clustering = _huella(datos_ml['datos_clustered'])
+        for equipo in sorted(datos_ml['datos_clustered']['equipo_limpio'].unique()):
+            informes.append({
+                'tipo': 'ml',
+                'entidad': equipo,
+                'archivo': f"analisis_comparativo_{_nombre_archivo(equipo)}.pdf",
+                'huella': _huella('ml', equipo, huella_clustering)
+            })
+
+    return informes
+
+
+def _inicializar_proceso(data, datos_ml, carpeta_cache):
+    """
+    Inicializa cada proceso del pool con los datos compartidos y la caché de gráficos
+    """
+    global _datos_proceso, _ml_proceso
+    _datos_proceso = data
+    _ml_proceso = datos_ml
+
+    from utils import render_figuras
+    from utils.pdf_export import configurar_cache_disco
+
+    # Un solo motor de exportación por proceso: el paralelismo ya lo da el pool
+    render_figuras.NUM_MOTORES = 1
+    configurar_cache_disco(carpeta_cache)
+
+
+def _generar_informe(tipo, entidad, ruta_pdf):
+    """
+    Genera un informe en un proceso del pool y lo guarda en disco
+
+    Returns:
+        tuple: (tipo, entidad, error o None)
+    """
+    try:
+        if tipo == 'jugador':
+            from utils.pdf_jugador import generate_jugador_pdf
+            pdf = generate_jugador_pdf(_datos_proceso, entidad)
+        elif tipo == 'equipo':
+            from utils.pdf_equipo import generate_equipo_pdf
+            pdf = generate_equipo_pdf(_datos_proceso, entidad)
+        else:
+            from utils.pdf_ml import generate_ml_pdf
+            from pages.ml import graficar_comparativa
+
+            datos_clustered = _ml_proceso['datos_clustered']
+            equipo_data = datos_clustered[datos_clustered['equipo_limpio'] == entidad].iloc[0]
+            penya_data = datos_clustered[datos_clustered['equipo_limpio'].str.contains('PENYA INDEPENDENT', case=False)]
+
+            # Gráfico comparativo solo para equipos distintos de Penya
+            comparativa_fig = None
+            if not penya_data.empty and 'PENYA INDEPENDENT' not in entidad.upper():
+                penya_row = penya_data.iloc[0]
+                comparativa_fig = graficar_comparativa(
+                    equipo_data,
+                    {k: penya_row[k] for k in equipo_data.index if k in penya_row},
+                    titulo=""
+                )
+
+            pdf = generate_ml_pdf(
+                _ml_proceso,
+                entidad,
+                datos_clustered,
+                _ml_proceso['caracteristicas_clusters'],
+                _ml_proceso['mapa_fig'],
+                comparativa_fig
+            )
+
+        pdf.output(ruta_pdf)
+        return tipo, entidad, None
+    except Exception as e:
+        return tipo, entidad, str(e)
+
+
+def generar_informes(carpeta_salida, tipos=TIPOS_INFORME, procesos=None, data_path="data"):
+    """
+    Genera todos los informes pedidos y escribe el manifest y el zip
+
+    Args:
+        carpeta_salida: Carpeta donde se guardan los PDFs, el manifest y el zip
+        tipos: Tipos de informe a generar ('jugador', 'equipo', 'ml')
+        procesos: Número de procesos del pool (por defecto, uno por CPU)
+        data_path: Carpeta de los datos
+
+    Returns:
+        dict: Manifest de la ejecución
+    """
+    from utils.data import leer_datos
+
+    print("🔄 Cargando datos...")
+    data = leer_datos(data_path)
+
+    datos_ml = None
+    if 'ml' in tipos:
+        print("🔄 Calculando clustering de equipos...")
+        datos_ml = preparar_datos_ml(data)
+
+    carpeta_pdfs = os.path.join(carpeta_salida, 'pdf')
+    carpeta_cache = os.path.join(carpeta_salida, '.cache_graficos')
+    ruta_manifest = os.path.join(carpeta_salida, 'manifest.json')
+    os.makedirs(carpeta_pdfs, exist_ok=True)
+
+    # Manifest de la ejecución anterior para saltar los informes sin cambios
+    anterior = {}
+    if os.path.exists(ruta_manifest):
+        with open(ruta_manifest, encoding='utf-8') as f:
+            anterior = json.load(f).get('informes', {})
+
+    informes = listar_informes(data, datos_ml, tipos)
+    pendientes = []
+    for informe in informes:
+        clave = f"{informe['tipo']}/{informe['entidad']}"
+        previo = anterior.get(clave, {})
+        ruta_pdf = os.path.join(carpeta_pdfs, informe['archivo'])
+        if (previo.get('huella') == informe['huella'] and previo.get('estado') != 'error'
+                and os.path.exists(ruta_pdf)):
+            informe['estado'] = 'sin_cambios'
+        else:
+            pendientes.append(informe)
+
+    print(f"📊 {len(informes)} informes, {len(pendientes)} por generar")
+
+    if pendientes:
+        por_clave = {(i['tipo'], i['entidad']): i for i in pendientes}
+        with ProcessPoolExecutor(
+            max_workers=procesos,
+            initializer=_inicializar_proceso,
+            initargs=(data, datos_ml, carpeta_cache)
+        ) as executor:
+            futuros = [
+                executor.submit(_generar_informe, i['tipo'], i['entidad'],
+                                os.path.join(carpeta_pdfs, i['archivo']))
+                for i in pendientes
+            ]
+            for futuro in as_completed(futuros):
+                tipo, entidad, error = futuro.result()
+                informe = por_clave[(tipo, entidad)]
+                if error:
+                    informe['estado'] = 'error'
+                    informe['error'] = error
+                    print(f"  ❌ {tipo}: {entidad} - {error}")
+                else:
+                    informe['estado'] = 'generado'
+                    print(f"  ✅ {tipo}: {entidad}")
+
+    manifest = {
+        'generado': datetime.now().isoformat(timespec='seconds'),
+        'version': VERSION_INFORMES,
+        'informes': {
+            f"{i['tipo']}/{i['entidad']}": {k: v for k, v in i.items() if k not in ('tipo', 'entidad')}
+            for i in informes
+        }
+    }
+    with open(ruta_manifest, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    # Empaquetar todos los PDFs válidos junto con el manifest
+    ruta_zip = os.path.join(carpeta_salida, 'informes.zip')
+    with zipfile.ZipFile(ruta_zip, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        for informe in informes:
+            ruta_pdf = os.path.join(carpeta_pdfs, informe['archivo'])
+            if informe['estado'] != 'error' and os.path.exists(ruta_pdf):
+                zf.write(ruta_pdf, arcname=os.path.join(informe['tipo'], informe['archivo']))
+        zf.write(ruta_manifest, arcname='manifest.json')
+
+    generados = sum(1 for i in informes if i['estado'] == 'generado')
+    sin_cambios = sum(1 for i in informes if i['estado'] == 'sin_cambios')
+    errores = sum(1 for i in informes if i['estado'] == 'error')
+    print(f"✅ Generados: {generados} | Sin cambios: {sin_cambios} | Errores: {errores}")
+    print(f"📦 Zip: {ruta_zip}")
+
+    return manifest
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Genera en lote los informes PDF de jugadores y equipos")
+    parser.add_argument('--salida', default='informes', help="Carpeta de salida")
+    parser.add_argument('--tipos', nargs='+', choices=TIPOS_INFORME, default=list(TIPOS_INFORME),
+                        help="Tipos de informe a generar")
+    parser.add_argument('--procesos', type=int, default=None, help="Número de procesos en paralelo")
+    parser.add_argument('--datos', default='data', help="Carpeta de datos")
+    args = parser.parse_args()
+
+    generar_informes(args.salida, tipos=args.tipos, procesos=args.procesos, data_path=args.datos)
@@ -0,0 +1,267 @@
+"""
+Instrumentación ligera de las funciones más usadas de la aplicación.
+
+Cada llamada medida guarda su duración, las filas de entrada y de salida y,
+si está activado el trazado de memoria, los bytes netos reservados (memoria
+trazada al salir menos memoria al entrar; no es el pico). Los registros se
+guardan en un buffer circular en memoria (los más antiguos se descartan) y,
+opcionalmente, se añaden a un fichero JSON lines para analizarlos fuera de
+la aplicación. El fichero se mantiene abierto y se vuelca a disco cada
+REGISTROS_POR_VOLCADO registros y al terminar el proceso.
+
+El trazado de memoria (tracemalloc) es global al proceso: afecta a todas las
+sesiones abiertas, no solo a la del administrador que lo activa.
+
+Uso:
+    @instrumentar
+    def calcular_algo(df): ...
+
+    with medir("bloque costoso") as registro:
+        ...
+        registro['filas_salida'] = len(resultado)
+
+Variables de entorno:
+    PENYA_INSTRUMENTACION_JSONL: ruta del fichero JSON lines donde se añade cada registro
+    PENYA_TRAZAR_MEMORIA: si vale 1, mide la memoria reservada con tracemalloc desde el arranque
+"""
+import os
+import json
+import time
+import atexit
+import threading
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+
+# Número máximo de llamadas que se conservan en memoria
+MAX_REGISTROS = 5000
+
+# Registros escritos en el fichero JSON lines entre dos volcados a disco
+REGISTROS_POR_VOLCADO = 100
+
+_registros = deque(maxlen=MAX_REGISTROS)
+_lock = threading.Lock()
+_ruta_jsonl = os.environ.get("PENYA_INSTRUMENTACION_JSONL")
+_fichero_jsonl = None
+_sin_volcar = 0
+
+
+def activar_trazado_memoria(activar=True):
+    """
+    Activa o desactiva la medición de memoria con tracemalloc.
+    Afecta a todo el proceso y, con el trazado activo, la aplicación es
+    bastante más lenta.
+    """
+    if activar and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    elif not activar and tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def trazando_memoria():
+    """
+    Indica si la medición de memoria está activa
+    """
+    return tracemalloc.is_tracing()
+
+
+def _cerrar_jsonl():
+    """
+    Vuelca y cierra el fichero JSON lines (se llama con _lock adquirido)
+    """
+    global _fichero_jsonl, _sin_volcar
+    if _fichero_jsonl is not None:
+        try:
+            _fichero_jsonl.close()
+        except OSError as e:
+            print(f"No se pudo cerrar el registro de rendimiento: {e}")
+    _fichero_jsonl = None
+    _sin_volcar = 0
+
+
+def configurar_exportacion(ruta):
+    """
+    Indica el fichero JSON lines al que se añade cada registro (None para desactivarlo)
+    """
+    global _ruta_jsonl
+    with _lock:
+        _cerrar_jsonl()
+        _ruta_jsonl = ruta
+
+
+def _contar_filas(valor):
+    """
+    Cuenta las filas de un DataFrame, Serie o array, o de una colección de ellos
+    """
+    if hasattr(valor, 'shape') and len(getattr(valor, 'shape', ())) > 0:
+        return int(valor.shape[0])
+    if isinstance(valor, dict):
+        return sum(_contar_filas(v) for v in valor.values() if hasattr(v, 'shape'))
+    if isinstance(valor, (list, tuple)):
+        return sum(_contar_filas(v) for v in valor if hasattr(v, 'shape'))
+    return 0
+
+
+def _guardar_registro(registro):
+    """
+    Añade un registro al buffer y, si está configurado, al fichero JSON lines
+    (abierto una sola vez y volcado por lotes)
+    """
+    global _fichero_jsonl, _sin_volcar
+    with _lock:
+        _registros.append(registro)
+        if _ruta_jsonl:
+            try:
+                if _fichero_jsonl is None:
+                    _fichero_jsonl = open(_ruta_jsonl, 'a', encoding='utf-8')
+                _fichero_jsonl.write(json.dumps(registro, ensure_ascii=False) + '\n')
+                _sin_volcar += 1
+                if _sin_volcar >= REGISTROS_POR_VOLCADO:
+                    _fichero_jsonl.flush()
+                    _sin_volcar = 0
+            except OSError as e:
+                print(f"No se pudo escribir el registro de rendimiento: {e}")
+                _cerrar_jsonl()
+
+
+@contextmanager
+def medir(nombre, filas_entrada=0):
+    """
+    Mide un bloque de código
+
+    Args:
+        nombre: Nombre con el que se agrupan las mediciones
+        filas_entrada: Filas de los datos de entrada (opcional)
+
+    Yields:
+        dict: Registro de la medición; se puede rellenar 'filas_salida' dentro del bloque
+    """
+    registro = {
+        'funcion': nombre,
+        'inicio': time.time(),
+        'ms': 0.0,
+        'filas_entrada': filas_entrada,
+        'filas_salida': 0,
+        'bytes_netos': None,
+        'error': False
+    }
+    memoria_inicial = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None
+    inicio = time.perf_counter()
+    try:
+        yield registro
+    except BaseException:
+        registro['error'] = True
+        raise
+    finally:
+        registro['ms'] = round((time.perf_counter() - inicio) * 1000, 3)
+        if memoria_inicial is not None and tracemalloc.is_tracing():
+            registro['bytes_netos'] = tracemalloc.get_traced_memory()[0] - memoria_inicial
+        _guardar_registro(registro)
+
+
+def instrumentar(func=None, nombre=None):
+    """
+    Decorador que mide cada llamada a la función. Se puede usar como
+    @instrumentar o @instrumentar(nombre="...")
+    """
+    if func is None:
+        return lambda f: instrumentar(f, nombre=nombre)
+
+    # getattr: algunos envoltorios (por ejemplo los de st.cache_data) pueden no exponer __qualname__
+    nombre_completo = getattr(func, '__qualname__', getattr(func, '__name__', repr(func)))
+    nombre_funcion = nombre or f"{getattr(func, '__module__', '')}.{nombre_completo}"
+
+    @wraps(func)
+    def envoltorio(*args, **kwargs):
+        filas_entrada = _contar_filas(args) + _contar_filas(kwargs)
+        with medir(nombre_funcion, filas_entrada) as registro:
+            resultado = func(*args, **kwargs)
+            registro['filas_salida'] = _contar_filas(resultado)
+        return resultado
+
+    # Conservar utilidades del objeto envuelto, como clear() de st.cache_data
+    if hasattr(func, 'clear'):
+        envoltorio.clear = func.clear
+
+    return envoltorio
+
+
+def _percentil(valores_ordenados, p):
+    """
+    Percentil p (0-100) por interpolación lineal de una lista ya ordenada
+    """
+    if not valores_ordenados:
+        return 0.0
+    posicion = (len(valores_ordenados) - 1) * p / 100
+    inferior = int(posicion)
+    superior = min(inferior + 1, len(valores_ordenados) - 1)
+    fraccion = posicion - inferior
+    return valores_ordenados[inferior] * (1 - fraccion) + valores_ordenados[superior] * fraccion
+
+
+def resumen_rendimiento():
+    """
+    Agrega los registros del buffer por función
+
+    Returns:
+        list: Un diccionario por función con llamadas, p50, p95, máximo y total
+              en ms, filas medias de entrada/salida y memoria neta p95 en KB,
+              ordenado de mayor a menor tiempo total
+    """
+    with _lock:
+        registros = list(_registros)
+
+    por_funcion = {}
+    for registro in registros:
+        por_funcion.setdefault(registro['funcion'], []).append(registro)
+
+    filas = []
+    for funcion, lista in por_funcion.items():
+        tiempos = sorted(r['ms'] for r in lista)
+        memoria = sorted(r['bytes_netos'] for r in lista if r.get('bytes_netos') is not None)
+        filas.append({
+            'funcion': funcion,
+            'llamadas': len(lista),
+            'p50_ms': round(_percentil(tiempos, 50), 2),
+            'p95_ms': round(_percentil(tiempos, 95), 2),
+            'max_ms': round(tiempos[-1], 2),
+            'total_ms': round(sum(tiempos), 1),
+            'filas_entrada': round(sum(r['filas_entrada'] for r in lista) / len(lista)),
+            'filas_salida': round(sum(r['filas_salida'] for r in lista) / len(lista)),
+            'memoria_neta_p95_kb': round(_percentil(memoria, 95) / 1024, 1) if memoria else None,
+            'errores': sum(1 for r in lista if r['error'])
+        })
+
+    return sorted(filas, key=lambda fila: fila['total_ms'], reverse=True)
+
+
+def exportar_jsonl():
+    """
+    Devuelve todos los registros del buffer en formato JSON lines
+
+    Returns:
+        str: Una línea JSON por llamada medida
+    """
+    with _lock:
+        registros = list(_registros)
+    return ''.join(json.dumps(r, ensure_ascii=False) + '\n' for r in registros)
+
+
+def limpiar_registros():
+    """
+    Vacía el buffer de registros
+    """
+    with _lock:
+        _registros.clear()
+
+
+def _cerrar_al_salir():
+    with _lock:
+        _cerrar_jsonl()
+
+
+atexit.register(_cerrar_al_salir)
+
+if os.environ.get("PENYA_TRAZAR_MEMORIA") == "1":
+    activar_trazado_memoria(True)
@@ -4,7 +4,9 @@ Funciones específicas para la generación de PDF de equipos
 import io
 from utils.pdf_export import PenyaPDF
 from utils.constants import PENYA_PRIMARY_COLOR, PENYA_SECONDARY_COLOR, COLOR_TARJETAS_AMARILLAS, COLOR_TARJETAS_ROJAS
+from utils.instrumentacion import instrumentar
 
+@instrumentar
 def generate_equipo_pdf(data, equipo_seleccionado):
     """
     Genera un PDF con el análisis del equipo seleccionado
@@ -21,7 +23,7 @@ def generate_equipo_pdf(data, equipo_seleccionado):
             calcular_estadisticas_generales, calcular_metricas_avanzadas,
             obtener_rivales_con_goles, analizar_tarjetas_por_jornada,
             analizar_tipos_goles, calcular_goles_contra,
-            calcular_tarjetas_rivales, normalizar_nombre_equipo
+            calcular_tarjetas_rivales
         )
         from calculos.calculo_jugadores import (
             obtener_top_goleadores, obtener_top_amonestados,
@@ -34,60 +36,29 @@ def generate_equipo_pdf(data, equipo_seleccionado):
             graficar_goles_por_tiempo
         )
         from visualizaciones.jugadores import (
-            graficar_goles_por_jugador, graficar_tarjetas_por_jugador
+            graficar_goles_por_jugador, graficar_tarjetas_por_jugador,
+            construir_goles_por_jugador
         )
         from visualizaciones.minutos import (
             graficar_minutos_por_jugador,
-            graficar_minutos_por_jugador_desglose
+            graficar_minutos_por_jugador_desglose,
+            construir_minutos_desglose,
+            construir_distribucion_sustituciones
         )
-        import plotly.express as px
         import plotly.graph_objects as go
         
         # Inicializar PDF con título mejorado
         pdf = PenyaPDF(title=f"Análisis del Equipo - {equipo_seleccionado}")
         pdf.set_auto_page_break(auto=True, margin=15)
         
-        # Filtrar datos del equipo
-        equipo_normalizado = normalizar_nombre_equipo(equipo_seleccionado)
-        
-        # Función para filtrar por equipo normalizado
-        def filtrar_por_equipo(campo):
-            return campo.apply(lambda x: normalizar_nombre_equipo(x)).str.contains(equipo_normalizado, na=False)
-        
-        # Filtrar actas
-        actas = data['actas']
-        actas_penya = data['actas'][filtrar_por_equipo(data['actas']['equipo'])]
-        
-        # Crear un mapa de jugador -> equipo para filtrar goles específicos del equipo
-        jugador_equipo = data['actas'][['jugador', 'equipo']].drop_duplicates()
-        jugador_equipo_dict = dict(zip(jugador_equipo['jugador'], jugador_equipo['equipo']))
-        
-        # Filtrar goles
-        goles_con_equipo = data['goles'].copy()
-        goles_con_equipo['equipo'] = goles_con_equipo['jugador'].map(jugador_equipo_dict)
-        goles_penya = goles_con_equipo[filtrar_por_equipo(goles_con_equipo['equipo'])].copy()
-        
-        # Filtrar partidos
-        partidos_filtrados = data['jornadas'][
-            (filtrar_por_equipo(data['jornadas']['equipo_local'])) | 
-            (filtrar_por_equipo(data['jornadas']['equipo_visitante']))
-        ].copy()
-        
-        # Añadir columna es_local para facilitar cálculos posteriores
-        partidos_filtrados['es_local'] = filtrar_por_equipo(partidos_filtrados['equipo_local'])
-        partidos_penya = partidos_filtrados
-        
-        # Filtrar sustituciones
-        sustituciones_penya = data['sustituciones'][filtrar_por_equipo(data['sustituciones']['equipo'])]
-        
-        # Recopilar los datos filtrados en un diccionario
-        datos_equipo = {
-            'actas': actas,
-            'actas_penya': actas_penya,
-            'goles_penya': goles_penya,
-            'partidos_penya': partidos_penya,
-            'sustituciones_penya': sustituciones_penya
-        }
+        # Filtrar datos del equipo (misma caché que la página de equipos)
+        from utils.data import obtener_datos_equipo
+        datos_equipo = obtener_datos_equipo(data, equipo_seleccionado)
+        actas = datos_equipo['actas']
+        actas_penya = datos_equipo['actas_penya']
+        goles_penya = datos_equipo['goles_penya']
+        partidos_penya = datos_equipo['partidos_penya']
+        sustituciones_penya = datos_equipo['sustituciones_penya']
         
         # Calcular número de partidos jugados
         partidos_jugados = partidos_penya[
@@ -282,25 +253,11 @@ def generate_equipo_pdf(data, equipo_seleccionado):
         try:
             goles_jugador = analizar_goles_por_jugador(goles_penya, actas_penya)
             if not goles_jugador.empty:
-                # Mostrar hasta 15 jugadores con goles
-                df = goles_jugador.head(15).copy()
-                
-                # Crear gráfico de barras horizontales
-                fig = px.bar(
-                    df,
-                    y='jugador',
-                    x='goles',
-                    orientation='h',
-                    labels={'jugador': 'Jugador', 'goles': 'Goles'},
-                    color_discrete_sequence=[PENYA_PRIMARY_COLOR]
-                )
+                # Mostrar hasta 15 jugadores con goles (copia de la figura en caché)
+                fig = go.Figure(construir_goles_por_jugador(goles_jugador, top_n=15))
                 
                 # Optimizar diseño del gráfico
                 fig.update_layout(
-                    yaxis={'categoryorder': 'total ascending'},
-                    xaxis_title='Goles',
-                    yaxis_title='',
-                    showlegend=False,
                     margin=dict(l=130, r=30, t=10, b=30),
                     width=300,
                     height=300,
@@ -404,36 +361,19 @@ def generate_equipo_pdf(data, equipo_seleccionado):
         try:
             minutos_jugador = analizar_minutos_por_jugador(actas_penya)
             if not minutos_jugador.empty:
-                df = minutos_jugador.head(15).copy()
-                
-                # Gráfico de minutos jugados
-                fig = go.Figure()
-                
-                # Minutos como local
-                fig.add_trace(go.Bar(
-                    y=df['jugador'],
-                    x=df['minutos_local'],
-                    name='Local',
-                    orientation='h',
-                    marker=dict(color=PENYA_PRIMARY_COLOR),
-                    text=df['minutos_local'],  # CAMBIO: Añadir valores en las barras
-                    textposition='auto',       # CAMBIO: Posición automática del texto
-                    insidetextanchor='middle', # CAMBIO: Ancla del texto
-                    textangle=0                # CAMBIO: Ángulo del texto
+                # Partir de la figura compartida con la web y adaptarla al PDF
+                fig = go.Figure(construir_minutos_desglose(
+                    minutos_jugador, 15, 'local_visitante',
+                    PENYA_PRIMARY_COLOR, PENYA_SECONDARY_COLOR
                 ))
                 
-                # Minutos como visitante
-                fig.add_trace(go.Bar(
-                    y=df['jugador'],
-                    x=df['minutos_visitante'],
-                    name='Visitante',
-                    orientation='h',
-                    marker=dict(color='#36A2EB' if PENYA_SECONDARY_COLOR is None else PENYA_SECONDARY_COLOR),
-                    text=df['minutos_visitante'],  # CAMBIO: Añadir valores en las barras
-                    textposition='auto',           # CAMBIO: Posición automática del texto
-                    insidetextanchor='middle',     # CAMBIO: Ancla del texto
-                    textangle=0                    # CAMBIO: Ángulo del texto
-                ))
+                # Mostrar los valores en las barras
+                fig.update_traces(
+                    texttemplate='%{x}',
+                    textposition='auto',
+                    insidetextanchor='middle',
+                    textangle=0
+                )
                 
                 # Optimizar diseño
                 fig.update_layout(
@@ -478,14 +418,8 @@ def generate_equipo_pdf(data, equipo_seleccionado):
                 # Calcular distribución de sustituciones
                 sustituciones_data = analizar_distribucion_sustituciones(sustituciones_penya, rango_minutos=5)
                 
-                # Gráfico de distribución de sustituciones
-                fig = px.bar(
-                    sustituciones_data['distribucion_minutos'],
-                    x='rango',
-                    y='cantidad',
-                    labels={'rango': 'Minuto', 'cantidad': 'Número de Sustituciones'},
-                    color_discrete_sequence=[PENYA_SECONDARY_COLOR]
-                )
+                # Gráfico de distribución de sustituciones (compartido con la web)
+                fig = go.Figure(construir_distribucion_sustituciones(sustituciones_data['distribucion_minutos']))
                 
                 # Optimizar diseño
                 fig.update_layout(
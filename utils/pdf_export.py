@@ -3,19 +3,316 @@ Utilidades principales para exportar datos a PDF
 """
 import os
 import pandas as pd
+import numpy as np
 import streamlit as st
 from fpdf import FPDF
 import tempfile
 import base64
-import matplotlib
-matplotlib.use('Agg') 
-import matplotlib.pyplot as plt
 from pathlib import Path
-import time
-from PIL import Image
 import io
+import zlib
+import struct
+import hashlib
+import pickle
+import threading
+from collections import OrderedDict
 from utils.constants import PENYA_PRIMARY_COLOR, PENYA_SECONDARY_COLOR, COLOR_TARJETAS_AMARILLAS, COLOR_TARJETAS_ROJAS
 
+# Resolución de impresión usada para calcular los píxeles de cada hueco del PDF
+DPI_IMPRESION = 200
+# Ancho útil de la página A4 en mm (se usa cuando no se indica el ancho del hueco)
+ANCHO_UTIL_MM = 190
+# Número máximo de imágenes rasterizadas que se mantienen en memoria
+MAX_IMAGENES_CACHE = 64
+
+# Caché de PNGs rasterizados indexada por el hash de la especificación de la figura
+_cache_imagenes = OrderedDict()
+_cache_lock = threading.Lock()
+# Carpeta opcional donde se comparten los PNGs entre procesos (generación en lote)
+_cache_disco = None
+# Logo de la cabecera ya convertido a PNG RGB (se prepara una sola vez por proceso)
+_logo_png = None
+
+
+def configurar_cache_disco(ruta):
+    """
+    Activa una segunda capa de caché en disco para que varios procesos
+    reutilicen las mismas imágenes rasterizadas
+    
+    Args:
+        ruta: Carpeta donde guardar los PNGs (None para desactivarla)
+    """
+    global _cache_disco
+    if ruta:
+        os.makedirs(ruta, exist_ok=True)
+    _cache_disco = ruta
+
+
+def _leer_de_cache(clave):
+    """
+    Busca un PNG en la caché de memoria y, si está activada, en la de disco
+    """
+    if clave is None:
+        return None
+    with _cache_lock:
+        datos = _cache_imagenes.get(clave)
+        if datos is not None:
+            _cache_imagenes.move_to_end(clave)
+            return datos
+    if _cache_disco:
+        ruta = os.path.join(_cache_disco, f"{clave}.png")
+        if os.path.exists(ruta):
+            with open(ruta, 'rb') as f:
+                datos = f.read()
+            _insertar_en_memoria(clave, datos)
+            return datos
+    return None
+
+
+def _insertar_en_memoria(clave, datos):
+    """
+    Inserta un PNG en la caché de memoria descartando los menos usados
+    """
+    with _cache_lock:
+        _cache_imagenes[clave] = datos
+        _cache_imagenes.move_to_end(clave)
+        while len(_cache_imagenes) > MAX_IMAGENES_CACHE:
+            _cache_imagenes.popitem(last=False)
+
+
+def _es_figura_plotly(fig):
+    """
+    Indica si la figura es de Plotly (en caso contrario se asume matplotlib)
+    """
+    return 'plotly' in str(type(fig))
+
+
+def _pixeles_hueco(w_mm):
+    """
+    Calcula el ancho en píxeles necesario para un hueco del PDF de w_mm milímetros
+    """
+    return max(1, int(round((w_mm or ANCHO_UTIL_MM) / 25.4 * DPI_IMPRESION)))
+
+
+def _huella_figura(fig, ancho_px):
+    """
+    Calcula el hash de la especificación de una figura para la resolución pedida.
+    
+    Args:
+        fig: Figura (matplotlib o plotly)
+        ancho_px: Ancho en píxeles al que se va a rasterizar
+        
+    Returns:
+        str: Hash hexadecimal, o None si la figura no se puede serializar
+    """
+    try:
+        if _es_figura_plotly(fig):
+            especificacion = fig.to_json().encode('utf-8')
+        else:
+            especificacion = pickle.dumps(fig)
+    except Exception:
+        return None
+    return hashlib.sha1(especificacion + f"|{ancho_px}".encode('utf-8')).hexdigest()
+
+
+def _dimensiones_png(datos):
+    """
+    Lee ancho y alto de un PNG directamente de su cabecera IHDR
+    """
+    return int.from_bytes(datos[16:20], 'big'), int.from_bytes(datos[20:24], 'big')
+
+
+def _tamano_plotly(fig):
+    """
+    Devuelve el ancho y alto base (en píxeles) con el que se exporta una figura de Plotly
+    """
+    return fig.layout.width or 700, fig.layout.height or 500
+
+
+def _renderizar_png(fig, ancho_px):
+    """
+    Rasteriza una figura a PNG en memoria con el ancho en píxeles indicado
+    """
+    if _es_figura_plotly(fig):
+        from utils.render_figuras import renderizar_figura
+        ancho_base, alto_base = _tamano_plotly(fig)
+        return renderizar_figura(fig, ancho_base, alto_base, ancho_px / ancho_base)
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', bbox_inches='tight', dpi=ancho_px / fig.get_figwidth())
+    return buffer.getvalue()
+
+
+def _guardar_en_cache(clave, datos):
+    """
+    Guarda un PNG en la caché de imágenes descartando los menos usados
+    """
+    if clave is None:
+        return
+    _insertar_en_memoria(clave, datos)
+    if _cache_disco:
+        # Escribir con nombre temporal y renombrar para que otro proceso nunca lea un PNG a medias
+        ruta = os.path.join(_cache_disco, f"{clave}.png")
+        ruta_tmp = f"{ruta}.{os.getpid()}.tmp"
+        with open(ruta_tmp, 'wb') as f:
+            f.write(datos)
+        os.replace(ruta_tmp, ruta)
+
+
+def rasterizar_figura(fig, w=None):
+    """
+    Convierte una figura en un PNG en memoria, reutilizando la caché si la
+    misma especificación ya se rasterizó a esa resolución.
+    
+    Args:
+        fig: Figura (matplotlib o plotly)
+        w: Ancho en mm del hueco donde se colocará (opcional)
+        
+    Returns:
+        tuple: (clave, bytes del PNG)
+    """
+    ancho_px = _pixeles_hueco(w)
+    clave = _huella_figura(fig, ancho_px)
+    datos = _leer_de_cache(clave)
+
+    if datos is None:
+        datos = _renderizar_png(fig, ancho_px)
+        _guardar_en_cache(clave, datos)
+
+    if not _es_figura_plotly(fig):
+        import matplotlib.pyplot as plt
+        plt.close(fig)
+
+    return clave or hashlib.sha1(datos).hexdigest(), datos
+
+
+def rasterizar_lote(figuras):
+    """
+    Rasteriza varias figuras de una vez. Las de Plotly que no estén en caché
+    se exportan juntas y en paralelo con los motores calientes de kaleido.
+    
+    Args:
+        figuras: Lista de tuplas (figura, ancho en mm del hueco)
+        
+    Returns:
+        list: Tuplas (clave, bytes del PNG) en el mismo orden
+    """
+    from utils.render_figuras import renderizar_lote
+    
+    resultados = [None] * len(figuras)
+    pendientes_plotly = []
+    
+    for i, (fig, w) in enumerate(figuras):
+        if not _es_figura_plotly(fig):
+            resultados[i] = rasterizar_figura(fig, w)
+            continue
+        
+        ancho_px = _pixeles_hueco(w)
+        clave = _huella_figura(fig, ancho_px)
+        datos = _leer_de_cache(clave)
+        if datos is not None:
+            resultados[i] = (clave, datos)
+        else:
+            pendientes_plotly.append((i, clave, fig, ancho_px))
+    
+    # Exportar en un solo lote todas las figuras de Plotly que faltan
+    trabajos = []
+    for _, _, fig, ancho_px in pendientes_plotly:
+        ancho_base, alto_base = _tamano_plotly(fig)
+        trabajos.append((fig, ancho_base, alto_base, ancho_px / ancho_base))
+    
+    for (i, clave, _, _), datos in zip(pendientes_plotly, renderizar_lote(trabajos)):
+        _guardar_en_cache(clave, datos)
+        resultados[i] = (clave or hashlib.sha1(datos).hexdigest(), datos)
+    
+    return resultados
+
+
+def _obtener_logo_png():
+    """
+    Devuelve el logo de Penya convertido a PNG RGB, preparándolo solo la primera vez
+    """
+    global _logo_png
+    if _logo_png is None:
+        penya_logo = Path(__file__).parent.parent / "assets" / "logo_penya.png"
+        if not penya_logo.exists():
+            return None
+        from PIL import Image
+        with Image.open(str(penya_logo)) as img_penya:
+            # Convertir a RGB si es necesario
+            if img_penya.mode != 'RGB':
+                img_penya = img_penya.convert('RGB')
+            img_buffer = io.BytesIO()
+            img_penya.save(img_buffer, format='PNG')
+        _logo_png = img_buffer.getvalue()
+    return _logo_png
+
+
+def _info_png(datos):
+    """
+    Extrae de los bytes de un PNG la información de imagen que espera FPDF,
+    igual que FPDF._parsepng pero sin leer de disco. El canal alfa se separa
+    con numpy en lugar de fila a fila.
+    
+    Args:
+        datos: Bytes del PNG
+        
+    Returns:
+        dict: Información de la imagen (w, h, cs, bpc, f, dp, pal, trns, data y smask si hay alfa)
+    """
+    if datos[:8] != b'\x89PNG\r\n\x1a\n' or datos[12:16] != b'IHDR':
+        raise ValueError("Los datos no son un PNG válido")
+    w, h, bpc, ct, compresion, filtro, entrelazado = struct.unpack('>IIBBBBB', datos[16:29])
+    if bpc > 8:
+        raise ValueError("Profundidad de 16 bits no soportada")
+    if ct not in (0, 2, 3, 4, 6):
+        raise ValueError(f"Tipo de color desconocido: {ct}")
+    if compresion != 0 or filtro != 0 or entrelazado != 0:
+        raise ValueError("PNG con compresión, filtro o entrelazado no soportado")
+    espacio = {0: 'DeviceGray', 2: 'DeviceRGB', 3: 'Indexed', 4: 'DeviceGray', 6: 'DeviceRGB'}[ct]
+    colores = 3 if espacio == 'DeviceRGB' else 1
+    dp = f'/Predictor 15 /Colors {colores} /BitsPerComponent {bpc} /Columns {w}'
+    
+    # Recorrer los bloques buscando paleta, transparencia y datos de imagen
+    pal, trns, idat = '', '', []
+    pos = 33
+    while pos + 8 <= len(datos):
+        longitud = struct.unpack('>I', datos[pos:pos + 4])[0]
+        tipo = datos[pos + 4:pos + 8]
+        contenido = datos[pos + 8:pos + 8 + longitud]
+        if tipo == b'PLTE':
+            pal = contenido
+        elif tipo == b'tRNS':
+            if ct == 0:
+                trns = [contenido[1]]
+            elif ct == 2:
+                trns = [contenido[1], contenido[3], contenido[5]]
+            elif b'\x00' in contenido:
+                trns = [contenido.index(b'\x00')]
+        elif tipo == b'IDAT':
+            idat.append(contenido)
+        elif tipo == b'IEND':
+            break
+        pos += longitud + 12
+    if ct == 3 and not pal:
+        raise ValueError("PNG indexado sin paleta")
+    
+    info = {'w': w, 'h': h, 'cs': espacio, 'bpc': bpc, 'f': 'FlateDecode',
+            'dp': dp, 'pal': pal, 'trns': trns, 'data': b''.join(idat)}
+    
+    if ct >= 4:
+        # Separar color y alfa conservando el byte de filtro de cada fila
+        canales = colores + 1
+        filas = np.frombuffer(zlib.decompress(info['data']), dtype=np.uint8).reshape(h, 1 + canales * w)
+        pixeles = filas[:, 1:].reshape(h, w, canales)
+        filtros = filas[:, :1]
+        color = np.hstack([filtros, pixeles[:, :, :colores].reshape(h, -1)])
+        alfa = np.hstack([filtros, pixeles[:, :, colores]])
+        info['data'] = zlib.compress(color.tobytes())
+        info['smask'] = zlib.compress(alfa.tobytes())
+    return info
+
+
 class PenyaPDF(FPDF):
     """
     Clase personalizada para generar PDFs con el estilo de Penya Independent
@@ -23,6 +320,10 @@ class PenyaPDF(FPDF):
     def __init__(self, title="Análisis Penya Independent"):
         super().__init__()
         self.title = title
+        # PNGs en memoria registrados por nombre para que FPDF los lea sin tocar disco
+        self._imagenes_memoria = {}
+        # Gráficos de Plotly pendientes de exportar en lote: (página, figura, x, y, w, h)
+        self._graficos_pendientes = []
         self.add_page()
         self.set_font('Arial', '', 12)
         
@@ -31,36 +332,15 @@ class PenyaPDF(FPDF):
         Encabezado del PDF con logos y título
         """
         try:
-            # Obtener la ruta base del proyecto
-            base_path = Path(__file__).parent.parent
-            
-            # Construir ruta absoluta para el logo de Penya 
-            penya_logo = base_path / "assets" / "logo_penya.png"
-            
-            # Verificar y convertir la imagen si es necesario
             # Reducir el tamaño del logo
             logo_width = 15  
             
-            if penya_logo.exists():
-                try:
-                    # Abrir y verificar la imagen con PIL
-                    with Image.open(str(penya_logo)) as img_penya:
-                        # Convertir a RGB si es necesario
-                        if img_penya.mode != 'RGB':
-                            img_penya = img_penya.convert('RGB')
-                        # Guardar en un buffer de memoria
-                        img_buffer = io.BytesIO()
-                        img_penya.save(img_buffer, format='PNG')
-                        img_buffer.seek(0)
-                        # Guardar temporalmente
-                        temp_penya = os.path.join(tempfile.gettempdir(), f'penya_logo_{time.time_ns()}.png')
-                        with open(temp_penya, 'wb') as f:
-                            f.write(img_buffer.getvalue())
-                        self.image(temp_penya, 10, 8, logo_width)
-                        # Limpiar
-                        os.unlink(temp_penya)
-                except Exception as e:
-                    print(f"Error al procesar logo_penya.png: {e}")
+            try:
+                logo_png = _obtener_logo_png()
+                if logo_png:
+                    self.image_png(logo_png, "penya_logo.png", 10, 8, logo_width)
+            except Exception as e:
+                print(f"Error al procesar logo_penya.png: {e}")
                 
             # Título centrado
             self.set_font('Arial', 'B', 15)
@@ -104,9 +384,34 @@ class PenyaPDF(FPDF):
             self.cell(metric_width, 8, str(value), 0, 0, 'C')
         self.ln(15)
     
+    def _parsepng(self, name):
+        """
+        Lee las imágenes registradas con image_png directamente de memoria
+        (FPDF 1.7.2 solo sabe abrir PNGs desde un archivo o una URL)
+        """
+        if name not in self._imagenes_memoria:
+            return super()._parsepng(name)
+        info = _info_png(self._imagenes_memoria[name])
+        if 'smask' in info and self.pdf_version < '1.4':
+            self.pdf_version = '1.4'
+        return info
+
+    def image_png(self, datos, nombre, x=None, y=None, w=0, h=0):
+        """
+        Inserta un PNG que está en memoria sin escribirlo en disco
+        
+        Args:
+            datos: Bytes del PNG
+            nombre: Nombre único con extensión .png (las repeticiones reutilizan la imagen)
+            x, y, w, h: Posición y tamaño en el PDF
+        """
+        self._imagenes_memoria[nombre] = datos
+        self.image(nombre, x=x, y=y, w=w, h=h)
+
     def add_plot(self, fig, x=10, y=None, w=None, h=None):
         """
-        Añade un gráfico al PDF, soporta tanto figuras de matplotlib como de plotly
+        Añade un gráfico al PDF, soporta tanto figuras de matplotlib como de plotly.
+        La figura se rasteriza en memoria a la resolución que necesita el hueco.
         
         Args:
             fig: Figura (matplotlib o plotly)
@@ -120,56 +425,85 @@ class PenyaPDF(FPDF):
             return
         
         try:
-            import tempfile
-            import os
-            
-            # Crear un archivo temporal
-            temp_fd, temp_path = tempfile.mkstemp(suffix='.png')
-            os.close(temp_fd)
-            
-            try:
-                # Detectar el tipo de figura y guardarla apropiadamente
-                if 'plotly' in str(type(fig)):
-                    # Es una figura de Plotly
-                    fig.write_image(temp_path, format="png")
-                else:
-                    # Es una figura de matplotlib
-                    fig.savefig(temp_path, format='png', bbox_inches='tight', dpi=300)
-                    plt.close(fig)
-                
-                # Abrir la imagen para obtener sus dimensiones
-                img = Image.open(temp_path)
-                
-                # Si no se especifica el alto, calcularlo manteniendo la proporción
-                if h is None and w is not None:
-                    aspect_ratio = img.height / img.width
-                    h = w * aspect_ratio
-                
-                # Añadir la imagen al PDF
+            # Las figuras de Plotly con tamaño conocido se reservan y se exportan
+            # todas juntas al generar el PDF (ver exportar_graficos_pendientes)
+            if _es_figura_plotly(fig) and w is not None:
+                if h is None:
+                    ancho_base, alto_base = _tamano_plotly(fig)
+                    h = w * alto_base / ancho_base
                 if y is None:
                     y = self.get_y()
-                self.image(temp_path, x=x, y=y, w=w, h=h)
-                
-                # Actualizar la posición Y
-                if h:
-                    self.set_y(y + h + 5)
-                
-            finally:
-                # Limpiar: cerrar la imagen y eliminar el archivo temporal
-                try:
-                    img.close()
-                except:
-                    pass
-                try:
-                    os.unlink(temp_path)
-                except:
-                    pass
+                self._graficos_pendientes.append((self.page, _copiar_figura(fig), x, y, w, h))
+                self.set_y(y + h + 5)
+                return
+            
+            clave, datos = rasterizar_figura(fig, w)
+            
+            # Si no se especifica el alto, calcularlo manteniendo la proporción
+            if h is None and w is not None:
+                ancho_img, alto_img = _dimensiones_png(datos)
+                h = w * alto_img / ancho_img
+            
+            # Añadir la imagen al PDF
+            if y is None:
+                y = self.get_y()
+            self.image_png(datos, f"{clave}.png", x=x, y=y, w=w or 0, h=h or 0)
+            
+            # Actualizar la posición Y
+            if h:
+                self.set_y(y + h + 5)
             
         except Exception as e:
             print(f"Error al añadir gráfico al PDF: {str(e)}")
             # No levantar la excepción para continuar con el resto del PDF
             pass
 
+    def exportar_graficos_pendientes(self):
+        """
+        Exporta en un solo lote los gráficos de Plotly reservados por add_plot
+        y los coloca en la página y posición donde se pidieron
+        """
+        if not self._graficos_pendientes:
+            return
+        
+        pendientes = self._graficos_pendientes
+        self._graficos_pendientes = []
+        
+        try:
+            imagenes = rasterizar_lote([(fig, w) for _, fig, _, _, w, _ in pendientes])
+        except Exception as e:
+            print(f"Error al exportar los gráficos del PDF: {str(e)}")
+            return
+        
+        pagina_actual = self.page
+        try:
+            for (pagina, _, x, y, w, h), (clave, datos) in zip(pendientes, imagenes):
+                self.page = pagina
+                try:
+                    self.image_png(datos, f"{clave}.png", x=x, y=y, w=w, h=h)
+                except Exception as e:
+                    print(f"Error al añadir gráfico al PDF: {str(e)}")
+        finally:
+            self.page = pagina_actual
+
+    def output(self, *args, **kwargs):
+        """
+        Genera el PDF asegurando antes que todos los gráficos están exportados
+        """
+        self.exportar_graficos_pendientes()
+        return super().output(*args, **kwargs)
+
+
+def _copiar_figura(fig):
+    """
+    Copia una figura de Plotly para que los cambios posteriores del llamador
+    no afecten a la versión que se exporta en el lote
+    """
+    try:
+        return fig.__class__(fig)
+    except Exception:
+        return fig
+
 
 def show_download_button(data, page_type, equipo_seleccionado=None, jugador_seleccionado=None):
     """
@@ -290,6 +624,24 @@ def show_download_button(data, page_type, equipo_seleccionado=None, jugador_sele
         print(f"Error detallado: {e}")
 
 
+@st.fragment
+def boton_pdf_bajo_demanda(data, page_type, equipo_seleccionado=None, jugador_seleccionado=None):
+    """
+    Muestra un botón que genera el PDF solo cuando se pulsa.
+
+    Se ejecuta como fragmento: pulsar el botón no recarga la página, y cambiar
+    la selección ya no genera el informe completo en cada recarga.
+    """
+    clave = f"pdf_{page_type}_{equipo_seleccionado or ''}_{jugador_seleccionado or ''}"
+    if st.button("📄 Generar PDF", key=clave):
+        with st.spinner("Generando PDF..."):
+            show_download_button(
+                data, page_type,
+                equipo_seleccionado=equipo_seleccionado,
+                jugador_seleccionado=jugador_seleccionado
+            )
+
+
 def get_pdf_download_link(pdf, filename="informe.pdf"):
     temp_path = None
     try:
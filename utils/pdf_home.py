@@ -2,7 +2,9 @@
 Funciones específicas para la generación de PDF de la página de inicio
 """
 from utils.pdf_export import PenyaPDF
+from utils.instrumentacion import instrumentar
 
+@instrumentar
 def generate_home_pdf(data):
     """
     Genera un PDF con el análisis general del equipo
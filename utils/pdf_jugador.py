@@ -4,7 +4,9 @@ Funciones específicas para la generación de PDF de jugadores
 import io
 from utils.pdf_export import PenyaPDF
 from utils.constants import PENYA_PRIMARY_COLOR, PENYA_SECONDARY_COLOR, COLOR_TARJETAS_AMARILLAS, COLOR_TARJETAS_ROJAS
+from utils.instrumentacion import instrumentar
 
+@instrumentar
 def generate_jugador_pdf(data, jugador_seleccionado):
     """
     Genera un PDF con el análisis del jugador seleccionado
@@ -32,8 +34,14 @@ def generate_jugador_pdf(data, jugador_seleccionado):
         actas_df = data['actas_penya'] if 'actas_penya' in data else data['actas']
         goles_df = data['goles_penya'] if 'goles_penya' in data else data['goles']
         
+        # Usar el perfil precalculado si está disponible; si no, calcularlo a partir de las actas
+        perfil = data['perfiles_jugadores'].get(jugador_seleccionado) if 'perfiles_jugadores' in data else None
+        
         # Obtener estadísticas del jugador
-        estadisticas = calcular_estadisticas_jugador(actas_df, jugador_seleccionado)
+        if perfil:
+            estadisticas = perfil['estadisticas']
+        else:
+            estadisticas = calcular_estadisticas_jugador(actas_df, jugador_seleccionado)
         
         if not estadisticas:
             # Si no hay datos, mostrar mensaje
@@ -91,7 +99,10 @@ def generate_jugador_pdf(data, jugador_seleccionado):
         pdf.cell(90, 8, "Minutos", 0, 1, 'L')
         
         # Obtener minutos por jornada para visualización
-        minutos_jornada = obtener_minutos_por_jornada(actas_df, jugador_seleccionado)
+        if perfil:
+            minutos_jornada = perfil['minutos_jornada'].copy()
+        else:
+            minutos_jornada = obtener_minutos_por_jornada(actas_df, jugador_seleccionado)
         
         if not minutos_jornada.empty:
             # Crear columna de condición basada en si es titular
@@ -297,19 +308,23 @@ def generate_jugador_pdf(data, jugador_seleccionado):
                 pdf.set_font('Arial', 'B', 9)
                 pdf.cell(90, 6, "Goles", 0, 1, 'L')
                 
-                # Filtrar goles del jugador
-                goles_jugador = goles_df[goles_df['jugador'] == jugador_seleccionado].copy()
-                
-                # Añadir información de rivales
-                jugador_actas = actas_df[actas_df['jugador'] == jugador_seleccionado]
-                jornada_rival = dict(zip(jugador_actas['jornada'], jugador_actas['rival']))
-                goles_jugador['Rival'] = goles_jugador['Jornada'].map(jornada_rival)
-                
-                # Crear tabla de goles
-                if not goles_jugador.empty:
+                if perfil:
+                    # Goles ya cruzados con el rival en el perfil precalculado
+                    goles_tabla = perfil['goles']
+                else:
+                    # Filtrar goles del jugador
+                    goles_jugador = goles_df[goles_df['jugador'] == jugador_seleccionado].copy()
+                    
+                    # Añadir información de rivales
+                    jugador_actas = actas_df[actas_df['jugador'] == jugador_seleccionado]
+                    jornada_rival = dict(zip(jugador_actas['jornada'], jugador_actas['rival']))
+                    goles_jugador['Rival'] = goles_jugador['Jornada'].map(jornada_rival)
+                    
                     goles_tabla = goles_jugador[['Jornada', 'Minuto', 'Tipo de Gol', 'Rival']]
                     goles_tabla = goles_tabla.sort_values('Jornada')
-                    
+                
+                # Crear tabla de goles
+                if not goles_tabla.empty:
                     # Cabecera de la tabla
                     pdf.set_xy(der_x, section_start_y + 17)
                     pdf.set_font('Arial', 'B', 8)
@@ -351,53 +366,59 @@ def generate_jugador_pdf(data, jugador_seleccionado):
                 pdf.set_font('Arial', 'B', 9)
                 pdf.cell(90, 6, "Tarjetas", 0, 1, 'L')
                 
-                # Aplicar ajuste de tarjetas
-                actas_ajustadas = ajustar_tarjetas_por_doble_amarilla(actas_df)
-                
-                # Filtrar las actas del jugador
-                actas_jugador = actas_ajustadas[actas_ajustadas['jugador'] == jugador_seleccionado].copy()
+                if perfil:
+                    # Tarjetas ya desglosadas en el perfil precalculado
+                    tarjetas_df = perfil['tarjetas']
+                else:
+                    # Aplicar ajuste de tarjetas
+                    actas_ajustadas = ajustar_tarjetas_por_doble_amarilla(actas_df)
                 
-                # Crear una lista para almacenar las tarjetas
-                tarjetas_temp = []
+                    # Filtrar las actas del jugador
+                    actas_jugador = actas_ajustadas[actas_ajustadas['jugador'] == jugador_seleccionado].copy()
                 
-                # Procesar tarjetas amarillas (después del ajuste)
-                for _, row in actas_jugador[actas_jugador['Tarjetas Amarillas'] > 0].iterrows():
-                    tarjetas_temp.append({
-                        'Jornada': int(row['jornada']),  # Convertir a entero
-                        'Tipo': 'Amarilla',
-                        'Rival': row['rival'],
-                        'Doble Amarilla': '-'
-                    })
+                    # Crear una lista para almacenar las tarjetas
+                    tarjetas_temp = []
                 
-                # Procesar tarjetas rojas
-                for _, row in actas_jugador[actas_jugador['Tarjetas Rojas'] > 0].iterrows():
-                    # Verificar si es una tarjeta roja directa o por doble amarilla
-                    jornada = int(row['jornada'])  # Convertir a entero
-                    
-                    # Comprobar si esta roja proviene de una doble amarilla
-                    actas_original = actas_df[
-                        (actas_df['jugador'] == jugador_seleccionado) & 
-                        (actas_df['jornada'] == jornada)
-                    ]
-                    
-                    amarillas_originales = actas_original['Tarjetas Amarillas'].sum() if not actas_original.empty else 0
-                    es_por_doble_amarilla = amarillas_originales >= 2 and row['Tarjetas Amarillas'] < amarillas_originales
-                    
-                    # Añadir tarjetas rojas a la lista
-                    for i in range(int(row['Tarjetas Rojas'])):
-                        doble_amarilla = 'Si' if (i == 0 and es_por_doble_amarilla) else 'No'
+                    # Procesar tarjetas amarillas (después del ajuste)
+                    for _, row in actas_jugador[actas_jugador['Tarjetas Amarillas'] > 0].iterrows():
                         tarjetas_temp.append({
-                            'Jornada': jornada,
-                            'Tipo': 'Roja',
+                            'Jornada': int(row['jornada']),  # Convertir a entero
+                            'Tipo': 'Amarilla',
                             'Rival': row['rival'],
-                            'Doble Amarilla': doble_amarilla
+                            'Doble Amarilla': '-'
                         })
                 
-                # Crear DataFrame y tabla
-                if tarjetas_temp:
-                    tarjetas_df = pd.DataFrame(tarjetas_temp)
-                    tarjetas_df = tarjetas_df.sort_values('Jornada')
+                    # Procesar tarjetas rojas
+                    for _, row in actas_jugador[actas_jugador['Tarjetas Rojas'] > 0].iterrows():
+                        # Verificar si es una tarjeta roja directa o por doble amarilla
+                        jornada = int(row['jornada'])  # Convertir a entero
                     
+                        # Comprobar si esta roja proviene de una doble amarilla
+                        actas_original = actas_df[
+                            (actas_df['jugador'] == jugador_seleccionado) & 
+                            (actas_df['jornada'] == jornada)
+                        ]
+                    
+                        amarillas_originales = actas_original['Tarjetas Amarillas'].sum() if not actas_original.empty else 0
+                        es_por_doble_amarilla = amarillas_originales >= 2 and row['Tarjetas Amarillas'] < amarillas_originales
+                    
+                        # Añadir tarjetas rojas a la lista
+                        for i in range(int(row['Tarjetas Rojas'])):
+                            doble_amarilla = 'Si' if (i == 0 and es_por_doble_amarilla) else 'No'
+                            tarjetas_temp.append({
+                                'Jornada': jornada,
+                                'Tipo': 'Roja',
+                                'Rival': row['rival'],
+                                'Doble Amarilla': doble_amarilla
+                            })
+                    
+                    # Crear DataFrame
+                    tarjetas_df = pd.DataFrame(tarjetas_temp)
+                    if not tarjetas_df.empty:
+                        tarjetas_df = tarjetas_df.sort_values('Jornada')
+                
+                # Crear tabla
+                if not tarjetas_df.empty:
                     # Cabecera de la tabla
                     pdf.set_xy(der_x, tarjetas_y + 7)
                     pdf.set_font('Arial', 'B', 8)
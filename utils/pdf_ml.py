@@ -3,7 +3,9 @@ Funciones específicas para la generación de PDF del análisis comparativo
 """
 from utils.pdf_export import PenyaPDF
 from utils.constants import PENYA_PRIMARY_COLOR, PENYA_SECONDARY_COLOR
+from utils.instrumentacion import instrumentar
 
+@instrumentar
 def generate_ml_pdf(data, equipo_seleccionado, datos_clustered, caracteristicas_clusters, mapa_fig, comparativa_fig=None):
     """
     Genera un PDF con el análisis comparativo de equipos
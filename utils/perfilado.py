@@ -0,0 +1,144 @@
+"""
+Captura de perfiles de ejecución de una página.
+
+Un administrador puede pedir que la siguiente carga completa de la página se
+ejecute bajo un perfilador. Si pyinstrument está instalado se usa su
+perfilador por muestreo y se guarda el informe HTML (flame graph); si no, se
+usa cProfile y se guardan las estadísticas (.prof) junto con un resumen en
+texto. Cada captura lleva un .json con la página, la selección, la versión de
+los datos y la duración.
+
+Cuando no hay ninguna captura pedida no se añade ningún coste a la página.
+"""
+import os
+import io
+import json
+import time
+from datetime import datetime
+from contextlib import contextmanager
+
+# Carpeta donde se guardan las capturas
+CARPETA_CAPTURAS = "perfiles"
+
+# Claves de session_state con la selección de cada página
+CLAVES_SELECCION = ("selector_equipo", "selector_jugador", "selector_equipo_ml")
+
+
+def _perfilador():
+    """
+    Devuelve el perfilador disponible: 'pyinstrument' o 'cprofile'
+    """
+    try:
+        import pyinstrument  # noqa: F401
+        return "pyinstrument"
+    except ImportError:
+        return "cprofile"
+
+
+def _nombre_captura(pagina):
+    """
+    Nombre base de los archivos de una captura (fecha + página)
+    """
+    marca = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    return f"{marca}_{pagina.replace('.', '_')}"
+
+
+@contextmanager
+def perfilar(pagina, metadatos=None, carpeta=CARPETA_CAPTURAS):
+    """
+    Ejecuta el bloque bajo un perfilador y guarda la captura en disco
+
+    Args:
+        pagina: Nombre del módulo de la página perfilada
+        metadatos: Información adicional (selección, usuario, versión de datos...)
+        carpeta: Carpeta donde se guardan las capturas
+    """
+    os.makedirs(carpeta, exist_ok=True)
+    base = os.path.join(carpeta, _nombre_captura(pagina))
+    tipo = _perfilador()
+
+    if tipo == "pyinstrument":
+        from pyinstrument import Profiler
+        perfilador = Profiler(interval=0.001)
+        iniciar, detener = perfilador.start, perfilador.stop
+    else:
+        import cProfile
+        perfilador = cProfile.Profile()
+        iniciar, detener = perfilador.enable, perfilador.disable
+
+    inicio = time.perf_counter()
+    iniciar()
+    try:
+        yield
+    finally:
+        # Se guarda también si la página termina con st.rerun() o con un error
+        detener()
+        duracion_ms = (time.perf_counter() - inicio) * 1000
+        try:
+            archivos = _guardar_captura(perfilador, tipo, base)
+            info = {
+                'pagina': pagina,
+                'fecha': datetime.now().isoformat(timespec='seconds'),
+                'duracion_ms': round(duracion_ms, 1),
+                'perfilador': tipo,
+                'archivos': archivos,
+                **(metadatos or {})
+            }
+            with open(base + ".json", 'w', encoding='utf-8') as f:
+                json.dump(info, f, ensure_ascii=False, indent=2, default=str)
+            print(f"🔬 Captura de perfilado guardada: {base} ({duracion_ms:.0f} ms)")
+        except Exception as e:
+            print(f"Error al guardar la captura de perfilado: {e}")
+
+
+def _guardar_captura(perfilador, tipo, base):
+    """
+    Escribe los artefactos del perfilador
+
+    Returns:
+        list: Nombres de los archivos generados
+    """
+    if tipo == "pyinstrument":
+        ruta_html = base + ".html"
+        with open(ruta_html, 'w', encoding='utf-8') as f:
+            f.write(perfilador.output_html())
+        return [os.path.basename(ruta_html)]
+
+    import pstats
+    ruta_prof = base + ".prof"
+    perfilador.dump_stats(ruta_prof)
+
+    # Resumen legible con las 40 funciones de mayor tiempo acumulado
+    resumen = io.StringIO()
+    pstats.Stats(perfilador, stream=resumen).sort_stats('cumulative').print_stats(40)
+    ruta_txt = base + ".txt"
+    with open(ruta_txt, 'w', encoding='utf-8') as f:
+        f.write(resumen.getvalue())
+    return [os.path.basename(ruta_prof), os.path.basename(ruta_txt)]
+
+
+def listar_capturas(n=10, carpeta=CARPETA_CAPTURAS):
+    """
+    Devuelve las últimas capturas guardadas, de la más reciente a la más antigua
+
+    Args:
+        n: Número máximo de capturas
+        carpeta: Carpeta de las capturas
+
+    Returns:
+        list: Metadatos de cada captura, con la ruta de sus archivos en 'rutas'
+    """
+    if not os.path.isdir(carpeta):
+        return []
+
+    capturas = []
+    for nombre in sorted((f for f in os.listdir(carpeta) if f.endswith(".json")), reverse=True)[:n]:
+        try:
+            with open(os.path.join(carpeta, nombre), encoding='utf-8') as f:
+                info = json.load(f)
+        except (OSError, ValueError):
+            continue
+        info['rutas'] = [os.path.join(carpeta, a) for a in info.get('archivos', [])
+                         if os.path.exists(os.path.join(carpeta, a))]
+        capturas.append(info)
+    return capturas
@@ -0,0 +1,132 @@
+"""
+Servicio de exportación de figuras de Plotly a PNG.
+
+Mantiene vivos durante todo el proceso unos pocos motores de kaleido ya
+arrancados y permite renderizar en paralelo todas las figuras de un informe.
+"""
+import queue
+import threading
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# Número de motores de kaleido que se mantienen arrancados
+NUM_MOTORES = max(1, min(3, (os.cpu_count() or 1)))
+
+_motores = None
+_motores_lock = threading.Lock()
+# Se activa si kaleido no está disponible y hay que usar la exportación estándar de Plotly
+_sin_motores = False
+
+
+def _opciones_motor():
+    """
+    Configuración del motor igual que la que usa plotly.io (ver plotly/io/_kaleido.py):
+    el plotly.js incluido en el paquete de Plotly en lugar del de la CDN, para
+    funcionar sin conexión y con la misma versión que la librería de Python
+
+    Returns:
+        dict: Argumentos para PlotlyScope
+    """
+    import plotly
+    
+    ruta_paquete = os.path.join(os.path.dirname(os.path.abspath(plotly.__file__)), "package_data")
+    return {
+        'plotlyjs': os.path.join(ruta_paquete, "plotly.min.js"),
+        'mathjax': "https://cdnjs.cloudflare.com/ajax/libs/mathjax/2.7.5/MathJax.js"
+    }
+
+
+def _crear_motor():
+    """
+    Crea un motor de kaleido y lo calienta con una figura mínima para que el
+    navegador interno quede arrancado
+
+    Returns:
+        PlotlyScope o None si kaleido no está disponible
+    """
+    try:
+        from kaleido.scopes.plotly import PlotlyScope
+        motor = PlotlyScope(**_opciones_motor())
+        motor.transform({'data': [], 'layout': {}}, format='png', width=10, height=10)
+        return motor
+    except Exception as e:
+        print(f"No se pudo arrancar el motor de kaleido: {e}")
+        return None
+
+
+def _obtener_motores():
+    """
+    Devuelve la cola de motores del proceso, creándolos la primera vez
+    """
+    global _motores, _sin_motores
+    with _motores_lock:
+        if _motores is None:
+            _motores = queue.Queue()
+            for _ in range(NUM_MOTORES):
+                motor = _crear_motor()
+                if motor is None:
+                    break
+                _motores.put(motor)
+            _sin_motores = _motores.qsize() == 0
+        return _motores
+
+
+def calentar_motores():
+    """
+    Arranca los motores de exportación por adelantado (por ejemplo al iniciar la app)
+
+    Returns:
+        int: Número de motores disponibles
+    """
+    return _obtener_motores().qsize()
+
+
+def renderizar_figura(figura, width, height, scale=1):
+    """
+    Renderiza una figura de Plotly a PNG usando uno de los motores calientes
+
+    Args:
+        figura: Figura de Plotly o su diccionario (to_dict)
+        width: Ancho base de la figura en píxeles
+        height: Alto base de la figura en píxeles
+        scale: Factor de escala aplicado al ancho y alto
+
+    Returns:
+        bytes: Contenido del PNG
+    """
+    motores = _obtener_motores()
+    if _sin_motores:
+        import plotly.io as pio
+        return pio.to_image(figura, format='png', width=width, height=height, scale=scale)
+
+    # Tomar un motor libre y devolverlo a la cola al terminar
+    motor = motores.get()
+    try:
+        if hasattr(figura, 'to_dict'):
+            figura = figura.to_dict()
+        return motor.transform(figura, format='png', width=width, height=height, scale=scale)
+    finally:
+        motores.put(motor)
+
+
+def renderizar_lote(trabajos):
+    """
+    Renderiza un lote de figuras en paralelo repartiéndolas entre los motores
+
+    Args:
+        trabajos: Lista de tuplas (figura, width, height, scale)
+
+    Returns:
+        list: PNGs (bytes) en el mismo orden que los trabajos
+    """
+    if not trabajos:
+        return []
+
+    _obtener_motores()
+    num_hilos = 1 if _sin_motores else max(1, min(len(trabajos), NUM_MOTORES))
+
+    if num_hilos == 1:
+        return [renderizar_figura(*trabajo) for trabajo in trabajos]
+
+    with ThreadPoolExecutor(max_workers=num_hilos) as executor:
+        return list(executor.map(lambda trabajo: renderizar_figura(*trabajo), trabajos))
@@ -24,4 +24,32 @@ def show_sidebar():
     """
     Esta función ya no muestra elementos en la barra lateral
     """
-    pass
\ No newline at end of file
+    pass
+
+
+def pestanas_perezosas(etiquetas, clave):
+    """
+    Selector de pestañas en el que solo se calcula la pestaña visible.
+
+    A diferencia de st.tabs, que ejecuta el contenido de todas las pestañas en
+    cada recarga, aquí el llamador solo dibuja la opción devuelta. Usa
+    st.segmented_control si está disponible y, si no, un st.radio horizontal.
+
+    Args:
+        etiquetas: Lista con los nombres de las pestañas
+        clave: Clave única del widget dentro de la página
+
+    Returns:
+        str: Etiqueta de la pestaña seleccionada
+    """
+    if hasattr(st, "segmented_control"):
+        seleccion = st.segmented_control(
+            "Vista", etiquetas, default=etiquetas[0], key=clave, label_visibility="collapsed"
+        )
+    else:
+        seleccion = st.radio(
+            "Vista", etiquetas, horizontal=True, key=clave, label_visibility="collapsed"
+        )
+
+    # segmented_control devuelve None si se deselecciona la opción activa
+    return seleccion or etiquetas[0]
@@ -0,0 +1,145 @@
+"""
+Caché de figuras de Plotly compartida por la interfaz y la generación de PDFs.
+
+Las funciones que construyen figuras se decoran con cachear_figura: la figura
+se guarda con una clave formada por la función y una huella de los datos de
+entrada y de los parámetros. La caché es LRU y está limitada en número de
+figuras y en memoria (tamaño aproximado del JSON de cada figura).
+
+Las figuras devueltas son compartidas: quien necesite modificarlas (por
+ejemplo para ajustar el diseño en el PDF) debe trabajar sobre una copia,
+go.Figure(fig).
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+import numpy as np
+import pandas as pd
+
+# Límites de la caché
+MAX_FIGURAS = 256
+MAX_BYTES = 64 * 1024 * 1024
+
+_figuras = OrderedDict()  # clave -> (figura, tamaño en bytes)
+_bytes_totales = 0
+_lock = threading.Lock()
+_estadisticas = {'aciertos': 0, 'fallos': 0, 'descartes': 0}
+
+
+def _actualizar_huella(h, valor):
+    """
+    Añade un valor (DataFrame, Serie, array, colección o escalar) al hash
+    """
+    if isinstance(valor, pd.DataFrame):
+        h.update(b'df')
+        h.update('|'.join(map(str, valor.columns)).encode('utf-8'))
+        h.update(pd.util.hash_pandas_object(valor, index=True).values.tobytes())
+    elif isinstance(valor, pd.Series):
+        h.update(b'serie')
+        h.update(str(valor.name).encode('utf-8'))
+        h.update(pd.util.hash_pandas_object(valor, index=True).values.tobytes())
+    elif isinstance(valor, np.ndarray):
+        h.update(b'array')
+        h.update(str(valor.dtype).encode('utf-8'))
+        h.update(np.ascontiguousarray(valor).tobytes())
+    elif isinstance(valor, dict):
+        h.update(b'dict')
+        for clave in sorted(valor, key=str):
+            h.update(str(clave).encode('utf-8'))
+            _actualizar_huella(h, valor[clave])
+    elif isinstance(valor, (list, tuple)):
+        h.update(b'lista')
+        for elemento in valor:
+            _actualizar_huella(h, elemento)
+    else:
+        h.update(repr(valor).encode('utf-8'))
+    h.update(b';')
+
+
+def huella(*args, **kwargs):
+    """
+    Calcula una huella barata y estable de los argumentos de una función
+
+    Returns:
+        str: Hash hexadecimal
+    """
+    h = hashlib.sha1()
+    _actualizar_huella(h, args)
+    _actualizar_huella(h, kwargs)
+    return h.hexdigest()
+
+
+def _tamano_figura(fig):
+    """
+    Estima la memoria ocupada por una figura a partir de su JSON
+    """
+    try:
+        return len(fig.to_json())
+    except Exception:
+        return 0
+
+
+def cachear_figura(func):
+    """
+    Decorador que memoriza la figura devuelta por una función de visualización.
+    Si la función devuelve None (sin datos) no se guarda nada.
+    """
+    nombre = f"{func.__module__}.{func.__qualname__}"
+
+    @wraps(func)
+    def envoltorio(*args, **kwargs):
+        global _bytes_totales
+        clave = (nombre, huella(*args, **kwargs))
+
+        with _lock:
+            entrada = _figuras.get(clave)
+            if entrada is not None:
+                _figuras.move_to_end(clave)
+                _estadisticas['aciertos'] += 1
+                return entrada[0]
+            _estadisticas['fallos'] += 1
+
+        fig = func(*args, **kwargs)
+        if fig is None:
+            return None
+
+        tamano = _tamano_figura(fig)
+        with _lock:
+            if clave not in _figuras:
+                _figuras[clave] = (fig, tamano)
+                _bytes_totales += tamano
+            # Descartar las figuras menos usadas hasta cumplir los límites
+            while _figuras and (len(_figuras) > MAX_FIGURAS or _bytes_totales > MAX_BYTES):
+                _, (_, tamano_descartado) = _figuras.popitem(last=False)
+                _bytes_totales -= tamano_descartado
+                _estadisticas['descartes'] += 1
+        return fig
+
+    return envoltorio
+
+
+def limpiar_cache_figuras():
+    """
+    Vacía la caché de figuras
+    """
+    global _bytes_totales
+    with _lock:
+        _figuras.clear()
+        _bytes_totales = 0
+
+
+def estadisticas_cache_figuras():
+    """
+    Devuelve el estado de la caché de figuras
+
+    Returns:
+        dict: Número de figuras, bytes ocupados, aciertos, fallos y descartes
+    """
+    with _lock:
+        return {
+            'figuras': len(_figuras),
+            'bytes': _bytes_totales,
+            **_estadisticas
+        }
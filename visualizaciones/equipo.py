@@ -4,11 +4,11 @@ Visualizaciones relacionadas con estadísticas del equipo
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 import plotly.express as px
 import plotly.graph_objects as go
 from utils.constants import PENYA_PRIMARY_COLOR, PENYA_SECONDARY_COLOR, COLOR_TARJETAS_AMARILLAS, COLOR_TARJETAS_ROJAS
+from visualizaciones.cache import cachear_figura
+from utils.instrumentacion import instrumentar
 
 def mostrar_resumen_equipo(estadisticas):
     """
@@ -35,6 +35,7 @@ def mostrar_resumen_equipo(estadisticas):
     # Mostrar promedio de goles por partido
     st.metric("Promedio Goles/Partido", estadisticas['promedio_goles'])
 
+@instrumentar
 def graficar_tarjetas_por_jornada(tarjetas_df, return_fig=False):
     """
     Crea un gráfico de tarjetas por jornada
@@ -48,6 +49,23 @@ def graficar_tarjetas_por_jornada(tarjetas_df, return_fig=False):
             st.warning("No hay datos de tarjetas por jornada")
         return None
     
+    fig = construir_tarjetas_por_jornada(tarjetas_df)
+    
+    if return_fig:
+        return fig
+        
+    # Mostrar el gráfico
+    st.plotly_chart(fig, use_container_width=True)
+
+@instrumentar
+@cachear_figura
+def construir_tarjetas_por_jornada(tarjetas_df):
+    """
+    Construye la figura de líneas de tarjetas por jornada
+    
+    Args:
+        tarjetas_df: DataFrame con tarjetas por jornada
+    """
     # Crear gráfico de líneas
     fig = go.Figure()
     
@@ -88,12 +106,9 @@ def graficar_tarjetas_por_jornada(tarjetas_df, return_fig=False):
         hovertemplate='<b>Jornada %{x}</b><br>Tarjetas: %{y}<extra></extra>'
     )
     
-    if return_fig:
-        return fig
-        
-    # Mostrar el gráfico
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
 
+@instrumentar
 def graficar_goles_por_tiempo(goles_por_tiempo, return_fig=False):
     """
     Crea un gráfico de distribución de goles por minuto
@@ -138,6 +153,7 @@ def graficar_goles_por_tiempo(goles_por_tiempo, return_fig=False):
     # Mostrar el gráfico
     st.plotly_chart(fig, use_container_width=True)
 
+@instrumentar
 def graficar_tipos_goles(tipos_goles, return_fig=False):
     """
     Crea un gráfico de tipos de goles marcados
@@ -182,6 +198,7 @@ def graficar_tipos_goles(tipos_goles, return_fig=False):
     # Mostrar el gráfico
     st.plotly_chart(fig, use_container_width=True)
 
+@instrumentar
 def graficar_goles_por_rival(goles_rival_df, top_n=10):
     """
     Crea un gráfico de goles marcados por rival
@@ -219,6 +236,7 @@ def graficar_goles_por_rival(goles_rival_df, top_n=10):
     # Mostrar el gráfico
     st.plotly_chart(fig, use_container_width=True)
 
+@instrumentar
 def graficar_calendario_partidos(partidos_df, goles_favor_dict, primary_color, secondary_color):
     """
     Crea un gráfico tipo timeline para visualizar el calendario de partidos y goles marcados.
@@ -229,68 +247,77 @@ def graficar_calendario_partidos(partidos_df, goles_favor_dict, primary_color, s
         primary_color: Color primario para equipos locales
         secondary_color: Color secundario para equipos visitantes
     """
-    # Preparar datos para la visualización
-    calendario_data = []
-    for _, partido in partidos_df.iterrows():
-        goles = goles_favor_dict.get(partido['jornada'], 0)
-        calendario_data.append({
-            'jornada': partido['jornada'],
-            'rival': partido['rival'],
-            'condicion': 'Local' if partido['es_local'] else 'Visitante',
-            'goles_favor': goles,
-            'color': primary_color if partido['es_local'] else secondary_color
-        })
-    
-    calendario_df = pd.DataFrame(calendario_data)
+    # Preparar datos para la visualización (una fila por partido)
+    es_local = partidos_df['es_local'].astype(bool).values
+    calendario_df = pd.DataFrame({
+        'jornada': partidos_df['jornada'].values,
+        'rival': partidos_df['rival'].values,
+        'condicion': np.where(es_local, 'Local', 'Visitante'),
+        'color': np.where(es_local, primary_color, secondary_color)
+    })
+    calendario_df['goles_favor'] = calendario_df['jornada'].map(goles_favor_dict).fillna(0).astype(int)
     calendario_df = calendario_df.sort_values('jornada')
     
+    # Textos de cada partido calculados por columnas
+    goles_texto = calendario_df['goles_favor'].astype(str)
+    etiqueta_rival = calendario_df['rival'].astype(str) + " (" + calendario_df['condicion'].str[0] + ")"
+    texto_barra = calendario_df['rival'].astype(str) + " - " + goles_texto + " goles"
+    texto_hover = (
+        "Jornada " + calendario_df['jornada'].astype(str) + "<br>" +
+        calendario_df['condicion'] + " vs " + calendario_df['rival'].astype(str) +
+        "<br>Goles a favor: " + goles_texto
+    )
+    
     # Crear visualización tipo timeline
     fig = go.Figure()
     
-    # Añadir barras horizontales para cada partido
-    for i, row in calendario_df.iterrows():
+    # Una sola traza de barras por condición (local / visitante)
+    for condicion, color in [('Local', primary_color), ('Visitante', secondary_color)]:
+        mascara = (calendario_df['condicion'] == condicion).values
+        if not mascara.any():
+            continue
         fig.add_trace(go.Bar(
-            y=[row['jornada']],
-            x=[row['goles_favor']],
-            name=f"{row['rival']} ({row['condicion']})",
+            y=calendario_df['jornada'][mascara],
+            x=calendario_df['goles_favor'][mascara],
+            name=condicion,
             orientation='h',
             marker=dict(
-                color=row['color'],
+                color=color,
                 line=dict(color='rgba(0,0,0,0.5)', width=1)
             ),
-            text=f"{row['rival']} - {row['goles_favor']} goles",
+            text=texto_barra[mascara],
             textposition='auto',
             hoverinfo='text',
-            hovertext=f"Jornada {row['jornada']}<br>{row['condicion']} vs {row['rival']}<br>Goles a favor: {row['goles_favor']}",
+            hovertext=texto_hover[mascara],
             showlegend=False
         ))
     
-    # Añadir etiquetas de rivales
-    for i, row in calendario_df.iterrows():
-        fig.add_annotation(
-            x=row['goles_favor'] + 0.2,
-            y=row['jornada'],
-            text=f"{row['rival']} ({row['condicion'][0]})",
-            showarrow=False,
-            font=dict(
-                size=10,
-                color="black"
-            ),
-            xanchor="left"
-        )
+    # Etiquetas de rivales en una única traza de texto
+    fig.add_trace(go.Scatter(
+        x=calendario_df['goles_favor'] + 0.2,
+        y=calendario_df['jornada'],
+        text=etiqueta_rival,
+        mode='text',
+        textposition='middle right',
+        textfont=dict(size=10, color="black"),
+        hoverinfo='skip',
+        showlegend=False
+    ))
     
-    # Añadir iconos de local/visitante
-    for i, row in calendario_df.iterrows():
-        fig.add_shape(
-            type="circle",
-            xref="x", yref="y",
-            x0=row['goles_favor'] - 0.2,
-            y0=row['jornada'] - 0.3,
-            x1=row['goles_favor'] + 0.2,
-            y1=row['jornada'] + 0.3,
-            fillcolor=row['color'],
-            line_color="rgba(0,0,0,0.5)",
-        )
+    # Iconos de local/visitante en una única traza de marcadores con colores por partido
+    fig.add_trace(go.Scatter(
+        x=calendario_df['goles_favor'],
+        y=calendario_df['jornada'],
+        mode='markers',
+        marker=dict(
+            symbol='circle',
+            size=14,
+            color=calendario_df['color'],
+            line=dict(color='rgba(0,0,0,0.5)', width=1)
+        ),
+        hoverinfo='skip',
+        showlegend=False
+    ))
     
     # Personalizar el gráfico
     max_goles = max(calendario_df['goles_favor']) if not calendario_df.empty and max(calendario_df['goles_favor']) > 0 else 1
@@ -310,7 +337,7 @@ def graficar_calendario_partidos(partidos_df, goles_favor_dict, primary_color, s
         ),
         height=600,
         margin=dict(l=10, r=150, t=50, b=50),
-        barmode='group',
+        barmode='overlay',
         bargap=0.15,
         plot_bgcolor='rgba(240,240,240,0.3)'
     )
@@ -333,6 +360,7 @@ def graficar_calendario_partidos(partidos_df, goles_favor_dict, primary_color, s
             use_container_width=True
         )
 
+@instrumentar
 def graficar_rendimiento_rivales(partidos_df, goles_df, primary_color):
     """
     Crea gráficos para visualizar el rendimiento contra rivales.
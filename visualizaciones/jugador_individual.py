@@ -3,11 +3,12 @@ Visualizaciones específicas para el análisis individual de jugadores
 """
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
 import plotly.express as px
 import plotly.graph_objects as go
 from utils.constants import PENYA_PRIMARY_COLOR, PENYA_SECONDARY_COLOR, COLOR_TARJETAS_AMARILLAS, COLOR_TARJETAS_ROJAS
+from utils.instrumentacion import instrumentar
 
+@instrumentar
 def graficar_minutos_por_jornada(minutos_df, return_fig=False):
     """
     Crea un gráfico de minutos jugados por jornada para un jugador
@@ -55,6 +56,7 @@ def graficar_minutos_por_jornada(minutos_df, return_fig=False):
     else:
         st.plotly_chart(fig, use_container_width=True)
 
+@instrumentar
 def graficar_goles_por_tiempo(goles_df, return_fig=False):
     """
     Crea un gráfico de goles por tiempo para un jugador
@@ -88,6 +90,7 @@ def graficar_goles_por_tiempo(goles_df, return_fig=False):
     else:
         st.plotly_chart(fig, use_container_width=True)
 
+@instrumentar
 def graficar_tarjetas_por_jornada(tarjetas_df, return_fig=False):
     """
     Crea un gráfico de tarjetas por jornada para un jugador
@@ -4,12 +4,13 @@ Visualizaciones relacionadas con estadísticas de jugadores
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 import plotly.express as px
 import plotly.graph_objects as go
 from utils.constants import PENYA_PRIMARY_COLOR, PENYA_SECONDARY_COLOR, COLOR_TARJETAS_AMARILLAS, COLOR_TARJETAS_ROJAS
+from visualizaciones.cache import cachear_figura
+from utils.instrumentacion import instrumentar
 
+@instrumentar
 def graficar_top_goleadores(goleadores_df, top_n=10):
     """
     Crea un gráfico de los mejores goleadores
@@ -52,6 +53,7 @@ def graficar_top_goleadores(goleadores_df, top_n=10):
     # Mostrar el gráfico
     st.plotly_chart(fig, use_container_width=True)
 
+@instrumentar
 def graficar_top_amonestados(amonestados_df, top_n=10):
     """
     Crea un gráfico de los jugadores más amonestados
@@ -112,6 +114,7 @@ def graficar_top_amonestados(amonestados_df, top_n=10):
     # Mostrar el gráfico
     st.plotly_chart(fig, use_container_width=True)
 
+@instrumentar
 def graficar_minutos_jugados(minutos_df, top_n=10):
     """
     Crea un gráfico de los jugadores con más minutos
@@ -154,6 +157,7 @@ def graficar_minutos_jugados(minutos_df, top_n=10):
     # Mostrar el gráfico
     st.plotly_chart(fig, use_container_width=True)
 
+@instrumentar
 def graficar_goles_por_jugador(goles_jugador_df, top_n=10):
     """
     Crea un gráfico de los jugadores con más goles
@@ -166,6 +170,22 @@ def graficar_goles_por_jugador(goles_jugador_df, top_n=10):
         st.warning("No hay datos de goles por jugador")
         return
     
+    fig = construir_goles_por_jugador(goles_jugador_df, top_n=top_n, titulo='Goleadores del Equipo')
+    
+    # Mostrar el gráfico
+    st.plotly_chart(fig, use_container_width=True)
+
+@instrumentar
+@cachear_figura
+def construir_goles_por_jugador(goles_jugador_df, top_n=None, titulo=None):
+    """
+    Construye el gráfico de barras horizontales de goles por jugador
+    
+    Args:
+        goles_jugador_df: DataFrame con goles por jugador
+        top_n: Número de jugadores a mostrar (None para mostrar todos)
+        titulo: Título del gráfico (opcional)
+    """
     # Limitar a los top_n jugadores si se especifica
     df = goles_jugador_df
     if top_n is not None:
@@ -177,7 +197,7 @@ def graficar_goles_por_jugador(goles_jugador_df, top_n=10):
         y='jugador',
         x='goles',
         orientation='h',
-        title='Goleadores del Equipo',
+        title=titulo,
         labels={'jugador': 'Jugador', 'goles': 'Goles'},
         color_discrete_sequence=[PENYA_PRIMARY_COLOR]
     )
@@ -196,9 +216,9 @@ def graficar_goles_por_jugador(goles_jugador_df, top_n=10):
         hovertemplate='Goles: %{x}<extra></extra>'
     )
     
-    # Mostrar el gráfico
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
 
+@instrumentar
 def graficar_tarjetas_por_jugador(tarjetas_jugador_df, top_n=10):
     """
     Crea un gráfico de los jugadores con más tarjetas
@@ -262,6 +282,7 @@ def graficar_tarjetas_por_jugador(tarjetas_jugador_df, top_n=10):
     # Mostrar el gráfico
     st.plotly_chart(fig, use_container_width=True)
 
+@instrumentar
 def graficar_minutos_por_jornada(minutos_df, return_fig=False):
     """
     Crea un gráfico de minutos jugados por jornada para un jugador
@@ -309,6 +330,7 @@ def graficar_minutos_por_jornada(minutos_df, return_fig=False):
     else:
         st.plotly_chart(fig, use_container_width=True)
 
+@instrumentar
 def graficar_goles_por_tiempo(goles_df, return_fig=False):
     """
     Crea un gráfico de goles por tiempo para un jugador
@@ -347,6 +369,7 @@ def graficar_goles_por_tiempo(goles_df, return_fig=False):
     else:
         st.plotly_chart(fig, use_container_width=True)
 
+@instrumentar
 def graficar_tarjetas_por_jornada(tarjetas_df, return_fig=False):
     """
     Crea un gráfico de tarjetas por jornada para un jugador
@@ -391,4 +414,89 @@ def graficar_tarjetas_por_jornada(tarjetas_df, return_fig=False):
     if return_fig:
         return fig
     else:
-        st.plotly_chart(fig, use_container_width=True)
\ No newline at end of file
+        st.plotly_chart(fig, use_container_width=True)
+
+@instrumentar
+@cachear_figura
+def construir_minutos_por_jornada(minutos_df):
+    """
+    Construye el gráfico de minutos por jornada de un jugador, coloreado por condición
+    
+    Args:
+        minutos_df: DataFrame con jornada, minutos_jugados, es_titular y rival
+    """
+    minutos_plot = minutos_df.copy()
+    minutos_plot['condicion'] = minutos_plot['es_titular'].map({True: 'Titular', False: 'Suplente'})
+    
+    fig = px.bar(
+        minutos_plot, 
+        x='jornada', 
+        y='minutos_jugados',
+        color='condicion',
+        labels={'jornada': 'Jornada', 'minutos_jugados': 'Minutos Jugados', 'condicion': 'Condición'},
+        color_discrete_map={'Titular': PENYA_PRIMARY_COLOR, 'Suplente': PENYA_SECONDARY_COLOR},
+        hover_data=['rival']
+    )
+    
+    # Personalizar el gráfico
+    fig.update_layout(
+        xaxis_title='Jornada',
+        yaxis_title='Minutos',
+        yaxis_range=[0, 100],
+        legend_title="Condición",
+        height=400  # Fijar altura para mantener consistencia
+    )
+    
+    return fig
+
+@instrumentar
+@cachear_figura
+def construir_desglose_participacion(categorias, valores):
+    """
+    Construye el gráfico de barras de partidos por tipo de participación
+    
+    Args:
+        categorias: Nombres de los tipos de participación
+        valores: Número de partidos de cada tipo
+    """
+    fig = go.Figure()
+    
+    # Añadir barras (alternando naranja y negro)
+    fig.add_trace(go.Bar(
+        x=categorias,
+        y=valores,
+        marker_color=[PENYA_PRIMARY_COLOR if i % 2 == 0 else PENYA_SECONDARY_COLOR for i in range(len(categorias))]
+    ))
+    
+    # Personalizar el gráfico
+    fig.update_layout(
+        xaxis_title='Tipo de Participación',
+        yaxis_title='Partidos',
+        yaxis=dict(
+            tickmode='linear',
+            tick0=0,
+            dtick=1
+        ),
+        height=400  
+    )
+    
+    return fig
+
+@instrumentar
+@cachear_figura
+def construir_mapa_parejas(valores, nombres, escala, punto_medio=None):
+    """
+    Construye el mapa de calor de las parejas de jugadores
+    
+    Args:
+        valores: Matriz jugadores x jugadores a representar
+        nombres: Nombres de los jugadores (filas y columnas)
+        escala: Escala de color continua de Plotly
+        punto_medio: Valor central de la escala (None para no fijarlo)
+    """
+    fig = px.imshow(
+        valores, x=nombres, y=nombres, color_continuous_scale=escala,
+        color_continuous_midpoint=punto_medio, aspect="auto", text_auto='.0f'
+    )
+    fig.update_layout(height=35 * len(nombres) + 150, margin=dict(l=10, r=10, t=30, b=10))
+    return fig
@@ -6,10 +6,20 @@ import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-import matplotlib.pyplot as plt
-import seaborn as sns
 from utils.constants import PENYA_PRIMARY_COLOR, PENYA_SECONDARY_COLOR, COLOR_TARJETAS_AMARILLAS, COLOR_TARJETAS_ROJAS
+from visualizaciones.cache import cachear_figura
+from utils.instrumentacion import instrumentar
 
+def _pyplot():
+    """
+    Importa matplotlib (backend Agg) solo cuando se genera una figura para PDF
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
+
+@instrumentar
 def graficar_top_goleadores_home(goleadores_df, top_n=5, return_fig=False):
     """
     Versión especial para la página Home que muestra Top 5
@@ -28,6 +38,7 @@ def graficar_top_goleadores_home(goleadores_df, top_n=5, return_fig=False):
     
     if return_fig:
         # Crear gráfico con matplotlib para PDF
+        plt = _pyplot()
         fig, ax = plt.subplots(figsize=(8, 4))
         bars = ax.barh(df['jugador'], df['goles'], color=PENYA_PRIMARY_COLOR)
         ax.set_title('Top Goleadores', fontsize=12, pad=10)
@@ -37,37 +48,50 @@ def graficar_top_goleadores_home(goleadores_df, top_n=5, return_fig=False):
         ax.tick_params(axis='both', which='major', labelsize=10)
         
         # Añadir valores en las barras
-        for i, v in enumerate(df['goles']):
-            ax.text(v, i, str(v), va='center', fontsize=10)
+        ax.bar_label(bars, fmt='%g', padding=2, fontsize=10)
         
         # Ajustar márgenes
         plt.tight_layout()
         return fig
     else:
         # Crear gráfico de barras horizontales con plotly para web
-        fig = px.bar(
-            df,
-            y='jugador',
-            x='goles',
-            orientation='h',
-            title=f'Top {top_n} Goleadores',
-            labels={'jugador': 'Jugador', 'goles': 'Goles'},
-            color_discrete_sequence=[PENYA_PRIMARY_COLOR]
-        )
-        
-        fig.update_layout(
-            yaxis={'categoryorder': 'total ascending'},
-            xaxis_title='Goles',
-            yaxis_title='',
-            showlegend=False
-        )
-        
-        fig.update_traces(
-            hovertemplate='Goles: %{x}<extra></extra>'
-        )
-        
+        fig = construir_top_goleadores_home(df, top_n)
         st.plotly_chart(fig, use_container_width=True)
 
+@instrumentar
+@cachear_figura
+def construir_top_goleadores_home(df, top_n):
+    """
+    Construye la figura de Plotly de los máximos goleadores
+    
+    Args:
+        df: DataFrame con los top_n goleadores ya ordenados
+        top_n: Número de jugadores mostrados (para el título)
+    """
+    fig = px.bar(
+        df,
+        y='jugador',
+        x='goles',
+        orientation='h',
+        title=f'Top {top_n} Goleadores',
+        labels={'jugador': 'Jugador', 'goles': 'Goles'},
+        color_discrete_sequence=[PENYA_PRIMARY_COLOR]
+    )
+    
+    fig.update_layout(
+        yaxis={'categoryorder': 'total ascending'},
+        xaxis_title='Goles',
+        yaxis_title='',
+        showlegend=False
+    )
+    
+    fig.update_traces(
+        hovertemplate='Goles: %{x}<extra></extra>'
+    )
+    
+    return fig
+
+@instrumentar
 def graficar_top_amonestados_home(amonestados_df, top_n=5, return_fig=False):
     """
     Versión especial para la página Home que muestra Top 5
@@ -88,12 +112,13 @@ def graficar_top_amonestados_home(amonestados_df, top_n=5, return_fig=False):
     
     if return_fig:
         # Crear gráfico con matplotlib para PDF
+        plt = _pyplot()
         fig, ax = plt.subplots(figsize=(8, 4))
         
         # Crear barras apiladas horizontalmente
-        ax.barh(df['jugador'], df['Tarjetas Amarillas'], 
+        barras_amarillas = ax.barh(df['jugador'], df['Tarjetas Amarillas'], 
                 color=COLOR_TARJETAS_AMARILLAS, label='Amarillas')
-        ax.barh(df['jugador'], df['Tarjetas Rojas'], 
+        barras_rojas = ax.barh(df['jugador'], df['Tarjetas Rojas'], 
                 left=df['Tarjetas Amarillas'], 
                 color=COLOR_TARJETAS_ROJAS, label='Rojas')
         
@@ -103,14 +128,13 @@ def graficar_top_amonestados_home(amonestados_df, top_n=5, return_fig=False):
         # Ajustar tamaño de las etiquetas
         ax.tick_params(axis='both', which='major', labelsize=10)
         
-        # Añadir valores en las barras
-        for i, (amarillas, rojas) in enumerate(zip(df['Tarjetas Amarillas'], df['Tarjetas Rojas'])):
-            # Texto para tarjetas amarillas
-            if amarillas > 0:
-                ax.text(amarillas/2, i, str(int(amarillas)), va='center', ha='center', color='black', fontsize=10)
-            # Texto para tarjetas rojas
-            if rojas > 0:
-                ax.text(amarillas + rojas/2, i, str(int(rojas)), va='center', ha='center', color='white', fontsize=10)
+        # Añadir valores en las barras (vacío cuando no hay tarjetas de ese tipo)
+        amarillas = df['Tarjetas Amarillas'].astype(int)
+        rojas = df['Tarjetas Rojas'].astype(int)
+        ax.bar_label(barras_amarillas, labels=amarillas.astype(str).where(amarillas > 0, '').tolist(),
+                     label_type='center', color='black', fontsize=10)
+        ax.bar_label(barras_rojas, labels=rojas.astype(str).where(rojas > 0, '').tolist(),
+                     label_type='center', color='white', fontsize=10)
         
         # Ajustar la leyenda
         ax.legend(fontsize=10, loc='lower right')
@@ -120,45 +144,59 @@ def graficar_top_amonestados_home(amonestados_df, top_n=5, return_fig=False):
         return fig
     else:
         # Crear gráfico de barras apiladas con plotly para web
-        fig = go.Figure()
-        
-        fig.add_trace(go.Bar(
-            y=df['jugador'],
-            x=df['Tarjetas Amarillas'],
-            name='Amarillas',
-            orientation='h',
-            marker=dict(color=COLOR_TARJETAS_AMARILLAS)
-        ))
-        
-        fig.add_trace(go.Bar(
-            y=df['jugador'],
-            x=df['Tarjetas Rojas'],
-            name='Rojas',
-            orientation='h',
-            marker=dict(color=COLOR_TARJETAS_ROJAS)
-        ))
-        
-        fig.update_layout(
-            title=f'Top {top_n} Jugadores con Más Tarjetas',
-            xaxis_title='Número de Tarjetas',
-            yaxis_title='',
-            barmode='stack',
-            yaxis={'categoryorder': 'total ascending'},
-            legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                y=1.02,
-                xanchor="right",
-                x=1
-            )
-        )
-        
-        fig.update_traces(
-            hovertemplate='Tarjetas: %{x}<extra></extra>'
-        )
-        
+        fig = construir_top_amonestados_home(df, top_n)
         st.plotly_chart(fig, use_container_width=True)
 
+@instrumentar
+@cachear_figura
+def construir_top_amonestados_home(df, top_n):
+    """
+    Construye la figura de Plotly de los jugadores con más tarjetas
+    
+    Args:
+        df: DataFrame con los top_n amonestados ya ordenados
+        top_n: Número de jugadores mostrados (para el título)
+    """
+    fig = go.Figure()
+    
+    fig.add_trace(go.Bar(
+        y=df['jugador'],
+        x=df['Tarjetas Amarillas'],
+        name='Amarillas',
+        orientation='h',
+        marker=dict(color=COLOR_TARJETAS_AMARILLAS)
+    ))
+    
+    fig.add_trace(go.Bar(
+        y=df['jugador'],
+        x=df['Tarjetas Rojas'],
+        name='Rojas',
+        orientation='h',
+        marker=dict(color=COLOR_TARJETAS_ROJAS)
+    ))
+    
+    fig.update_layout(
+        title=f'Top {top_n} Jugadores con Más Tarjetas',
+        xaxis_title='Número de Tarjetas',
+        yaxis_title='',
+        barmode='stack',
+        yaxis={'categoryorder': 'total ascending'},
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1
+        )
+    )
+    
+    fig.update_traces(
+        hovertemplate='Tarjetas: %{x}<extra></extra>'
+    )
+    
+    return fig
+
+@instrumentar
 def graficar_minutos_jugados_home(minutos_df, top_n=5, return_fig=False):
     """
     Versión especial para la página Home que muestra Top 5
@@ -177,6 +215,7 @@ def graficar_minutos_jugados_home(minutos_df, top_n=5, return_fig=False):
     
     if return_fig:
         # Crear gráfico con matplotlib para PDF
+        plt = _pyplot()
         fig, ax = plt.subplots(figsize=(8, 4))
         bars = ax.barh(df['jugador'], df['minutos_jugados'], color='black')
         ax.set_title('Top Minutos Jugados', fontsize=12, pad=10)
@@ -186,33 +225,45 @@ def graficar_minutos_jugados_home(minutos_df, top_n=5, return_fig=False):
         ax.tick_params(axis='both', which='major', labelsize=10)
         
         # Añadir valores en las barras
-        for i, v in enumerate(df['minutos_jugados']):
-            ax.text(v, i, str(v), va='center', fontsize=10)
+        ax.bar_label(bars, fmt='%g', padding=2, fontsize=10)
         
         # Ajustar márgenes
         plt.tight_layout()
         return fig
     else:
         # Crear gráfico de barras horizontales con plotly para web
-        fig = px.bar(
-            df,
-            y='jugador',
-            x='minutos_jugados',
-            orientation='h',
-            title=f'Top {top_n} Jugadores con Más Minutos',
-            labels={'jugador': 'Jugador', 'minutos_jugados': 'Minutos Jugados'},
-            color_discrete_sequence=["#000000"]
-        )
-        
-        fig.update_layout(
-            yaxis={'categoryorder': 'total ascending'},
-            xaxis_title='Minutos Jugados',
-            yaxis_title='',
-            showlegend=False
-        )
-        
-        fig.update_traces(
-            hovertemplate='Minutos: %{x}<extra></extra>'
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
\ No newline at end of file
+        fig = construir_minutos_jugados_home(df, top_n)
+        st.plotly_chart(fig, use_container_width=True)
+
+@instrumentar
+@cachear_figura
+def construir_minutos_jugados_home(df, top_n):
+    """
+    Construye la figura de Plotly de los jugadores con más minutos
+    
+    Args:
+        df: DataFrame con los top_n jugadores ya ordenados
+        top_n: Número de jugadores mostrados (para el título)
+    """
+    fig = px.bar(
+        df,
+        y='jugador',
+        x='minutos_jugados',
+        orientation='h',
+        title=f'Top {top_n} Jugadores con Más Minutos',
+        labels={'jugador': 'Jugador', 'minutos_jugados': 'Minutos Jugados'},
+        color_discrete_sequence=["#000000"]
+    )
+    
+    fig.update_layout(
+        yaxis={'categoryorder': 'total ascending'},
+        xaxis_title='Minutos Jugados',
+        yaxis_title='',
+        showlegend=False
+    )
+    
+    fig.update_traces(
+        hovertemplate='Minutos: %{x}<extra></extra>'
+    )
+    
+    return fig
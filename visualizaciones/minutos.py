@@ -7,7 +7,11 @@ import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from utils.constants import PENYA_PRIMARY_COLOR, PENYA_SECONDARY_COLOR
+from visualizaciones.cache import cachear_figura
+from utils.ui import pestanas_perezosas
+from utils.instrumentacion import instrumentar
 
+@instrumentar
 def graficar_minutos_por_jugador(minutos_df, top_n=15, return_fig=False):
     """
     Crea un gráfico de barras con los minutos jugados por cada jugador
@@ -57,6 +61,7 @@ def graficar_minutos_por_jugador(minutos_df, top_n=15, return_fig=False):
     # Mostrar el gráfico
     st.plotly_chart(fig, use_container_width=True)
 
+@instrumentar
 def graficar_minutos_por_jugador_desglose(minutos_df, top_n=15, tipo_desglose='local_visitante', 
                                           color_izquierda=None, color_derecha=None):
     """
@@ -73,6 +78,25 @@ def graficar_minutos_por_jugador_desglose(minutos_df, top_n=15, tipo_desglose='l
         st.warning("No hay datos de minutos por jugador")
         return
     
+    fig = construir_minutos_desglose(minutos_df, top_n, tipo_desglose, color_izquierda, color_derecha)
+    
+    # Mostrar el gráfico
+    st.plotly_chart(fig, use_container_width=True)
+
+@instrumentar
+@cachear_figura
+def construir_minutos_desglose(minutos_df, top_n=15, tipo_desglose='local_visitante',
+                               color_izquierda=None, color_derecha=None):
+    """
+    Construye la figura de barras apiladas con el desglose de minutos por jugador
+    
+    Args:
+        minutos_df: DataFrame con minutos por jugador
+        top_n: Número de jugadores a mostrar (None para todos)
+        tipo_desglose: Tipo de desglose ('local_visitante' o 'titular_suplente')
+        color_izquierda: Color para la primera categoría (local o titular)
+        color_derecha: Color para la segunda categoría (visitante o suplente)
+    """
     # Limitar a los top_n jugadores si se especifica
     if top_n is not None:
         df = minutos_df.head(top_n).copy()
@@ -88,12 +112,10 @@ def graficar_minutos_por_jugador_desglose(minutos_df, top_n=15, tipo_desglose='l
         columnas = ['minutos_local', 'minutos_visitante']
         nombres = ['Local', 'Visitante']
         colores = [color_izquierda, color_derecha if color_derecha else '#36A2EB']  # Usar colores personalizados o los por defecto
-        titulo = f'Minutos Jugados (Local vs Visitante)'
     else:  # titular_suplente
         columnas = ['minutos_titular', 'minutos_suplente']
         nombres = ['Como Titular', 'Como Suplente']
         colores = [color_izquierda, color_derecha if color_derecha else '#888888']  # Usar colores personalizados o los por defecto
-        titulo = f'Minutos Jugados (Titular vs Suplente)'
     
     # Crear figura
     fig = go.Figure()
@@ -118,8 +140,6 @@ def graficar_minutos_por_jugador_desglose(minutos_df, top_n=15, tipo_desglose='l
     
     # Personalizar el gráfico
     fig.update_layout(
-        # CAMBIO: Quitar título
-        # title=titulo,
         yaxis={'categoryorder': 'total ascending'},
         xaxis_title='Minutos Jugados',
         yaxis_title='',
@@ -134,9 +154,9 @@ def graficar_minutos_por_jugador_desglose(minutos_df, top_n=15, tipo_desglose='l
         height=600
     )
     
-    # Mostrar el gráfico
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
 
+@instrumentar
 def graficar_porcentaje_minutos_jugador(minutos_df, top_n=10):
     """
     Crea un gráfico de pastel con el porcentaje de minutos jugados por cada jugador
@@ -186,54 +206,66 @@ def graficar_porcentaje_minutos_jugador(minutos_df, top_n=10):
     # Mostrar el gráfico
     st.plotly_chart(fig, use_container_width=True)
 
-def graficar_distribucion_sustituciones(sustituciones_data):
+@instrumentar
+@cachear_figura
+def construir_distribucion_sustituciones(distribucion_minutos):
+    """
+    Construye el gráfico de barras de sustituciones por rango de minutos
+    
+    Args:
+        distribucion_minutos: DataFrame con columnas 'rango' y 'cantidad'
+    """
+    fig = px.bar(
+        distribucion_minutos,
+        x='rango',
+        y='cantidad',
+        labels={'rango': 'Minuto', 'cantidad': 'Número de Sustituciones'},
+        color_discrete_sequence=[PENYA_SECONDARY_COLOR]
+    )
+    
+    # Personalizar el gráfico
+    fig.update_layout(
+        xaxis_title='Rango de Minutos',
+        yaxis_title='Número de Sustituciones',
+        showlegend=False
+    )
+    
+    # Personalizar tooltip
+    fig.update_traces(
+        hovertemplate='<b>%{x}</b><br>Sustituciones: %{y}<extra></extra>'
+    )
+    
+    return fig
+
+@instrumentar
+def graficar_distribucion_sustituciones(sustituciones_data, clave="sustituciones"):
     """
     Crea visualizaciones para el análisis de sustituciones
     
     Args:
         sustituciones_data: Diccionario con datos de sustituciones
+        clave: Clave del selector de pestañas (solo se dibuja la pestaña visible)
     """
     if not sustituciones_data:
         st.warning("No hay datos de sustituciones")
         return
     
     # Crear pestañas para las diferentes visualizaciones
-    tab1, tab2, tab3 = st.tabs([
+    pestana = pestanas_perezosas([
         "Distribución por Minuto", 
         "Sustituciones por Jornada",
         "Estadísticas de Sustituciones"
-    ])
+    ], clave)
     
     # Pestaña 1: Distribución por Minuto
-    with tab1:
-        # Crear gráfico de barras para distribución por minuto - CAMBIO: Quitar título
-        fig = px.bar(
-            sustituciones_data['distribucion_minutos'],
-            x='rango',
-            y='cantidad',
-            # CAMBIO: Quitar título
-            # title='Distribución de Sustituciones por Minuto',
-            labels={'rango': 'Minuto', 'cantidad': 'Número de Sustituciones'},
-            color_discrete_sequence=[PENYA_SECONDARY_COLOR]
-        )
-        
-        # Personalizar el gráfico
-        fig.update_layout(
-            xaxis_title='Rango de Minutos',
-            yaxis_title='Número de Sustituciones',
-            showlegend=False
-        )
-        
-        # Personalizar tooltip
-        fig.update_traces(
-            hovertemplate='<b>%{x}</b><br>Sustituciones: %{y}<extra></extra>'
-        )
+    if pestana == "Distribución por Minuto":
+        fig = construir_distribucion_sustituciones(sustituciones_data['distribucion_minutos'])
         
         # Mostrar el gráfico
         st.plotly_chart(fig, use_container_width=True)
     
     # Pestaña 2: Sustituciones por Jornada
-    with tab2:
+    elif pestana == "Sustituciones por Jornada":
         # Crear gráfico de líneas para sustituciones por jornada 
         fig = px.line(
             sustituciones_data['sustituciones_jornada'],
@@ -268,7 +300,7 @@ def graficar_distribucion_sustituciones(sustituciones_data):
         st.plotly_chart(fig, use_container_width=True)
         
     # Pestaña 3: Estadísticas de Sustituciones
-    with tab3:
+    else:
         # Crear sub-pestañas para diferentes estadísticas
         subtab1, subtab2, subtab3 = st.tabs([
             "Sustituciones Más Repetidas",